@@ -15,7 +15,7 @@
 # limitations under the License.
 
 from copy import deepcopy
-from typing import Union, Any, get_type_hints
+from typing import Union, Any, Callable, Optional, get_type_hints
 
 from iconservice.base.type_converter_templates import ParamType, \
     type_convert_templates, ValueType, KEY_CONVERTER, CONVERT_USING_SWITCH_KEY, SWITCH_KEY
@@ -241,6 +241,47 @@ class TypeConverter:
             kw_param = TypeConverter._convert_data_value(param, kw_param)
             kw_params[key] = kw_param
 
+    @staticmethod
+    def make_data_params_converter(annotation_params: dict) -> Callable[[dict], None]:
+        """Makes a function which converts kw_params in place like convert_data_params.
+        The converter of each param is looked up only once.
+
+        :param annotation_params: annotations of a method
+        :return: converter function
+        """
+        converters = []
+        for key, param in annotation_params.items():
+            if key == 'self' or key == 'cls':
+                continue
+
+            param = get_main_type_from_annotations_type(param)
+            converter = TypeConverter._get_data_value_converter(param)
+            if converter is not None:
+                converters.append((key, converter))
+
+        def convert(kw_params: dict) -> None:
+            for key, converter in converters:
+                kw_param = kw_params.get(key)
+                if kw_param is None:
+                    continue
+                kw_params[key] = converter(kw_param)
+
+        return convert
+
+    @staticmethod
+    def _get_data_value_converter(annotation_type: type) -> Optional[Callable[[Any], Any]]:
+        if annotation_type == int:
+            return TypeConverter._convert_value_int
+        elif annotation_type == str:
+            return TypeConverter._convert_value_string
+        elif annotation_type == bool:
+            return TypeConverter._convert_value_bool
+        elif annotation_type == Address:
+            return TypeConverter._convert_value_address
+        elif annotation_type == bytes:
+            return TypeConverter._convert_value_bytes
+        return None
+
     @staticmethod
     def _convert_data_value(annotation_type: type, param: Any) -> Any:
         if annotation_type == int:
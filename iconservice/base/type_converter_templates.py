@@ -34,6 +34,7 @@ class ParamType(IntEnum):
     ICX_GET_TOTAL_SUPPLY = 303
     ICX_GET_SCORE_API = 304
     ISE_GET_STATUS = 305
+    DEBUG_GET_TRACES = 306
 
     WRITE_PRECOMMIT = 400
     REMOVE_PRECOMMIT = 500
@@ -108,6 +109,7 @@ class ConstantKeys:
     ICX_GET_TOTAL_SUPPLY = "icx_getTotalSupply"
     ICX_GET_SCORE_API = "icx_getScoreApi"
     ISE_GET_STATUS = "ise_getStatus"
+    DEBUG_GET_TRACES = "debug_getTraces"
 
 
 type_convert_templates[ParamType.BLOCK] = {
@@ -196,6 +198,11 @@ type_convert_templates[ParamType.ISE_GET_STATUS] = {
     ConstantKeys.FILTER: [ValueType.STRING]
 }
 
+type_convert_templates[ParamType.DEBUG_GET_TRACES] = {
+    ConstantKeys.BLOCK_HASH: ValueType.BYTES,
+    ConstantKeys.TX_HASH: ValueType.BYTES
+}
+
 type_convert_templates[ParamType.QUERY] = {
     ConstantKeys.METHOD: ValueType.STRING,
     ConstantKeys.PARAMS: {
@@ -205,7 +212,8 @@ type_convert_templates[ParamType.QUERY] = {
             ConstantKeys.ICX_GET_BALANCE: type_convert_templates[ParamType.ICX_GET_BALANCE],
             ConstantKeys.ICX_GET_TOTAL_SUPPLY: type_convert_templates[ParamType.ICX_GET_TOTAL_SUPPLY],
             ConstantKeys.ICX_GET_SCORE_API: type_convert_templates[ParamType.ICX_GET_SCORE_API],
-            ConstantKeys.ISE_GET_STATUS: type_convert_templates[ParamType.ISE_GET_STATUS]
+            ConstantKeys.ISE_GET_STATUS: type_convert_templates[ParamType.ISE_GET_STATUS],
+            ConstantKeys.DEBUG_GET_TRACES: type_convert_templates[ParamType.DEBUG_GET_TRACES]
         }
     }
 }
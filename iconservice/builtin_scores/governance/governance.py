@@ -90,8 +90,8 @@ class StepCosts:
         return self._step_types.__len__()
 
     def items(self):
-        for step_type in self._step_types:
-            yield (step_type, self._step_costs[step_type])
+        step_types = list(self._step_types)
+        return zip(step_types, self._step_costs.get_many(step_types))
 
 
 class Governance(IconScoreBase):
@@ -166,8 +166,7 @@ class Governance(IconScoreBase):
     def _fill_status_with_str(db: DictDB):
         count = 0
         status = {}
-        for key in VALID_STATUS_KEYS:
-            value: bytes = db[key]
+        for key, value in zip(VALID_STATUS_KEYS, db.get_many(VALID_STATUS_KEYS)):
             if value:
                 if key == STATUS:
                     status[key] = value.decode()
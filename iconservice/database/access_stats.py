@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Optional state access statistics per SCORE and per container variable
+
+IconScoreDatabase reports every access to StateAccessStats
+when IconScoreDatabase.access_stats is set.
+"""
+
+import heapq
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
+
+from iconservice.iconscore.icon_container_db import ARRAY_DB_ID, DICT_DB_ID, VAR_DB_ID, SET_DB_ID, SORTED_DB_ID
+from iconservice.iconscore.icon_score_context import IconScoreContextType
+
+if TYPE_CHECKING:
+    from iconservice.base.address import Address
+    from iconservice.iconscore.icon_score_context import IconScoreContext
+
+DEFAULT_HOT_KEY_COUNT = 100
+
+_CONTAINER_NAMES = {
+    ARRAY_DB_ID: 'ArrayDB',
+    DICT_DB_ID: 'DictDB',
+    VAR_DB_ID: 'VarDB',
+    SET_DB_ID: 'SetDB',
+    SORTED_DB_ID: 'SortedDB'
+}
+
+
+def get_variable_name(relative_key: bytes) -> str:
+    """Returns the container variable which a key belongs to
+
+    Keys of container dbs start with a container id and a variable name.
+    Other keys are regarded as a variable by themselves.
+
+    :param relative_key: key without the SCORE address
+    :return: e.g. 'DictDB:balances'
+    """
+    segments = relative_key.split(b'|', 2)
+    container = _CONTAINER_NAMES.get(segments[0])
+
+    if container is None or len(segments) < 2:
+        return relative_key.decode('utf-8', 'backslashreplace')
+
+    return f"{container}:{segments[1].decode('utf-8', 'backslashreplace')}"
+
+
+class AccessCounter(object):
+    """Access counts of a container variable
+    """
+    __slots__ = ('gets', 'puts', 'deletes', 'bytes_read', 'bytes_written', 'batch_hits', 'db_hits')
+
+    def __init__(self) -> None:
+        self.gets = 0
+        self.puts = 0
+        self.deletes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        # gets served from TransactionBatch or BlockBatch
+        self.batch_hits = 0
+        # gets which reached StateDB
+        self.db_hits = 0
+
+    def add(self, other: 'AccessCounter') -> None:
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def to_dict(self) -> dict:
+        return {
+            'gets': self.gets,
+            'puts': self.puts,
+            'deletes': self.deletes,
+            'bytesRead': self.bytes_read,
+            'bytesWritten': self.bytes_written,
+            'batchHits': self.batch_hits,
+            'dbHits': self.db_hits
+        }
+
+
+class HotKeySketch(object):
+    """Space-saving sketch which finds the most frequently accessed keys
+
+    At most capacity keys are monitored.
+    When a new key comes to a full sketch, it replaces the least counted key
+    and inherits its count as an overestimation error.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f'Invalid capacity: {capacity}')
+
+        self._capacity = capacity
+        # key: [count, error]
+        self._counters = {}
+        # (count, key) lower bounds of counts, one entry per monitored key
+        self._heap = []
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def add(self, key: bytes) -> None:
+        counter = self._counters.get(key)
+        if counter is not None:
+            counter[0] += 1
+            return
+
+        if len(self._counters) < self._capacity:
+            self._counters[key] = [1, 0]
+            heapq.heappush(self._heap, (1, key))
+            return
+
+        min_count, min_key = self._pop_min()
+        del self._counters[min_key]
+        self._counters[key] = [min_count + 1, min_count]
+        heapq.heappush(self._heap, (min_count + 1, key))
+
+    def _pop_min(self) -> tuple:
+        # Counts only increase, so a stale entry is pushed again with its current count
+        while True:
+            count, key = heapq.heappop(self._heap)
+            current = self._counters[key][0]
+            if count == current:
+                return count, key
+            heapq.heappush(self._heap, (current, key))
+
+    def top(self, n: int) -> list:
+        """Returns the n most counted keys
+
+        :param n: the number of keys to return
+        :return: [(key, count, error)] sorted by count in descending order
+        """
+        items = sorted(self._counters.items(), key=lambda item: item[1][0], reverse=True)
+        return [(key, count, error) for key, (count, error) in items[:n]]
+
+
+class StateAccessStats(object):
+    """Aggregates state accesses of SCOREs
+
+    Counts are grouped by SCORE address and by container variable.
+    """
+
+    def __init__(self, hot_key_count: int = DEFAULT_HOT_KEY_COUNT) -> None:
+        """Constructor
+
+        :param hot_key_count: the number of hot keys to report
+        """
+        if hot_key_count < 1:
+            raise ValueError(f'Invalid hot_key_count: {hot_key_count}')
+
+        self._hot_key_count = hot_key_count
+        self._lock = Lock()
+        # address: {variable name: AccessCounter}
+        self._counters = {}
+        # Monitors more keys than reported to make the top keys accurate
+        self._hot_keys = HotKeySketch(hot_key_count * 4)
+
+    def _get_counter(self, address: 'Address', hashed_key: bytes) -> 'AccessCounter':
+        # hashed_key is made of address bytes, b'|' and a relative key
+        relative_key = hashed_key[len(address.to_bytes()) + 1:]
+        variable = get_variable_name(relative_key)
+
+        variables = self._counters.setdefault(address, {})
+        counter = variables.get(variable)
+        if counter is None:
+            counter = variables[variable] = AccessCounter()
+        return counter
+
+    def on_get(self,
+               context: Optional['IconScoreContext'],
+               address: 'Address',
+               hashed_key: bytes,
+               value: Optional[bytes]) -> None:
+        """Records a read
+
+        :param context: the context which the read is done on
+        :param address: SCORE address
+        :param hashed_key: key stored in StateDB
+        :param value: the value read
+        """
+        is_batch_hit = self._is_in_batch(context, hashed_key)
+
+        with self._lock:
+            counter = self._get_counter(address, hashed_key)
+            counter.gets += 1
+            if value:
+                counter.bytes_read += len(value)
+            if is_batch_hit:
+                counter.batch_hits += 1
+            else:
+                counter.db_hits += 1
+            self._hot_keys.add(hashed_key)
+
+    def on_put(self, address: 'Address', hashed_key: bytes, value: bytes) -> None:
+        """Records a write
+
+        :param address: SCORE address
+        :param hashed_key: key stored in StateDB
+        :param value: the value written
+        """
+        with self._lock:
+            counter = self._get_counter(address, hashed_key)
+            counter.puts += 1
+            counter.bytes_written += len(value)
+            self._hot_keys.add(hashed_key)
+
+    def on_delete(self, address: 'Address', hashed_key: bytes) -> None:
+        """Records a deletion
+
+        :param address: SCORE address
+        :param hashed_key: key stored in StateDB
+        """
+        with self._lock:
+            self._get_counter(address, hashed_key).deletes += 1
+            self._hot_keys.add(hashed_key)
+
+    @staticmethod
+    def _is_in_batch(context: Optional['IconScoreContext'], hashed_key: bytes) -> bool:
+        if context is None or context.type in (IconScoreContextType.DIRECT, IconScoreContextType.QUERY):
+            return False
+
+        return hashed_key in context.tx_batch or hashed_key in context.block_batch
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._hot_keys = HotKeySketch(self._hot_key_count * 4)
+
+    def to_dict(self) -> dict:
+        """Returns the statistics
+
+        SCOREs are sorted by the number of accesses in descending order.
+
+        :return: {'scores': [...], 'hotKeys': [...]}
+        """
+        with self._lock:
+            scores = []
+            for address, variables in self._counters.items():
+                total = AccessCounter()
+                for counter in variables.values():
+                    total.add(counter)
+
+                score = total.to_dict()
+                score['address'] = address
+                score['variables'] = {name: counter.to_dict() for name, counter in variables.items()}
+                scores.append(score)
+
+            hot_keys = [{'key': key, 'count': count, 'error': error}
+                        for key, count, error in self._hot_keys.top(self._hot_key_count)]
+
+        scores.sort(key=lambda score: score['gets'] + score['puts'] + score['deletes'], reverse=True)
+        return {'scores': scores, 'hotKeys': hot_keys}
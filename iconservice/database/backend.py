@@ -0,0 +1,582 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Key-value storage engines behind KeyValueDatabase
+
+plyvel.DB is used as it is because it already satisfies DatabaseBackend.
+"""
+
+import hashlib
+import struct
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import plyvel
+
+from ..base.exception import DatabaseException
+from ..icon_constant import ConfigKey
+
+# lmdb reserves the address space of map size, not the disk space
+DEFAULT_LMDB_MAP_SIZE = 1 << 40
+
+_LMDB_KEY_HASH_SIZE = 32
+_LMDB_KEY_SIZE_HEADER = struct.Struct('>I')
+
+
+class BackendType(object):
+    PLYVEL = 'plyvel'
+    LMDB = 'lmdb'
+    MEMORY = 'memory'
+
+
+SUPPORTED_BACKEND_TYPES = (BackendType.PLYVEL, BackendType.LMDB, BackendType.MEMORY)
+
+# config key: (plyvel.DB argument, minimum value)
+_LEVELDB_INT_OPTIONS = {
+    ConfigKey.STATE_DB_LRU_CACHE_SIZE: ('lru_cache_size', 0),
+    ConfigKey.STATE_DB_BLOOM_FILTER_BITS: ('bloom_filter_bits', 0),
+    ConfigKey.STATE_DB_WRITE_BUFFER_SIZE: ('write_buffer_size', 64 * 1024),
+    ConfigKey.STATE_DB_MAX_OPEN_FILES: ('max_open_files', 64),
+    ConfigKey.STATE_DB_BLOCK_SIZE: ('block_size', 1024)
+}
+_LEVELDB_COMPRESSIONS = ('snappy', 'none')
+
+
+def get_prefix_upper_bound(prefix: bytes) -> Optional[bytes]:
+    """Returns the smallest key greater than all keys starting with prefix
+
+    :param prefix:
+    :return: upper bound or None if there is no upper bound
+    """
+    prefix = prefix.rstrip(b'\xff')
+    if len(prefix) == 0:
+        return None
+
+    return prefix[:-1] + bytes([prefix[-1] + 1])
+
+
+def make_leveldb_options(options: Optional[dict]) -> dict:
+    """Validates LevelDB options in config and converts them to plyvel.DB arguments
+
+    Options which are not given keep the defaults of LevelDB.
+
+    :param options: stateDbOptions in config
+    :return: keyword arguments for plyvel.DB
+    """
+    if options is None:
+        return {}
+    if not isinstance(options, dict):
+        raise DatabaseException(f'Invalid {ConfigKey.STATE_DB_OPTIONS}: {options}')
+
+    unknown_keys = set(options) - set(_LEVELDB_INT_OPTIONS) - {ConfigKey.STATE_DB_COMPRESSION}
+    if unknown_keys:
+        raise DatabaseException(f'Unknown {ConfigKey.STATE_DB_OPTIONS}: {sorted(unknown_keys)}')
+
+    kwargs = {}
+    for key, (name, min_value) in _LEVELDB_INT_OPTIONS.items():
+        if key not in options:
+            continue
+
+        value = options[key]
+        # bool is a subclass of int
+        if not isinstance(value, int) or isinstance(value, bool) or value < min_value:
+            raise DatabaseException(f'Invalid {key}: {value} (int >= {min_value} expected)')
+        kwargs[name] = value
+
+    if ConfigKey.STATE_DB_COMPRESSION in options:
+        compression = options[ConfigKey.STATE_DB_COMPRESSION]
+        if compression not in _LEVELDB_COMPRESSIONS:
+            raise DatabaseException(
+                f'Invalid {ConfigKey.STATE_DB_COMPRESSION}: {compression} (one of {_LEVELDB_COMPRESSIONS} expected)')
+        kwargs['compression'] = None if compression == 'none' else compression
+
+    return kwargs
+
+
+def _check_value(value: bytes) -> None:
+    # Follows plyvel which does not allow non-bytes values
+    if not isinstance(value, bytes):
+        raise TypeError(f'Expected bytes: {type(value)}')
+
+
+class DatabaseBackend(ABC):
+    """Interface of a key-value storage engine
+
+    Snapshots returned by snapshot() provide get(), iterator() and close().
+    """
+
+    @abstractmethod
+    def get(self, key: bytes) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def put(self, key: bytes, value: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def write_batch(self) -> 'WriteBatch':
+        """Returns a batch which is written at once on leaving `with` block
+        """
+        pass
+
+    @abstractmethod
+    def prefixed_db(self, prefix: bytes) -> 'DatabaseBackend':
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> 'DatabaseBackend':
+        """Returns a read-only view of the current state
+        """
+        pass
+
+    @abstractmethod
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        """Returns an iterator of (key, value) pairs in [start, stop) in key order
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class WriteBatch(ABC):
+    """Collects changes and writes them at once
+    """
+
+    @abstractmethod
+    def put(self, key: bytes, value: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def write(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.write()
+
+
+class PrefixedBackend(DatabaseBackend):
+    """Prefixed view of a backend which has no native prefix support
+    """
+
+    def __init__(self, backend: 'DatabaseBackend', prefix: bytes, owns_backend: bool = False) -> None:
+        """Constructor
+
+        :param backend: backend to wrap
+        :param prefix: prefix of all keys
+        :param owns_backend: whether to close the backend on close()
+        """
+        self._backend = backend
+        self._prefix = prefix
+        self._owns_backend = owns_backend
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._backend.get(self._prefix + key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._backend.put(self._prefix + key, value)
+
+    def delete(self, key: bytes) -> None:
+        self._backend.delete(self._prefix + key)
+
+    def write_batch(self) -> 'WriteBatch':
+        return PrefixedWriteBatch(self._backend.write_batch(), self._prefix)
+
+    def prefixed_db(self, prefix: bytes) -> 'DatabaseBackend':
+        return PrefixedBackend(self._backend, self._prefix + prefix)
+
+    def snapshot(self) -> 'DatabaseBackend':
+        return PrefixedBackend(self._backend.snapshot(), self._prefix, owns_backend=True)
+
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        prefix = self._prefix
+        start = prefix if start is None else prefix + start
+        stop = get_prefix_upper_bound(prefix) if stop is None else prefix + stop
+
+        for key, value in self._backend.iterator(start=start, stop=stop, reverse=reverse):
+            yield key[len(prefix):], value
+
+    def close(self) -> None:
+        if self._owns_backend:
+            self._backend.close()
+
+
+class PrefixedWriteBatch(WriteBatch):
+    def __init__(self, write_batch: 'WriteBatch', prefix: bytes) -> None:
+        self._write_batch = write_batch
+        self._prefix = prefix
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._write_batch.put(self._prefix + key, value)
+
+    def delete(self, key: bytes) -> None:
+        self._write_batch.delete(self._prefix + key)
+
+    def write(self) -> None:
+        self._write_batch.write()
+
+
+class MemoryBackend(DatabaseBackend):
+    """Dict based backend which keeps no data on disk
+
+    Mainly for tests.
+    """
+
+    def __init__(self, data: Optional[dict] = None) -> None:
+        self._data = {} if data is None else data
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._data.get(key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        _check_value(value)
+        self._data[key] = value
+
+    def delete(self, key: bytes) -> None:
+        self._data.pop(key, None)
+
+    def write_batch(self) -> 'WriteBatch':
+        return MemoryWriteBatch(self)
+
+    def prefixed_db(self, prefix: bytes) -> 'DatabaseBackend':
+        return PrefixedBackend(self, prefix)
+
+    def snapshot(self) -> 'DatabaseBackend':
+        return MemoryBackend(dict(self._data))
+
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        keys = sorted((key for key in self._data
+                       if (start is None or key >= start) and (stop is None or key < stop)),
+                      reverse=reverse)
+        return iter([(key, self._data[key]) for key in keys])
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryWriteBatch(WriteBatch):
+    def __init__(self, backend: 'MemoryBackend') -> None:
+        self._backend = backend
+        self._states = {}
+
+    def put(self, key: bytes, value: bytes) -> None:
+        _check_value(value)
+        self._states[key] = value
+
+    def delete(self, key: bytes) -> None:
+        self._states[key] = None
+
+    def write(self) -> None:
+        for key, value in self._states.items():
+            if value is None:
+                self._backend.delete(key)
+            else:
+                self._backend.put(key, value)
+        self._states.clear()
+
+
+class LmdbBackend(DatabaseBackend):
+    """Memory-mapped B+tree backend based on LMDB
+
+    Reads are served from a read transaction,
+    so readers never block each other or a writer.
+    Keys longer than LMDB allows are stored by LmdbKeyCodec.
+    """
+
+    @staticmethod
+    def from_path(path: str,
+                  create_if_missing: bool = True,
+                  map_size: int = DEFAULT_LMDB_MAP_SIZE,
+                  read_only: bool = False) -> 'LmdbBackend':
+        try:
+            import lmdb
+        except ImportError:
+            raise DatabaseException('lmdb is not installed')
+
+        if read_only:
+            # Another process can keep writing to the environment
+            env = lmdb.open(path, map_size=map_size, create=False, readonly=True)
+        else:
+            env = lmdb.open(path, map_size=map_size, create=create_if_missing)
+        return LmdbBackend(env)
+
+    def __init__(self, env) -> None:
+        """Constructor
+
+        :param env: lmdb.Environment instance
+        """
+        self._env = env
+        self._codec = LmdbKeyCodec(env.max_key_size())
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        with self._env.begin() as txn:
+            return self._codec.get(txn, key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        _check_value(value)
+        with self._env.begin(write=True) as txn:
+            self._codec.put(txn, key, value)
+
+    def delete(self, key: bytes) -> None:
+        with self._env.begin(write=True) as txn:
+            self._codec.delete(txn, key)
+
+    def write_batch(self) -> 'WriteBatch':
+        return LmdbWriteBatch(self._env, self._codec)
+
+    def prefixed_db(self, prefix: bytes) -> 'DatabaseBackend':
+        return PrefixedBackend(self, prefix)
+
+    def snapshot(self) -> 'DatabaseBackend':
+        return LmdbSnapshot(self._env.begin(), self._codec)
+
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        txn = self._env.begin()
+        try:
+            yield from self._codec.iterate(txn, start, stop, reverse)
+        finally:
+            txn.abort()
+
+    def close(self) -> None:
+        if self._env:
+            self._env.close()
+            self._env = None
+
+
+class LmdbSnapshot(DatabaseBackend):
+    """Read-only view on a LMDB read transaction
+    """
+
+    def __init__(self, txn, codec: 'LmdbKeyCodec') -> None:
+        self._txn = txn
+        self._codec = codec
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._codec.get(self._txn, key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        raise DatabaseException('put is not allowed on snapshot')
+
+    def delete(self, key: bytes) -> None:
+        raise DatabaseException('delete is not allowed on snapshot')
+
+    def write_batch(self) -> 'WriteBatch':
+        raise DatabaseException('write_batch is not allowed on snapshot')
+
+    def prefixed_db(self, prefix: bytes) -> 'DatabaseBackend':
+        return PrefixedBackend(self, prefix)
+
+    def snapshot(self) -> 'DatabaseBackend':
+        return self
+
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        return self._codec.iterate(self._txn, start, stop, reverse)
+
+    def close(self) -> None:
+        if self._txn:
+            self._txn.abort()
+            self._txn = None
+
+
+class LmdbWriteBatch(WriteBatch):
+    def __init__(self, env, codec: 'LmdbKeyCodec') -> None:
+        self._env = env
+        self._codec = codec
+        self._states = {}
+
+    def put(self, key: bytes, value: bytes) -> None:
+        _check_value(value)
+        self._states[key] = value
+
+    def delete(self, key: bytes) -> None:
+        self._states[key] = None
+
+    def write(self) -> None:
+        with self._env.begin(write=True) as txn:
+            for key, value in self._states.items():
+                if value is None:
+                    self._codec.delete(txn, key)
+                else:
+                    self._codec.put(txn, key, value)
+        self._states.clear()
+
+
+class LmdbKeyCodec(object):
+    """Stores keys which LMDB rejects for their size
+
+    A key of max_key_size bytes or longer is stored under its first bytes followed by its hash
+    and the whole key is put in front of its value, so the key is restored on reads.
+    Stored keys sharing those first bytes are contiguous,
+    so they are sorted again by their whole keys on iteration.
+    """
+
+    def __init__(self, max_key_size: int) -> None:
+        """Constructor
+
+        :param max_key_size: lmdb.Environment.max_key_size()
+        """
+        self._max_key_size = max_key_size
+        self._head_size = max_key_size - _LMDB_KEY_HASH_SIZE
+
+    def get(self, txn, key: bytes) -> Optional[bytes]:
+        stored_key = self._encode_key(key)
+        stored_value = txn.get(stored_key)
+        if stored_value is None or stored_key is key:
+            return stored_value
+
+        whole_key, value = self._decode_item(stored_key, stored_value)
+        return value if whole_key == key else None
+
+    def put(self, txn, key: bytes, value: bytes) -> None:
+        stored_key = self._encode_key(key)
+        if stored_key is not key:
+            value = _LMDB_KEY_SIZE_HEADER.pack(len(key)) + key + value
+        txn.put(stored_key, value)
+
+    def delete(self, txn, key: bytes) -> None:
+        txn.delete(self._encode_key(key))
+
+    def iterate(self, txn, start: Optional[bytes], stop: Optional[bytes], reverse: bool) -> iter:
+        head_size = self._head_size
+        # Scans whole groups of keys sharing the first bytes of start and stop
+        scan_start = start if start is None or len(start) <= head_size else start[:head_size]
+        scan_stop = stop if stop is None or len(stop) <= head_size else get_prefix_upper_bound(stop[:head_size])
+
+        group = []
+        group_head = None
+        for stored_key, stored_value in _iterate_lmdb(txn, scan_start, scan_stop, reverse):
+            head = stored_key[:head_size] if len(stored_key) >= head_size else None
+            if head != group_head or head is None:
+                yield from self._flush(group, start, stop, reverse)
+                group_head = head
+
+            group.append(self._decode_item(stored_key, stored_value))
+
+        yield from self._flush(group, start, stop, reverse)
+
+    @staticmethod
+    def _flush(group: list, start: Optional[bytes], stop: Optional[bytes], reverse: bool) -> iter:
+        if len(group) > 1:
+            group.sort(key=lambda item: item[0], reverse=reverse)
+
+        for key, value in group:
+            if (start is None or key >= start) and (stop is None or key < stop):
+                yield key, value
+        group.clear()
+
+    def _encode_key(self, key: bytes) -> bytes:
+        if len(key) < self._max_key_size:
+            return key
+        return key[:self._head_size] + hashlib.sha3_256(key).digest()
+
+    def _decode_item(self, stored_key: bytes, stored_value: bytes) -> tuple:
+        if len(stored_key) < self._max_key_size:
+            return stored_key, stored_value
+
+        key_size, = _LMDB_KEY_SIZE_HEADER.unpack_from(stored_value)
+        offset = _LMDB_KEY_SIZE_HEADER.size + key_size
+        return stored_value[_LMDB_KEY_SIZE_HEADER.size:offset], stored_value[offset:]
+
+
+def _iterate_lmdb(txn, start: Optional[bytes], stop: Optional[bytes], reverse: bool) -> iter:
+    cursor = txn.cursor()
+
+    if reverse:
+        # Moves to the last key less than stop
+        if stop is None or not cursor.set_range(stop):
+            valid = cursor.last()
+        else:
+            valid = cursor.prev()
+
+        while valid:
+            key = cursor.key()
+            if start is not None and key < start:
+                break
+            yield key, cursor.value()
+            valid = cursor.prev()
+    else:
+        valid = cursor.first() if start is None else cursor.set_range(start)
+
+        while valid:
+            key = cursor.key()
+            if stop is not None and key >= stop:
+                break
+            yield key, cursor.value()
+            valid = cursor.next()
+
+
+def open_backend(backend_type: str,
+                 path: str,
+                 create_if_missing: bool = True,
+                 options: Optional[dict] = None,
+                 read_only: bool = False) -> 'DatabaseBackend':
+    """Opens a backend of backend_type at path
+
+    :param backend_type: one of SUPPORTED_BACKEND_TYPES
+    :param path: db path
+    :param create_if_missing:
+    :param options: plyvel.DB arguments made by make_leveldb_options(), ignored by other backends
+    :param read_only: opens the db shared with a writer in another process, lmdb only
+    :return: backend instance
+    """
+    if read_only:
+        # LevelDB locks its db exclusively
+        if backend_type != BackendType.LMDB:
+            raise DatabaseException(f'{backend_type} backend cannot be opened read-only')
+        return LmdbBackend.from_path(path, read_only=True)
+
+    if backend_type == BackendType.PLYVEL:
+        return plyvel.DB(path, create_if_missing=create_if_missing, **(options or {}))
+    elif backend_type == BackendType.LMDB:
+        return LmdbBackend.from_path(path, create_if_missing)
+    elif backend_type == BackendType.MEMORY:
+        return MemoryBackend()
+    else:
+        raise DatabaseException(f'Unsupported state db backend: {backend_type}')
@@ -14,12 +14,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Optional
 
-import plyvel
-
 from iconcommons.logger import Logger
 from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import BackendType, open_backend, get_prefix_upper_bound
 from iconservice.icon_constant import ICON_DB_LOG_TAG
 from iconservice.iconscore.icon_score_context import ContextGetter
 from iconservice.iconscore.icon_score_context import IconScoreContextType
@@ -27,6 +27,8 @@ from iconservice.iconscore.icon_score_context import IconScoreContextType
 if TYPE_CHECKING:
     from iconservice.iconscore.icon_score_context import IconScoreContext
     from iconservice.base.address import Address
+    from iconservice.database.backend import DatabaseBackend
+    from iconservice.database.access_stats import StateAccessStats
 
 
 def _get_context_type(context: 'IconScoreContext') -> 'IconScoreContextType':
@@ -36,6 +38,41 @@ def _get_context_type(context: 'IconScoreContext') -> 'IconScoreContextType':
         return context.type
 
 
+def _merge_items(db_items: iter, batch_items: dict, reverse: bool) -> iter:
+    """Merges items from StateDB with items in batch in key order
+
+    Values in batch take precedence over ones in StateDB
+    and None value in batch means a deleted item.
+
+    :param db_items: (key, value) iterator from StateDB sorted by key
+    :param batch_items: key/value pairs in batch
+    :param reverse: whether items are sorted in descending order
+    :return: (key, value) iterator
+    """
+    batch_keys = sorted(batch_items, reverse=reverse)
+    i = 0
+
+    for key, value in db_items:
+        while i < len(batch_keys) and \
+                (batch_keys[i] > key if reverse else batch_keys[i] < key):
+            batch_key = batch_keys[i]
+            i += 1
+            if batch_items[batch_key] is not None:
+                yield batch_key, batch_items[batch_key]
+
+        if i < len(batch_keys) and batch_keys[i] == key:
+            i += 1
+            value = batch_items[key]
+            if value is None:
+                continue
+
+        yield key, value
+
+    for batch_key in batch_keys[i:]:
+        if batch_items[batch_key] is not None:
+            yield batch_key, batch_items[batch_key]
+
+
 def _is_db_writable_on_context(context: 'IconScoreContext'):
     """Check if db is writable on a given context
 
@@ -51,20 +88,26 @@ def _is_db_writable_on_context(context: 'IconScoreContext'):
 class KeyValueDatabase(object):
     @staticmethod
     def from_path(path: str,
-                  create_if_missing: bool=True) -> 'KeyValueDatabase':
+                  create_if_missing: bool=True,
+                  backend_type: str=BackendType.PLYVEL,
+                  options: Optional[dict]=None,
+                  read_only: bool=False) -> 'KeyValueDatabase':
         """
 
         :param path: db path
         :param create_if_missing:
+        :param backend_type: storage engine to use
+        :param options: backend specific options
+        :param read_only: opens the db shared with a writer in another process
         :return: KeyValueDatabase instance
         """
-        db = plyvel.DB(path, create_if_missing=create_if_missing)
+        db = open_backend(backend_type, path, create_if_missing, options, read_only)
         return KeyValueDatabase(db)
 
-    def __init__(self, db: plyvel.DB) -> None:
+    def __init__(self, db: 'DatabaseBackend') -> None:
         """Constructor
 
-        :param db: plyvel db instance
+        :param db: backend instance such as plyvel db
         """
         self._db = db
 
@@ -76,6 +119,20 @@ class KeyValueDatabase(object):
         """
         return self._db.get(key)
 
+    def get_many(self, keys: list) -> list:
+        """Get the values for the specified keys at once.
+
+        All keys are read from a single snapshot of the database.
+
+        :param keys: (list): keys to retrieve
+        :return: values in the same order as keys, None if not found
+        """
+        if not keys:
+            return []
+
+        with self._db.snapshot() as snapshot:
+            return [snapshot.get(key) for key in keys]
+
     def put(self, key: bytes, value: bytes) -> None:
         """Set a value for the specified key.
 
@@ -98,6 +155,13 @@ class KeyValueDatabase(object):
             self._db.close()
             self._db = None
 
+    def snapshot(self) -> 'DatabaseBackend':
+        """Return a read-only view of the current state.
+
+        It should be closed after use.
+        """
+        return self._db.snapshot()
+
     def get_sub_db(self, prefix: bytes) -> 'KeyValueDatabase':
         """Return a new prefixed database.
 
@@ -105,8 +169,17 @@ class KeyValueDatabase(object):
         """
         return KeyValueDatabase(self._db.prefixed_db(prefix))
 
-    def iterator(self) -> iter:
-        return self._db.iterator()
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        """Return an iterator of (key, value) pairs in key order.
+
+        :param start: the first key to include
+        :param stop: the first key to exclude
+        :param reverse: iterate in descending key order
+        """
+        return self._db.iterator(start=start, stop=stop, reverse=reverse)
 
     def write_batch(self, states: dict) -> None:
         """Write a batch to the database for the specified states dict.
@@ -125,6 +198,45 @@ class KeyValueDatabase(object):
                     wb.delete(key)
 
 
+class ReadView(object):
+    """Committed states pinned at the moment the view is taken
+
+    Reads through a view see no writes made after it was taken.
+    It should be closed after use.
+    """
+
+    def __init__(self, db: 'KeyValueDatabase') -> None:
+        """Constructor
+
+        :param db: KeyValueDatabase to take the view of
+        """
+        self.db = db
+        self._snapshot = db.snapshot()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._snapshot.get(key)
+
+    def get_many(self, keys: list) -> list:
+        return [self._snapshot.get(key) for key in keys]
+
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        return self._snapshot.iterator(start=start, stop=stop, reverse=reverse)
+
+    def close(self) -> None:
+        if self._snapshot:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
 class DatabaseObserver(object):
     """ An abstract class of database observer.
     """
@@ -194,6 +306,8 @@ class ContextDatabase(object):
         self.key_value_db = db
         # True: this db is shared with all SCOREs
         self._is_shared = is_shared
+        # Committed states are read from this view instead of the db if it is set
+        self.read_view: Optional['ReadView'] = None
 
     def get(self, context: Optional['IconScoreContext'], key: bytes) -> bytes:
         """Returns value indicated by key from batch or StateDB
@@ -205,7 +319,7 @@ class ContextDatabase(object):
         context_type = _get_context_type(context)
 
         if context_type in (IconScoreContextType.DIRECT, IconScoreContextType.QUERY):
-            return self.key_value_db.get(key)
+            return self._get_committed_db(context).get(key)
         else:
             return self.get_from_batch(context, key)
 
@@ -236,7 +350,99 @@ class ContextDatabase(object):
             return block_batch[key]
 
         # get value from state_db
-        return self.key_value_db.get(key)
+        return self._get_committed_db(context).get(key)
+
+    def get_many(self,
+                 context: Optional['IconScoreContext'],
+                 keys: list) -> list:
+        """Returns values indicated by keys from batch or StateDB
+
+        :param context:
+        :param keys:
+        :return: values in the same order as keys
+        """
+        context_type = _get_context_type(context)
+
+        if context_type in (IconScoreContextType.DIRECT, IconScoreContextType.QUERY):
+            return self._get_committed_db(context).get_many(keys)
+        else:
+            return self.get_many_from_batch(context, keys)
+
+    def get_many_from_batch(self,
+                            context: 'IconScoreContext',
+                            keys: list) -> list:
+        """Returns values for given keys
+
+        Keys found in neither TransactionBatch nor BlockBatch
+        are read from StateDB at once.
+
+        :param context:
+        :param keys:
+        :return: values in the same order as keys
+        """
+        block_batch = context.block_batch
+        tx_batch = context.tx_batch
+
+        values = [None] * len(keys)
+        missed_indexes = []
+
+        for i, key in enumerate(keys):
+            if key in tx_batch:
+                values[i] = tx_batch[key]
+            elif key in block_batch:
+                values[i] = block_batch[key]
+            else:
+                missed_indexes.append(i)
+
+        if missed_indexes:
+            missed_values = self._get_committed_db(context).get_many(
+                [keys[i] for i in missed_indexes])
+            for i, value in zip(missed_indexes, missed_values):
+                values[i] = value
+
+        return values
+
+    def iterator(self,
+                 context: Optional['IconScoreContext'],
+                 start: bytes,
+                 stop: Optional[bytes],
+                 reverse: bool = False) -> iter:
+        """Returns an iterator of (key, value) pairs
+        whose keys are in the range of [start, stop)
+
+        Changes in TransactionBatch and BlockBatch are applied
+        according to context type.
+
+        :param context:
+        :param start: the first key to include
+        :param stop: the first key to exclude, None means no upper bound
+        :param reverse: iterate in descending key order
+        :return: (key, value) iterator sorted by key
+        """
+        db_items = self._get_committed_db(context).iterator(start=start, stop=stop, reverse=reverse)
+        context_type = _get_context_type(context)
+
+        if context_type in (IconScoreContextType.DIRECT, IconScoreContextType.QUERY):
+            return db_items
+
+        batch_items = {}
+        for batch in (context.block_batch, context.tx_batch):
+            for key in batch:
+                if start <= key and (stop is None or key < stop):
+                    batch_items[key] = batch[key]
+
+        return _merge_items(db_items, batch_items, reverse)
+
+    def _get_committed_db(self, context: Optional['IconScoreContext']):
+        """Returns the view of the context or of this db, or the db itself
+        which committed states are read from
+        """
+        read_view: Optional['ReadView'] = getattr(context, 'read_view', None)
+        if read_view is not None and read_view.db is self.key_value_db:
+            return read_view
+        if self.read_view is not None:
+            return self.read_view
+        return self.key_value_db
 
     def put(self,
             context: Optional['IconScoreContext'],
@@ -298,8 +504,10 @@ class ContextDatabase(object):
 
     @staticmethod
     def from_path(path: str,
-                  create_if_missing: bool=True) -> 'ContextDatabase':
-        db = KeyValueDatabase.from_path(path, create_if_missing)
+                  create_if_missing: bool=True,
+                  backend_type: str=BackendType.PLYVEL,
+                  options: Optional[dict]=None) -> 'ContextDatabase':
+        db = KeyValueDatabase.from_path(path, create_if_missing, backend_type, options)
         return ContextDatabase(db)
 
 
@@ -308,6 +516,9 @@ class IconScoreDatabase(ContextGetter):
 
     IconScore can access its states only through IconScoreDatabase
     """
+    # Records all state accesses of SCOREs if it is set
+    access_stats: Optional['StateAccessStats'] = None
+
     def __init__(self,
                  address: 'Address',
                  context_db: 'ContextDatabase',
@@ -334,8 +545,42 @@ class IconScoreDatabase(ContextGetter):
         value = self._context_db.get(self._context, hashed_key)
         if self._observer:
             self._observer.on_get(self._context, key, value)
+        if self.access_stats:
+            self.access_stats.on_get(self._context, self.address, hashed_key, value)
         return value
 
+    def get_many(self, keys: list) -> list:
+        """
+        Gets the values for the specified keys at once
+
+        The observer is notified for each key in order,
+        as if `get` were called for every key.
+
+        :param keys: keys to retrieve
+        :return: values in the same order as keys, None if not found
+        """
+        return list(self.iter_many(keys))
+
+    def iter_many(self, keys: list) -> iter:
+        """
+        Yields the values for the specified keys in order
+
+        All values are read at once on the first iteration
+        but the observer is notified only when each value is yielded.
+
+        :param keys: keys to retrieve
+        :return: generator of values
+        """
+        hashed_keys = [self._hash_key(key) for key in keys]
+        values = self._context_db.get_many(self._context, hashed_keys)
+
+        for key, hashed_key, value in zip(keys, hashed_keys, values):
+            if self._observer:
+                self._observer.on_get(self._context, key, value)
+            if self.access_stats:
+                self.access_stats.on_get(self._context, self.address, hashed_key, value)
+            yield value
+
     def put(self, key: bytes, value: bytes):
         """
         Sets a value for the specified key.
@@ -351,8 +596,76 @@ class IconScoreDatabase(ContextGetter):
             elif old_value:
                 # If new value is None, then deletes the field
                 self._observer.on_delete(self._context, key, old_value)
+        if self.access_stats:
+            self._record_put(hashed_key, value)
         self._context_db.put(self._context, hashed_key, value)
 
+    def put_many(self, items: list) -> None:
+        """
+        Sets values for the specified keys in order.
+
+        The observer is notified for each item as if `put` were called
+        for every item but only the last value of each key is written.
+        None value means deleting the key.
+
+        :param items: list of (key, value) tuples
+        """
+        hashed_items = [(key, self._hash_key(key), value) for key, value in items]
+        # the last value of each key in the order of first appearance
+        values = OrderedDict()
+
+        if self._observer:
+            for _, hashed_key, _ in hashed_items:
+                values[hashed_key] = None
+            old_values = self._context_db.get_many(self._context, list(values))
+            values.update(zip(values, old_values))
+
+            for key, hashed_key, value in hashed_items:
+                old_value = values[hashed_key]
+                if value:
+                    self._observer.on_put(self._context, key, old_value, value)
+                elif old_value:
+                    self._observer.on_delete(self._context, key, old_value)
+                values[hashed_key] = value
+        else:
+            for _, hashed_key, value in hashed_items:
+                values[hashed_key] = value
+
+        for hashed_key, value in values.items():
+            if self.access_stats:
+                self._record_put(hashed_key, value)
+            if value is None:
+                self._context_db.delete(self._context, hashed_key)
+            else:
+                self._context_db.put(self._context, hashed_key, value)
+
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        """
+        Returns an iterator of (key, value) pairs in this db in key order
+
+        Keys are relative to this db and include the ones of its sub dbs.
+        The observer is notified as each item is yielded.
+
+        :param start: the first key to include
+        :param stop: the first key to exclude
+        :param reverse: iterate in descending key order
+        :return: (key, value) iterator
+        """
+        prefix: bytes = self._hash_key(b'')
+        start = prefix if start is None else prefix + start
+        stop = get_prefix_upper_bound(prefix) if stop is None else prefix + stop
+
+        for hashed_key, value in self._context_db.iterator(self._context, start, stop, reverse):
+            key = hashed_key[len(prefix):]
+            if self._observer:
+                self._observer.on_get(self._context, key, value)
+            if self.access_stats:
+                self.access_stats.on_get(self._context, self.address, hashed_key, value)
+            yield key, value
+
     def get_sub_db(self, prefix: bytes) -> 'IconScoreDatabase':
         """
         Returns sub db with a prefix
@@ -387,6 +700,8 @@ class IconScoreDatabase(ContextGetter):
             # If old value is None, won't fire the callback
             if old_value:
                 self._observer.on_delete(self._context, key, old_value)
+        if self.access_stats:
+            self.access_stats.on_delete(self.address, hashed_key)
         self._context_db.delete(self._context, hashed_key)
 
     def close(self):
@@ -395,6 +710,12 @@ class IconScoreDatabase(ContextGetter):
     def set_observer(self, observer: 'DatabaseObserver'):
         self._observer = observer
 
+    def _record_put(self, hashed_key: bytes, value: Optional[bytes]) -> None:
+        if value is None:
+            self.access_stats.on_delete(self.address, hashed_key)
+        else:
+            self.access_stats.on_put(self.address, hashed_key, value)
+
     def _hash_key(self, key: bytes) -> bytes:
         """All key is hashed and stored
         to StateDB to avoid key conflicts among SCOREs
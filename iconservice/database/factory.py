@@ -17,36 +17,107 @@
 
 import os
 from enum import IntEnum
+from typing import Optional
+
+from iconcommons.logger import Logger
 
 from ..base.address import Address
-from ..icon_constant import ICON_DEX_DB_NAME
-from .db import KeyValueDatabase, ContextDatabase
+from ..base.exception import DatabaseException
+from ..icon_constant import ICON_DEX_DB_NAME, ICON_DB_LOG_TAG
+from .backend import BackendType, SUPPORTED_BACKEND_TYPES, make_leveldb_options
+from .db import KeyValueDatabase, ContextDatabase, ReadView
+from .sharding import DEFAULT_DB_POOL_SIZE, DatabasePool, PooledKeyValueDatabase, ShardedContextDatabase
 
 
 class ContextDatabaseFactory(object):
+    """Creates ContextDatabase for icx and SCOREs
+
+    SINGLE_DB: all states are stored in one db.
+    MULTIPLE_DB: each SCORE has its own db (see sharding.py).
+    """
 
     class Mode(IntEnum):
         SINGLE_DB = 0
         MULTIPLE_DB = 1
 
+        @staticmethod
+        def from_str(name: str) -> 'ContextDatabaseFactory.Mode':
+            """Converts stateDbMode in config
+
+            :param name: 'single' or 'multiple'
+            """
+            modes = {
+                'single': ContextDatabaseFactory.Mode.SINGLE_DB,
+                'multiple': ContextDatabaseFactory.Mode.MULTIPLE_DB
+            }
+            if name not in modes:
+                raise DatabaseException(f'Unsupported state db mode: {name}')
+
+            return modes[name]
+
     _state_db_root_path: str = None
     _mode: 'Mode' = Mode.SINGLE_DB
+    _backend_type: str = BackendType.PLYVEL
+    _backend_options: dict = {}
     _shared_context_db: 'ContextDatabase' = None
+    _pool: 'DatabasePool' = None
+    _pool_size: int = DEFAULT_DB_POOL_SIZE
+    _context_dbs: dict = {}
+    _read_only: bool = False
 
     @classmethod
-    def open(cls, state_db_root_path: str, mode: 'Mode'):
+    def open(cls,
+             state_db_root_path: str,
+             mode: 'Mode',
+             backend_type: str = BackendType.PLYVEL,
+             options: Optional[dict] = None,
+             pool_size: int = DEFAULT_DB_POOL_SIZE,
+             read_only: bool = False):
+        """
+
+        :param state_db_root_path:
+        :param mode:
+        :param backend_type: one of SUPPORTED_BACKEND_TYPES
+        :param options: LevelDB tuning options (stateDbOptions in config)
+        :param pool_size: the number of SCORE dbs kept open in MULTIPLE_DB mode
+        :param read_only: opens the state db written by another process, SINGLE_DB and lmdb only
+        """
+        if backend_type not in SUPPORTED_BACKEND_TYPES:
+            raise DatabaseException(f'Unsupported state db backend: {backend_type}')
+        if read_only and mode != cls.Mode.SINGLE_DB:
+            # SCORE dbs are not committed atomically with the main db
+            raise DatabaseException('Read-only state db supports single mode only')
+
+        backend_options = make_leveldb_options(options)
+        # Checks pool size before closing the current dbs
+        pool = DatabasePool(state_db_root_path, backend_type, backend_options, pool_size)
+
         cls.close()
 
         cls._state_db_root_path = state_db_root_path
         cls._mode = mode
+        cls._backend_type = backend_type
+        cls._backend_options = backend_options if backend_type == BackendType.PLYVEL else {}
+        cls._pool = pool if mode == cls.Mode.MULTIPLE_DB else None
+        cls._pool_size = pool_size
+        cls._read_only = read_only
+
+        if backend_type == BackendType.PLYVEL:
+            Logger.info(f'State db options: {backend_options}', ICON_DB_LOG_TAG)
+        elif backend_options:
+            Logger.info(f'State db options are ignored by {backend_type} backend', ICON_DB_LOG_TAG)
 
     @classmethod
     def get_shared_db(cls) -> ContextDatabase:
         if cls._shared_context_db is None:
             path = os.path.join(cls._state_db_root_path, ICON_DEX_DB_NAME)
-            key_value_db = KeyValueDatabase.from_path(path)
-            cls._shared_context_db = ContextDatabase(
-                key_value_db, is_shared=True)
+            key_value_db = KeyValueDatabase.from_path(
+                path, backend_type=cls._backend_type, options=cls._backend_options, read_only=cls._read_only)
+            if cls._mode == cls.Mode.SINGLE_DB:
+                cls._shared_context_db = ContextDatabase(key_value_db, is_shared=True)
+            else:
+                cls._shared_context_db = ShardedContextDatabase(key_value_db, cls._pool)
+                cls._shared_context_db.recover()
 
         return cls._shared_context_db
 
@@ -59,14 +130,59 @@ class ContextDatabaseFactory(object):
 
     @classmethod
     def create_by_name(cls, name: str) -> ContextDatabase:
-        if cls._mode == cls.Mode.SINGLE_DB:
+        if cls._mode == cls.Mode.SINGLE_DB or name == ICON_DEX_DB_NAME:
             return cls.get_shared_db()
-        else:
-            path = os.path.join(cls._state_db_root_path, name)
-            return ContextDatabase.from_path(path)
+
+        # SCORE dbs are opened lazily by the pool
+        context_db = cls._context_dbs.get(name)
+        if context_db is None:
+            # Replays interrupted commits before any SCORE db is read
+            cls.get_shared_db()
+            context_db = ContextDatabase(PooledKeyValueDatabase(cls._pool, name))
+            cls._context_dbs[name] = context_db
+
+        return context_db
+
+    @classmethod
+    def create_read_view(cls) -> Optional['ReadView']:
+        """Pins the committed states of all SCOREs
+
+        :return: None in MULTIPLE_DB mode where SCORE dbs cannot be pinned together
+        """
+        if cls._mode != cls.Mode.SINGLE_DB:
+            return None
+
+        return ReadView(cls.get_shared_db().key_value_db)
+
+    @classmethod
+    def move(cls, state_db_root_path: str) -> None:
+        """Serves the state db in another directory with the same options
+
+        The shared context db stays the same object with a new db in it,
+        so the objects holding it read the new states. No db should be in use.
+
+        :param state_db_root_path: directory of the new state db
+        """
+        cls._state_db_root_path = state_db_root_path
+        if cls._pool is not None:
+            cls._pool.move(state_db_root_path)
+
+        context_db = cls._shared_context_db
+        if context_db is not None:
+            key_value_db = context_db.key_value_db
+            context_db.key_value_db = KeyValueDatabase.from_path(
+                os.path.join(state_db_root_path, ICON_DEX_DB_NAME),
+                backend_type=cls._backend_type, options=cls._backend_options, read_only=cls._read_only)
+            key_value_db.close()
 
     @classmethod
     def close(cls):
         if cls._shared_context_db:
             cls._shared_context_db.key_value_db.close()
             cls._shared_context_db = None
+
+        if cls._pool:
+            cls._pool.close()
+            cls._pool = None
+
+        cls._context_dbs = {}
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reverse diffs of recent blocks and periodic checkpoints of committed states
+
+A reverse diff of a block has the values of keys changed by the block
+as they were before the block was committed. It is written with the block
+in a single write batch, so the states of any of the last K blocks can be restored
+by applying reverse diffs from the last block backward.
+
+A checkpoint is a state snapshot file (see state_snapshot.py) written
+in a background thread from a db snapshot taken right after a block is committed.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+from iconcommons.logger import Logger
+
+from ..base.block import Block
+from ..base.exception import DatabaseException
+from ..icon_constant import ICON_DB_LOG_TAG, ICON_DEX_DB_NAME
+from ..icx.icx_storage import IcxStorage
+from .backend import get_prefix_upper_bound
+from .sharding import encode_states, decode_states
+from .state_snapshot import write_state_snapshot
+
+if TYPE_CHECKING:
+    from ..iconscore.icon_score_context import IconScoreContext
+    from .db import ContextDatabase
+
+_REVERSE_DIFF_PREFIX = b'reverse_diff|'
+_HEIGHT_SIZE = 8
+
+CHECKPOINT_FILE_PREFIX = 'checkpoint_'
+CHECKPOINT_FILE_SUFFIX = '.snapshot'
+
+
+def _make_reverse_diff_key(block_height: int) -> bytes:
+    return _REVERSE_DIFF_PREFIX + block_height.to_bytes(_HEIGHT_SIZE, 'big')
+
+
+def list_checkpoints(checkpoint_path: Optional[str]) -> list:
+    """Returns (block height, path) of checkpoint files in ascending order of height
+
+    :param checkpoint_path: directory containing checkpoint files
+    """
+    if checkpoint_path is None or not os.path.isdir(checkpoint_path):
+        return []
+
+    checkpoints = []
+    for name in os.listdir(checkpoint_path):
+        if name.startswith(CHECKPOINT_FILE_PREFIX) and name.endswith(CHECKPOINT_FILE_SUFFIX):
+            height = name[len(CHECKPOINT_FILE_PREFIX):-len(CHECKPOINT_FILE_SUFFIX)]
+            if height.isdigit():
+                checkpoints.append((int(height), os.path.join(checkpoint_path, name)))
+
+    return sorted(checkpoints)
+
+
+class StateHistory(object):
+    """Keeps reverse diffs of the last blocks and takes checkpoints periodically
+    """
+
+    def __init__(self,
+                 context_db: 'ContextDatabase',
+                 max_reverse_diffs: int = 0,
+                 checkpoint_interval: int = 0,
+                 checkpoint_path: Optional[str] = None,
+                 max_checkpoints: int = 0,
+                 score_root_path: Optional[str] = None) -> None:
+        """Constructor
+
+        :param context_db: the main db
+        :param max_reverse_diffs: the number of blocks which can be rolled back, 0 to disable
+        :param checkpoint_interval: take a checkpoint every this number of blocks, 0 to disable
+        :param checkpoint_path: directory to write checkpoint files to
+        :param max_checkpoints: the number of checkpoint files to keep
+        :param score_root_path: scoreRootPath in config
+        """
+        for name, value in (('maxReverseDiffs', max_reverse_diffs),
+                            ('checkpointInterval', checkpoint_interval),
+                            ('maxCheckpoints', max_checkpoints)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise DatabaseException(f'Invalid {name}: {value}')
+
+        if checkpoint_interval > 0:
+            if checkpoint_path is None or max_checkpoints < 1:
+                raise DatabaseException('checkpointPath and maxCheckpoints are required for checkpoints')
+            # Raises DatabaseException if the db does not support snapshot
+            context_db.key_value_db.snapshot().close()
+
+        self._context_db = context_db
+        self._max_reverse_diffs = max_reverse_diffs
+        self._checkpoint_interval = checkpoint_interval
+        self._checkpoint_path = checkpoint_path
+        self._max_checkpoints = max_checkpoints
+        self._score_root_path = score_root_path
+        self._checkpoint_thread: Optional[threading.Thread] = None
+
+    @property
+    def max_reverse_diffs(self) -> int:
+        return self._max_reverse_diffs
+
+    def get_reverse_diff_heights(self) -> list:
+        """Returns the heights of blocks which have reverse diffs in ascending order
+        """
+        prefix = _REVERSE_DIFF_PREFIX
+        it = self._context_db.key_value_db.iterator(start=prefix, stop=get_prefix_upper_bound(prefix))
+        return [int.from_bytes(key[len(prefix):], 'big') for key, _ in it]
+
+    def make_commit_states(self, block_batch: dict, block: 'Block') -> OrderedDict:
+        """Returns states to write for committing a block
+
+        They include the last block info and the reverse diff of the block.
+
+        :param block_batch: states changed by the block
+        :param block: the block to commit
+        :return: states to write in a single write batch
+        """
+        states = OrderedDict(block_batch)
+        states[IcxStorage.LAST_BLOCK_KEY] = bytes(block)
+
+        if self._max_reverse_diffs > 0:
+            keys = list(states)
+            old_values = self._context_db.get_many(None, keys)
+            states[_make_reverse_diff_key(block.height)] = encode_states(OrderedDict(zip(keys, old_values)))
+
+            expired_height = block.height - self._max_reverse_diffs
+            if expired_height >= 0:
+                states[_make_reverse_diff_key(expired_height)] = None
+
+        return states
+
+    def check(self, last_block: Optional['Block']) -> None:
+        """Removes reverse diffs which cannot be used to roll back from the last block
+
+        Reverse diffs are usable only if they are contiguous up to the last block.
+        Ones left while reverse diffs were disabled are removed once they are enabled again.
+
+        :param last_block: the last committed block
+        """
+        if self._max_reverse_diffs == 0:
+            return
+
+        heights = set(self.get_reverse_diff_heights())
+        if not heights:
+            return
+
+        usable_heights = set()
+        if last_block is not None:
+            height = last_block.height
+            while height in heights and len(usable_heights) < self._max_reverse_diffs:
+                usable_heights.add(height)
+                height -= 1
+
+        unusable_heights = sorted(heights - usable_heights)
+        if unusable_heights:
+            Logger.warning(f'Remove {len(unusable_heights)} unusable reverse diffs: '
+                           f'{unusable_heights[0]} ~ {unusable_heights[-1]}', ICON_DB_LOG_TAG)
+            self._context_db.key_value_db.write_batch(
+                dict.fromkeys(_make_reverse_diff_key(height) for height in unusable_heights))
+
+    def rollback_to(self, context: 'IconScoreContext', block_height: int, last_block: 'Block') -> 'Block':
+        """Restores committed states to the ones right after a given block was committed
+
+        :param context: DIRECT context
+        :param block_height: height of the block to roll back to
+        :param last_block: the last committed block
+        :return: the block of block_height
+        """
+        if last_block is None or not 0 <= block_height < last_block.height:
+            raise DatabaseException(f'Invalid block height to roll back to: {block_height}')
+
+        key_value_db = self._context_db.key_value_db
+        states = OrderedDict()
+
+        for height in range(last_block.height, block_height, -1):
+            key = _make_reverse_diff_key(height)
+            value = key_value_db.get(key)
+            if value is None:
+                raise DatabaseException(f'No reverse diff to roll back to {block_height}: {height}')
+
+            # The older value overwrites the newer one
+            states.update(decode_states(value))
+            states[key] = None
+
+        block_bytes = states.get(IcxStorage.LAST_BLOCK_KEY)
+        if block_bytes is None:
+            raise DatabaseException(f'No block info in reverse diffs: {block_height}')
+
+        block = Block.from_bytes(block_bytes)
+        if block.height != block_height:
+            raise DatabaseException(f'Block height mismatch: {block.height} != {block_height}')
+
+        self._context_db.write_batch(context, states)
+        Logger.info(f'Rolled back from {last_block.height} to {block_height}', ICON_DB_LOG_TAG)
+
+        return block
+
+    def on_commit(self, block: 'Block') -> None:
+        """Takes a checkpoint if it is time to
+
+        :param block: the block committed just before
+        """
+        if self._checkpoint_interval == 0 or block.height % self._checkpoint_interval != 0:
+            return
+
+        if self._checkpoint_thread is not None and self._checkpoint_thread.is_alive():
+            Logger.warning(f'Skip checkpoint at {block.height}: previous one is in progress', ICON_DB_LOG_TAG)
+            return
+
+        snapshot = self._context_db.key_value_db.snapshot()
+        self._checkpoint_thread = threading.Thread(
+            target=self._write_checkpoint, args=(snapshot, block.height), daemon=True)
+        self._checkpoint_thread.start()
+
+    def _write_checkpoint(self, snapshot, block_height: int) -> None:
+        os.makedirs(self._checkpoint_path, exist_ok=True)
+        path = os.path.join(self._checkpoint_path, f'{CHECKPOINT_FILE_PREFIX}{block_height}{CHECKPOINT_FILE_SUFFIX}')
+        temp_path = f'{path}.tmp'
+
+        try:
+            with open(temp_path, 'wb') as f:
+                write_state_snapshot(f, {ICON_DEX_DB_NAME: snapshot}, self._score_root_path, block_height)
+            os.replace(temp_path, path)
+            Logger.info(f'Checkpoint at {block_height}: {path}', ICON_DB_LOG_TAG)
+
+            self._remove_old_checkpoints()
+        except Exception as e:
+            Logger.exception(f'Failed to write checkpoint at {block_height}: {e}', ICON_DB_LOG_TAG)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        finally:
+            snapshot.close()
+
+    def get_checkpoints(self) -> list:
+        """Returns (block height, path) of checkpoint files in ascending order of height
+        """
+        return list_checkpoints(self._checkpoint_path)
+
+    def _remove_old_checkpoints(self) -> None:
+        checkpoints = self.get_checkpoints()
+        for _, path in checkpoints[:-self._max_checkpoints]:
+            os.remove(path)
+
+    def close(self) -> None:
+        """Waits for the checkpoint in progress which reads the db
+        """
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join()
+            self._checkpoint_thread = None
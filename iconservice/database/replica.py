@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""States served by a read replica, which answers queries only
+
+A read replica follows the committed states of another iconservice process in one of two ways.
+
+In-place: the state db of the other process is opened read-only.
+Only lmdb allows another process to read a db while it is written.
+IconServiceEngine reads the last block key periodically to find new blocks.
+
+Checkpoint: the newest checkpoint file written by StateHistory is imported
+into a generation directory under stateDbRootPath and scoreRootPath of the replica.
+A newer checkpoint is imported in a background thread
+and IconServiceEngine moves its dbs and SCOREs to the new generation when it is ready.
+"""
+
+import os
+import shutil
+import threading
+from time import monotonic
+from typing import Callable, Optional
+
+from iconcommons.logger import Logger
+
+from ..base.exception import DatabaseException
+from ..icon_constant import ICON_DB_LOG_TAG
+from .backend import BackendType
+from .history import list_checkpoints
+from .state_snapshot import import_state_snapshot
+
+GENERATION_DIR_PREFIX = 'replica_'
+DEFAULT_REFRESH_INTERVAL = 1
+
+
+class ReadReplica(object):
+    def __init__(self,
+                 state_db_root_path: str,
+                 score_root_path: str,
+                 backend_type: str,
+                 checkpoint_path: Optional[str] = None,
+                 refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 clock: Callable[[], float] = monotonic) -> None:
+        """Constructor
+
+        :param state_db_root_path: stateDbRootPath in config
+        :param score_root_path: scoreRootPath in config
+        :param backend_type: stateDbBackend in config
+        :param checkpoint_path: directory of checkpoint files, None or empty to open the state db in place
+        :param refresh_interval: seconds between checks for new committed states
+        :param clock: returns the current time in seconds
+        """
+        if not checkpoint_path and backend_type != BackendType.LMDB:
+            raise DatabaseException(f'{backend_type} backend cannot be shared with a read replica; '
+                                    f'use lmdb or checkpointPath')
+
+        self._state_db_root_path = state_db_root_path
+        self._score_root_path = score_root_path
+        self._backend_type = backend_type
+        self._checkpoint_path = checkpoint_path or None
+        self._refresh_interval = refresh_interval
+        self._clock = clock
+        self._checked_at = clock()
+
+        # Height of the checkpoint being served
+        self._height: Optional[int] = None
+        # Height of the checkpoint imported in background and ready to be served
+        self._ready_height: Optional[int] = None
+        self._import_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_in_place(self) -> bool:
+        return self._checkpoint_path is None
+
+    @property
+    def height(self) -> Optional[int]:
+        """Height of the checkpoint being served, None if in place
+        """
+        return self._height
+
+    @property
+    def state_db_root_path(self) -> str:
+        if self.is_in_place:
+            return self._state_db_root_path
+        return self._get_generation_path(self._state_db_root_path, self._height)
+
+    @property
+    def score_root_path(self) -> str:
+        if self.is_in_place:
+            return self._score_root_path
+        return self._get_generation_path(self._score_root_path, self._height)
+
+    def open(self) -> None:
+        """Prepares the newest checkpoint to serve, which is imported unless it was imported before
+        """
+        if self.is_in_place:
+            return
+
+        checkpoints = list_checkpoints(self._checkpoint_path)
+        if not checkpoints:
+            raise DatabaseException(f'No checkpoint in {self._checkpoint_path}')
+        height, path = checkpoints[-1]
+        if not self._is_imported(height):
+            self._import(height, path)
+
+        self._height = height
+        self._ready_height = None
+        self._remove_generations(keep=height)
+        Logger.info(f'Read replica serves checkpoint {height}', ICON_DB_LOG_TAG)
+
+    def is_due(self) -> bool:
+        """Returns True once every refresh interval
+        """
+        now = self._clock()
+        if now - self._checked_at < self._refresh_interval:
+            return False
+
+        self._checked_at = now
+        return True
+
+    def poll_checkpoint(self) -> Optional[int]:
+        """Starts importing a newer checkpoint in background if there is one
+
+        :return: height of an imported checkpoint newer than the one being served, None if not ready
+        """
+        if self._import_thread is not None:
+            if self._import_thread.is_alive():
+                return None
+            self._import_thread = None
+
+        if self._ready_height is not None:
+            return self._ready_height
+
+        checkpoints = list_checkpoints(self._checkpoint_path)
+        if checkpoints and checkpoints[-1][0] > self._height:
+            height, path = checkpoints[-1]
+            self._import_thread = threading.Thread(target=self._import_in_background, args=(height, path), daemon=True)
+            self._import_thread.start()
+
+        return None
+
+    def advance(self) -> int:
+        """Serves the checkpoint returned by poll_checkpoint()
+
+        Generation paths change to the new ones. The old generation is removed by remove_old_generations().
+
+        :return: height of the checkpoint to serve
+        """
+        if self._ready_height is None:
+            raise DatabaseException('No checkpoint is ready')
+
+        self._height = self._ready_height
+        self._ready_height = None
+        Logger.info(f'Read replica serves checkpoint {self._height}', ICON_DB_LOG_TAG)
+        return self._height
+
+    def remove_old_generations(self) -> None:
+        """Removes generations other than the one being served, which nothing should use
+        """
+        self._remove_generations(keep=self._height)
+
+    def close(self) -> None:
+        """Waits for the checkpoint import in progress
+        """
+        if self._import_thread is not None:
+            self._import_thread.join()
+            self._import_thread = None
+
+    def _import_in_background(self, height: int, path: str) -> None:
+        try:
+            self._import(height, path)
+            self._ready_height = height
+        except Exception as e:
+            Logger.exception(f'Failed to import checkpoint {height}: {e}', ICON_DB_LOG_TAG)
+
+    def _import(self, height: int, path: str) -> None:
+        state_db_path = self._get_generation_path(self._state_db_root_path, height)
+        score_path = self._get_generation_path(self._score_root_path, height)
+
+        # Leftovers of an interrupted import
+        for generation_path in (state_db_path, score_path):
+            shutil.rmtree(generation_path, ignore_errors=True)
+
+        try:
+            with open(path, 'rb') as f:
+                block = import_state_snapshot(f, state_db_path, score_path, self._backend_type)
+        except BaseException:
+            for generation_path in (state_db_path, score_path):
+                shutil.rmtree(generation_path, ignore_errors=True)
+            raise
+
+        if block.height != height:
+            raise DatabaseException(f'Block height mismatch: {block.height} != {height}')
+
+        # Marks the generation complete
+        with open(self._get_done_path(height), 'w'):
+            pass
+        Logger.info(f'Imported checkpoint {height}: {path}', ICON_DB_LOG_TAG)
+
+    def _is_imported(self, height: int) -> bool:
+        return os.path.exists(self._get_done_path(height))
+
+    def _remove_generations(self, keep: int) -> None:
+        if not os.path.isdir(self._state_db_root_path):
+            return
+
+        for name in os.listdir(self._state_db_root_path):
+            if not name.startswith(GENERATION_DIR_PREFIX):
+                continue
+            height = name[len(GENERATION_DIR_PREFIX):].split('.')[0]
+            if not height.isdigit() or int(height) == keep:
+                continue
+
+            height = int(height)
+            # The done mark is removed first so that a partially removed generation is imported again
+            done_path = self._get_done_path(height)
+            if os.path.exists(done_path):
+                os.remove(done_path)
+            for root_path in (self._state_db_root_path, self._score_root_path):
+                shutil.rmtree(self._get_generation_path(root_path, height), ignore_errors=True)
+
+    @staticmethod
+    def _get_generation_path(root_path: str, height: int) -> str:
+        return os.path.join(root_path, f'{GENERATION_DIR_PREFIX}{height}')
+
+    def _get_done_path(self, height: int) -> str:
+        return f'{self._get_generation_path(self._state_db_root_path, height)}.done'
@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""State db split into the main db and one db per SCORE
+
+The states of a SCORE are stored with keys starting with its address
+(see IconScoreDatabase._hash_key) so that the db of a key is decided by the key itself.
+Other states like icx accounts and deploy info are stored in the main db.
+
+A block batch touching several dbs is committed as follows.
+1. The changes of the main db and a commit marker for each SCORE db are written
+   in a single write batch to the main db.
+   A commit marker contains all changes of its SCORE db.
+2. The changes of each SCORE db are written in a single write batch.
+3. Commit markers are deleted.
+If the process stops in the middle, commit markers left are replayed on the next open.
+"""
+
+import os
+import struct
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
+
+from iconcommons.logger import Logger
+
+from ..base.address import AddressPrefix
+from ..base.exception import DatabaseException
+from ..icon_constant import ICON_DB_LOG_TAG, ICON_DEX_DB_NAME
+from ..iconscore.icon_score_context import IconScoreContextType
+from .backend import BackendType, open_backend, get_prefix_upper_bound
+from .db import KeyValueDatabase, ContextDatabase, _get_context_type, _is_db_writable_on_context
+
+if TYPE_CHECKING:
+    from ..iconscore.icon_score_context import IconScoreContext
+    from .backend import DatabaseBackend
+
+# Address.to_bytes() of a SCORE is its prefix byte followed by 20 bytes body
+_SCORE_ADDRESS_SIZE = 21
+_SCORE_KEY_SEPARATOR = ord('|')
+_COMMIT_MARKER_PREFIX = b'shard_commit|'
+
+_LENGTH_FORMAT = '>I'
+_LENGTH_SIZE = struct.calcsize(_LENGTH_FORMAT)
+_NONE_LENGTH = 0xffffffff
+
+MIN_DB_POOL_SIZE = 8
+DEFAULT_DB_POOL_SIZE = 256
+
+
+def get_shard_name(key: bytes) -> Optional[str]:
+    """Returns the name of SCORE db where a given key is stored
+
+    :param key: key in StateDB
+    :return: SCORE address body in hex or None if the key belongs to the main db
+    """
+    if len(key) > _SCORE_ADDRESS_SIZE \
+            and key[0] == AddressPrefix.CONTRACT.value \
+            and key[_SCORE_ADDRESS_SIZE] == _SCORE_KEY_SEPARATOR:
+        return key[1:_SCORE_ADDRESS_SIZE].hex()
+
+    return None
+
+
+def split_states(states: dict) -> tuple:
+    """Splits states into the ones of the main db and the ones of each SCORE db
+
+    :param states: key/value pairs
+    :return: (main db states, {shard name: states})
+    """
+    main_states = OrderedDict()
+    shard_states = {}
+
+    for key, value in states.items():
+        name = get_shard_name(key)
+        if name is None:
+            main_states[key] = value
+        else:
+            shard_states.setdefault(name, OrderedDict())[key] = value
+
+    return main_states, shard_states
+
+
+def encode_states(states: dict) -> bytes:
+    data = []
+    for key, value in states.items():
+        data.append(struct.pack(_LENGTH_FORMAT, len(key)))
+        data.append(key)
+        if value is None:
+            data.append(struct.pack(_LENGTH_FORMAT, _NONE_LENGTH))
+        else:
+            data.append(struct.pack(_LENGTH_FORMAT, len(value)))
+            data.append(value)
+
+    return b''.join(data)
+
+
+def decode_states(data: bytes) -> OrderedDict:
+    states = OrderedDict()
+    offset = 0
+
+    while offset < len(data):
+        size, = struct.unpack_from(_LENGTH_FORMAT, data, offset)
+        offset += _LENGTH_SIZE
+        key = data[offset:offset + size]
+        offset += size
+
+        size, = struct.unpack_from(_LENGTH_FORMAT, data, offset)
+        offset += _LENGTH_SIZE
+        if size == _NONE_LENGTH:
+            states[key] = None
+        else:
+            states[key] = data[offset:offset + size]
+            offset += size
+
+    return states
+
+
+class DatabasePool(object):
+    """Keeps SCORE dbs open up to pool size and closes the least recently used one
+
+    A db in use is never closed, so the number of open dbs can exceed pool size for a while.
+    """
+
+    def __init__(self,
+                 root_path: str,
+                 backend_type: str,
+                 options: Optional[dict] = None,
+                 size: int = MIN_DB_POOL_SIZE) -> None:
+        """Constructor
+
+        :param root_path: directory containing dbs
+        :param backend_type: storage engine of dbs
+        :param options: backend specific options
+        :param size: the number of dbs kept open
+        """
+        if size < MIN_DB_POOL_SIZE:
+            raise DatabaseException(f'Invalid db pool size: {size} (>= {MIN_DB_POOL_SIZE} expected)')
+
+        self._root_path = root_path
+        self._backend_type = backend_type
+        self._options = options
+        self._size = size
+        # name: [backend, reference count]
+        self._handles = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    @contextmanager
+    def handle(self, name: str) -> 'DatabaseBackend':
+        """Provides the db of a given name, which is not closed until leaving `with` block
+
+        :param name: db name
+        """
+        db = self._acquire(name)
+        try:
+            yield db
+        finally:
+            self._release(name)
+
+    def _acquire(self, name: str) -> 'DatabaseBackend':
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is None:
+                path = os.path.join(self._root_path, name)
+                handle = [open_backend(self._backend_type, path, options=self._options), 0]
+                self._handles[name] = handle
+            else:
+                self._handles.move_to_end(name)
+
+            handle[1] += 1
+            self._evict()
+
+            return handle[0]
+
+    def _release(self, name: str) -> None:
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is not None:
+                handle[1] -= 1
+                self._evict()
+
+    def _evict(self) -> None:
+        # MemoryBackend loses its data on close
+        if self._backend_type == BackendType.MEMORY:
+            return
+
+        excess = len(self._handles) - self._size
+        if excess <= 0:
+            return
+
+        for name in [name for name, (_, ref_count) in self._handles.items() if ref_count == 0][:excess]:
+            db, _ = self._handles.pop(name)
+            db.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for db, _ in self._handles.values():
+                db.close()
+            self._handles.clear()
+
+    def move(self, root_path: str) -> None:
+        """Closes all dbs and opens dbs in another directory from now on
+
+        :param root_path: directory containing dbs
+        """
+        with self._lock:
+            for db, _ in self._handles.values():
+                db.close()
+            self._handles.clear()
+            self._root_path = root_path
+
+
+class PooledKeyValueDatabase(KeyValueDatabase):
+    """KeyValueDatabase whose db is borrowed from DatabasePool on every access
+    """
+
+    def __init__(self, pool: 'DatabasePool', name: str, prefix: bytes = b'') -> None:
+        """Constructor
+
+        :param pool: pool which owns the db
+        :param name: db name
+        :param prefix: prefix of all keys
+        """
+        super().__init__(None)
+        self._pool = pool
+        self._name = name
+        self._prefix = prefix
+
+    @contextmanager
+    def _key_value_db(self) -> 'KeyValueDatabase':
+        with self._pool.handle(self._name) as db:
+            if self._prefix:
+                db = db.prefixed_db(self._prefix)
+            yield KeyValueDatabase(db)
+
+    def get(self, key: bytes) -> bytes:
+        with self._key_value_db() as db:
+            return db.get(key)
+
+    def get_many(self, keys: list) -> list:
+        with self._key_value_db() as db:
+            return db.get_many(keys)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        with self._key_value_db() as db:
+            db.put(key, value)
+
+    def delete(self, key: bytes) -> None:
+        with self._key_value_db() as db:
+            db.delete(key)
+
+    def close(self) -> None:
+        # The db is closed by pool
+        pass
+
+    def snapshot(self) -> 'DatabaseBackend':
+        raise DatabaseException('snapshot is not supported on pooled db')
+
+    def get_sub_db(self, prefix: bytes) -> 'KeyValueDatabase':
+        return PooledKeyValueDatabase(self._pool, self._name, self._prefix + prefix)
+
+    def iterator(self,
+                 start: Optional[bytes] = None,
+                 stop: Optional[bytes] = None,
+                 reverse: bool = False) -> iter:
+        with self._key_value_db() as db:
+            yield from db.iterator(start=start, stop=stop, reverse=reverse)
+
+    def write_batch(self, states: dict) -> None:
+        with self._key_value_db() as db:
+            db.write_batch(states)
+
+
+class ShardedContextDatabase(ContextDatabase):
+    """ContextDatabase of the main db which commits block batches across all dbs
+    """
+
+    def __init__(self, db: 'KeyValueDatabase', pool: 'DatabasePool') -> None:
+        """Constructor
+
+        :param db: the main db
+        :param pool: pool of SCORE dbs
+        """
+        super().__init__(db, is_shared=True)
+        self._pool = pool
+
+    def get(self, context: Optional['IconScoreContext'], key: bytes) -> bytes:
+        name = get_shard_name(key)
+        if name is None or _get_context_type(context) not in (IconScoreContextType.DIRECT,
+                                                              IconScoreContextType.QUERY):
+            return super().get(context, key)
+
+        return self._pool_db(name).get(key)
+
+    def get_many(self, context: Optional['IconScoreContext'], keys: list) -> list:
+        """Reads committed states from the db of each key in DIRECT and QUERY context
+        """
+        if _get_context_type(context) not in (IconScoreContextType.DIRECT, IconScoreContextType.QUERY):
+            return super().get_many(context, keys)
+
+        indexes = {}
+        for i, key in enumerate(keys):
+            indexes.setdefault(get_shard_name(key), []).append(i)
+
+        values = [None] * len(keys)
+        for name, indexes_in_db in indexes.items():
+            db = self._get_committed_db(context) if name is None else self._pool_db(name)
+            for i, value in zip(indexes_in_db, db.get_many([keys[i] for i in indexes_in_db])):
+                values[i] = value
+
+        return values
+
+    def write_batch(self,
+                    context: 'IconScoreContext',
+                    states: dict):
+        if not _is_db_writable_on_context(context):
+            raise DatabaseException(
+                'write_batch is not allowed on readonly context')
+
+        main_states, shard_states = split_states(states)
+        if not shard_states:
+            return self.key_value_db.write_batch(main_states)
+
+        markers = {}
+        for name, states_in_shard in shard_states.items():
+            markers[_COMMIT_MARKER_PREFIX + name.encode()] = encode_states(states_in_shard)
+
+        main_states.update(markers)
+        self.key_value_db.write_batch(main_states)
+
+        for name, states_in_shard in shard_states.items():
+            self._pool_db(name).write_batch(states_in_shard)
+
+        self.key_value_db.write_batch(dict.fromkeys(markers))
+
+    def recover(self) -> int:
+        """Replays commit markers left by an interrupted commit
+
+        :return: the number of replayed commit markers
+        """
+        prefix = _COMMIT_MARKER_PREFIX
+        markers = list(self.key_value_db.iterator(start=prefix, stop=get_prefix_upper_bound(prefix)))
+
+        for key, value in markers:
+            name = key[len(prefix):].decode()
+            self._pool_db(name).write_batch(decode_states(value))
+
+        if markers:
+            self.key_value_db.write_batch(dict.fromkeys(key for key, _ in markers))
+            Logger.info(f'Replayed {len(markers)} commit markers', ICON_DB_LOG_TAG)
+
+        return len(markers)
+
+    def _pool_db(self, name: str) -> 'KeyValueDatabase':
+        return PooledKeyValueDatabase(self._pool, name)
+
+
+def migrate_to_multiple_db(state_db_root_path: str,
+                           backend_type: str,
+                           options: Optional[dict] = None,
+                           batch_size: int = 10000) -> int:
+    """Moves SCORE states from the main db to SCORE dbs
+
+    It is safe to run again after being interrupted.
+
+    :param state_db_root_path: directory containing the main db
+    :param backend_type: storage engine of dbs
+    :param options: backend specific options
+    :param batch_size: the number of keys written at once
+    :return: the number of moved keys
+    """
+    main_db = KeyValueDatabase.from_path(
+        os.path.join(state_db_root_path, ICON_DEX_DB_NAME), False, backend_type, options)
+    pool = DatabasePool(state_db_root_path, backend_type, options)
+    moved_count = 0
+
+    try:
+        states = OrderedDict()
+        start = bytes([AddressPrefix.CONTRACT.value])
+        stop = bytes([AddressPrefix.CONTRACT.value + 1])
+
+        for key, value in main_db.iterator(start=start, stop=stop):
+            if get_shard_name(key) is None:
+                continue
+
+            states[key] = value
+            if len(states) >= batch_size:
+                moved_count += _move_states(main_db, pool, states)
+                states = OrderedDict()
+
+        moved_count += _move_states(main_db, pool, states)
+    finally:
+        pool.close()
+        main_db.close()
+
+    return moved_count
+
+
+def _move_states(main_db: 'KeyValueDatabase', pool: 'DatabasePool', states: dict) -> int:
+    # Deletes states from the main db only after all of them are written to SCORE dbs
+    _, shard_states = split_states(states)
+    for name, states_in_shard in shard_states.items():
+        PooledKeyValueDatabase(pool, name).write_batch(states_in_shard)
+
+    main_db.write_batch(dict.fromkeys(states))
+    return len(states)
@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Snapshot file of committed states for bootstrapping a node without replaying blocks
+
+A snapshot file is MAGIC followed by chunks.
+chunk: type(1) | size of compressed payload(4) | crc32 of compressed payload(4) | compressed payload
+
+META: json including the last block and db names, always the first chunk
+DB: db name length(2) | db name | key/value pairs encoded by encode_states()
+FILE: relative path length(2) | relative path | file data
+LINK: relative path length(2) | relative path | relative target of a symbolic link
+END: sha3_256 of (type | payload) of all chunks before END, always the last chunk
+
+Every chunk is read and written one by one, so a snapshot of any size needs
+memory of a few chunks only.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import struct
+import zlib
+from enum import IntEnum
+from typing import TYPE_CHECKING, Optional, BinaryIO
+
+from ..base.block import Block
+from ..base.exception import DatabaseException
+from ..deploy.icon_score_package_store import PACKAGE_DIR
+from ..icon_constant import ICON_DEX_DB_NAME
+from ..icx.icx_storage import IcxStorage
+from .backend import open_backend
+from .sharding import encode_states, decode_states
+
+if TYPE_CHECKING:
+    from .backend import DatabaseBackend
+
+SNAPSHOT_MAGIC = b'ICONSNAP\x01'
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+_CHUNK_HEADER = struct.Struct('>BII')
+_NAME_SIZE = struct.Struct('>H')
+
+_PACKAGE_LINK_NAME = re.compile(r'[0-9a-f]{42}/0x[0-9a-f]{64}')
+_PACKAGE_LINK_TARGET = re.compile(rf'\.\./{re.escape(PACKAGE_DIR)}/[0-9a-z_]+')
+_IMPORT_SUFFIX = '.importing'
+
+
+class ChunkType(IntEnum):
+    META = 0
+    DB = 1
+    FILE = 2
+    END = 3
+    LINK = 4
+
+
+class SnapshotWriter(object):
+    def __init__(self, fp: BinaryIO, compress_level: int = 6) -> None:
+        """Constructor
+
+        :param fp: binary file to write snapshot to
+        :param compress_level: zlib compression level
+        """
+        self._fp = fp
+        self._compress_level = compress_level
+        self._hash = hashlib.sha3_256()
+
+        fp.write(SNAPSHOT_MAGIC)
+
+    def write_chunk(self, chunk_type: 'ChunkType', payload: bytes) -> None:
+        self._hash.update(bytes([chunk_type]))
+        self._hash.update(payload)
+        self._write(chunk_type, payload)
+
+    def close(self) -> bytes:
+        """Writes END chunk
+
+        :return: digest of snapshot
+        """
+        digest = self._hash.digest()
+        self._write(ChunkType.END, digest)
+        return digest
+
+    def _write(self, chunk_type: 'ChunkType', payload: bytes) -> None:
+        data = zlib.compress(payload, self._compress_level)
+        self._fp.write(_CHUNK_HEADER.pack(chunk_type, len(data), zlib.crc32(data)))
+        self._fp.write(data)
+
+
+class SnapshotReader(object):
+    def __init__(self, fp: BinaryIO) -> None:
+        """Constructor
+
+        :param fp: binary file to read snapshot from
+        """
+        self._fp = fp
+        self._hash = hashlib.sha3_256()
+
+        if fp.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise DatabaseException('Not a state snapshot')
+
+    def __iter__(self) -> iter:
+        """Yields (chunk type, payload) until END chunk and verifies the digest
+
+        :return: (chunk type, payload) iterator
+        """
+        while True:
+            header = self._fp.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                raise DatabaseException('Truncated state snapshot')
+
+            chunk_type, size, crc = _CHUNK_HEADER.unpack(header)
+            data = self._fp.read(size)
+            if len(data) < size or zlib.crc32(data) != crc:
+                raise DatabaseException('Broken chunk in state snapshot')
+            payload = zlib.decompress(data)
+
+            if chunk_type == ChunkType.END:
+                if payload != self._hash.digest():
+                    raise DatabaseException('Digest mismatch in state snapshot')
+                return
+
+            self._hash.update(bytes([chunk_type]))
+            self._hash.update(payload)
+            yield ChunkType(chunk_type), payload
+
+
+def _pack_name(name: str) -> bytes:
+    name = name.encode()
+    return _NAME_SIZE.pack(len(name)) + name
+
+
+def _unpack_name(payload: bytes) -> tuple:
+    size, = _NAME_SIZE.unpack_from(payload)
+    end = _NAME_SIZE.size + size
+    return payload[_NAME_SIZE.size:end].decode(), payload[end:]
+
+
+def _list_dbs(state_db_root_path: str) -> list:
+    return sorted(name for name in os.listdir(state_db_root_path)
+                  if os.path.isdir(os.path.join(state_db_root_path, name)))
+
+
+def _list_files(score_root_path: str) -> list:
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(score_root_path):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            paths.append(os.path.relpath(os.path.join(dir_path, file_name), score_root_path))
+
+    return paths
+
+
+def _is_package_link(name: str, target: str) -> bool:
+    # Only <address>/0x<tx hash> -> ../.packages/<content hash> made by IconScorePackageStore
+    return _PACKAGE_LINK_NAME.fullmatch(name) is not None and _PACKAGE_LINK_TARGET.fullmatch(target) is not None
+
+
+def _list_links(score_root_path: str) -> list:
+    """Lists symbolic links to SCORE packages, which os.walk() does not follow
+
+    Other links, e.g. ones to outside score_root_path, are left out like before.
+    """
+    links = []
+    for dir_path, dir_names, _ in os.walk(score_root_path):
+        dir_names.sort()
+        for name in dir_names:
+            path = os.path.join(dir_path, name)
+            if not os.path.islink(path):
+                continue
+
+            name = os.path.relpath(path, score_root_path)
+            target = os.readlink(path)
+            if _is_package_link(name, target):
+                links.append((name, target))
+
+    return links
+
+
+def export_state_snapshot(fp: BinaryIO,
+                          state_db_root_path: str,
+                          score_root_path: str,
+                          backend_type: str,
+                          block_height: Optional[int] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'Block':
+    """Writes committed states and SCORE packages to a snapshot file
+
+    iconservice using the state db should be stopped.
+
+    :param fp: binary file to write snapshot to
+    :param state_db_root_path: stateDbRootPath in config
+    :param score_root_path: scoreRootPath in config
+    :param backend_type: stateDbBackend in config
+    :param block_height: expected height of the last block, not checked if None
+    :param chunk_size: uncompressed size of a chunk
+    :return: the last block in snapshot
+    """
+    db_names = _list_dbs(state_db_root_path)
+    if ICON_DEX_DB_NAME not in db_names:
+        raise DatabaseException(f'No state db in {state_db_root_path}')
+
+    dbs = []
+    snapshots = {}
+    try:
+        for name in db_names:
+            db = open_backend(backend_type, os.path.join(state_db_root_path, name), False)
+            dbs.append(db)
+            snapshots[name] = db.snapshot()
+
+        return write_state_snapshot(fp, snapshots, score_root_path, block_height, chunk_size)
+    finally:
+        for snapshot in snapshots.values():
+            snapshot.close()
+        for db in dbs:
+            db.close()
+
+
+def write_state_snapshot(fp: BinaryIO,
+                         snapshots: dict,
+                         score_root_path: str,
+                         block_height: Optional[int] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'Block':
+    """Writes the states in db snapshots and SCORE packages to a snapshot file
+
+    :param fp: binary file to write snapshot to
+    :param snapshots: db name and snapshot of the db, including the main db
+    :param score_root_path: scoreRootPath in config
+    :param block_height: expected height of the last block, not checked if None
+    :param chunk_size: uncompressed size of a chunk
+    :return: the last block in snapshot
+    """
+    block_bytes = snapshots[ICON_DEX_DB_NAME].get(IcxStorage.LAST_BLOCK_KEY)
+    if block_bytes is None:
+        raise DatabaseException('No block committed')
+    last_block = Block.from_bytes(block_bytes)
+    if block_height is not None and last_block.height != block_height:
+        raise DatabaseException(f'Block height mismatch: {last_block.height} != {block_height}')
+
+    db_names = sorted(snapshots)
+    writer = SnapshotWriter(fp)
+    meta = {'lastBlock': block_bytes.hex(), 'dbs': db_names}
+    writer.write_chunk(ChunkType.META, json.dumps(meta).encode())
+
+    for name in db_names:
+        _export_db(writer, name, snapshots[name], chunk_size)
+
+    for path in _list_files(score_root_path):
+        _export_file(writer, path, os.path.join(score_root_path, path), chunk_size)
+    for path, target in _list_links(score_root_path):
+        writer.write_chunk(ChunkType.LINK, _pack_name(path) + target.encode())
+
+    writer.close()
+    return last_block
+
+
+def _export_db(writer: 'SnapshotWriter', name: str, snapshot: 'DatabaseBackend', chunk_size: int) -> None:
+    header = _pack_name(name)
+    states = {}
+    size = 0
+    chunk_count = 0
+
+    for key, value in snapshot.iterator():
+        states[key] = value
+        size += len(key) + len(value)
+        if size >= chunk_size:
+            writer.write_chunk(ChunkType.DB, header + encode_states(states))
+            chunk_count += 1
+            states = {}
+            size = 0
+
+    # An empty db is also written to be created on import
+    if states or chunk_count == 0:
+        writer.write_chunk(ChunkType.DB, header + encode_states(states))
+
+
+def _export_file(writer: 'SnapshotWriter', name: str, path: str, chunk_size: int) -> None:
+    header = _pack_name(name)
+
+    with open(path, 'rb') as f:
+        data = f.read(chunk_size)
+        # An empty file is also written to be created on import
+        writer.write_chunk(ChunkType.FILE, header + data)
+
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            writer.write_chunk(ChunkType.FILE, header + data)
+
+
+def import_state_snapshot(fp: BinaryIO,
+                          state_db_root_path: str,
+                          score_root_path: str,
+                          backend_type: str) -> 'Block':
+    """Loads a snapshot file into empty state db and score directories
+
+    The snapshot is loaded into temporary sibling directories which are renamed
+    into place only after its digest is verified, so nothing is left behind on failure.
+
+    :param fp: binary file to read snapshot from
+    :param state_db_root_path: stateDbRootPath in config
+    :param score_root_path: scoreRootPath in config
+    :param backend_type: stateDbBackend in config
+    :return: the last block in snapshot
+    """
+    paths = [os.path.normpath(path) for path in (state_db_root_path, score_root_path)]
+    for path in paths:
+        if os.path.exists(path) and os.listdir(path):
+            raise DatabaseException(f'Not empty: {path}')
+
+    temp_paths = [f'{path}{_IMPORT_SUFFIX}' for path in paths]
+    try:
+        for temp_path in temp_paths:
+            # Leftovers of an interrupted import
+            shutil.rmtree(temp_path, ignore_errors=True)
+            os.makedirs(temp_path)
+
+        last_block = _import_state_snapshot(fp, temp_paths[0], temp_paths[1], backend_type)
+
+        for temp_path, path in zip(temp_paths, paths):
+            if os.path.isdir(path):
+                os.rmdir(path)
+            os.rename(temp_path, path)
+    except BaseException:
+        for temp_path in temp_paths:
+            shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+    return last_block
+
+
+def _import_state_snapshot(fp: BinaryIO,
+                           state_db_root_path: str,
+                           score_root_path: str,
+                           backend_type: str) -> 'Block':
+    reader = iter(SnapshotReader(fp))
+
+    chunk_type, payload = next(reader, (None, None))
+    if chunk_type != ChunkType.META:
+        raise DatabaseException('No meta in state snapshot')
+    meta = json.loads(payload)
+    last_block = Block.from_bytes(bytes.fromhex(meta['lastBlock']))
+
+    db_name, db = None, None
+    db_names = set()
+    file_names = set()
+
+    try:
+        for chunk_type, payload in reader:
+            name, data = _unpack_name(payload)
+
+            if chunk_type == ChunkType.DB:
+                if name != db_name:
+                    if db is not None:
+                        db.close()
+                    db_name = name
+                    db = open_backend(backend_type, _join_path(state_db_root_path, name))
+                    db_names.add(name)
+
+                with db.write_batch() as wb:
+                    for key, value in decode_states(data).items():
+                        wb.put(key, value)
+            elif chunk_type == ChunkType.FILE:
+                path = _join_path(score_root_path, name)
+                _check_parent_path(score_root_path, path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'ab' if name in file_names else 'wb') as f:
+                    f.write(data)
+                file_names.add(name)
+            elif chunk_type == ChunkType.LINK:
+                target = data.decode()
+                if not _is_package_link(name, target):
+                    raise DatabaseException(f'Invalid link in state snapshot: {name} -> {target}')
+                path = _join_path(score_root_path, name)
+                _check_parent_path(score_root_path, path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.symlink(target, path)
+            else:
+                raise DatabaseException(f'Unexpected chunk in state snapshot: {chunk_type}')
+    finally:
+        if db is not None:
+            db.close()
+
+    if db_names != set(meta['dbs']):
+        raise DatabaseException('Missing dbs in state snapshot')
+
+    return last_block
+
+
+def _join_path(root_path: str, name: str) -> str:
+    # Prevents a snapshot from writing files outside root_path
+    root_path = os.path.abspath(root_path)
+    path = os.path.abspath(os.path.join(root_path, name))
+    if os.path.isabs(name) or os.path.commonpath([root_path, path]) != root_path or path == root_path:
+        raise DatabaseException(f'Invalid path in state snapshot: {name}')
+
+    return path
+
+
+def _check_parent_path(root_path: str, path: str) -> None:
+    # Links written before must not lead a file or a link outside root_path
+    parent_path = os.path.dirname(path)
+    relative_path = os.path.relpath(parent_path, os.path.abspath(root_path))
+    if os.path.realpath(parent_path) != os.path.normpath(os.path.join(os.path.realpath(root_path), relative_path)):
+        raise DatabaseException(f'Invalid path in state snapshot: {path}')
@@ -21,6 +21,7 @@ from typing import TYPE_CHECKING, Optional, Tuple
 from . import DeployType, DeployState
 from ..base.address import Address, ICON_EOA_ADDRESS_BYTES_SIZE, ICON_CONTRACT_ADDRESS_BYTES_SIZE
 from ..base.exception import ServerErrorException
+from ..database.backend import get_prefix_upper_bound
 from ..icon_constant import DEFAULT_BYTE_SIZE, REVISION_2
 from ..iconscore.icon_score_context_util import IconScoreContextUtil
 
@@ -304,6 +305,16 @@ class IconScoreDeployStorage(object):
         else:
             return None
 
+    def get_deploy_infos(self, context: Optional['IconScoreContext']) -> iter:
+        """Yields the deploy infos of all SCOREs in address order
+
+        :param context:
+        :return: IconScoreDeployInfo iterator
+        """
+        prefix: bytes = self._DEPLOY_STORAGE_DEPLOY_INFO_PREFIX
+        for _, bytes_value in self._db.iterator(context, prefix, get_prefix_upper_bound(prefix)):
+            yield IconScoreDeployInfo.from_bytes(bytes_value)
+
     def _put_deploy_tx_params(self, context: 'IconScoreContext', deploy_tx_params: 'IconScoreDeployTXParams') -> None:
         """
 
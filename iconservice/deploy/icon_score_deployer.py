@@ -15,46 +15,52 @@
 # limitations under the License.
 import io
 import os
-import shutil
 import zipfile
 
+from .icon_score_package_store import IconScorePackageStore, remove_score_path
 from ..base.address import Address
 from ..base.exception import ScoreInstallExtractException, ScoreInstallException
 
+# Packages extracted by deploy_legacy() differ from the ones by deploy() for the same zip file
+_LEGACY_PREFIX = 'legacy_'
+
 
 class IconScoreDeployer(object):
     """Deployer installing and deploying SCORE"""
     def __init__(self, score_root_path: str):
         self.score_root_path = score_root_path
+        self._package_store = IconScorePackageStore(score_root_path)
 
     def deploy(self, address: Address, data: bytes, tx_hash: bytes):
         """Deploy SCORE; Stores SCORE on the root path
 
+        The package is stored once per zip file and the install path refers to it.
+
         :param address: SCORE address
         :param data: Bytes of the zip file.
         :param tx_hash: Transaction hash
         """
+        self._install(address, data, tx_hash, IconScoreDeployer._extract_files_gen, '')
+
+    def _install(self, address: Address, data: bytes, tx_hash: bytes, extract_files_gen: callable, prefix: str):
         score_root_path = os.path.join(self.score_root_path, address.to_bytes().hex())
         converted_tx_hash = f'0x{bytes.hex(tx_hash)}'
         install_path = os.path.join(score_root_path, converted_tx_hash)
-        try:
-            if os.path.isfile(install_path):
-                raise ScoreInstallException(f'{install_path} is a file. Check your path.')
-            if os.path.isdir(install_path):
-                raise ScoreInstallException(f'{install_path} is a directory. Check {install_path}')
-            else:
-                os.makedirs(install_path)
-
-            file_info_generator = IconScoreDeployer._extract_files_gen(data)
-            for name, file_info, parent_dir in file_info_generator:
-                if not os.path.exists(os.path.join(install_path, parent_dir)):
-                    os.makedirs(os.path.join(install_path, parent_dir))
-                with file_info as file_info_context, open(os.path.join(install_path, name), 'wb') as dest:
+
+        if os.path.isfile(install_path):
+            raise ScoreInstallException(f'{install_path} is a file. Check your path.')
+        if os.path.isdir(install_path):
+            raise ScoreInstallException(f'{install_path} is a directory. Check {install_path}')
+
+        def _extract(package_path: str):
+            for name, file_info, parent_dir in extract_files_gen(data):
+                if not os.path.exists(os.path.join(package_path, parent_dir)):
+                    os.makedirs(os.path.join(package_path, parent_dir))
+                with file_info as file_info_context, open(os.path.join(package_path, name), 'wb') as dest:
                     contents = file_info_context.read()
                     dest.write(contents)
-        except BaseException as e:
-            shutil.rmtree(install_path, ignore_errors=True)
-            raise e
+
+        self._package_store.install(install_path, IconScorePackageStore.make_content_hash(data, prefix), _extract)
 
     @staticmethod
     def _extract_files_gen(data: bytes):
@@ -102,10 +108,7 @@ class IconScoreDeployer(object):
 
         :param archive_path: The path of SCORE archive.
         """
-        if os.path.isfile(archive_path):
-            os.remove(archive_path)
-        elif os.path.isdir(archive_path):
-            shutil.rmtree(archive_path)
+        remove_score_path(archive_path)
 
     def deploy_legacy(self,
                       address: 'Address',
@@ -119,28 +122,7 @@ class IconScoreDeployer(object):
         :return:
         """
 
-        score_root_path = os.path.join(self.score_root_path, address.to_bytes().hex())
-        converted_tx_hash = f'0x{bytes.hex(tx_hash)}'
-        install_path = os.path.join(score_root_path, converted_tx_hash)
-
-        try:
-            if os.path.isfile(install_path):
-                raise ScoreInstallException(f'{install_path} is a file. Check your path.')
-            if os.path.isdir(install_path):
-                raise ScoreInstallException(f'{install_path} is a directory. Check {install_path}')
-            if not os.path.exists(install_path):
-                os.makedirs(install_path)
-
-            file_info_generator = IconScoreDeployer._extract_files_gen_legacy(data)
-            for name, file_info, parent_directory in file_info_generator:
-                if not os.path.exists(os.path.join(install_path, parent_directory)):
-                    os.makedirs(os.path.join(install_path, parent_directory))
-                with file_info as file_info_context, open(os.path.join(install_path, name), 'wb') as dest:
-                    contents = file_info_context.read()
-                    dest.write(contents)
-        except BaseException as e:
-            shutil.rmtree(install_path, ignore_errors=True)
-            raise e
+        self._install(address, data, tx_hash, IconScoreDeployer._extract_files_gen_legacy, _LEGACY_PREFIX)
 
     @staticmethod
     def _extract_files_gen_legacy(data: bytes):
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SCORE packages stored once under the hash of their contents
+
+A package is extracted into scoreRootPath/.packages/<content hash>
+and scoreRootPath/<address>/0x<tx hash> is a relative symbolic link to it,
+so a SCORE deployed many times with the same zip file takes one directory.
+Links are the references of a package, and a package without links is garbage.
+"""
+
+import os
+import shutil
+from typing import Callable, Iterable
+
+from iconcommons.logger import Logger
+
+from ..icon_constant import ICON_DEPLOY_LOG_TAG
+from ..utils import sha3_256
+
+PACKAGE_DIR = '.packages'
+_TEMP_SUFFIX = '.tmp'
+
+
+class IconScorePackageStore(object):
+    def __init__(self, score_root_path: str) -> None:
+        """Constructor
+
+        :param score_root_path: scoreRootPath in config
+        """
+        self._score_root_path = score_root_path
+        self._package_root_path = os.path.join(score_root_path, PACKAGE_DIR)
+
+    @property
+    def package_root_path(self) -> str:
+        return self._package_root_path
+
+    @staticmethod
+    def make_content_hash(data: bytes, prefix: str = '') -> str:
+        """Returns the name of a package made from data
+
+        :param data: bytes of the zip file
+        :param prefix: distinguishes packages extracted from the same data in another way
+        :return: content hash
+        """
+        return f'{prefix}{sha3_256(data).hex()}'
+
+    def install(self,
+                install_path: str,
+                content_hash: str,
+                extract: Callable[[str], None]) -> None:
+        """Makes install_path refer to the package of content_hash
+
+        The package is extracted only if it is not stored yet.
+
+        :param install_path: ex) .../.score/address/0x<tx hash>
+        :param content_hash: name of the package
+        :param extract: extracts the package into the given directory
+        """
+        package_path = self._prepare(content_hash, extract)
+        os.makedirs(os.path.dirname(install_path), exist_ok=True)
+        os.symlink(os.path.relpath(package_path, os.path.dirname(install_path)), install_path,
+                   target_is_directory=True)
+
+    def _prepare(self, content_hash: str, extract: Callable[[str], None]) -> str:
+        package_path = os.path.join(self._package_root_path, content_hash)
+        if os.path.isdir(package_path):
+            return package_path
+
+        # A package appears at once so that a partially extracted one is never referred to
+        temp_path = f'{package_path}{_TEMP_SUFFIX}{os.getpid()}'
+        shutil.rmtree(temp_path, ignore_errors=True)
+        os.makedirs(temp_path)
+        try:
+            extract(temp_path)
+            os.rename(temp_path, package_path)
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if os.path.isdir(package_path):
+                return package_path
+            raise
+
+        return package_path
+
+    def get_reference_counts(self) -> dict:
+        """Counts links to each stored package
+
+        :return: {content hash: number of links}
+        """
+        counts = {name: 0 for name in self._list_packages()}
+        for link_path in self._list_links():
+            target = os.path.normpath(os.path.join(os.path.dirname(link_path), os.readlink(link_path)))
+            if os.path.dirname(target) == os.path.normpath(self._package_root_path):
+                name = os.path.basename(target)
+                if name in counts:
+                    counts[name] += 1
+
+        return counts
+
+    def collect_garbage(self) -> int:
+        """Removes packages which no link refers to
+
+        :return: the number of removed packages
+        """
+        count = 0
+        for name, reference_count in self.get_reference_counts().items():
+            if reference_count > 0:
+                continue
+
+            try:
+                shutil.rmtree(os.path.join(self._package_root_path, name))
+                count += 1
+            except OSError as e:
+                Logger.warning(f'Failed to remove a package {name}: {e}', ICON_DEPLOY_LOG_TAG)
+
+        # Leftovers of interrupted extractions
+        if os.path.isdir(self._package_root_path):
+            for name in os.listdir(self._package_root_path):
+                if _TEMP_SUFFIX in name:
+                    shutil.rmtree(os.path.join(self._package_root_path, name), ignore_errors=True)
+
+        return count
+
+    def _list_packages(self) -> list:
+        if not os.path.isdir(self._package_root_path):
+            return []
+        return [name for name in os.listdir(self._package_root_path) if _TEMP_SUFFIX not in name]
+
+    def _list_links(self) -> Iterable[str]:
+        # Links are only in address directories: <address>/0x<tx hash>
+        for dir_name in os.listdir(self._score_root_path):
+            dir_path = os.path.join(self._score_root_path, dir_name)
+            if dir_name.startswith('.') or os.path.islink(dir_path) or not os.path.isdir(dir_path):
+                continue
+
+            for name in os.listdir(dir_path):
+                path = os.path.join(dir_path, name)
+                if os.path.islink(path):
+                    yield path
+
+
+def remove_score_path(path: str) -> None:
+    """Removes a SCORE directory or a link to a package
+
+    :param path: ex) .../.score/address or .../.score/address/0x<tx hash>
+    """
+    if os.path.islink(path) or os.path.isfile(path):
+        os.remove(path)
+    elif os.path.isdir(path):
+        shutil.rmtree(path)
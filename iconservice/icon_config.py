@@ -20,9 +20,62 @@ default_icon_config = {
     },
     ConfigKey.SCORE_ROOT_PATH: ".score",
     ConfigKey.STATE_DB_ROOT_PATH: ".statedb",
+    ConfigKey.STATE_DB_BACKEND: "plyvel",
+    ConfigKey.STATE_DB_MODE: "single",
+    ConfigKey.STATE_DB_POOL_SIZE: 256,
+    ConfigKey.STATE_DB_OPTIONS: {
+        ConfigKey.STATE_DB_LRU_CACHE_SIZE: 64 * 1024 * 1024,
+        ConfigKey.STATE_DB_BLOOM_FILTER_BITS: 10,
+        ConfigKey.STATE_DB_WRITE_BUFFER_SIZE: 16 * 1024 * 1024,
+        ConfigKey.STATE_DB_MAX_OPEN_FILES: 1000,
+        ConfigKey.STATE_DB_BLOCK_SIZE: 4096,
+        ConfigKey.STATE_DB_COMPRESSION: "snappy"
+    },
+    ConfigKey.STATE_HISTORY: {
+        ConfigKey.STATE_HISTORY_MAX_REVERSE_DIFFS: 0,
+        ConfigKey.STATE_HISTORY_CHECKPOINT_INTERVAL: 0,
+        ConfigKey.STATE_HISTORY_CHECKPOINT_PATH: ".checkpoint",
+        ConfigKey.STATE_HISTORY_MAX_CHECKPOINTS: 2
+    },
+    ConfigKey.STATE_ACCESS_STATS: {
+        ConfigKey.STATE_ACCESS_STATS_ENABLE: False,
+        ConfigKey.STATE_ACCESS_STATS_HOT_KEY_COUNT: 100
+    },
+    ConfigKey.SCORE_MAPPER_CAPACITY: 1024,
+    ConfigKey.SCORE_WARM_UP: {
+        ConfigKey.SCORE_WARM_UP_ENABLE: False,
+        ConfigKey.SCORE_WARM_UP_WORKERS: 4,
+        ConfigKey.SCORE_WARM_UP_TIMEOUT: 30
+    },
+    ConfigKey.TRACE_LEVEL: "full",
+    ConfigKey.SCHEDULER: {
+        ConfigKey.SCHEDULER_MAX_PENDING_QUERIES: 100,
+        ConfigKey.SCHEDULER_QUERY_TIMEOUT: 10
+    },
+    ConfigKey.QUERY_BUDGET: {
+        ConfigKey.QUERY_BUDGET_ENABLE: False,
+        ConfigKey.QUERY_BUDGET_WINDOW: 60,
+        ConfigKey.QUERY_BUDGET_CALLER_STEPS: 1_000_000_000,
+        ConfigKey.QUERY_BUDGET_SCORE_STEPS: 5_000_000_000
+    },
+    ConfigKey.ESTIMATE_STEP_CACHE: {
+        ConfigKey.ESTIMATE_STEP_CACHE_SIZE: 1024,
+        ConfigKey.ESTIMATE_STEP_CACHE_TTL: 10
+    },
+    ConfigKey.PRECOMMIT: {
+        ConfigKey.PRECOMMIT_MAX_COUNT: 16,
+        ConfigKey.PRECOMMIT_MAX_BYTES: 268435456
+    },
+    ConfigKey.READ_REPLICA: {
+        ConfigKey.READ_REPLICA_ENABLE: False,
+        ConfigKey.READ_REPLICA_CHECKPOINT_PATH: "",
+        ConfigKey.READ_REPLICA_REFRESH_INTERVAL: 1
+    },
     ConfigKey.CHANNEL: "loopchain_default",
     ConfigKey.AMQP_KEY: "7100",
     ConfigKey.AMQP_TARGET: "127.0.0.1",
+    ConfigKey.SOCKET_PATH: "",
+    ConfigKey.SOCKET_MODE: "0600",
     ConfigKey.BUILTIN_SCORE_OWNER: "hxebf3a409845cd09dcb5af31ed5be5e34e2af9433",
     ConfigKey.SERVICE: {
         ConfigKey.SERVICE_FEE: False,
@@ -65,9 +65,53 @@ class ConfigKey:
     SERVICE_SCORE_PACKAGE_VALIDATOR = 'scorePackageValidator'
     SCORE_ROOT_PATH = 'scoreRootPath'
     STATE_DB_ROOT_PATH = 'stateDbRootPath'
+    STATE_DB_BACKEND = 'stateDbBackend'
+    STATE_DB_MODE = 'stateDbMode'
+    STATE_DB_POOL_SIZE = 'stateDbPoolSize'
+    STATE_DB_OPTIONS = 'stateDbOptions'
+    STATE_DB_LRU_CACHE_SIZE = 'lruCacheSize'
+    STATE_DB_BLOOM_FILTER_BITS = 'bloomFilterBits'
+    STATE_DB_WRITE_BUFFER_SIZE = 'writeBufferSize'
+    STATE_DB_MAX_OPEN_FILES = 'maxOpenFiles'
+    STATE_DB_BLOCK_SIZE = 'blockSize'
+    STATE_DB_COMPRESSION = 'compression'
+    STATE_HISTORY = 'stateHistory'
+    STATE_HISTORY_MAX_REVERSE_DIFFS = 'maxReverseDiffs'
+    STATE_HISTORY_CHECKPOINT_INTERVAL = 'checkpointInterval'
+    STATE_HISTORY_CHECKPOINT_PATH = 'checkpointPath'
+    STATE_HISTORY_MAX_CHECKPOINTS = 'maxCheckpoints'
+    STATE_ACCESS_STATS = 'stateAccessStats'
+    STATE_ACCESS_STATS_ENABLE = 'enable'
+    STATE_ACCESS_STATS_HOT_KEY_COUNT = 'hotKeyCount'
+    SCORE_MAPPER_CAPACITY = 'scoreMapperCapacity'
+    SCORE_WARM_UP = 'scoreWarmUp'
+    SCORE_WARM_UP_ENABLE = 'enable'
+    SCORE_WARM_UP_WORKERS = 'workers'
+    SCORE_WARM_UP_TIMEOUT = 'timeout'
+    TRACE_LEVEL = 'traceLevel'
+    SCHEDULER = 'scheduler'
+    SCHEDULER_MAX_PENDING_QUERIES = 'maxPendingQueries'
+    SCHEDULER_QUERY_TIMEOUT = 'queryTimeout'
+    QUERY_BUDGET = 'queryBudget'
+    QUERY_BUDGET_ENABLE = 'enable'
+    QUERY_BUDGET_WINDOW = 'window'
+    QUERY_BUDGET_CALLER_STEPS = 'callerSteps'
+    QUERY_BUDGET_SCORE_STEPS = 'scoreSteps'
+    ESTIMATE_STEP_CACHE = 'estimateStepCache'
+    ESTIMATE_STEP_CACHE_SIZE = 'size'
+    ESTIMATE_STEP_CACHE_TTL = 'ttl'
+    PRECOMMIT = 'precommit'
+    PRECOMMIT_MAX_COUNT = 'maxCount'
+    PRECOMMIT_MAX_BYTES = 'maxBytes'
+    READ_REPLICA = 'readReplica'
+    READ_REPLICA_ENABLE = 'enable'
+    READ_REPLICA_CHECKPOINT_PATH = 'checkpointPath'
+    READ_REPLICA_REFRESH_INTERVAL = 'refreshInterval'
     CHANNEL = 'channel'
     AMQP_KEY = 'amqpKey'
     AMQP_TARGET = 'amqpTarget'
+    SOCKET_PATH = 'socketPath'
+    SOCKET_MODE = 'socketMode'
     CONFIG = 'config'
     TBEARS_MODE = 'tbearsMode'
 
@@ -14,19 +14,23 @@
 
 from asyncio import get_event_loop
 from concurrent.futures.thread import ThreadPoolExecutor
+from threading import Event, Lock, local
+from time import monotonic, sleep
 
 from earlgrey import message_queue_task, MessageQueueStub, MessageQueueService
-from typing import Any, TYPE_CHECKING
+from typing import Any, Callable, Optional, TYPE_CHECKING
 
 from iconcommons.logger import Logger
 from iconservice.base.address import Address
 from iconservice.base.block import Block
-from iconservice.base.exception import ExceptionCode, IconServiceBaseException
+from iconservice.base.exception import ExceptionCode, IconServiceBaseException, InvalidRequestException, \
+    ServerErrorException
 from iconservice.base.type_converter import TypeConverter, ParamType
 from iconservice.icon_constant import ICON_INNER_LOG_TAG, ICON_SERVICE_LOG_TAG, \
-    EnableThreadFlag, ENABLE_THREAD_FLAG
+    EnableThreadFlag, ENABLE_THREAD_FLAG, ConfigKey
 from iconservice.icon_service_engine import IconServiceEngine
-from iconservice.utils import check_error_response, to_camel_case
+from iconservice.iconscore.icon_score_result_encoder import ResultFormat, encode_invoke_result
+from iconservice.utils import check_error_response
 
 if TYPE_CHECKING:
     from earlgrey import RobustConnection
@@ -36,12 +40,163 @@ THREAD_INVOKE = 'invoke'
 THREAD_QUERY = 'query'
 THREAD_VALIDATE = 'validate'
 
+DEFAULT_MAX_PENDING_QUERIES = 100
+DEFAULT_QUERY_TIMEOUT = 10
+
+
+class PriorityScheduler(object):
+    """Gives block-critical work priority over queries and validations
+
+    Block work (invoke, write and remove precommit state) is counted from its submission.
+    While it is pending, queries and validations wait before they start
+    and running queries wait before each step and before each request of a batch.
+    Queries are shed when too many of them are pending and stopped after their deadline.
+    Each request of a batch counts as a query.
+    """
+
+    def __init__(self,
+                 max_pending_queries: int = DEFAULT_MAX_PENDING_QUERIES,
+                 query_timeout: float = DEFAULT_QUERY_TIMEOUT) -> None:
+        """Constructor
+
+        :param max_pending_queries: max number of queries waiting or running, 0 means unlimited
+        :param query_timeout: seconds from the arrival of a query to its deadline, 0 means no deadline
+        """
+        self._max_pending_queries = max_pending_queries
+        self._query_timeout = query_timeout
+
+        self._lock = Lock()
+        self._block_work_count = 0
+        self._block_work_done = Event()
+        self._block_work_done.set()
+        self._pending_query_count = 0
+
+        # Deadline of the query running in the current thread
+        self._local = local()
+
+    @property
+    def block_work_count(self) -> int:
+        return self._block_work_count
+
+    @property
+    def pending_query_count(self) -> int:
+        return self._pending_query_count
+
+    def wrap_block_work(self, func: Callable, *args) -> Callable:
+        """Counts block work from now until it finishes
+
+        :param func: function doing block work
+        :param args: arguments of func
+        :return: function to run in a thread
+        """
+        with self._lock:
+            self._block_work_count += 1
+            self._block_work_done.clear()
+
+        def _run():
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._block_work_count -= 1
+                    if self._block_work_count == 0:
+                        self._block_work_done.set()
+
+        return _run
+
+    def wrap_query(self, func: Callable, *args, count: int = 1) -> Callable:
+        """Admits a query and gives it a deadline
+
+        :param func: function running a query
+        :param args: arguments of func
+        :param count: the number of requests processed by func
+        :return: function to run in a thread
+        :exception ServerErrorException: too many queries are pending
+        """
+        with self._lock:
+            if 0 < self._max_pending_queries < self._pending_query_count + count:
+                raise ServerErrorException('Server is busy')
+            self._pending_query_count += count
+
+        deadline = monotonic() + self._query_timeout if self._query_timeout > 0 else None
+
+        def _run():
+            try:
+                self._wait_for_block_work(deadline)
+                if deadline is not None and monotonic() > deadline:
+                    e = ServerErrorException('Query timeout')
+                    return MakeResponse.make_error_response(e.code, e.message)
+
+                self._local.deadline = deadline
+                self._local.in_query = True
+                try:
+                    return func(*args)
+                finally:
+                    self._local.deadline = None
+                    self._local.in_query = False
+            finally:
+                with self._lock:
+                    self._pending_query_count -= count
+
+        return _run
+
+    def wrap_validation(self, func: Callable, *args) -> Callable:
+        """Delays a validation while block work is pending
+
+        It waits up to the query timeout and runs anyway.
+
+        :param func: function validating a transaction
+        :param args: arguments of func
+        :return: function to run in a thread
+        """
+        deadline = monotonic() + self._query_timeout if self._query_timeout > 0 else None
+
+        def _run():
+            self._wait_for_block_work(deadline)
+            return func(*args)
+
+        return _run
+
+    def checkpoint(self, can_wait: bool = True) -> None:
+        """Called before each step of a query and before each request of a batch
+
+        A query waits here until pending block work is done if it can wait.
+
+        :param can_wait: False in the middle of a request or if the query holds a lock which block work needs.
+            Then it only yields the GIL.
+        :exception ServerErrorException: the deadline of the query has passed
+        """
+        deadline = getattr(self._local, 'deadline', None)
+        self._check_deadline(deadline)
+
+        if self._block_work_count > 0:
+            if can_wait and getattr(self._local, 'in_query', False):
+                self._wait_for_block_work(deadline)
+                self._check_deadline(deadline)
+            else:
+                # Releases the GIL so that the invoke thread can take it
+                sleep(0)
+
+    @staticmethod
+    def _check_deadline(deadline: Optional[float]) -> None:
+        if deadline is not None and monotonic() > deadline:
+            raise ServerErrorException('Query timeout')
+
+    def _wait_for_block_work(self, deadline: Optional[float]) -> None:
+        timeout = None if deadline is None else max(deadline - monotonic(), 0)
+        self._block_work_done.wait(timeout)
+
 
 class IconScoreInnerTask(object):
     def __init__(self, conf: 'IconConfig'):
         self._conf = conf
         self._thread_flag = ENABLE_THREAD_FLAG
 
+        scheduler_conf = conf.get(ConfigKey.SCHEDULER, {})
+        self._scheduler = PriorityScheduler(
+            scheduler_conf.get(ConfigKey.SCHEDULER_MAX_PENDING_QUERIES, DEFAULT_MAX_PENDING_QUERIES),
+            scheduler_conf.get(ConfigKey.SCHEDULER_QUERY_TIMEOUT, DEFAULT_QUERY_TIMEOUT))
+
         self._icon_service_engine = IconServiceEngine()
         self._open()
 
@@ -52,6 +207,7 @@ class IconScoreInnerTask(object):
     def _open(self):
         Logger.info("icon_score_service open", ICON_INNER_LOG_TAG)
         self._icon_service_engine.open(self._conf)
+        self._icon_service_engine.set_query_checkpoint(self._scheduler.checkpoint)
 
     def _is_thread_flag_on(self, flag: 'EnableThreadFlag') -> bool:
         return (self._thread_flag & flag) == flag
@@ -79,12 +235,12 @@ class IconScoreInnerTask(object):
     @message_queue_task
     async def invoke(self, request: dict):
         Logger.info(f'invoke request with {request}', ICON_INNER_LOG_TAG)
+        work = self._scheduler.wrap_block_work(self._invoke, request)
         if self._is_thread_flag_on(EnableThreadFlag.INVOKE):
             loop = get_event_loop()
-            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE],
-                                              self._invoke, request)
+            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE], work)
         else:
-            return self._invoke(request)
+            return work()
 
     def _invoke(self, request: dict):
         """Process transactions in a block
@@ -102,14 +258,8 @@ class IconScoreInnerTask(object):
             converted_tx_requests = params['transactions']
             tx_results, state_root_hash = self._icon_service_engine.invoke(
                 block=block, tx_requests=converted_tx_requests)
-
-            convert_tx_results = \
-                {bytes.hex(tx_result.tx_hash): tx_result.to_dict(to_camel_case) for tx_result in tx_results}
-            results = {
-                'txResults': convert_tx_results,
-                'stateRootHash': bytes.hex(state_root_hash)
-            }
-            response = MakeResponse.make_response(results)
+            response = self._make_invoke_response(tx_results, state_root_hash, request.get('resultFormat'))
+            self._icon_service_engine.release_tx_results()
         except IconServiceBaseException as icon_e:
             self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
             response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
@@ -120,15 +270,127 @@ class IconScoreInnerTask(object):
             Logger.info(f'invoke response with {response}', ICON_INNER_LOG_TAG)
             return response
 
+    @staticmethod
+    def _make_invoke_response(tx_results: list, state_root_hash: bytes, result_format: str = None) -> dict:
+        # Results are encoded in the response format at once without MakeResponse.make_response()
+        return encode_invoke_result(tx_results, state_root_hash, ResultFormat.from_str(result_format))
+
+    @message_queue_task
+    async def begin_block(self, request: dict):
+        Logger.info(f'begin_block request with {request}', ICON_INNER_LOG_TAG)
+        work = self._scheduler.wrap_block_work(self._begin_block, request)
+        if self._is_thread_flag_on(EnableThreadFlag.INVOKE):
+            loop = get_event_loop()
+            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE], work)
+        else:
+            return work()
+
+    def _begin_block(self, request: dict):
+        """Starts to process a block whose transactions are sent by add_transactions
+
+        :param request: {'block': block}
+        :return:
+        """
+
+        response = None
+        try:
+            params = TypeConverter.convert(request, ParamType.INVOKE)
+            block = Block.from_dict(params['block'])
+
+            self._icon_service_engine.begin_block(block)
+            response = MakeResponse.make_response(ExceptionCode.OK)
+        except IconServiceBaseException as icon_e:
+            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
+        except Exception as e:
+            self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
+        finally:
+            Logger.info(f'begin_block response with {response}', ICON_INNER_LOG_TAG)
+            return response
+
+    @message_queue_task
+    async def add_transactions(self, request: dict):
+        Logger.info(f'add_transactions request with {request}', ICON_INNER_LOG_TAG)
+        work = self._scheduler.wrap_block_work(self._add_transactions, request)
+        if self._is_thread_flag_on(EnableThreadFlag.INVOKE):
+            loop = get_event_loop()
+            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE], work)
+        else:
+            return work()
+
+    def _add_transactions(self, request: dict):
+        """Processes a chunk of transactions in the block started by begin_block
+
+        While a chunk is processed in the invoke thread, the next chunks are received.
+
+        :param request: {'transactions': transactions}
+        :return:
+        """
+
+        response = None
+        try:
+            params = TypeConverter.convert(request, ParamType.INVOKE)
+
+            self._icon_service_engine.add_transactions(params['transactions'])
+            response = MakeResponse.make_response(ExceptionCode.OK)
+        except IconServiceBaseException as icon_e:
+            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
+        except Exception as e:
+            self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
+        finally:
+            Logger.info(f'add_transactions response with {response}', ICON_INNER_LOG_TAG)
+            return response
+
+    @message_queue_task
+    async def end_block(self, request: dict = None):
+        Logger.info(f'end_block request with {request}', ICON_INNER_LOG_TAG)
+        work = self._scheduler.wrap_block_work(self._end_block, request)
+        if self._is_thread_flag_on(EnableThreadFlag.INVOKE):
+            loop = get_event_loop()
+            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE], work)
+        else:
+            return work()
+
+    def _end_block(self, request: dict = None):
+        """Finishes the block started by begin_block
+
+        :param request: {'resultFormat': 'json' or 'binary'}, optional
+        :return: the same response as invoke for the block
+        """
+
+        response = None
+        try:
+            tx_results, state_root_hash = self._icon_service_engine.end_block()
+            result_format = request.get('resultFormat') if request else None
+            response = self._make_invoke_response(tx_results, state_root_hash, result_format)
+            self._icon_service_engine.release_tx_results()
+        except IconServiceBaseException as icon_e:
+            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
+        except Exception as e:
+            self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
+        finally:
+            Logger.info(f'end_block response with {response}', ICON_INNER_LOG_TAG)
+            return response
+
     @message_queue_task
     async def query(self, request: dict):
         Logger.info(f'query request with {request}', ICON_INNER_LOG_TAG)
+        try:
+            work = self._scheduler.wrap_query(self._query, request)
+        except IconServiceBaseException as e:
+            Logger.warning(f'query rejected: {e.message}', ICON_INNER_LOG_TAG)
+            return MakeResponse.make_error_response(e.code, e.message)
+
         if self._is_thread_flag_on(EnableThreadFlag.QUERY):
             loop = get_event_loop()
-            return await loop.run_in_executor(self._thread_pool[THREAD_QUERY],
-                                              self._query, request)
+            return await loop.run_in_executor(self._thread_pool[THREAD_QUERY], work)
         else:
-            return self._query(request)
+            return work()
 
     def _query(self, request: dict):
         response = None
@@ -156,15 +418,127 @@ class IconScoreInnerTask(object):
             Logger.info(f'query response with {response}', ICON_INNER_LOG_TAG)
             return response
 
+    @message_queue_task
+    async def batch_query(self, requests: list):
+        Logger.info(f'batch_query request with {len(requests)} requests', ICON_INNER_LOG_TAG)
+        try:
+            work = self._scheduler.wrap_query(self._batch_query, requests, count=len(requests))
+        except IconServiceBaseException as e:
+            Logger.warning(f'batch_query rejected: {e.message}', ICON_INNER_LOG_TAG)
+            return MakeResponse.make_error_response(e.code, e.message)
+
+        if self._is_thread_flag_on(EnableThreadFlag.QUERY):
+            loop = get_event_loop()
+            return await loop.run_in_executor(self._thread_pool[THREAD_QUERY], work)
+        else:
+            return work()
+
+    def _batch_query(self, requests: list):
+        """Process query requests against the same committed states
+
+        :param requests: a list of query requests
+        :return: a list of responses in the order of requests
+        """
+        responses = [None] * len(requests)
+        converted_requests = []
+
+        for i, request in enumerate(requests):
+            try:
+                method = request['method']
+                if method == 'debug_estimateStep':
+                    raise InvalidRequestException(f'{method} is not allowed in batch_query')
+
+                converted_request = TypeConverter.convert(request, ParamType.QUERY)
+                converted_requests.append((i, method, converted_request['params']))
+            except BaseException as e:
+                responses[i] = self._make_error_response(e)
+
+        try:
+            values = self._icon_service_engine.batch_query(
+                [(method, params) for _, method, params in converted_requests])
+
+            for (i, _, _), value in zip(converted_requests, values):
+                if isinstance(value, BaseException):
+                    responses[i] = self._make_error_response(value)
+                    continue
+
+                if isinstance(value, Address):
+                    value = str(value)
+                responses[i] = MakeResponse.make_response(value)
+        except BaseException as e:
+            error_response = self._make_error_response(e)
+            for i, _, _ in converted_requests:
+                responses[i] = error_response
+
+        Logger.info(f'batch_query response with {len(responses)} responses', ICON_INNER_LOG_TAG)
+        return responses
+
+    @message_queue_task
+    async def batch_estimate_step(self, requests: list):
+        Logger.info(f'batch_estimate_step request with {len(requests)} requests', ICON_INNER_LOG_TAG)
+        try:
+            work = self._scheduler.wrap_query(self._batch_estimate_step, requests, count=len(requests))
+        except IconServiceBaseException as e:
+            Logger.warning(f'batch_estimate_step rejected: {e.message}', ICON_INNER_LOG_TAG)
+            return MakeResponse.make_error_response(e.code, e.message)
+
+        if self._is_thread_flag_on(EnableThreadFlag.QUERY):
+            loop = get_event_loop()
+            return await loop.run_in_executor(self._thread_pool[THREAD_QUERY], work)
+        else:
+            return work()
+
+    def _batch_estimate_step(self, requests: list):
+        """Estimates steps of debug_estimateStep requests against the same committed states
+
+        :param requests: a list of debug_estimateStep requests
+        :return: a list of responses in the order of requests
+        """
+        responses = [None] * len(requests)
+        converted_requests = []
+
+        for i, request in enumerate(requests):
+            try:
+                method = request['method']
+                if method != 'debug_estimateStep':
+                    raise InvalidRequestException(f'{method} is not allowed in batch_estimate_step')
+
+                converted_requests.append((i, TypeConverter.convert(request, ParamType.INVOKE_TRANSACTION)))
+            except BaseException as e:
+                responses[i] = self._make_error_response(e)
+
+        try:
+            values = self._icon_service_engine.batch_estimate_step(
+                [converted_request for _, converted_request in converted_requests])
+
+            for (i, _), value in zip(converted_requests, values):
+                if isinstance(value, BaseException):
+                    responses[i] = self._make_error_response(value)
+                else:
+                    responses[i] = MakeResponse.make_response(value)
+        except BaseException as e:
+            error_response = self._make_error_response(e)
+            for i, _ in converted_requests:
+                responses[i] = error_response
+
+        Logger.info(f'batch_estimate_step response with {len(responses)} responses', ICON_INNER_LOG_TAG)
+        return responses
+
+    def _make_error_response(self, e: BaseException) -> dict:
+        self._log_exception(e, ICON_SERVICE_LOG_TAG)
+        if isinstance(e, IconServiceBaseException):
+            return MakeResponse.make_error_response(e.code, e.message)
+        return MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
+
     @message_queue_task
     async def write_precommit_state(self, request: dict):
         Logger.info(f'write_precommit_state request with {request}', ICON_INNER_LOG_TAG)
+        work = self._scheduler.wrap_block_work(self._write_precommit_state, request)
         if self._is_thread_flag_on(EnableThreadFlag.INVOKE):
             loop = get_event_loop()
-            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE],
-                                              self._write_precommit_state, request)
+            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE], work)
         else:
-            return self._write_precommit_state(request)
+            return work()
 
     def _write_precommit_state(self, request: dict):
         response = None
@@ -187,12 +561,12 @@ class IconScoreInnerTask(object):
     @message_queue_task
     async def remove_precommit_state(self, request: dict):
         Logger.info(f'remove_precommit_state request with {request}', ICON_INNER_LOG_TAG)
+        work = self._scheduler.wrap_block_work(self._remove_precommit_state, request)
         if self._is_thread_flag_on(EnableThreadFlag.INVOKE):
             loop = get_event_loop()
-            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE],
-                                              self._remove_precommit_state, request)
+            return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE], work)
         else:
-            return self._remove_precommit_state(request)
+            return work()
 
     def _remove_precommit_state(self, request: dict):
         response = None
@@ -215,12 +589,12 @@ class IconScoreInnerTask(object):
     @message_queue_task
     async def validate_transaction(self, request: dict):
         Logger.info(f'pre_validate_check request with {request}', ICON_INNER_LOG_TAG)
+        work = self._scheduler.wrap_validation(self._validate_transaction, request)
         if self._is_thread_flag_on(EnableThreadFlag.VALIDATE):
             loop = get_event_loop()
-            return await loop.run_in_executor(self._thread_pool[THREAD_VALIDATE],
-                                              self._validate_transaction, request)
+            return await loop.run_in_executor(self._thread_pool[THREAD_VALIDATE], work)
         else:
-            return self._validate_transaction(request)
+            return work()
 
     def _validate_transaction(self, request: dict):
         response = None
@@ -46,12 +46,16 @@ class IconService(object):
 
     def serve(self, config: 'IconConfig'):
         async def _serve():
-            await self._inner_service.connect(exclusive=True)
+            if socket_path:
+                await self._inner_service.serve()
+            else:
+                await self._inner_service.connect(exclusive=True)
             Logger.info(f'Start IconService Service serve!', ICON_SERVICE)
 
         channel = config[ConfigKey.CHANNEL]
         amqp_key = config[ConfigKey.AMQP_KEY]
         amqp_target = config[ConfigKey.AMQP_TARGET]
+        socket_path = config.get(ConfigKey.SOCKET_PATH)
         score_root_path = config[ConfigKey.SCORE_ROOT_PATH]
         db_root_patn = config[ConfigKey.STATE_DB_ROOT_PATH]
 
@@ -63,9 +67,16 @@ class IconService(object):
         Logger.info(f'amqp_target  : {amqp_target}', ICON_SERVICE)
         Logger.info(f'amqp_key  :  {amqp_key}', ICON_SERVICE)
         Logger.info(f'icon_score_queue_name  : {self._icon_score_queue_name}', ICON_SERVICE)
+        Logger.info(f'socket_path  : {socket_path}', ICON_SERVICE)
         Logger.info(f'==========IconService Service params==========', ICON_SERVICE)
 
-        self._inner_service = IconScoreInnerService(amqp_target, self._icon_score_queue_name, conf=config)
+        if socket_path:
+            # Serves over a Unix domain socket instead of the message queue
+            from iconservice.icon_socket_service import IconScoreSocketService
+            socket_mode = int(config.get(ConfigKey.SOCKET_MODE, '0600'), 8)
+            self._inner_service = IconScoreSocketService(socket_path, socket_mode, conf=config)
+        else:
+            self._inner_service = IconScoreInnerService(amqp_target, self._icon_score_queue_name, conf=config)
 
         loop = MessageQueueService.loop
         loop.create_task(_serve())
@@ -103,6 +114,8 @@ def main():
                         help="icon score amqp_key : [amqp_key]")
     parser.add_argument("-at", dest=ConfigKey.AMQP_TARGET, type=str, default=None,
                         help="icon score amqp_target : [127.0.0.1]")
+    parser.add_argument("-sp", dest=ConfigKey.SOCKET_PATH, type=str, default=None,
+                        help="unix domain socket path served instead of amqp  example : /tmp/iconservice.sock")
     parser.add_argument("-c", dest=ConfigKey.CONFIG, type=str, default=None,
                         help="icon score config")
     parser.add_argument("-tbears", dest=ConfigKey.TBEARS_MODE, action='store_true',
@@ -127,14 +140,16 @@ def main():
     Logger.load_config(conf)
     Logger.print_config(conf, ICON_SERVICE_CLI)
 
-    _run_async(_check_rabbitmq())
+    if not conf.get(ConfigKey.SOCKET_PATH):
+        _run_async(_check_rabbitmq())
     icon_service = IconService()
     icon_service.serve(config=conf)
     Logger.info(f'==========IconService Done==========', ICON_SERVICE_CLI)
 
 
 def run_in_foreground(conf: 'IconConfig'):
-    _run_async(_check_rabbitmq())
+    if not conf.get(ConfigKey.SOCKET_PATH):
+        _run_async(_check_rabbitmq())
     icon_service = IconService()
     icon_service.serve(config=conf)
 
@@ -52,6 +52,7 @@ def main():
         -at : amqp target info [IP]:[PORT]
         -ak : key sharing peer group using queue name. use it if one more peers connect one MQ
         -ch : loopchain channel ex) loopchain_default
+        -sp : unix domain socket path served instead of amqp ex) /tmp/iconservice.sock
         -fg : foreground process
         -tbears : tbears mode
     """)
@@ -70,6 +71,8 @@ def main():
                         help="icon score amqp_key : [amqp_key]")
     parser.add_argument("-at", dest=ConfigKey.AMQP_TARGET, type=str, default=None,
                         help="icon score amqp_target : [127.0.0.1]")
+    parser.add_argument("-sp", dest=ConfigKey.SOCKET_PATH, type=str, default=None,
+                        help="unix domain socket path served instead of amqp  example : /tmp/iconservice.sock")
     parser.add_argument("-c", dest=ConfigKey.CONFIG, type=str, default=None,
                         help="icon score config")
     parser.add_argument("-fg", dest='foreground', action='store_true',
@@ -134,7 +137,8 @@ def _start_process(conf: 'IconConfig'):
     converted_params = {'-sc': conf[ConfigKey.SCORE_ROOT_PATH],
                         '-st': conf[ConfigKey.STATE_DB_ROOT_PATH],
                         '-ch': conf[ConfigKey.CHANNEL], '-ak': conf[ConfigKey.AMQP_KEY],
-                        '-at': conf[ConfigKey.AMQP_TARGET], '-c': conf.get(ConfigKey.CONFIG)}
+                        '-at': conf[ConfigKey.AMQP_TARGET], '-sp': conf.get(ConfigKey.SOCKET_PATH) or None,
+                        '-c': conf.get(ConfigKey.CONFIG)}
 
     custom_argv = []
     for k, v in converted_params.items():
@@ -156,8 +160,15 @@ def _start_process(conf: 'IconConfig'):
 
 
 async def stop_process(conf: 'IconConfig'):
-    icon_score_queue_name = _make_icon_score_queue_name(conf[ConfigKey.CHANNEL], conf[ConfigKey.AMQP_KEY])
-    stub = await _create_icon_score_stub(conf[ConfigKey.AMQP_TARGET], icon_score_queue_name)
+    socket_path = conf.get(ConfigKey.SOCKET_PATH)
+    if socket_path:
+        from .icon_socket_service import IconScoreSocketStub
+
+        stub = IconScoreSocketStub(socket_path)
+        await stub.connect()
+    else:
+        icon_score_queue_name = _make_icon_score_queue_name(conf[ConfigKey.CHANNEL], conf[ConfigKey.AMQP_KEY])
+        stub = await _create_icon_score_stub(conf[ConfigKey.AMQP_TARGET], icon_score_queue_name)
     await stub.async_task().close()
     Logger.info(f'stop_process_icon_service!', ICON_SERVICE_CLI)
 
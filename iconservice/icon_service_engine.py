@@ -14,25 +14,38 @@
 # limitations under the License.
 
 
+import json
+from contextlib import contextmanager
 from math import ceil
 from os import makedirs
-from typing import TYPE_CHECKING, List, Any, Optional
+from threading import Lock, local
+from typing import TYPE_CHECKING, List, Any, Optional, Callable, Iterable
 
 from iconcommons.logger import Logger
 
 from .base.address import Address, generate_score_address, generate_score_address_for_tbears
 from .base.address import ZERO_SCORE_ADDRESS, GOVERNANCE_SCORE_ADDRESS
 from .base.block import Block
-from .base.exception import ExceptionCode, RevertException, ScoreErrorException
-from .base.exception import IconServiceBaseException, ServerErrorException
+from .base.exception import ExceptionCode, RevertException, ScoreErrorException, DatabaseException
+from .base.exception import IconServiceBaseException, ServerErrorException, InvalidRequestException, \
+    InvalidParamsException
 from .base.message import Message
 from .base.transaction import Transaction
+from .base.type_converter import TypeConverter
+from .database.access_stats import StateAccessStats, DEFAULT_HOT_KEY_COUNT
+from .database.backend import BackendType
 from .database.batch import BlockBatch, TransactionBatch
+from .database.db import IconScoreDatabase, ReadView
 from .database.factory import ContextDatabaseFactory
+from .database.history import StateHistory
+from .database.replica import ReadReplica, DEFAULT_REFRESH_INTERVAL
+from .database.sharding import DEFAULT_DB_POOL_SIZE
+from .deploy import DeployState
 from .deploy.icon_builtin_score_loader import IconBuiltinScoreLoader
 from .deploy.icon_score_deploy_engine import IconScoreDeployEngine
 from .deploy.icon_score_deploy_storage import IconScoreDeployStorage
-from .icon_constant import ICON_DEX_DB_NAME, ICON_SERVICE_LOG_TAG, IconServiceFlag, ConfigKey
+from .icon_constant import ICON_DEX_DB_NAME, ICON_SERVICE_LOG_TAG, ICON_DB_LOG_TAG, IconServiceFlag, ConfigKey
+from .icon_constant import DEFAULT_BYTE_SIZE
 from .iconscore.icon_pre_validator import IconPreValidator
 from .iconscore.icon_score_context import IconScoreContext, IconScoreFuncType, ContextContainer
 from .iconscore.icon_score_context import IconScoreContextType
@@ -42,8 +55,11 @@ from .iconscore.icon_score_event_log import EventLogEmitter
 from .iconscore.icon_score_loader import IconScoreLoader
 from .iconscore.icon_score_mapper import IconScoreMapper
 from .iconscore.icon_score_result import TransactionResult
-from .iconscore.icon_score_step import IconScoreStepCounterFactory, StepType
-from .iconscore.icon_score_trace import Trace, TraceType
+from .iconscore.icon_score_step import IconScoreStepCounterFactory, StepType, StepCosts
+from .iconscore.icon_score_trace import Trace, TraceType, TraceLevel, materialize_traces
+from .iconscore.estimate_step_cache import EstimateStepCache, make_estimate_key, DEFAULT_CACHE_SIZE, \
+    DEFAULT_CACHE_TTL
+from .iconscore.query_budget import QueryBudget, DEFAULT_WINDOW, DEFAULT_CALLER_STEPS, DEFAULT_SCORE_STEPS
 from .icx.icx_account import AccountType
 from .icx.icx_engine import IcxEngine
 from .icx.icx_storage import IcxStorage
@@ -60,6 +76,27 @@ if TYPE_CHECKING:
     from iconcommons.icon_config import IconConfig
 
 
+class BlockInvokeState(object):
+    """States of a block while its transactions are being processed
+    """
+
+    def __init__(self,
+                 block: 'Block',
+                 context: Optional['IconScoreContext'],
+                 precommit_data: Optional['PrecommitData'] = None) -> None:
+        """Constructor
+
+        :param block:
+        :param context: invoke context, None if the block has already been processed
+        :param precommit_data: the result of the block processed before
+        """
+        self.block = block
+        self.context = context
+        self.precommit_data = precommit_data
+        self.block_result = []
+        self.precommit_flag = PrecommitFlag.NONE
+
+
 class IconServiceEngine(ContextContainer):
     """The entry of all icon service related components
 
@@ -79,6 +116,23 @@ class IconServiceEngine(ContextContainer):
         self._icon_score_deploy_engine = None
         self._step_counter_factory = None
         self._icon_pre_validator = None
+        self._state_history = None
+        # Keeps committed states from changing while they are pinned or read by a read replica
+        self._commit_lock = Lock()
+        # Whether the query running in the current thread holds the commit lock
+        self._query_local = local()
+        # The block being processed by begin_block(), add_transactions() and end_block()
+        self._block_invoke_state = None
+        # Step budgets of icx_call per caller and per SCORE, None if disabled
+        self._query_budget = None
+        # Estimated steps of repeated debug_estimateStep requests
+        self._estimate_step_cache = None
+        # Committed states followed by a query-only engine, None if it is not a read replica
+        self._read_replica = None
+        # Whether reads of committed states wait for a commit in progress.
+        # A commit in MULTIPLE_DB mode writes SCORE dbs after the main db
+        self._serializes_reads = False
+        self._query_checkpoint = None
 
         # JSON-RPC handlers
         self._handlers = {
@@ -88,7 +142,12 @@ class IconServiceEngine(ContextContainer):
             'icx_sendTransaction': self._handle_icx_send_transaction,
             'debug_estimateStep': self._handle_estimate_step,
             'icx_getScoreApi': self._handle_icx_get_score_api,
-            'ise_getStatus': self._handle_ise_get_status
+            'ise_getStatus': self._handle_ise_get_status,
+            'debug_getStateAccessStats': self._handle_debug_get_state_access_stats,
+            'debug_getScoreMapperStatus': self._handle_debug_get_score_mapper_status,
+            'debug_getTraces': self._handle_debug_get_traces,
+            'debug_getQueryBudgetStatus': self._handle_debug_get_query_budget_status,
+            'debug_getPrecommitStatus': self._handle_debug_get_precommit_status
         }
 
         self._precommit_data_manager = PrecommitDataManager()
@@ -104,25 +163,80 @@ class IconServiceEngine(ContextContainer):
         score_root_path: str = self._conf[ConfigKey.SCORE_ROOT_PATH].rstrip('/')
         state_db_root_path: str = self._conf[ConfigKey.STATE_DB_ROOT_PATH].rstrip('/')
 
+        backend_type: str = self._conf.get(ConfigKey.STATE_DB_BACKEND, BackendType.PLYVEL)
+
+        replica_conf: dict = self._conf.get(ConfigKey.READ_REPLICA, {})
+        if replica_conf.get(ConfigKey.READ_REPLICA_ENABLE, False):
+            self._read_replica = ReadReplica(
+                state_db_root_path, score_root_path, backend_type,
+                replica_conf.get(ConfigKey.READ_REPLICA_CHECKPOINT_PATH),
+                replica_conf.get(ConfigKey.READ_REPLICA_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL))
+            self._read_replica.open()
+            state_db_root_path = self._read_replica.state_db_root_path
+            score_root_path = self._read_replica.score_root_path
+        else:
+            self._read_replica = None
+
         makedirs(score_root_path, exist_ok=True)
         makedirs(state_db_root_path, exist_ok=True)
 
-        # Share one context db with all SCOREs
+        # SINGLE_DB mode shares one context db with all SCOREs
+        state_db_mode = ContextDatabaseFactory.Mode.from_str(self._conf.get(ConfigKey.STATE_DB_MODE, 'single'))
+        self._serializes_reads = state_db_mode == ContextDatabaseFactory.Mode.MULTIPLE_DB
         ContextDatabaseFactory.open(
-            state_db_root_path, ContextDatabaseFactory.Mode.SINGLE_DB)
+            state_db_root_path,
+            state_db_mode,
+            backend_type,
+            self._conf.get(ConfigKey.STATE_DB_OPTIONS),
+            self._conf.get(ConfigKey.STATE_DB_POOL_SIZE, DEFAULT_DB_POOL_SIZE),
+            read_only=self._read_replica is not None and self._read_replica.is_in_place)
+
+        stats_conf: dict = self._conf.get(ConfigKey.STATE_ACCESS_STATS, {})
+        if stats_conf.get(ConfigKey.STATE_ACCESS_STATS_ENABLE, False):
+            IconScoreDatabase.access_stats = StateAccessStats(
+                stats_conf.get(ConfigKey.STATE_ACCESS_STATS_HOT_KEY_COUNT, DEFAULT_HOT_KEY_COUNT))
+        else:
+            IconScoreDatabase.access_stats = None
+
+        budget_conf: dict = self._conf.get(ConfigKey.QUERY_BUDGET, {})
+        if budget_conf.get(ConfigKey.QUERY_BUDGET_ENABLE, False):
+            self._query_budget = QueryBudget(
+                budget_conf.get(ConfigKey.QUERY_BUDGET_WINDOW, DEFAULT_WINDOW),
+                budget_conf.get(ConfigKey.QUERY_BUDGET_CALLER_STEPS, DEFAULT_CALLER_STEPS),
+                budget_conf.get(ConfigKey.QUERY_BUDGET_SCORE_STEPS, DEFAULT_SCORE_STEPS))
+        else:
+            self._query_budget = None
+
+        cache_conf: dict = self._conf.get(ConfigKey.ESTIMATE_STEP_CACHE, {})
+        self._estimate_step_cache = EstimateStepCache(
+            cache_conf.get(ConfigKey.ESTIMATE_STEP_CACHE_SIZE, DEFAULT_CACHE_SIZE),
+            cache_conf.get(ConfigKey.ESTIMATE_STEP_CACHE_TTL, DEFAULT_CACHE_TTL))
+
+        precommit_conf: dict = self._conf.get(ConfigKey.PRECOMMIT, {})
+        self._precommit_data_manager = PrecommitDataManager(
+            precommit_conf.get(ConfigKey.PRECOMMIT_MAX_COUNT, 0),
+            precommit_conf.get(ConfigKey.PRECOMMIT_MAX_BYTES, 0))
 
         self._icx_engine = IcxEngine()
         self._icon_score_deploy_engine = IconScoreDeployEngine()
 
         self._icx_context_db = ContextDatabaseFactory.create_by_name(ICON_DEX_DB_NAME)
+        if self._read_replica is not None and self._read_replica.is_in_place:
+            # All reads are served from the states pinned at the last refresh
+            self._icx_context_db.read_view = ReadView(self._icx_context_db.key_value_db)
         self._icx_storage = IcxStorage(self._icx_context_db)
         icon_score_deploy_storage = IconScoreDeployStorage(self._icx_context_db)
 
         IconScoreMapper.icon_score_loader = IconScoreLoader(score_root_path)
         IconScoreMapper.deploy_storage = icon_score_deploy_storage
-        self._icon_score_mapper = IconScoreMapper(is_lock=True)
+        self._icon_score_mapper = IconScoreMapper(is_lock=True,
+                                                  capacity=self._conf.get(ConfigKey.SCORE_MAPPER_CAPACITY, 0))
+        # SCOREs updated in precommit data stay until the data is written or removed
+        self._icon_score_mapper.is_pinned = self._precommit_data_manager.has_score
 
         self._step_counter_factory = IconScoreStepCounterFactory()
+        self._step_counter_factory.set_query_checkpoint(
+            None if self._query_checkpoint is None else self._run_step_checkpoint)
         self._icon_pre_validator = IconPreValidator(self._icx_engine,
                                                     icon_score_deploy_storage)
 
@@ -131,14 +245,32 @@ class IconServiceEngine(ContextContainer):
         IconScoreContext.icon_score_deploy_engine = self._icon_score_deploy_engine
         IconScoreContext.icon_service_flag = service_config_flag
         IconScoreContext.legacy_tbears_mode = self._conf.get(ConfigKey.TBEARS_MODE, False)
+        IconScoreContext.trace_level = TraceLevel.from_str(self._conf.get(ConfigKey.TRACE_LEVEL, 'full'))
 
         self._icx_engine.open(self._icx_storage)
         self._icon_score_deploy_engine.open(
             score_root_path=score_root_path,
             icon_deploy_storage=icon_score_deploy_storage)
 
-        self._load_builtin_scores()
+        if self._read_replica is not None:
+            # A read replica writes nothing, so it needs the states committed by another process
+            if self._icx_storage.last_block is None:
+                raise DatabaseException('No committed states to serve')
+            self._state_history = StateHistory(self._icx_context_db)
+        else:
+            history_conf: dict = self._conf.get(ConfigKey.STATE_HISTORY, {})
+            self._state_history = StateHistory(
+                self._icx_context_db,
+                max_reverse_diffs=history_conf.get(ConfigKey.STATE_HISTORY_MAX_REVERSE_DIFFS, 0),
+                checkpoint_interval=history_conf.get(ConfigKey.STATE_HISTORY_CHECKPOINT_INTERVAL, 0),
+                checkpoint_path=history_conf.get(ConfigKey.STATE_HISTORY_CHECKPOINT_PATH),
+                max_checkpoints=history_conf.get(ConfigKey.STATE_HISTORY_MAX_CHECKPOINTS, 0),
+                score_root_path=score_root_path)
+            self._state_history.check(self._icx_storage.last_block)
+
+            self._load_builtin_scores()
         self._init_global_value_by_governance_score()
+        self._warm_up_scores(icon_score_deploy_storage)
 
         self._precommit_data_manager.last_block = self._icx_storage.last_block
 
@@ -163,6 +295,36 @@ class IconServiceEngine(ContextContainer):
         finally:
             self._pop_context()
 
+    def _warm_up_scores(self, icon_score_deploy_storage: 'IconScoreDeployStorage') -> None:
+        """Loads active SCOREs before the first block comes
+
+        It returns when all SCOREs are loaded or the timeout expires.
+
+        :param icon_score_deploy_storage:
+        """
+        warm_up_conf: dict = self._conf.get(ConfigKey.SCORE_WARM_UP, {})
+        if not warm_up_conf.get(ConfigKey.SCORE_WARM_UP_ENABLE, False):
+            return
+
+        scores = []
+        for deploy_info in icon_score_deploy_storage.get_deploy_infos(None):
+            if deploy_info.deploy_state != DeployState.ACTIVE or deploy_info.score_address in self._icon_score_mapper:
+                continue
+
+            tx_hash = deploy_info.current_tx_hash
+            if tx_hash is None:
+                tx_hash = bytes(DEFAULT_BYTE_SIZE)
+            scores.append((deploy_info.score_address, tx_hash))
+
+        # Loading more SCOREs than capacity only makes them evicted
+        capacity: int = self._conf.get(ConfigKey.SCORE_MAPPER_CAPACITY, 0)
+        if capacity > 0:
+            scores = scores[:capacity]
+
+        self._icon_score_mapper.warm_up(scores,
+                                        warm_up_conf.get(ConfigKey.SCORE_WARM_UP_WORKERS, 4),
+                                        warm_up_conf.get(ConfigKey.SCORE_WARM_UP_TIMEOUT))
+
     def _init_global_value_by_governance_score(self):
         """Initialize step_counter_factory with parameters
         managed by governance SCORE
@@ -216,7 +378,7 @@ class IconServiceEngine(ContextContainer):
         return step_price
 
     @staticmethod
-    def _get_step_costs_from_governance(governance) -> dict:
+    def _get_step_costs_from_governance(governance) -> 'StepCosts':
         step_costs = {}
         # Gets the step costs
         for key, value in governance.getStepCosts().items():
@@ -226,7 +388,7 @@ class IconServiceEngine(ContextContainer):
                 # Pass the unknown step type
                 pass
 
-        return step_costs
+        return StepCosts(step_costs)
 
     @staticmethod
     def _get_step_max_limits_from_governance(governance) -> dict:
@@ -276,7 +438,9 @@ class IconServiceEngine(ContextContainer):
         """Free all resources occupied by IconServiceEngine
         including db, memory and so on
         """
-        self._icon_score_mapper.clear_garbage_score()
+        # SCORE packages of a read replica belong to another process or to a checkpoint
+        if self._read_replica is None:
+            self._icon_score_mapper.clear_garbage_score()
         context = IconScoreContext(IconScoreContextType.DIRECT)
         self._push_context(context)
         try:
@@ -284,6 +448,18 @@ class IconServiceEngine(ContextContainer):
             self._icon_score_mapper.close()
         finally:
             self._pop_context()
+            if self._state_history:
+                self._state_history.close()
+            if self._read_replica:
+                self._read_replica.close()
+                self._read_replica = None
+            if self._icx_context_db is not None and self._icx_context_db.read_view is not None:
+                self._icx_context_db.read_view.close()
+                self._icx_context_db.read_view = None
+            self._dump_state_access_stats()
+            IconScoreContext.trace_level = TraceLevel.FULL
+            self._block_invoke_state = None
+            self._query_budget = None
             ContextDatabaseFactory.close()
             self._clear_context()
 
@@ -294,8 +470,53 @@ class IconServiceEngine(ContextContainer):
 
         :param block:
         :param tx_requests: transactions in a block
-        :return: (TransactionResult[], bytes)
+        :return: (TransactionResult[], bytes),
+            transaction results are encoded dicts if the block has been invoked and released
+        """
+        self._check_writable()
+        invoke_state = self._begin_block(block)
+        self._add_transactions(invoke_state, tx_requests)
+        return self._end_block(invoke_state)
+
+    def begin_block(self, block: 'Block') -> None:
+        """Starts to process a block whose transactions are sent in chunks
+
+        An unfinished block started before is discarded.
+
+        :param block:
+        """
+        self._check_writable()
+        if self._block_invoke_state is not None:
+            Logger.warning(
+                f'Discard the unfinished block(0x{self._block_invoke_state.block.hash.hex()})',
+                ICON_SERVICE_LOG_TAG)
+            self._block_invoke_state = None
+
+        self._block_invoke_state = self._begin_block(block)
+
+    def add_transactions(self, tx_requests: list) -> list:
+        """Processes a chunk of transactions in the block started by begin_block()
+
+        :param tx_requests: transactions following the ones added before
+        :return: TransactionResult[] of the given transactions
+        """
+        return self._add_transactions(self._get_block_invoke_state(), tx_requests)
+
+    def end_block(self) -> tuple:
+        """Finishes the block started by begin_block()
+
+        :return: (TransactionResult[], bytes) which invoke() returns for the same block
         """
+        invoke_state = self._get_block_invoke_state()
+        self._block_invoke_state = None
+        return self._end_block(invoke_state)
+
+    def _get_block_invoke_state(self) -> 'BlockInvokeState':
+        if self._block_invoke_state is None:
+            raise InvalidRequestException('No block has begun')
+        return self._block_invoke_state
+
+    def _begin_block(self, block: 'Block') -> 'BlockInvokeState':
         # If the block has already been processed,
         # return the result from PrecommitDataManager
         precommit_data: 'PrecommitData' = self._precommit_data_manager.get(block.hash)
@@ -303,7 +524,7 @@ class IconServiceEngine(ContextContainer):
             Logger.info(
                 f'The result of block(0x{block.hash.hex()} already exists',
                 ICON_SERVICE_LOG_TAG)
-            return precommit_data.block_result, precommit_data.state_root_hash
+            return BlockInvokeState(block, None, precommit_data)
 
         # Check for block validation before invoke
         self._precommit_data_manager.validate_block_to_invoke(block)
@@ -315,33 +536,63 @@ class IconServiceEngine(ContextContainer):
         context.tx_batch = TransactionBatch()
         context.new_icon_score_mapper = IconScoreMapper()
         self._set_revision_to_context(context)
-        block_result = []
-        precommit_flag = PrecommitFlag.NONE
 
-        if block.height == 0:
-            # Assume that there is only one tx in genesis_block
-            tx_result = self._invoke_genesis(context, tx_requests[0], 0)
-            block_result.append(tx_result)
-            context.block_batch.update(context.tx_batch)
-            context.tx_batch.clear()
-        else:
-            for index, tx_request in enumerate(tx_requests):
+        return BlockInvokeState(block, context)
+
+    def _add_transactions(self, invoke_state: 'BlockInvokeState', tx_requests: list) -> list:
+        if invoke_state.precommit_data is not None:
+            return []
+
+        context = invoke_state.context
+        block_result = invoke_state.block_result
+        tx_results = []
+
+        for tx_request in tx_requests:
+            index = len(block_result)
+
+            if context.block.height == 0:
+                # Assume that there is only one tx in genesis_block
+                if index > 0:
+                    break
+                tx_result = self._invoke_genesis(context, tx_request, index)
+                context.block_batch.update(context.tx_batch)
+                context.tx_batch.clear()
+            else:
                 tx_result = self._invoke_request(context, tx_request, index)
-                block_result.append(tx_result)
                 context.block_batch.update(context.tx_batch)
                 context.tx_batch.clear()
                 self._update_revision_if_necessary(context, tx_result)
                 tx_precommit_flag = self._generate_precommit_flag(tx_result)
                 self._update_step_properties_if_necessary(context, tx_precommit_flag)
-                precommit_flag |= tx_precommit_flag
+                invoke_state.precommit_flag |= tx_precommit_flag
+
+            block_result.append(tx_result)
+            tx_results.append(tx_result)
 
-        # Save precommit data
-        # It will be written to levelDB on commit
-        precommit_data = PrecommitData(
-            context.block_batch, block_result, context.new_icon_score_mapper, precommit_flag)
-        self._precommit_data_manager.push(precommit_data)
+        return tx_results
 
-        return block_result, precommit_data.state_root_hash
+    def _end_block(self, invoke_state: 'BlockInvokeState') -> tuple:
+        precommit_data = invoke_state.precommit_data
+        if precommit_data is None:
+            context = invoke_state.context
+
+            # Save precommit data
+            # It will be written to levelDB on commit
+            precommit_data = PrecommitData(
+                context.block_batch, invoke_state.block_result, context.new_icon_score_mapper,
+                invoke_state.precommit_flag)
+            self._precommit_data_manager.push(precommit_data)
+
+        return precommit_data.tx_results, precommit_data.state_root_hash
+
+    def release_tx_results(self) -> None:
+        """Drops tx_results kept in precommit data after the invoke response is sent
+
+        States, newly deployed SCOREs and tx_results encoded in ResultFormat.BINARY
+        are kept until the block is committed or rolled back.
+        Invoking a released block again returns the encoded tx_results.
+        """
+        self._precommit_data_manager.release_block_results()
 
     def _update_revision_if_necessary(self, context, tx_result):
         """
@@ -388,7 +639,7 @@ class IconServiceEngine(ContextContainer):
             step_price: int = self._get_step_price_from_governance(context, governance_score)
             context.step_counter.set_step_price(step_price)
 
-            step_costs: int = self._get_step_costs_from_governance(governance_score)
+            step_costs: 'StepCosts' = self._get_step_costs_from_governance(governance_score)
             context.step_counter.set_step_costs(step_costs)
 
             max_step_limits: dict = self._get_step_max_limits_from_governance(governance_score)
@@ -574,13 +825,75 @@ class IconServiceEngine(ContextContainer):
 
         :return: The amount of step
         """
+        with self._serve_read_replica():
+            block: 'Block' = self._precommit_data_manager.last_block
+            key: tuple = make_estimate_key(block, request['params'])
+            step: Optional[int] = self._estimate_step_cache.get(key)
+            if step is None:
+                step = self._estimate_step(self._create_estimation_context(block), request)
+                self._estimate_step_cache.put(key, step)
+
+            return step
+
+    def batch_estimate_step(self, requests: list) -> list:
+        """Estimates steps of transactions against the same committed states
+
+        One context is used for all requests and the states changed by a request are
+        thrown away before the next one. All requests read the committed states
+        pinned before the first one (see _serve_batch).
+
+        :param requests: debug_estimateStep requests
+        :return: estimated steps in the order of requests.
+            The result of a failed request is the exception raised
+        """
+        results = []
+        context: Optional['IconScoreContext'] = None
+
+        for request, block, read_view in self._serve_batch(requests):
+            try:
+                key: tuple = make_estimate_key(block, request['params'])
+                step: Optional[int] = self._estimate_step_cache.get(key)
+                if step is None:
+                    if context is None or context.block is not block:
+                        context = self._create_estimation_context(block)
+                        context.read_view = read_view
+                    else:
+                        self._reset_estimation_context(context)
+
+                    step = self._estimate_step(context, request)
+                    self._estimate_step_cache.put(key, step)
+
+                results.append(step)
+            except BaseException as e:
+                results.append(e)
+
+        return results
+
+    def _create_estimation_context(self, block: 'Block') -> 'IconScoreContext':
         context = IconScoreContext(IconScoreContextType.ESTIMATION)
         context.step_counter = self._step_counter_factory.create(IconScoreContextType.INVOKE)
-        context.block = self._precommit_data_manager.last_block
-        context.block_batch = BlockBatch(Block.from_block(context.block))
+        context.block = block
+        context.block_batch = BlockBatch(Block.from_block(block))
         context.tx_batch = TransactionBatch()
         context.new_icon_score_mapper = IconScoreMapper()
         self._set_revision_to_context(context)
+        return context
+
+    @staticmethod
+    def _reset_estimation_context(context: 'IconScoreContext') -> None:
+        """Throws away the states left by the previous estimate
+        """
+        batch_block: 'Block' = context.block_batch.block
+        context.block_batch.clear()
+        context.block_batch.block = batch_block
+        context.tx_batch.clear()
+        context.new_icon_score_mapper.clear()
+        context.func_type = IconScoreFuncType.WRITABLE
+        context.cumulative_step_used = 0
+        context.msg_stack.clear()
+        context.event_log_stack.clear()
+
+    def _estimate_step(self, context: 'IconScoreContext', request: dict) -> int:
         # Fills the step_limit as the max step limit to proceed the transaction.
         step_limit: int = context.step_counter.max_step_limit
         context.step_counter.reset(step_limit)
@@ -609,10 +922,174 @@ class IconServiceEngine(ContextContainer):
         :param params:
         :return: the result of query
         """
-        context = IconScoreContext(IconScoreContextType.QUERY)
-        context.block = self._icx_storage.last_block
-        context.step_counter = self._step_counter_factory.create(IconScoreContextType.QUERY)
-        self._set_revision_to_context(context)
+        with self._serve_read_replica():
+            context = IconScoreContext(IconScoreContextType.QUERY)
+            context.block = self._icx_storage.last_block
+            context.step_counter = self._step_counter_factory.create(IconScoreContextType.QUERY)
+            self._set_revision_to_context(context)
+
+            return self._query(context, method, params)
+
+    def set_query_checkpoint(self, checkpoint: Optional[Callable[[bool], None]]) -> None:
+        """Sets a function called before each step of queries and before each request of batches
+
+        It can wait for block work only before a request of a batch.
+        A request waiting for a commit in the middle would mix the states of two blocks.
+
+        :param checkpoint: function which takes whether it can wait for block work,
+            None to remove it
+        """
+        self._query_checkpoint = checkpoint
+        self._step_counter_factory.set_query_checkpoint(
+            None if checkpoint is None else self._run_step_checkpoint)
+
+    def _run_step_checkpoint(self) -> None:
+        checkpoint: Optional[Callable[[bool], None]] = self._query_checkpoint
+        if checkpoint is not None:
+            checkpoint(False)
+
+    def _run_query_checkpoint(self) -> None:
+        checkpoint: Optional[Callable[[bool], None]] = self._query_checkpoint
+        if checkpoint is not None:
+            # A query holding the commit lock cannot wait for block work which needs the lock
+            checkpoint(not getattr(self._query_local, 'holds_commit_lock', False))
+
+    def batch_query(self, requests: list) -> list:
+        """Process query message calls against the same committed states
+
+        The last block, the step counter and the revision are prepared once for all requests
+        and all requests read the committed states pinned before the first one (see _serve_batch).
+
+        :param requests: a list of (method, params)
+        :return: results in the order of requests.
+            The result of a failed request is the exception raised
+        """
+        results = []
+        step_counter = self._step_counter_factory.create(IconScoreContextType.QUERY)
+        revision: Optional[int] = None
+
+        for (method, params), block, read_view in self._serve_batch(requests):
+            context = IconScoreContext(IconScoreContextType.QUERY)
+            context.block = block
+            context.step_counter = step_counter
+            context.read_view = read_view
+
+            try:
+                if revision is None:
+                    self._set_revision_to_context(context)
+                    revision = context.revision
+                else:
+                    context.revision = revision
+
+                results.append(self._query(context, method, params))
+            except BaseException as e:
+                results.append(e)
+
+        return results
+
+    def _serve_batch(self, requests: list) -> Iterable[tuple]:
+        """Serves the requests of a batch against the same committed states
+
+        The commit lock is held only while a view of the committed states is taken,
+        so a long batch does not hold up commits.
+        SCOREs and values cached in memory like the total supply can follow a commit made in the meantime.
+        SCORE dbs in MULTIPLE_DB mode cannot be pinned together and a read replica can refresh
+        its pinned states, so the lock is held for each request there instead
+        and requests can see different blocks.
+
+        :param requests: requests of a batch
+        :return: iterator of (request, the last block, view of the committed states or None)
+        """
+        with self._serve_read_replica(lock=True):
+            # A read replica keeps the states pinned at its last refresh
+            read_view: Optional['ReadView'] = \
+                None if self._read_replica is not None else ContextDatabaseFactory.create_read_view()
+            block: 'Block' = self._icx_storage.last_block
+
+        if read_view is None:
+            for request in requests:
+                # Gives the commit lock to pending block work
+                self._run_query_checkpoint()
+                with self._hold_commit_lock():
+                    yield request, self._icx_storage.last_block, None
+            return
+
+        with read_view:
+            for request in requests:
+                self._run_query_checkpoint()
+                yield request, block, read_view
+
+    @contextmanager
+    def _serve_read_replica(self, lock: bool = False):
+        """Keeps a read replica from refreshing its states while they are read
+
+        A query and a validation running in different threads are serialized on a read replica.
+        In MULTIPLE_DB mode they are serialized with commits as well,
+        so that they never see the main db and SCORE dbs written by a commit in between.
+
+        :param lock: holds the commit lock even if this is not a read replica
+        """
+        if self._read_replica is None and not self._serializes_reads and not lock:
+            yield
+            return
+
+        with self._hold_commit_lock():
+            if self._read_replica is not None:
+                self._refresh_read_replica()
+            yield
+
+    @contextmanager
+    def _hold_commit_lock(self):
+        """Holds the commit lock for reading committed states
+        """
+        with self._commit_lock:
+            self._query_local.holds_commit_lock = True
+            try:
+                yield
+            finally:
+                self._query_local.holds_commit_lock = False
+
+    def _refresh_read_replica(self) -> None:
+        """Follows the states committed by another process
+
+        It should be called with the commit lock.
+        """
+        read_replica: 'ReadReplica' = self._read_replica
+        if not read_replica.is_due():
+            return
+
+        if read_replica.is_in_place:
+            # The states of a block are pinned at once, so no query reads states of two blocks
+            read_view = ReadView(self._icx_context_db.key_value_db)
+            block_bytes: Optional[bytes] = read_view.get(IcxStorage.LAST_BLOCK_KEY)
+            if block_bytes is None or block_bytes == bytes(self._icx_storage.last_block):
+                read_view.close()
+                return
+
+            self._icx_context_db.read_view.close()
+            self._icx_context_db.read_view = read_view
+            self._reload_committed_states()
+            Logger.info(f'Read replica follows block {self._icx_storage.last_block.height}',
+                        ICON_SERVICE_LOG_TAG)
+        elif read_replica.poll_checkpoint() is not None:
+            # Only the dbs and SCOREs move to the new generation. Nothing else is rebuilt
+            read_replica.advance()
+            ContextDatabaseFactory.move(read_replica.state_db_root_path)
+
+            IconScoreMapper.icon_score_loader.close()
+            IconScoreMapper.icon_score_loader = IconScoreLoader(read_replica.score_root_path)
+            self._icon_score_deploy_engine.open(
+                score_root_path=read_replica.score_root_path,
+                icon_deploy_storage=IconScoreMapper.deploy_storage)
+
+            self._reload_committed_states()
+            read_replica.remove_old_generations()
+
+    def _check_writable(self) -> None:
+        if self._read_replica is not None:
+            raise InvalidRequestException('Not allowed on a read replica')
+
+    def _query(self, context: 'IconScoreContext', method: str, params: dict) -> Any:
         step_limit: int = context.step_counter.max_step_limit
 
         if params:
@@ -623,9 +1100,18 @@ class IconServiceEngine(ContextContainer):
         context.traces: List['Trace'] = []
         context.step_counter.reset(step_limit)
 
-        ret = self._call(context, method, params)
+        query_budget: Optional['QueryBudget'] = self._query_budget
+        if query_budget is None or method != 'icx_call':
+            return self._call(context, method, params)
 
-        return ret
+        # Rejects the call before running it if the caller or the SCORE used up its budget
+        from_: Optional['Address'] = params.get('from')
+        to: Optional['Address'] = params.get('to')
+        query_budget.check(from_, to)
+        try:
+            return self._call(context, method, params)
+        finally:
+            query_budget.consume(from_, to, context.step_counter.step_used)
 
     def validate_transaction(self, request: dict) -> None:
         """Validate JSON-RPC transaction request
@@ -640,6 +1126,10 @@ class IconServiceEngine(ContextContainer):
             in IconInnerService
         :return:
         """
+        with self._serve_read_replica():
+            self._validate_transaction(request)
+
+    def _validate_transaction(self, request: dict) -> None:
         method = request['method']
         assert method in ('icx_sendTransaction', 'debug_estimateStep')
         assert 'params' in request
@@ -651,14 +1141,15 @@ class IconServiceEngine(ContextContainer):
         self._set_revision_to_context(context)
 
         step_price: int = context.step_counter.step_price
-        minimum_step: int = self._step_counter_factory.get_step_cost(StepType.DEFAULT)
+        step_costs: 'StepCosts' = self._step_counter_factory.get_step_costs()
+        minimum_step: int = step_costs[StepType.DEFAULT]
 
         if 'data' in params:
             # minimum_step is the sum of
             # default STEP cost and input STEP costs if data field exists
             data = params['data']
             input_size = self._get_byte_length(data)
-            minimum_step += input_size * self._step_counter_factory.get_step_cost(StepType.INPUT)
+            minimum_step += input_size * step_costs[StepType.INPUT]
 
         self._icon_pre_validator.execute(params, step_price, minimum_step)
 
@@ -761,9 +1252,10 @@ class IconServiceEngine(ContextContainer):
             tx_result.status = TransactionResult.SUCCESS
         except BaseException as e:
             tx_result.failure = self._get_failure_from_exception(e)
-            trace = self._get_trace_from_exception(context.current_address, e)
             context.tx_batch.clear()
-            context.traces.append(trace)
+            if context.trace_level != TraceLevel.OFF:
+                trace = self._get_trace_from_exception(context.current_address, e)
+                context.traces.append(trace)
             context.event_logs.clear()
         finally:
             # Revert func_type to IconScoreFuncType.WRITABLE
@@ -785,7 +1277,11 @@ class IconServiceEngine(ContextContainer):
             tx_result.cumulative_step_used = context.cumulative_step_used
             tx_result.event_logs = context.event_logs
             tx_result.logs_bloom = self._generate_logs_bloom(context.event_logs)
-            tx_result.traces = context.traces
+            if context.trace_level == TraceLevel.ON_FAILURE and tx_result.status == TransactionResult.FAILURE:
+                tx_result.traces = materialize_traces(context.traces)
+            else:
+                # On success, call frames are kept as they are until debug_getTraces asks for them
+                tx_result.traces = context.traces
 
         return tx_result
 
@@ -1060,6 +1556,77 @@ class IconServiceEngine(ContextContainer):
             response['lastBlock'] = last_block_status
         return response
 
+    def _handle_debug_get_state_access_stats(self, context: 'IconScoreContext', params: dict) -> dict:
+        """Returns state accesses aggregated by SCORE and container variable
+        and the most frequently accessed keys
+
+        :param context:
+        :param params:
+        :return:
+        """
+        if IconScoreDatabase.access_stats is None:
+            raise InvalidRequestException('State access stats is disabled')
+
+        return IconScoreDatabase.access_stats.to_dict()
+
+    def _handle_debug_get_score_mapper_status(self, context: 'IconScoreContext', params: dict) -> dict:
+        """Returns the number of SCOREs loaded in memory, load latency and evictions
+
+        :param context:
+        :param params:
+        :return:
+        """
+        return self._icon_score_mapper.get_status()
+
+    def _handle_debug_get_query_budget_status(self, context: 'IconScoreContext', params: dict) -> dict:
+        """Returns the query step budgets and the callers and SCOREs using the most steps
+
+        :param context:
+        :param params:
+        :return:
+        """
+        if self._query_budget is None:
+            raise InvalidRequestException('Query budget is disabled')
+
+        return self._query_budget.get_status()
+
+    def _handle_debug_get_traces(self, context: 'IconScoreContext', params: dict) -> list:
+        """Returns the traces of a transaction in a block which is not written yet
+
+        :param context:
+        :param params: blockHash and txHash
+        :return: traces
+        """
+        precommit_data: 'PrecommitData' = self._precommit_data_manager.get(params.get('blockHash'))
+        if precommit_data is None:
+            raise InvalidParamsException('Precommit data not found')
+
+        tx_hash: bytes = params.get('txHash')
+        traces = precommit_data.get_traces(tx_hash)
+        if traces is None:
+            raise InvalidParamsException(f'Transaction not found: {tx_hash}')
+
+        return [trace.to_dict(to_camel_case) for trace in materialize_traces(traces)]
+
+    def _handle_debug_get_precommit_status(self, context: 'IconScoreContext', params: dict) -> dict:
+        """Returns the number and the bytes of candidate blocks kept in memory
+
+        :param context:
+        :param params:
+        :return:
+        """
+        return self._precommit_data_manager.get_status()
+
+    @staticmethod
+    def _dump_state_access_stats() -> None:
+        access_stats = IconScoreDatabase.access_stats
+        if access_stats is None:
+            return
+
+        IconScoreDatabase.access_stats = None
+        stats: dict = TypeConverter.convert_type_reverse(access_stats.to_dict())
+        Logger.info(f'State access stats: {json.dumps(stats)}', ICON_DB_LOG_TAG)
+
     def _make_last_block_status(self) -> Optional[dict]:
         block = self._precommit_data_manager.last_block
         if block is None:
@@ -1092,6 +1659,11 @@ class IconServiceEngine(ContextContainer):
         """Write updated states in a context.block_batch to StateDB
         when the candidate block has been confirmed
         """
+        self._check_writable()
+        with self._commit_lock:
+            self._commit(block)
+
+    def _commit(self, block: 'Block') -> None:
         # Check for block validation before commit
         self._precommit_data_manager.validate_precommit_block(block)
 
@@ -1099,24 +1671,61 @@ class IconServiceEngine(ContextContainer):
 
         precommit_data: 'PrecommitData' = \
             self._precommit_data_manager.get(block.hash)
-        block_batch = precommit_data.block_batch
         new_icon_score_mapper = precommit_data.score_mapper
         if new_icon_score_mapper:
             self._icon_score_mapper.update(new_icon_score_mapper)
 
+        # Writes the block info with the states changed by the block at once
+        states = self._state_history.make_commit_states(precommit_data.get_states(), precommit_data.block)
         self._icx_context_db.write_batch(
-            context=context, states=block_batch)
+            context=context, states=states)
 
-        self._icx_storage.put_block_info(context, block_batch.block)
-        self._precommit_data_manager.commit(block_batch.block)
+        self._icx_storage.last_block = precommit_data.block
+        self._precommit_data_manager.commit(precommit_data.block)
+        self._estimate_step_cache.clear()
 
         if precommit_data.precommit_flag & PrecommitFlag.STEP_ALL_CHANGED != PrecommitFlag.NONE:
             self._init_global_value_by_governance_score()
 
+        self._state_history.on_commit(precommit_data.block)
+
+    def rollback_to(self, block_height: int) -> 'Block':
+        """Restore committed states to the ones right after a given block was committed
+
+        Only the last maxReverseDiffs blocks can be rolled back.
+        All precommit states are thrown away.
+
+        :param block_height: height of the block to roll back to
+        :return: the new last block
+        """
+        self._check_writable()
+        with self._commit_lock:
+            return self._rollback_to(block_height)
+
+    def _rollback_to(self, block_height: int) -> 'Block':
+        context = IconScoreContext(IconScoreContextType.DIRECT)
+
+        block = self._state_history.rollback_to(context, block_height, self._icx_storage.last_block)
+        self._precommit_data_manager.clear()
+        self._reload_committed_states()
+
+        return block
+
+    def _reload_committed_states(self) -> None:
+        """Reloads the committed states cached in memory
+        """
+        self._icx_storage = IcxStorage(self._icx_context_db)
+        self._icx_engine.open(self._icx_storage)
+        self._icon_score_mapper.clear()
+        self._init_global_value_by_governance_score()
+        self._precommit_data_manager.last_block = self._icx_storage.last_block
+        self._estimate_step_cache.clear()
+
     def rollback(self, block: 'Block') -> None:
         """Throw away a precommit state
         in context.block_batch and IconScoreEngine
         """
+        self._check_writable()
         # Check for block validation before rollback
         self._precommit_data_manager.validate_precommit_block(block)
         self._precommit_data_manager.rollback(block)
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unix domain socket transport serving the same tasks as the message queue
+
+A frame is a 4-byte big-endian length followed by a msgpack payload.
+A request is [msg_id, func_name, kwargs] and a response is [msg_id, result, error].
+Requests are pipelined: a client sends requests without waiting for responses
+and responses are matched by msg_id, so they can arrive out of order.
+
+It requires msgpack.
+The socket is accessible only by its owner unless another mode is given.
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+import struct
+from typing import Any, Optional
+
+import msgpack
+from earlgrey import MessageQueueException, MessageQueueService, TASK_ATTR_DICT
+
+from iconcommons.logger import Logger
+from .icon_inner_service import IconScoreInnerTask
+
+SOCKET_SERVICE_LOG_TAG = 'SOCKET'
+
+_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+DEFAULT_SOCKET_MODE = 0o600
+
+
+def pack_frame(message: Any) -> bytes:
+    payload = msgpack.packb(message, use_bin_type=True)
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: 'asyncio.StreamReader') -> Any:
+    """Reads a frame
+
+    :param reader:
+    :return: unpacked message
+    :raise asyncio.IncompleteReadError: the connection is closed
+    """
+    header = await reader.readexactly(_HEADER.size)
+    size, = _HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise MessageQueueException(f'Too large frame: {size}')
+
+    payload = await reader.readexactly(size)
+    return msgpack.unpackb(payload, raw=False)
+
+
+def _get_task_names(task: object) -> list:
+    names = []
+    for attribute_name in dir(task):
+        try:
+            attribute = getattr(task, attribute_name)
+            getattr(attribute, TASK_ATTR_DICT)
+        except AttributeError:
+            pass
+        else:
+            names.append(attribute_name)
+    return names
+
+
+class UnixSocketService(object):
+    """Serves message_queue_task methods of TaskType over a Unix domain socket
+    """
+    TaskType: type = object
+
+    loop = MessageQueueService.loop
+
+    def __init__(self, socket_path: str, socket_mode: int = DEFAULT_SOCKET_MODE, **task_kwargs):
+        """Constructor
+
+        :param socket_path: path of the socket file
+        :param socket_mode: permission bits of the socket file
+        :param task_kwargs: arguments of TaskType
+        """
+        self._socket_path = socket_path
+        self._socket_mode = socket_mode
+        self._server = None
+        self._task = self.__class__.TaskType(**task_kwargs)
+        self._funcs = {name: getattr(self._task, name) for name in _get_task_names(self._task)}
+
+    async def serve(self) -> None:
+        if os.path.exists(self._socket_path):
+            os.remove(self._socket_path)
+
+        self._server = await asyncio.start_unix_server(self._on_connected, path=self._socket_path, loop=self.loop)
+        # Anyone who can connect can invoke blocks, so the process umask is not trusted
+        os.chmod(self._socket_path, self._socket_mode)
+        Logger.info(f'Serve on {self._socket_path}', SOCKET_SERVICE_LOG_TAG)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if os.path.exists(self._socket_path):
+            os.remove(self._socket_path)
+
+    async def _on_connected(self, reader: 'asyncio.StreamReader', writer: 'asyncio.StreamWriter') -> None:
+        # Concurrent drain() calls on a StreamWriter are not allowed
+        write_lock = asyncio.Lock(loop=self.loop)
+
+        try:
+            while True:
+                message = await read_frame(reader)
+                if not isinstance(message, list) or len(message) != 3 or not isinstance(message[0], int):
+                    # A response cannot be matched to the request
+                    raise MessageQueueException(f'Invalid request frame: {str(message)[:100]}')
+                msg_id, func_name, kwargs = message
+
+                # Tasks start in the order of requests,
+                # so requests sharing a thread pool are processed in order
+                asyncio.ensure_future(self._handle(writer, write_lock, msg_id, func_name, kwargs), loop=self.loop)
+        except asyncio.IncompleteReadError:
+            pass
+        except BaseException as e:
+            Logger.error(f'Connection error: {e}', SOCKET_SERVICE_LOG_TAG)
+        finally:
+            writer.close()
+
+    async def _handle(self,
+                      writer: 'asyncio.StreamWriter',
+                      write_lock: 'asyncio.Lock',
+                      msg_id: int,
+                      func_name: str,
+                      kwargs: dict) -> None:
+        result = None
+        error = None
+
+        func = self._funcs.get(func_name) if isinstance(func_name, str) else None
+        if func is None:
+            error = f'Invalid task: {func_name}'
+        elif not isinstance(kwargs, dict):
+            error = f'Invalid arguments of {func_name}: {type(kwargs).__name__}'
+        else:
+            # Every request gets a response, or the client would wait for it forever
+            try:
+                result = await func(**kwargs)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                result = e
+            if isinstance(result, BaseException):
+                result, error = None, str(result)
+
+        try:
+            frame = pack_frame([msg_id, result, error])
+        except BaseException as e:
+            frame = pack_frame([msg_id, None, f'Failed to pack the result of {func_name}: {e}'])
+
+        if writer.transport.is_closing():
+            return
+
+        async with write_lock:
+            writer.write(frame)
+            await writer.drain()
+
+
+class UnixSocketStub(object):
+    """Calls message_queue_task methods of TaskType served by UnixSocketService
+
+    async_task() returns an object having the same task methods as TaskType.
+    """
+    TaskType: type = object
+
+    def __init__(self, socket_path: str):
+        self._socket_path = socket_path
+        self._reader: Optional['asyncio.StreamReader'] = None
+        self._writer: Optional['asyncio.StreamWriter'] = None
+        self._read_task = None
+        self._write_lock = None
+        self._next_msg_id = 0
+        self._futures = {}
+
+        self._async_task = object.__new__(self.__class__.TaskType)  # not calling __init__
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self._socket_path)
+        self._write_lock = asyncio.Lock()
+        self._read_task = asyncio.ensure_future(self._read_responses())
+        self._register_tasks()
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._read_task is not None:
+            await self._read_task
+            self._read_task = None
+
+    def async_task(self):
+        return self._async_task
+
+    def _register_tasks(self) -> None:
+        for attribute_name in _get_task_names(self._async_task):
+            func = getattr(self.__class__.TaskType, attribute_name)
+            stub = functools.partial(self._call, attribute_name, func)
+            setattr(self._async_task, attribute_name, stub)
+
+    async def _call(self, func_name: str, func: callable, *args, **kwargs) -> Any:
+        params = inspect.signature(func).bind(self._async_task, *args, **kwargs)
+        params.apply_defaults()
+        kwargs = dict(params.arguments)
+        del kwargs['self']
+
+        if self._writer is None:
+            raise MessageQueueException('Not connected')
+
+        msg_id = self._next_msg_id
+        self._next_msg_id += 1
+        future = asyncio.get_event_loop().create_future()
+        self._futures[msg_id] = future
+
+        async with self._write_lock:
+            self._writer.write(pack_frame([msg_id, func_name, kwargs]))
+            await self._writer.drain()
+
+        return await future
+
+    async def _read_responses(self) -> None:
+        error = MessageQueueException('Connection closed')
+        try:
+            while True:
+                msg_id, result, error_message = await read_frame(self._reader)
+                future = self._futures.pop(msg_id, None)
+                if future is None or future.done():
+                    continue
+
+                if error_message is None:
+                    future.set_result(result)
+                else:
+                    Logger.error(error_message, SOCKET_SERVICE_LOG_TAG)
+                    future.set_exception(MessageQueueException(error_message))
+        except asyncio.IncompleteReadError:
+            pass
+        except BaseException as e:
+            error = MessageQueueException(str(e))
+        finally:
+            futures, self._futures = self._futures, {}
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(error)
+
+
+class IconScoreSocketService(UnixSocketService):
+    TaskType = IconScoreInnerTask
+
+    def clean_close(self):
+        self._task._close()
+
+
+class IconScoreSocketStub(UnixSocketStub):
+    TaskType = IconScoreInnerTask
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Short-lived cache of estimated steps
+
+Wallets estimate the same transaction again and again before sending it.
+An estimate depends on the committed states, so entries are keyed on the last block
+and IconServiceEngine clears the cache whenever committed states change.
+"""
+
+import json
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..utils import sha3_256
+
+if TYPE_CHECKING:
+    from ..base.block import Block
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 10
+
+
+def _encode_value(value: Any) -> str:
+    # Keeps values of different types apart, e.g. Address and its string
+    return f'{type(value).__name__}:{value}'
+
+
+def make_estimate_key(block: 'Block', params: dict) -> tuple:
+    """Makes a cache key of an estimate request
+
+    :param block: the block which the estimate is based on
+    :param params: converted params of debug_estimateStep
+    :return: (block hash, from, to, value, data hash)
+    """
+    data = json.dumps([params.get('dataType'), params.get('data')],
+                      sort_keys=True, default=_encode_value).encode()
+    return block.hash, params.get('from'), params.get('to'), params.get('value', 0), sha3_256(data)
+
+
+class EstimateStepCache(object):
+    def __init__(self,
+                 size: int = DEFAULT_CACHE_SIZE,
+                 ttl: float = DEFAULT_CACHE_TTL,
+                 clock: Callable[[], float] = monotonic) -> None:
+        """Constructor
+
+        :param size: the max number of estimates to keep, 0 to disable the cache
+        :param ttl: seconds to keep an estimate
+        :param clock: returns the current time in seconds
+        """
+        self._size = size
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        # key: (estimated step, expiration time)
+        self._entries = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[int]:
+        """Returns the estimated step of key, None if it is not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: tuple, step: int) -> None:
+        if self._size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (step, self._clock() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
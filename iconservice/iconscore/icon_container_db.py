@@ -16,6 +16,7 @@
 
 
 from collections import Iterator
+from itertools import islice
 from typing import TypeVar, Optional, Any, Union, TYPE_CHECKING
 
 from ..base.address import Address
@@ -33,6 +34,11 @@ V = TypeVar('V', int, str, Address, bytes, bool)
 ARRAY_DB_ID = b'\x00'
 DICT_DB_ID = b'\x01'
 VAR_DB_ID = b'\x02'
+SET_DB_ID = b'\x03'
+SORTED_DB_ID = b'\x04'
+
+# Max byte length of int key encoded by ContainerUtil.encode_sort_key()
+MAX_SORT_KEY_INT_LENGTH = 0x7f
 
 
 class ContainerUtil(object):
@@ -42,7 +48,7 @@ class ContainerUtil(object):
         """Create a prefix used
         as a parameter of IconScoreDatabase.get_sub_db()
 
-        :param cls: ArrayDB, DictDB, VarDB
+        :param cls: ArrayDB, DictDB, SetDB, SortedDB
         :param var_key:
         :return:
         """
@@ -53,10 +59,18 @@ class ContainerUtil(object):
             container_id = ARRAY_DB_ID
         elif cls == DictDB:
             container_id = DICT_DB_ID
+        elif cls == SetDB:
+            container_id = SET_DB_ID
+        elif cls == SortedDB:
+            container_id = SORTED_DB_ID
         else:
             raise ContainerDBException(f'Unsupported container class: {cls}')
 
         encoded_key: bytes = ContainerUtil.__encode_key(var_key)
+        if cls in (SetDB, SortedDB):
+            # Items are read by a range scan,
+            # so the key of a container must not start with the key of another one and a separator
+            encoded_key = encoded_key.replace(b'\\', b'\\\\').replace(b'|', b'\\|')
         return b'|'.join([container_id, encoded_key])
 
     @staticmethod
@@ -75,6 +89,54 @@ class ContainerUtil(object):
     def encode_value(value: V) -> bytes:
         return ContainerUtil.__encode_value(value)
 
+    @staticmethod
+    def encode_sort_key(key: K) -> bytes:
+        """Create a key whose byte order is the same as the order of key
+
+        int key is encoded with a leading byte indicating its sign and length.
+        The others are encoded in the same way as encode_key().
+
+        :param key:
+        :return:
+        """
+        if isinstance(key, int):
+            return ContainerUtil.__encode_sortable_int(key)
+
+        return ContainerUtil.encode_key(key)
+
+    @staticmethod
+    def decode_sort_key(key: bytes, key_type: type) -> K:
+        if key_type == int:
+            return ContainerUtil.__decode_sortable_int(key)
+
+        return ContainerUtil.decode_object(key, key_type)
+
+    @staticmethod
+    def __encode_sortable_int(key: int) -> bytes:
+        if key >= 0:
+            length = (key.bit_length() + 7) // 8
+            header = 0x80 + length
+            body = key
+        else:
+            length = ((-key).bit_length() + 7) // 8
+            header = 0x7f - length
+            body = 256 ** length + key
+
+        if length > MAX_SORT_KEY_INT_LENGTH:
+            raise ContainerDBException(f'too large key: {key}')
+
+        return bytes([header]) + body.to_bytes(length, DATA_BYTE_ORDER)
+
+    @staticmethod
+    def __decode_sortable_int(key: bytes) -> int:
+        header = key[0]
+        body = int.from_bytes(key[1:], DATA_BYTE_ORDER)
+
+        if header >= 0x80:
+            return body
+        else:
+            return body - 256 ** (0x7f - header)
+
     @staticmethod
     def __encode_key(key: K) -> bytes:
         if isinstance(key, int):
@@ -187,9 +249,23 @@ class DictDB(object):
         """
         self.__remove(key)
 
+    def get_many(self, keys: list) -> list:
+        """
+        Gets the values of given keys at once
+
+        :param keys: keys
+        :return: values in the same order as keys
+        """
+        if self.__depth != 1:
+            raise ContainerDBException('DictDB depth mismatch')
+
+        encoded_keys = [ContainerUtil.encode_key(key) for key in keys]
+        return [ContainerUtil.decode_object(value, self.__value_type)
+                for value in self._db.get_many(encoded_keys)]
+
     def __setitem__(self, key: K, value: V) -> None:
         if self.__depth != 1:
-            raise ContainerDBException(f'DictDB depth mismatch')
+            raise ContainerDBException('DictDB depth mismatch')
 
         encoded_key: bytes = ContainerUtil.encode_key(key)
         encoded_value: bytes = ContainerUtil.encode_value(value)
@@ -213,7 +289,7 @@ class DictDB(object):
 
     def __remove(self, key: K) -> None:
         if self.__depth != 1:
-            raise ContainerDBException(f'DictDB depth mismatch')
+            raise ContainerDBException('DictDB depth mismatch')
         self._db.delete(ContainerUtil.encode_key(key))
 
 
@@ -225,6 +301,8 @@ class ArrayDB(Iterator):
 
     __SIZE = 'size'
     __SIZE_BYTE_KEY = ContainerUtil.encode_key(__SIZE)
+    # The number of items read at once on iteration
+    __ITER_CHUNK_SIZE = 32
 
     def __init__(self, var_key: str, db: 'IconScoreDatabase', value_type: type) -> None:
         prefix: bytes = ContainerUtil.create_db_prefix(type(self), var_key)
@@ -256,11 +334,32 @@ class ArrayDB(Iterator):
 
         index = self.__size - 1
         last_val = self[index]
-        self._db.delete(ContainerUtil.encode_key(index))
-        self.__size -= 1
-        self.__set_size()
+        self._db.put_many([
+            (ContainerUtil.encode_key(index), None),
+            (ArrayDB.__SIZE_BYTE_KEY, ContainerUtil.encode_value(index))])
+        self.__size = index
         return last_val
 
+    def extend(self, values: iter) -> None:
+        """
+        Puts the values at the end of array
+
+        Steps are charged as if `put` were called for each value
+        but the size is written only once.
+
+        :param values: values to add
+        """
+        items = []
+        size = self.__size
+        for value in values:
+            items.append((ContainerUtil.encode_key(size), ContainerUtil.encode_value(value)))
+            size += 1
+            items.append((ArrayDB.__SIZE_BYTE_KEY, ContainerUtil.encode_value(size)))
+
+        if items:
+            self._db.put_many(items)
+            self.__size = size
+
     def get(self, index: int=0) -> V:
         """
         Gets the value at index
@@ -271,8 +370,19 @@ class ArrayDB(Iterator):
         return self[index]
 
     def __iter__(self):
+        # SCOREs may call next() on an ArrayDB after iter() as it is an Iterator
         self.__index = 0
-        return self
+        return self.__iter_chunks()
+
+    def __iter_chunks(self):
+        index = 0
+        while index < self.__size:
+            end = min(index + ArrayDB.__ITER_CHUNK_SIZE, self.__size)
+            keys = [ContainerUtil.encode_key(i) for i in range(index, end)]
+            # Steps are charged per item as it is yielded
+            for value in self._db.iter_many(keys):
+                yield ContainerUtil.decode_object(value, self.__value_type)
+            index = end
 
     def __next__(self) -> V:
         if self.__index < self.__size:
@@ -300,8 +410,12 @@ class ArrayDB(Iterator):
         byte_value = ContainerUtil.encode_value(value)
         sub_db.put(ContainerUtil.encode_key(index), byte_value)
 
-    def __getitem__(self, index: int) -> V:
-        if isinstance(index, int):
+    def __getitem__(self, index: Union[int, slice]) -> Union[V, list]:
+        if isinstance(index, slice):
+            keys = [ContainerUtil.encode_key(i) for i in range(*index.indices(self.__size))]
+            return [ContainerUtil.decode_object(value, self.__value_type)
+                    for value in self._db.get_many(keys)]
+        elif isinstance(index, int):
             if index < 0:
                 index += len(self)
             if index < 0 or index >= len(self):
@@ -317,6 +431,154 @@ class ArrayDB(Iterator):
         return False
 
 
+class SetDB(object):
+    """
+    Utility classes wrapping the state DB.
+    SetDB behaves more like python set.
+    Items are iterated in the byte order of their encoded values
+    """
+
+    __SIZE_BYTE_KEY = ContainerUtil.encode_key('size')
+    __ITEMS_PREFIX = b'items'
+    __ITEM_BYTE_VALUE = b'\x01'
+
+    def __init__(self, var_key: str, db: 'IconScoreDatabase', value_type: type) -> None:
+        prefix: bytes = ContainerUtil.create_db_prefix(type(self), var_key)
+        self._db = db.get_sub_db(prefix)
+        self._items_db = self._db.get_sub_db(SetDB.__ITEMS_PREFIX)
+
+        self.__value_type = value_type
+
+    def add(self, value: V) -> None:
+        """
+        Adds the value to the set
+
+        :param value: value to add
+        """
+        byte_key = ContainerUtil.encode_key(value)
+        if self._items_db.get(byte_key) is not None:
+            return
+
+        self._items_db.put(byte_key, SetDB.__ITEM_BYTE_VALUE)
+        self.__set_size(len(self) + 1)
+
+    def remove(self, value: V) -> None:
+        """
+        Removes the value from the set if it exists
+
+        :param value: value to remove
+        """
+        byte_key = ContainerUtil.encode_key(value)
+        if self._items_db.get(byte_key) is None:
+            return
+
+        self._items_db.delete(byte_key)
+        self.__set_size(len(self) - 1)
+
+    def __contains__(self, value: V) -> bool:
+        return self._items_db.get(ContainerUtil.encode_key(value)) is not None
+
+    def __iter__(self):
+        for byte_key, _ in self._items_db.iterator():
+            yield ContainerUtil.decode_object(byte_key, self.__value_type)
+
+    def __len__(self) -> int:
+        return ContainerUtil.decode_object(self._db.get(SetDB.__SIZE_BYTE_KEY), int)
+
+    def __set_size(self, size: int) -> None:
+        self._db.put(SetDB.__SIZE_BYTE_KEY, ContainerUtil.encode_value(size))
+
+
+class SortedDB(object):
+    """
+    Utility classes wrapping the state DB.
+    SortedDB behaves like python dict and keeps its items sorted by key.
+    supports range and top-k queries
+    """
+
+    __SIZE_BYTE_KEY = ContainerUtil.encode_key('size')
+    __ITEMS_PREFIX = b'items'
+
+    def __init__(self, var_key: str, db: 'IconScoreDatabase', key_type: type, value_type: type) -> None:
+        prefix: bytes = ContainerUtil.create_db_prefix(type(self), var_key)
+        self._db = db.get_sub_db(prefix)
+        self._items_db = self._db.get_sub_db(SortedDB.__ITEMS_PREFIX)
+
+        self.__key_type = key_type
+        self.__value_type = value_type
+
+    def remove(self, key: K) -> None:
+        """
+        Removes the value of given key
+
+        :param key: key
+        """
+        byte_key = self.__encode_key(key)
+        if self._items_db.get(byte_key) is None:
+            return
+
+        self._items_db.delete(byte_key)
+        self.__set_size(len(self) - 1)
+
+    def items(self, start: Optional[K] = None, stop: Optional[K] = None, reverse: bool = False) -> iter:
+        """
+        Iterates (key, value) pairs whose keys are in the range of [start, stop)
+
+        :param start: the first key to include, None means no lower bound
+        :param stop: the first key to exclude, None means no upper bound
+        :param reverse: iterate in descending key order
+        :return: (key, value) iterator
+        """
+        byte_start = None if start is None else self.__encode_key(start)
+        byte_stop = None if stop is None else self.__encode_key(stop)
+
+        for byte_key, byte_value in self._items_db.iterator(byte_start, byte_stop, reverse):
+            yield (ContainerUtil.decode_sort_key(byte_key, self.__key_type),
+                   ContainerUtil.decode_object(byte_value, self.__value_type))
+
+    def top(self, count: int) -> list:
+        """
+        Returns (key, value) pairs of the largest keys in descending key order
+
+        :param count: the number of items to return
+        :return: list of (key, value) pairs
+        """
+        return list(islice(self.items(reverse=True), max(count, 0)))
+
+    def __setitem__(self, key: K, value: V) -> None:
+        byte_key = self.__encode_key(key)
+        is_new = self._items_db.get(byte_key) is None
+
+        self._items_db.put(byte_key, ContainerUtil.encode_value(value))
+        if is_new:
+            self.__set_size(len(self) + 1)
+
+    def __getitem__(self, key: K) -> V:
+        return ContainerUtil.decode_object(
+            self._items_db.get(self.__encode_key(key)), self.__value_type)
+
+    def __delitem__(self, key: K) -> None:
+        self.remove(key)
+
+    def __contains__(self, key: K) -> bool:
+        return self._items_db.get(self.__encode_key(key)) is not None
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def __len__(self) -> int:
+        return ContainerUtil.decode_object(self._db.get(SortedDB.__SIZE_BYTE_KEY), int)
+
+    def __encode_key(self, key: K) -> bytes:
+        if not isinstance(key, self.__key_type):
+            raise ContainerDBException(f'Mismatch key type: {type(key)}, expected: {self.__key_type}')
+        return ContainerUtil.encode_sort_key(key)
+
+    def __set_size(self, size: int) -> None:
+        self._db.put(SortedDB.__SIZE_BYTE_KEY, ContainerUtil.encode_value(size))
+
+
 class VarDB(object):
     """
     Utility classes wrapping the state DB. can be used to store simple key-value state
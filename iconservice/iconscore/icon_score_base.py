@@ -24,7 +24,7 @@ from .icon_score_api_generator import ScoreApiGenerator
 from .icon_score_base2 import InterfaceScore, revert, Block
 from .icon_score_constant import CONST_INDEXED_ARGS_COUNT, FORMAT_IS_NOT_FUNCTION_OBJECT, CONST_BIT_FLAG, \
     ConstBitFlag, FORMAT_DECORATOR_DUPLICATED, FORMAT_IS_NOT_DERIVED_OF_OBJECT, STR_FALLBACK, CONST_CLASS_EXTERNALS, \
-    CONST_CLASS_PAYABLES, CONST_CLASS_API, T, BaseType
+    CONST_CLASS_PAYABLES, CONST_CLASS_API, CONST_CLASS_DISPATCH_TABLE, T, BaseType
 from .icon_score_context import ContextGetter
 from .icon_score_context import IconScoreContextType
 from .icon_score_context_util import IconScoreContextUtil
@@ -35,6 +35,7 @@ from .internal_call import InternalCall
 from ..base.address import Address, GOVERNANCE_SCORE_ADDRESS
 from ..base.exception import IconScoreException, IconTypeError, InterfaceException, PayableException, ExceptionCode, \
     EventLogException, ExternalException, ServerErrorException
+from ..base.type_converter import TypeConverter
 from ..database.db import IconScoreDatabase, DatabaseObserver
 from ..icon_constant import ICX_TRANSFER_EVENT_LOG
 from ..utils import get_main_type_from_annotations_type
@@ -292,6 +293,65 @@ class IconScoreObject(ABC):
         pass
 
 
+class ScoreFuncEntry(object):
+    """An entry of the dispatch table which IconScoreBaseMeta builds once per SCORE class.
+    It keeps what is needed to call a SCORE function so that a call needs a single lookup.
+    """
+    __slots__ = ('name', 'func', 'is_external', 'is_readonly', 'is_payable', '_params_converter')
+
+    def __init__(self, name: str, func: callable) -> None:
+        """Constructor
+
+        :param name: function name
+        :param func: function of the SCORE class
+        """
+        bit_flag = getattr(func, CONST_BIT_FLAG, 0)
+
+        self.name = name
+        self.func = func
+        self.is_external = bool(bit_flag & ConstBitFlag.External)
+        self.is_readonly = bool(bit_flag & ConstBitFlag.ReadOnly)
+        self.is_payable = bool(bit_flag & ConstBitFlag.Payable)
+        self._params_converter = None
+
+    def convert_params(self, kw_params: dict) -> dict:
+        """Converts the data params of an external call in place by the annotations of the function
+
+        :param kw_params: params in data
+        :return: converted params
+        """
+        converter = self._params_converter
+        if converter is None:
+            # Annotations are resolved on the first call, not on class creation,
+            # because they can refer to names defined after the SCORE class
+            annotation_params = TypeConverter.make_annotations_from_method(self.func)
+            converter = TypeConverter.make_data_params_converter(annotation_params)
+            self._params_converter = converter
+
+        converter(kw_params)
+        return kw_params
+
+    def call(self, score: 'IconScoreBase', arg_params: Optional[list] = None, kw_params: Optional[dict] = None) -> Any:
+        """Calls the function of the given SCORE after checking payable
+
+        :param score: SCORE instance
+        :param arg_params: positional params
+        :param kw_params: keyword params
+        :return: the result of the function
+        """
+        if not self.is_payable and score.msg.value > 0:
+            raise PayableException("This is not payable", self.name, type(score).__name__)
+
+        if self.name == STR_FALLBACK:
+            return self.func(score)
+
+        if arg_params is None:
+            arg_params = []
+        if kw_params is None:
+            kw_params = {}
+        return self.func(score, *arg_params, **kw_params)
+
+
 class IconScoreBaseMeta(ABCMeta):
 
     def __new__(mcs, name, bases, namespace, **kwargs):
@@ -303,8 +363,9 @@ class IconScoreBaseMeta(ABCMeta):
         if not isinstance(namespace, dict):
             raise IconScoreException('attr is not dict!')
 
-        custom_funcs = [value for key, value in getmembers(cls, predicate=isfunction)
-                        if not key.startswith('__')]
+        custom_members = [(key, value) for key, value in getmembers(cls, predicate=isfunction)
+                          if not key.startswith('__')]
+        custom_funcs = [value for key, value in custom_members]
 
         external_funcs = {func.__name__: signature(func) for func in custom_funcs
                           if getattr(func, CONST_BIT_FLAG, 0) & ConstBitFlag.External}
@@ -323,6 +384,10 @@ class IconScoreBaseMeta(ABCMeta):
             payable_funcs = {func.__name__: signature(func) for func in payable_funcs}
             setattr(cls, CONST_CLASS_PAYABLES, payable_funcs)
 
+        dispatch_table = {key: ScoreFuncEntry(key, func) for key, func in custom_members
+                          if key == STR_FALLBACK or getattr(func, CONST_BIT_FLAG, 0) & ConstBitFlag.External}
+        setattr(cls, CONST_CLASS_DISPATCH_TABLE, dispatch_table)
+
         ScoreApiGenerator.check_on_deploy(custom_funcs)
         api_list = ScoreApiGenerator.generate(custom_funcs)
         setattr(cls, CONST_CLASS_API, api_list)
@@ -405,30 +470,31 @@ class IconScoreBase(IconScoreObject, ContextGetter,
                arg_params: Optional[list] = None,
                kw_params: Optional[dict] = None) -> Any:
 
-        if func_name != STR_FALLBACK:
-            self.validate_external_method(func_name)
-
-        self.__check_payable(func_name, self.__get_attr_dict(CONST_CLASS_PAYABLES))
-
-        score_func = getattr(self, func_name)
-
-        if func_name == STR_FALLBACK:
-            ret = score_func()
-        else:
-            if arg_params is None:
-                arg_params = []
-            if kw_params is None:
-                kw_params = {}
-            ret = score_func(*arg_params, **kw_params)
+        func_entry = self.__get_func_entry(func_name)
+        return func_entry.call(self, arg_params, kw_params)
 
-        return ret
+    @classmethod
+    def __get_func_entry(cls, func_name: str, allow_fallback: bool = True) -> 'ScoreFuncEntry':
+        """Returns the dispatch table entry of an external method or fallback
 
-    def __check_payable(self, func_name: str, payable_dict: dict):
-        if func_name not in payable_dict:
-            if self.msg.value > 0:
-                raise PayableException(f"This is not payable", func_name, type(self).__name__)
+        :param func_name: name of method
+        :param allow_fallback: whether fallback can be returned
+        :return: dispatch table entry
+        """
+        func_entry = cls.__get_attr_dict(CONST_CLASS_DISPATCH_TABLE).get(func_name)
+        if func_entry is None or \
+                not (func_entry.is_external or (allow_fallback and func_name == STR_FALLBACK)):
+            raise ExternalException("Invalid external method",
+                                    func_name,
+                                    cls.__name__,
+                                    ExceptionCode.METHOD_NOT_FOUND)
+        return func_entry
 
     def __is_func_readonly(self, func_name: str) -> bool:
+        func_entry = self.__get_attr_dict(CONST_CLASS_DISPATCH_TABLE).get(func_name)
+        if func_entry is not None:
+            return func_entry.is_readonly
+
         func = getattr(self, func_name)
         return bool(getattr(func, CONST_BIT_FLAG, 0) & ConstBitFlag.ReadOnly)
 
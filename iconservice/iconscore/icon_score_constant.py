@@ -25,6 +25,7 @@ CONST_CLASS_EXTERNALS = '__externals'
 CONST_CLASS_PAYABLES = '__payables'
 CONST_CLASS_INDEXES = '__indexes'
 CONST_CLASS_API = '__api'
+CONST_CLASS_DISPATCH_TABLE = '__dispatch_table'
 
 CONST_BIT_FLAG = '__bit_flag'
 CONST_INDEXED_ARGS_COUNT = '__indexed_args_count'
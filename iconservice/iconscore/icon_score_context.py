@@ -16,9 +16,9 @@
 
 import threading
 import warnings
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, Optional, List, Union
 
-from .icon_score_trace import Trace
+from .icon_score_trace import Trace, TraceLevel, CallFrame
 from ..base.block import Block
 from ..base.exception import ServerErrorException
 from ..base.message import Message
@@ -34,6 +34,7 @@ if TYPE_CHECKING:
     from ..deploy.icon_score_deploy_engine import IconScoreDeployEngine
     from .icon_score_base import IconScoreBase
     from ..icx.icx_engine import IcxEngine
+    from ..database.db import ReadView
 
 _thread_local_data = threading.local()
 
@@ -96,6 +97,7 @@ class IconScoreContext(object):
     icx_engine: 'IcxEngine' = None
     icon_service_flag: int = 0
     legacy_tbears_mode = False
+    trace_level: 'TraceLevel' = TraceLevel.FULL
 
     """Contains the useful information to process user's jsonrpc request
     """
@@ -119,7 +121,10 @@ class IconScoreContext(object):
         self.cumulative_step_used: int = 0
         self.step_counter: 'IconScoreStepCounter' = None
         self.event_logs: List['EventLog'] = None
-        self.traces: List['Trace'] = None
+        # CallFrames can be kept instead of Traces on TraceLevel.ON_FAILURE
+        self.traces: List[Union['Trace', 'CallFrame']] = None
+        # Pinned committed states which QUERY and ESTIMATION read, None to read the latest ones
+        self.read_view: Optional['ReadView'] = None
 
         self.msg_stack = []
         self.event_log_stack = []
@@ -131,7 +136,10 @@ class IconScoreContext(object):
 
     def set_func_type_by_icon_score(self, icon_score: 'IconScoreBase', func_name: str):
         is_func_readonly = getattr(icon_score, '_IconScoreBase__is_func_readonly')
-        if func_name is not None and is_func_readonly(func_name):
+        self.set_func_type_by_readonly(func_name is not None and is_func_readonly(func_name))
+
+    def set_func_type_by_readonly(self, is_readonly: bool):
+        if is_readonly:
             self.func_type = IconScoreFuncType.READONLY
         else:
             self.func_type = IconScoreFuncType.WRITABLE
@@ -23,10 +23,9 @@ from .icon_score_context_util import IconScoreContextUtil
 from .icon_score_context import IconScoreContext
 from ..base.address import Address, ZERO_SCORE_ADDRESS
 from ..base.exception import InvalidParamsException, ServerErrorException
-from ..base.type_converter import TypeConverter
 
 if TYPE_CHECKING:
-    from ..iconscore.icon_score_base import IconScoreBase
+    from ..iconscore.icon_score_base import ScoreFuncEntry
 
 
 class IconScoreEngine(object):
@@ -105,22 +104,13 @@ class IconScoreEngine(object):
 
         icon_score = IconScoreEngine._get_icon_score(context, icon_score_address)
 
-        converted_params = IconScoreEngine._convert_score_params_by_annotations(icon_score, func_name, kw_params)
-        context.set_func_type_by_icon_score(icon_score, func_name)
+        get_func_entry = getattr(icon_score, '_IconScoreBase__get_func_entry')
+        func_entry: 'ScoreFuncEntry' = get_func_entry(func_name, allow_fallback=False)
 
-        score_func = getattr(icon_score, '_IconScoreBase__call')
-        return score_func(func_name=func_name, kw_params=converted_params)
-
-    @staticmethod
-    def _convert_score_params_by_annotations(icon_score: 'IconScoreBase', func_name: str, kw_params: dict) -> dict:
-        tmp_params = kw_params
-
-        icon_score.validate_external_method(func_name)
+        converted_params = func_entry.convert_params(kw_params)
+        context.set_func_type_by_readonly(func_entry.is_readonly)
 
-        score_func = getattr(icon_score, func_name)
-        annotation_params = TypeConverter.make_annotations_from_method(score_func)
-        TypeConverter.convert_data_params(annotation_params, tmp_params)
-        return tmp_params
+        return func_entry.call(icon_score, kw_params=converted_params)
 
     @staticmethod
     def _fallback(context: 'IconScoreContext',
@@ -17,11 +17,11 @@
 import importlib.util
 import json
 import sys
-from os import path
+from os import path, sep
 
 from typing import TYPE_CHECKING
 
-from .score_package_validator import ScorePackageValidator
+from .score_package_validator import ScorePackageValidatorCache
 
 if TYPE_CHECKING:
     from ..base.address import Address
@@ -31,11 +31,14 @@ class IconScoreLoader(object):
     _PACKAGE_PATH = 'package.json'
     _MAIN_SCORE = 'main_score'
     _MAIN_FILE = 'main_file'
+    # Not a SCORE address, so IconScoreMapper.clear_garbage_score() leaves it
+    _VALIDATOR_CACHE_DIR = '.validator_cache'
 
     def __init__(self, score_root_path: str):
         self._score_root_path = score_root_path
         if score_root_path not in sys.path:
             sys.path.append(score_root_path)
+        self._validator_cache = ScorePackageValidatorCache(path.join(score_root_path, self._VALIDATOR_CACHE_DIR))
 
     @property
     def score_root_path(self):
@@ -53,7 +56,27 @@ class IconScoreLoader(object):
 
     def try_score_package_validate(self, whitelist_table: dict, score_path: str):
         pkg_root_import: str = self._make_pkg_root_import(score_path)
-        ScorePackageValidator().execute(whitelist_table, score_path, pkg_root_import)
+        self._validator_cache.execute(whitelist_table, score_path, pkg_root_import)
+
+    def prune_validator_cache(self) -> int:
+        """Removes the validation results of packages which have not been validated lately
+
+        :return: the number of removed results
+        """
+        return self._validator_cache.prune()
+
+    def close(self) -> None:
+        """Removes score root path and the modules of SCORE packages under it from the import system
+        """
+        root_path: str = f'{self._score_root_path.rstrip(sep)}{sep}'
+        for name, module in list(sys.modules.items()):
+            module_paths = list(getattr(module, '__path__', None) or [])
+            module_paths.append(getattr(module, '__file__', None) or '')
+            if any(module_path.startswith(root_path) for module_path in module_paths):
+                sys.modules.pop(name, None)
+
+        if self._score_root_path in sys.path:
+            sys.path.remove(self._score_root_path)
 
     def load_score(self, score_path: str) -> callable:
         score_package_info = self._load_json(score_path)
@@ -65,6 +88,23 @@ class IconScoreLoader(object):
 
         return getattr(mod, score_package_info[self._MAIN_SCORE])
 
+    def unload_score(self, score_path: str) -> None:
+        """Removes the modules of a SCORE package from the import system
+        so that the package is imported again on the next load
+
+        :param score_path: ex) .../.score/address/tx_hash
+        """
+        pkg_root_import: str = self._make_pkg_root_import(score_path)
+        for name in list(sys.modules):
+            if name == pkg_root_import or name.startswith(f'{pkg_root_import}.'):
+                sys.modules.pop(name, None)
+
+        # The parent package refers to the package as an attribute
+        parent_name, _, name = pkg_root_import.rpartition('.')
+        parent = sys.modules.get(parent_name)
+        if parent is not None and hasattr(parent, name):
+            delattr(parent, name)
+
     def _make_pkg_root_import(self, score_path: str) -> str:
         """
         score_root_path: .../.score
@@ -15,20 +15,24 @@
 # limitations under the License.
 
 import os
+import time
 
-from shutil import rmtree
+from concurrent.futures import ThreadPoolExecutor, wait
+from itertools import islice
 from threading import Lock
 from typing import TYPE_CHECKING, Optional
 
 from iconcommons import Logger
 from iconservice.builtin_scores.governance.governance import Governance
+from .icon_score_context import IconScoreContext, IconScoreContextType, ContextContainer
 from .icon_score_mapper_object import IconScoreInfo, IconScoreMapperObject
 from ..base.address import Address, GOVERNANCE_SCORE_ADDRESS
 from ..base.exception import InvalidParamsException
 from ..database.db import IconScoreDatabase
 from ..database.factory import ContextDatabaseFactory
 from ..deploy.icon_score_deploy_engine import IconScoreDeployStorage
-from ..icon_constant import DEFAULT_BYTE_SIZE
+from ..deploy.icon_score_package_store import IconScorePackageStore, remove_score_path
+from ..icon_constant import DEFAULT_BYTE_SIZE, ICON_LOADER_LOG_TAG
 
 if TYPE_CHECKING:
     from .icon_score_base import IconScoreBase
@@ -42,17 +46,33 @@ class IconScoreMapper(object):
 
     key: icon_score_address
     value: IconScoreInfo
+
+    If capacity is set, the least recently used SCOREs are unloaded
+    except governance and ones which is_pinned returns True for.
     """
 
     icon_score_loader: 'IconScoreLoader' = None
     deploy_storage: 'IconScoreDeployStorage' = None
 
-    def __init__(self, is_lock: bool = False) -> None:
+    def __init__(self, is_lock: bool = False, capacity: int = 0) -> None:
         """Constructor
+
+        :param is_lock: whether to serialize accesses
+        :param capacity: the max number of SCOREs to keep, 0 means no limit
         """
         self._score_mapper = IconScoreMapperObject()
         self._lock = Lock()
         self._is_lock = is_lock
+        self._capacity = capacity
+        # Returns True for the address of a SCORE which must not be unloaded
+        self.is_pinned: Optional[callable] = None
+        # Keeps loading SCOREs in background after warm_up() times out
+        self._warm_up_executor: Optional['ThreadPoolExecutor'] = None
+
+        self._load_count = 0
+        self._load_time_total = 0.0
+        self._load_time_max = 0.0
+        self._eviction_count = 0
 
     def __contains__(self, address: 'Address'):
         if self._is_lock:
@@ -61,31 +81,105 @@ class IconScoreMapper(object):
         else:
             return address in self._score_mapper
 
+    def __len__(self) -> int:
+        return len(self._score_mapper)
+
     def __setitem__(self, key, value):
         if self._is_lock:
             with self._lock:
-                self._score_mapper[key] = value
+                self._put(key, value)
         else:
-            self._score_mapper[key] = value
+            self._put(key, value)
 
     def get(self, key):
         if self._is_lock:
             with self._lock:
-                return self._score_mapper.get(key)
+                return self._get(key)
         else:
-            return self._score_mapper.get(key)
+            return self._get(key)
 
     def update(self, mapper: 'IconScoreMapper'):
         if self._is_lock:
             with self._lock:
-                self._score_mapper.update(mapper._score_mapper)
+                self._update(mapper)
         else:
-            self._score_mapper.update(mapper._score_mapper)
+            self._update(mapper)
+
+    def _put(self, address: 'Address', info: 'IconScoreInfo') -> None:
+        self._score_mapper[address] = info
+        if self._capacity > 0:
+            self._score_mapper.move_to_end(address)
+            self._evict()
+
+    def _get(self, address: 'Address') -> Optional['IconScoreInfo']:
+        info = self._score_mapper.get(address)
+        if info is not None and self._capacity > 0:
+            self._score_mapper.move_to_end(address)
+        return info
+
+    def _update(self, mapper: 'IconScoreMapper') -> None:
+        for address, info in mapper._score_mapper.items():
+            self._score_mapper[address] = info
+            if self._capacity > 0:
+                self._score_mapper.move_to_end(address)
+        if self._capacity > 0:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Unloads the least recently used SCOREs over capacity
+        """
+        excess = len(self._score_mapper) - self._capacity
+        if excess <= 0:
+            return
+
+        evicted = []
+        # The most recently used one is kept even if others are all pinned
+        for address, info in islice(self._score_mapper.items(), len(self._score_mapper) - 1):
+            if len(evicted) == excess:
+                break
+            if address == GOVERNANCE_SCORE_ADDRESS or (self.is_pinned is not None and self.is_pinned(address)):
+                continue
+            evicted.append((address, info))
+
+        for address, info in evicted:
+            del self._score_mapper[address]
+            if self.icon_score_loader is not None:
+                self.icon_score_loader.unload_score(self.icon_score_loader.make_score_path(address, info.tx_hash))
+        self._eviction_count += len(evicted)
+
+    def get_status(self) -> dict:
+        """Returns the number of SCOREs loaded in memory and load statistics
+
+        Load times are in microseconds.
+
+        :return: status
+        """
+        with self._lock:
+            return {
+                'residentCount': len(self._score_mapper),
+                'capacity': self._capacity,
+                'loadCount': self._load_count,
+                'averageLoadTime': int(self._load_time_total / self._load_count * 10 ** 6)
+                if self._load_count > 0 else 0,
+                'maxLoadTime': int(self._load_time_max * 10 ** 6),
+                'evictionCount': self._eviction_count
+            }
 
     def close(self):
+        self._stop_warm_up()
         for addr, info in self._score_mapper.items():
             info.icon_score.db.close()
 
+    def clear(self):
+        """Unloads all SCOREs to reload them with their current states
+        """
+        self._stop_warm_up()
+        if self._is_lock:
+            with self._lock:
+                self._score_mapper.clear()
+        else:
+            self._score_mapper.clear()
+
     @property
     def score_root_path(self) -> str:
         return self.icon_score_loader.score_root_path
@@ -110,6 +204,59 @@ class IconScoreMapper(object):
 
         return score
 
+    def warm_up(self, scores: list, max_workers: int, timeout: Optional[float]) -> int:
+        """Loads SCOREs ahead of their first use
+
+        SCORE packages are imported in a thread pool.
+        SCOREs which are not loaded within timeout keep being loaded in background
+        and ones loaded lazily in the meantime are not replaced.
+
+        :param scores: [(address, tx_hash)]
+        :param max_workers: the number of loading threads
+        :param timeout: seconds to wait for loading, None means no limit
+        :return: the number of SCOREs loaded within timeout
+        """
+        self._stop_warm_up()
+        if len(scores) == 0:
+            return 0
+
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [executor.submit(self._warm_up_score, address, tx_hash) for address, tx_hash in scores]
+        done, not_done = wait(futures, timeout=timeout)
+
+        # Lets SCOREs being loaded finish and skips the rest
+        for future in not_done:
+            future.cancel()
+        executor.shutdown(wait=False)
+        self._warm_up_executor = executor
+
+        loaded = sum(1 for future in done if future.result())
+        Logger.info(f'Warmed up {loaded}/{len(scores)} SCOREs in {time.monotonic() - start:.3f}s',
+                    ICON_LOADER_LOG_TAG)
+        return loaded
+
+    def _warm_up_score(self, address: 'Address', tx_hash: bytes) -> bool:
+        context = IconScoreContext(IconScoreContextType.DIRECT)
+        ContextContainer._push_context(context)
+        try:
+            score = self.load_score(address, tx_hash)
+        except BaseException as e:
+            Logger.warning(f'Failed to warm up SCORE({address}): {e}', ICON_LOADER_LOG_TAG)
+            return False
+        finally:
+            ContextContainer._pop_context()
+
+        with self._lock:
+            if address not in self._score_mapper:
+                self._put(address, IconScoreInfo(score, tx_hash))
+        return True
+
+    def _stop_warm_up(self) -> None:
+        if self._warm_up_executor is not None:
+            self._warm_up_executor.shutdown(wait=True)
+            self._warm_up_executor = None
+
     def try_score_package_validate(self, address: 'Address', tx_hash: bytes):
         score_path = self.icon_score_loader.make_score_path(address, tx_hash)
         whitelist_table = self._get_score_package_validator_table()
@@ -127,9 +274,16 @@ class IconScoreMapper(object):
             return {"iconservice": ['*']}
 
     def load_score(self, address: 'Address', tx_hash: bytes) -> Optional['IconScoreBase']:
+        start = time.monotonic()
         score_wrapper = self._load_score_wrapper(address, tx_hash)
         score_db = self._create_icon_score_database(address)
         score = score_wrapper(score_db)
+
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self._load_count += 1
+            self._load_time_total += elapsed
+            self._load_time_max = max(self._load_time_max, elapsed)
         return score
 
     def put_score_info(self,
@@ -163,6 +317,9 @@ class IconScoreMapper(object):
         return score_wrapper
 
     def clear_garbage_score(self):
+        """Removes SCOREs which are not deployed, the packages no SCORE refers to
+        and the validation results of packages not validated lately
+        """
         if self.icon_score_loader is None:
             return
 
@@ -201,6 +358,14 @@ class IconScoreMapper(object):
                     else:
                         self._remove_score_dir(address, sub_dir_name)
 
+        removed_count = IconScorePackageStore(score_root_path).collect_garbage()
+        if removed_count > 0:
+            Logger.info(f'Removed {removed_count} unreferenced SCORE packages', ICON_LOADER_LOG_TAG)
+
+        removed_count = self.icon_score_loader.prune_validator_cache()
+        if removed_count > 0:
+            Logger.info(f'Removed {removed_count} SCORE package validation results', ICON_LOADER_LOG_TAG)
+
     @classmethod
     def _remove_score_dir(cls, address: 'Address', converted_tx_hash: Optional[str] = None):
         if cls.icon_score_loader is None:
@@ -213,6 +378,6 @@ class IconScoreMapper(object):
             target_path = os.path.join(score_root_path, bytes.hex(address.to_bytes()), converted_tx_hash)
 
         try:
-            rmtree(target_path)
+            remove_score_path(target_path)
         except Exception as e:
             Logger.warning(e)
@@ -14,6 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from collections import OrderedDict
+
 from .icon_score_base import IconScoreBase
 from ..base.address import Address
 from ..base.exception import InvalidParamsException
@@ -56,7 +58,10 @@ class IconScoreInfo(object):
             raise InvalidParamsException("score is not child from IconScoreBase")
 
 
-class IconScoreMapperObject(dict):
+class IconScoreMapperObject(OrderedDict):
+    """SCOREs in the order of their last use
+    """
+
     def __getitem__(self, key: 'Address') -> 'IconScoreInfo':
         """operator[] overriding
 
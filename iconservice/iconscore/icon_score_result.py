@@ -79,6 +79,7 @@ class TransactionResult(object):
         self.failure = None
 
         # Traces are managed in TransactionResult but not passed to chain engine
+        # On TraceLevel.ON_FAILURE, it keeps CallFrames of a successful transaction
         self.traces = None
 
     def __str__(self) -> str:
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Encodes invoke results into the response format in one pass
+
+ResultFormat.JSON produces the same values as
+TypeConverter.convert_type_reverse(tx_result.to_dict(to_camel_case)).
+ResultFormat.BINARY keeps bytes and 64-bit integers as they are
+for transports which carry them natively.
+A transaction result encoded in ResultFormat.BINARY can be encoded again in either format.
+"""
+
+from enum import IntEnum
+from typing import Any, Callable, List, Union
+
+from .icon_score_event_log import EventLog
+from .icon_score_result import TransactionResult
+from ..base.address import Address
+from ..icon_constant import DATA_BYTE_ORDER
+from ..utils import to_camel_case
+from ..utils.bloom import BloomFilter
+
+# if the value is of 'txHash' or 'blockHash', excludes '0x' prefix
+_HASH_KEYS = frozenset(('blockHash', 'txHash', 'prevBlockHash'))
+
+_MIN_BINARY_INT = -2 ** 63
+_MAX_BINARY_INT = 2 ** 64 - 1
+
+_camel_case_keys = {}
+
+
+class ResultFormat(IntEnum):
+    JSON = 0
+    BINARY = 1
+
+    @staticmethod
+    def from_str(value: str) -> 'ResultFormat':
+        return ResultFormat.BINARY if value == 'binary' else ResultFormat.JSON
+
+
+def _to_camel_case(key: str) -> str:
+    camel_case_key = _camel_case_keys.get(key)
+    if camel_case_key is None:
+        camel_case_key = to_camel_case(key)
+        _camel_case_keys[key] = camel_case_key
+    return camel_case_key
+
+
+def _to_json_value(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is str or value is None:
+        return value
+    if value_type is int:
+        return hex(value)
+    if value_type is bytes:
+        return f'0x{value.hex()}'
+    if value_type is Address:
+        return str(value)
+    if value_type is list:
+        return [_to_json_value(v) for v in value]
+
+    if isinstance(value, dict):
+        return {k: _to_json_item(k, v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_json_value(v) for v in value]
+    if isinstance(value, int):
+        return hex(value)
+    if isinstance(value, Address):
+        return str(value)
+    if isinstance(value, bytes):
+        return f'0x{value.hex()}'
+    return value
+
+
+def _to_json_item(key: str, value: Any) -> Any:
+    if isinstance(value, bytes):
+        return value.hex() if key in _HASH_KEYS else f'0x{value.hex()}'
+    return _to_json_value(value)
+
+
+def _to_binary_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _to_binary_item(k, v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_binary_value(v) for v in value]
+    if isinstance(value, int):
+        if _MIN_BINARY_INT <= value <= _MAX_BINARY_INT:
+            return int(value)
+        return hex(value)
+    if isinstance(value, Address):
+        return str(value)
+    if isinstance(value, bytes):
+        return bytes(value)
+    return value
+
+
+def _to_binary_item(key: str, value: Any) -> Any:
+    return _to_binary_value(value)
+
+
+def _encode_event_log(event_log: 'EventLog', to_item: Callable[[str, Any], Any]) -> dict:
+    new_dict = {}
+    for key, value in event_log.__dict__.items():
+        if value is None:
+            continue
+
+        new_key = _to_camel_case(key)
+        new_dict[new_key] = to_item(new_key, value)
+
+    return new_dict
+
+
+def _encode_tx_result(tx_result: 'TransactionResult', to_item: Callable[[str, Any], Any]) -> dict:
+    new_dict = {}
+    for key, value in tx_result.__dict__.items():
+        if value is None:
+            continue
+
+        new_key = _to_camel_case(key)
+        if key == 'event_logs':
+            new_dict[new_key] = [_encode_event_log(v, to_item) for v in value if isinstance(v, EventLog)]
+        elif isinstance(value, BloomFilter):
+            new_dict[new_key] = to_item(new_key, int(value).to_bytes(256, byteorder=DATA_BYTE_ORDER))
+        elif key == 'failure' and value:
+            if tx_result.status == TransactionResult.FAILURE:
+                new_dict[new_key] = {
+                    'code': to_item('code', value.code),
+                    'message': to_item('message', value.message)
+                }
+        elif key == 'traces':
+            # traces are excluded from dict property
+            continue
+        else:
+            new_dict[new_key] = to_item(new_key, value)
+
+    return new_dict
+
+
+def encode_tx_result(tx_result: 'TransactionResult', result_format: 'ResultFormat' = ResultFormat.JSON) -> dict:
+    """Encodes a transaction result
+
+    :param tx_result:
+    :param result_format:
+    :return: encoded transaction result
+    """
+    to_item = _to_binary_item if result_format == ResultFormat.BINARY else _to_json_item
+    return _encode_tx_result(tx_result, to_item)
+
+
+def _reencode_tx_result(tx_result: dict, to_item: Callable[[str, Any], Any]) -> dict:
+    return {key: to_item(key, value) for key, value in tx_result.items()}
+
+
+def encode_invoke_result(tx_results: List[Union['TransactionResult', dict]],
+                         state_root_hash: bytes,
+                         result_format: 'ResultFormat' = ResultFormat.JSON) -> dict:
+    """Encodes the result of a block for the invoke response
+
+    :param tx_results: transaction results in a block or the ones encoded in ResultFormat.BINARY
+    :param state_root_hash:
+    :param result_format:
+    :return: {'txResults': {tx_hash: tx_result}, 'stateRootHash': state_root_hash}
+    """
+    if result_format == ResultFormat.BINARY:
+        to_item = _to_binary_item
+        encoded_state_root_hash = state_root_hash
+    else:
+        to_item = _to_json_item
+        encoded_state_root_hash = bytes.hex(state_root_hash)
+
+    encoded_tx_results = {}
+    for tx_result in tx_results:
+        if isinstance(tx_result, dict):
+            encoded_tx_results[bytes.hex(tx_result['txHash'])] = _reencode_tx_result(tx_result, to_item)
+        else:
+            encoded_tx_results[bytes.hex(tx_result.tx_hash)] = _encode_tx_result(tx_result, to_item)
+
+    return {
+        'txResults': encoded_tx_results,
+        'stateRootHash': encoded_state_root_hash
+    }
@@ -15,15 +15,12 @@
 # limitations under the License.
 from enum import Enum, auto
 from threading import Lock
-from typing import TYPE_CHECKING
+from typing import Callable, Optional, Union
 
-from iconservice.icon_constant import MAX_EXTERNAL_CALL_COUNT
+from iconservice.icon_constant import MAX_EXTERNAL_CALL_COUNT, IconScoreContextType
 from iconservice.utils import to_camel_case
 from ..base.exception import IconServiceBaseException, ExceptionCode, InvalidRequestException
 
-if TYPE_CHECKING:
-    from iconservice.iconscore.icon_score_context import IconScoreContextType
-
 
 class AutoValueEnum(Enum):
     # noinspection PyMethodParameters
@@ -47,39 +44,112 @@ class StepType(AutoValueEnum):
     EVENT_LOG = auto()
     API_CALL = auto()
 
+    # noinspection PyUnusedLocal
+    def __init__(self, *args) -> None:
+        # Position in StepCosts. Members are appended to _member_names_ after __init__
+        self.index: int = len(type(self)._member_names_)
+
+
+class StepCosts(object):
+    """Immutable step costs addressed by StepType.index
+
+    An instance is made whenever governance changes step costs
+    and shared by reference between step counters.
+    """
+    __slots__ = ('_costs',)
+
+    def __init__(self, step_costs: Optional[dict] = None) -> None:
+        """Constructor
+
+        :param step_costs: a dict of StepType and step cost
+        """
+        costs = [0] * len(StepType)
+        if step_costs:
+            for step_type, cost in step_costs.items():
+                costs[step_type.index] = cost
+
+        self._costs: tuple = tuple(costs)
+
+    @property
+    def costs(self) -> tuple:
+        """Returns step costs in the order of StepType.index
+
+        :return: step costs
+        """
+        return self._costs
+
+    def __getitem__(self, step_type: 'StepType') -> int:
+        return self._costs[step_type.index]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, StepCosts) and self._costs == other._costs
+
+    def __hash__(self) -> int:
+        return hash(self._costs)
+
+    def replace(self, step_type: 'StepType', value: int) -> 'StepCosts':
+        """Returns new step costs in which the cost of step_type is changed
+
+        :param step_type: specific action
+        :param value: step cost
+        :return: new step costs
+        """
+        step_costs = self.to_dict()
+        step_costs[step_type] = value
+        return StepCosts(step_costs)
+
+    def to_dict(self) -> dict:
+        return {step_type: self._costs[step_type.index] for step_type in StepType}
+
+
+class _StepProperties(object):
+    """A snapshot of the step properties which IconScoreStepCounterFactory replaces as a whole
+    """
+    __slots__ = ('step_price', 'step_costs', 'max_step_limits')
+
+    def __init__(self, step_price: int, step_costs: 'StepCosts', max_step_limits: dict) -> None:
+        self.step_price: int = step_price
+        self.step_costs: 'StepCosts' = step_costs
+        self.max_step_limits: dict = max_step_limits
+
 
 class IconScoreStepCounterFactory(object):
     """Creates a step counter for the transaction
+
+    Step properties are kept in an immutable snapshot.
+    Setters replace the snapshot under the lock and readers take it without locking.
     """
 
     def __init__(self) -> None:
         self._lock = Lock()
-        self._step_price = 0
-        self._step_costs = {}
-        self._max_step_limits = {}
+        self._properties = _StepProperties(0, StepCosts(), {})
+        # Called before each step of a query
+        self._query_checkpoint: Optional[Callable[[], None]] = None
+
+    def _replace_properties(self, step_price=None, step_costs=None, max_step_limits=None):
+        # Must be called with the lock
+        properties = self._properties
+        self._properties = _StepProperties(
+            properties.step_price if step_price is None else step_price,
+            properties.step_costs if step_costs is None else to_step_costs(step_costs),
+            properties.max_step_limits if max_step_limits is None else dict(max_step_limits))
 
     def set_step_properties(self, step_price=None, step_costs=None, max_step_limits=None):
         """Sets the STEP properties if exists
 
         :param step_price: step price
-        :param step_costs: step cost dict
+        :param step_costs: step costs or step cost dict
         :param max_step_limits: max step limit dict
         """
         with self._lock:
-            if step_price is not None:
-                self._step_price = step_price
-            if step_costs is not None:
-                self._step_costs = step_costs
-            if max_step_limits is not None:
-                self._max_step_limits = max_step_limits
+            self._replace_properties(step_price, step_costs, max_step_limits)
 
     def get_step_price(self):
         """Returns the step price
 
         :return: step price
         """
-        with self._lock:
-            return self._step_price
+        return self._properties.step_price
 
     def set_step_price(self, step_price: int):
         """Sets the step price
@@ -87,11 +157,17 @@ class IconScoreStepCounterFactory(object):
         :param step_price: step price
         """
         with self._lock:
-            self._step_price = step_price
+            self._replace_properties(step_price=step_price)
+
+    def get_step_costs(self) -> 'StepCosts':
+        """Returns the step costs
+
+        :return: step costs
+        """
+        return self._properties.step_costs
 
     def get_step_cost(self, step_type: 'StepType') -> int:
-        with self._lock:
-            return self._step_costs.get(step_type, 0)
+        return self._properties.step_costs[step_type]
 
     def set_step_cost(self, step_type: 'StepType', value: int):
         """Sets the step cost for specific action.
@@ -100,15 +176,14 @@ class IconScoreStepCounterFactory(object):
         :param value: step cost
         """
         with self._lock:
-            self._step_costs[step_type] = value
+            self._replace_properties(step_costs=self._properties.step_costs.replace(step_type, value))
 
     def get_max_step_limit(self, context_type: 'IconScoreContextType') -> int:
         """Returns the max step limit
 
         :return: the max step limit
         """
-        with self._lock:
-            return self._max_step_limits.get(context_type, 0)
+        return self._properties.max_step_limits.get(context_type, 0)
 
     def set_max_step_limit(
             self, context_type: 'IconScoreContextType', max_step_limit: int):
@@ -118,7 +193,9 @@ class IconScoreStepCounterFactory(object):
         :param max_step_limit: the max step limit for the context type
         """
         with self._lock:
-            self._max_step_limits[context_type] = max_step_limit
+            max_step_limits = dict(self._properties.max_step_limits)
+            max_step_limits[context_type] = max_step_limit
+            self._replace_properties(max_step_limits=max_step_limits)
 
     def create(self, context_type: 'IconScoreContextType') -> 'IconScoreStepCounter':
         """Creates a step counter for the transaction
@@ -126,13 +203,38 @@ class IconScoreStepCounterFactory(object):
         :param context_type: context type
         :return: step counter
         """
-        with self._lock:
-            step_price: int = self._step_price
-            # Copying a `dict` so as not to change step costs when processing a transaction.
-            step_costs: dict = self._step_costs.copy()
-            max_step_limit: int = self._max_step_limits.get(context_type, 0)
+        properties = self._properties
+        max_step_limit = properties.max_step_limits.get(context_type, 0)
+
+        checkpoint = self._query_checkpoint
+        if checkpoint is not None and context_type == IconScoreContextType.QUERY:
+            return CheckpointStepCounter(properties.step_price, properties.step_costs, max_step_limit, checkpoint)
+
+        # Step costs are immutable, so they are shared without copying
+        return IconScoreStepCounter(properties.step_price, properties.step_costs, max_step_limit)
+
+    def set_query_checkpoint(self, checkpoint: Optional[Callable[[], None]]):
+        """Sets a function called before each step of queries
+
+        It can raise an exception to stop the query.
+
+        :param checkpoint: function with no arguments, None to remove it
+        """
+        self._query_checkpoint = checkpoint
+
+
+def to_step_costs(step_costs: Union[dict, 'StepCosts']) -> 'StepCosts':
+    """Converts a dict of step costs into StepCosts
+
+    :param step_costs: step costs or step cost dict
+    :return: step costs
+    """
+    if isinstance(step_costs, StepCosts):
+        return step_costs
+    return StepCosts(step_costs)
+
 
-        return IconScoreStepCounter(step_price, step_costs, max_step_limit)
+_DEFAULT_INDEX: int = StepType.DEFAULT.index
 
 
 class OutOfStepException(IconServiceBaseException):
@@ -197,16 +299,18 @@ class IconScoreStepCounter(object):
 
     def __init__(self,
                  step_price: int,
-                 step_costs: dict,
+                 step_costs: Union[dict, 'StepCosts'],
                  max_step_limit: int) -> None:
         """Constructor
 
         :param step_price: step price
-        :param step_costs: a dict of base step costs
+        :param step_costs: base step costs or a dict of them
         :param max_step_limit: max step limit for current context type
         """
         self._step_price = step_price
-        self._step_costs: dict = step_costs
+        self._step_costs: 'StepCosts' = to_step_costs(step_costs)
+        # Hot paths look up this tuple by StepType.index
+        self._costs: tuple = self._step_costs.costs
         self._max_step_limit: int = max_step_limit
         self._step_limit: int = 0
         self._step_used: int = 0
@@ -243,18 +347,18 @@ class IconScoreStepCounter(object):
         :return: used steps in the transaction
         """
         return max(self._step_used,
-                   self._step_costs.get(StepType.DEFAULT, 0))
+                   self._costs[_DEFAULT_INDEX])
 
     def apply_step(self, step_type: StepType, count: int) -> int:
         """ Increases steps for given step cost
         """
 
-        if step_type == StepType.CONTRACT_CALL:
+        if step_type is StepType.CONTRACT_CALL:
             self._external_call_count += 1
             if self._external_call_count > MAX_EXTERNAL_CALL_COUNT:
                 raise InvalidRequestException('Too many external calls')
 
-        step_to_apply = self._step_costs.get(step_type, 0) * count
+        step_to_apply = self._costs[step_type.index] * count
         if step_to_apply + self._step_used > self._step_limit:
             step_used = self._step_used
             self._step_used = self._step_limit
@@ -281,12 +385,13 @@ class IconScoreStepCounter(object):
         """
         self._step_price = step_price
 
-    def set_step_costs(self, step_costs: dict):
-        """Sets the step costs dict
+    def set_step_costs(self, step_costs: Union[dict, 'StepCosts']):
+        """Sets the step costs
 
-        :param step_costs: step costs dict
+        :param step_costs: step costs or step costs dict
         """
-        self._step_costs = step_costs
+        self._step_costs = to_step_costs(step_costs)
+        self._costs = self._step_costs.costs
 
     def set_max_step_limit(self, max_step_limit: int):
         """Sets the max step limit for current context
@@ -294,3 +399,27 @@ class IconScoreStepCounter(object):
         :param max_step_limit: max step limit
         """
         self._max_step_limit = max_step_limit
+
+
+class CheckpointStepCounter(IconScoreStepCounter):
+    """Calls a checkpoint function before applying each step
+    """
+
+    def __init__(self,
+                 step_price: int,
+                 step_costs: Union[dict, 'StepCosts'],
+                 max_step_limit: int,
+                 checkpoint: Callable[[], None]) -> None:
+        """Constructor
+
+        :param step_price: step price
+        :param step_costs: base step costs or a dict of them
+        :param max_step_limit: max step limit for current context type
+        :param checkpoint: function called before each step
+        """
+        super().__init__(step_price, step_costs, max_step_limit)
+        self._checkpoint = checkpoint
+
+    def apply_step(self, step_type: StepType, count: int) -> int:
+        self._checkpoint()
+        return super().apply_step(step_type, count)
@@ -14,14 +14,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from enum import Enum, unique
-from typing import TYPE_CHECKING, Optional
+from enum import Enum, IntEnum, unique
+from typing import TYPE_CHECKING, Optional, List, Union
 from ..base.address import Address
+from ..base.exception import ServerErrorException
 
 if TYPE_CHECKING:
     pass
 
 
+@unique
+class TraceLevel(IntEnum):
+    """How traces of internal calls are collected
+
+    OFF: no traces are collected
+    ON_FAILURE: call frames are recorded and made into traces only when needed
+    FULL: traces with call arguments are collected on every internal call
+    """
+    OFF = 0
+    ON_FAILURE = 1
+    FULL = 2
+
+    @staticmethod
+    def from_str(name: str) -> 'TraceLevel':
+        """Converts traceLevel in config
+
+        :param name: 'off', 'onFailure' or 'full'
+        """
+        levels = {
+            'off': TraceLevel.OFF,
+            'onFailure': TraceLevel.ON_FAILURE,
+            'full': TraceLevel.FULL
+        }
+        if name not in levels:
+            raise ServerErrorException(f'Unsupported trace level: {name}')
+
+        return levels[name]
+
+
 @unique
 class TraceType(Enum):
     CALL = 0
@@ -46,7 +76,8 @@ class Trace(object):
             self,
             score_address: 'Address',
             trace: TraceType,
-            data: list = None) -> None:
+            data: list = None,
+            step_used: int = None) -> None:
         """
         Constructor
 
@@ -58,10 +89,12 @@ class Trace(object):
             call: [SCORE_ADDRESS_TO_CALL, METHOD, [ARGS_OF_METHOD]]
             revert: [CODE, MESSAGE]
             throw: [CODE, MESSAGE]
+        :param step_used: steps used before the call, only for a trace made from CallFrame
         """
         self.score_address: 'Address' = score_address
         self.trace: TraceType = trace
         self.data: list = data
+        self.step_used: int = step_used
 
     def __str__(self) -> str:
         return '\n'.join([f'{k}: {v}' for k, v in self.__dict__.items()])
@@ -83,3 +116,47 @@ class Trace(object):
             new_dict[casing(key) if casing else key] = value
 
         return new_dict
+
+
+class CallFrame(object):
+    """A compact record of an internal call kept instead of Trace on TraceLevel.ON_FAILURE.
+    Call arguments are not copied.
+    """
+    __slots__ = ('score_address', 'to', 'func_name', 'amount', 'step_used')
+
+    def __init__(self,
+                 score_address: 'Address',
+                 to: 'Address',
+                 func_name: Optional[str],
+                 amount: int,
+                 step_used: int) -> None:
+        """
+        Constructor
+
+        :param score_address: an address of SCORE which makes the call
+        :param to: an address to call
+        :param func_name: method name
+        :param amount: icx amount to transfer
+        :param step_used: steps used before the call
+        """
+        self.score_address: 'Address' = score_address
+        self.to: 'Address' = to
+        self.func_name: Optional[str] = func_name
+        self.amount: int = amount
+        self.step_used: int = step_used
+
+    def to_trace(self) -> 'Trace':
+        """Materializes the call frame into a CALL trace without arguments
+
+        :return: a Trace
+        """
+        return Trace(self.score_address, TraceType.CALL, [self.to, self.func_name, None, self.amount], self.step_used)
+
+
+def materialize_traces(traces: List[Union['Trace', 'CallFrame']]) -> List['Trace']:
+    """Makes traces from the traces collected in a context, which can contain call frames
+
+    :param traces: traces and call frames
+    :return: traces
+    """
+    return [trace.to_trace() if isinstance(trace, CallFrame) else trace for trace in traces]
@@ -19,7 +19,7 @@ from typing import TYPE_CHECKING, Optional, Any
 from .icon_score_context_util import IconScoreContextUtil
 from .icon_score_event_log import EventLogEmitter
 from .icon_score_step import StepType
-from .icon_score_trace import Trace, TraceType
+from .icon_score_trace import Trace, TraceType, TraceLevel, CallFrame
 from ..base.address import Address
 from ..base.exception import InvalidRequestException
 from ..base.message import Message
@@ -27,6 +27,7 @@ from ..icon_constant import ICX_TRANSFER_EVENT_LOG, MAX_CALL_STACK_SIZE, IconSco
 
 if TYPE_CHECKING:
     from .icon_score_context import IconScoreContext
+    from .icon_score_base import ScoreFuncEntry
 
 
 class InternalCall(object):
@@ -90,6 +91,16 @@ class InternalCall(object):
                     func_name: str,
                     arg_params: Optional[tuple],
                     kw_params: Optional[dict]) -> None:
+        trace_level: 'TraceLevel' = context.trace_level
+        if trace_level == TraceLevel.OFF:
+            return
+
+        if trace_level == TraceLevel.ON_FAILURE:
+            # Arguments are not copied. Frames are made into traces only when needed
+            frame = CallFrame(_from, _to, func_name, amount, context.step_counter.step_used)
+            context.traces.append(frame)
+            return
+
         if arg_params is None:
             arg_data1 = []
         else:
@@ -138,9 +149,11 @@ class InternalCall(object):
 
         try:
             icon_score = IconScoreContextUtil.get_icon_score(context, addr_to)
+            # Looks up func_name first as before: a call to a method which does not exist is a server error
             context.set_func_type_by_icon_score(icon_score, func_name)
-            score_func = getattr(icon_score, '_IconScoreBase__call')
-            return score_func(func_name=func_name, arg_params=arg_params, kw_params=kw_params)
+            get_func_entry = getattr(icon_score, '_IconScoreBase__get_func_entry')
+            func_entry: 'ScoreFuncEntry' = get_func_entry(func_name)
+            return func_entry.call(icon_score, arg_params, kw_params)
         finally:
             context.func_type = prev_func_type
             context.current_address = addr_from
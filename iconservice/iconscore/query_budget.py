@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Step budgets of queries per caller and per SCORE over a sliding window
+
+IconServiceEngine checks the budgets before an icx_call
+and adds the steps used by the call afterwards.
+"""
+
+from collections import deque
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Optional
+
+from ..base.exception import ServerErrorException
+
+if TYPE_CHECKING:
+    from ..base.address import Address
+
+DEFAULT_WINDOW = 60
+DEFAULT_CALLER_STEPS = 1_000_000_000
+DEFAULT_SCORE_STEPS = 5_000_000_000
+DEFAULT_TOP_COUNT = 10
+
+
+class StepWindow(object):
+    """Steps used in the last window seconds, counted per second
+    """
+    __slots__ = ('_buckets', 'total')
+
+    def __init__(self) -> None:
+        # (second, steps) in ascending order of second
+        self._buckets = deque()
+        self.total = 0
+
+    def expire(self, oldest_second: int) -> None:
+        buckets = self._buckets
+        while buckets and buckets[0][0] < oldest_second:
+            _, steps = buckets.popleft()
+            self.total -= steps
+
+    def add(self, second: int, steps: int) -> None:
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == second:
+            buckets[-1][1] += steps
+        else:
+            buckets.append([second, steps])
+        self.total += steps
+
+
+class QueryBudget(object):
+    """Rejects queries of callers or SCOREs which used up their steps in the window
+    """
+
+    def __init__(self,
+                 window: int = DEFAULT_WINDOW,
+                 caller_steps: int = DEFAULT_CALLER_STEPS,
+                 score_steps: int = DEFAULT_SCORE_STEPS,
+                 clock: Callable[[], float] = monotonic) -> None:
+        """Constructor
+
+        :param window: seconds of the sliding window
+        :param caller_steps: steps a caller can use in the window, 0 means unlimited
+        :param score_steps: steps queries to a SCORE can use in the window, 0 means unlimited
+        :param clock: returns the current time in seconds
+        """
+        self._window = max(int(window), 1)
+        self._caller_steps = caller_steps
+        self._score_steps = score_steps
+        self._clock = clock
+
+        self._lock = Lock()
+        self._callers = {}
+        self._scores = {}
+        self._last_second = None
+
+        self._admitted_count = 0
+        self._rejected_count = 0
+
+    def check(self, caller: Optional['Address'], score: Optional['Address']) -> None:
+        """Checks if the caller and the SCORE have steps left in the window
+
+        :param caller: from address of the query, None if it is unknown
+        :param score: SCORE address which the query is sent to
+        :exception ServerErrorException: the budget is used up
+        """
+        with self._lock:
+            self._expire()
+
+            if self._is_used_up(self._callers, caller, self._caller_steps):
+                self._rejected_count += 1
+                raise ServerErrorException(f'Out of query budget: {caller}')
+            if self._is_used_up(self._scores, score, self._score_steps):
+                self._rejected_count += 1
+                raise ServerErrorException(f'Out of query budget: {score}')
+
+            self._admitted_count += 1
+
+    def consume(self, caller: Optional['Address'], score: Optional['Address'], steps: int) -> None:
+        """Adds the steps used by a query
+
+        :param caller: from address of the query, None if it is unknown
+        :param score: SCORE address which the query is sent to
+        :param steps: steps used by the query
+        """
+        with self._lock:
+            self._expire()
+            second = self._last_second
+
+            if caller is not None:
+                self._get_window(self._callers, caller).add(second, steps)
+            if score is not None:
+                self._get_window(self._scores, score).add(second, steps)
+
+    def get_status(self, top_count: int = DEFAULT_TOP_COUNT) -> dict:
+        """Returns the budgets and the callers and SCOREs using the most steps in the window
+
+        :param top_count: number of callers and SCOREs
+        :return: status
+        """
+        with self._lock:
+            self._expire()
+
+            return {
+                'window': self._window,
+                'callerSteps': self._caller_steps,
+                'scoreSteps': self._score_steps,
+                'admittedCount': self._admitted_count,
+                'rejectedCount': self._rejected_count,
+                'callerCount': len(self._callers),
+                'scoreCount': len(self._scores),
+                'callers': self._get_top(self._callers, top_count),
+                'scores': self._get_top(self._scores, top_count)
+            }
+
+    def get_steps(self, address: 'Address') -> tuple:
+        """Returns steps used by the address as a caller and as a SCORE in the window
+
+        :param address:
+        :return: (caller steps, SCORE steps)
+        """
+        with self._lock:
+            self._expire()
+
+            caller_window = self._callers.get(address)
+            score_window = self._scores.get(address)
+            return (0 if caller_window is None else caller_window.total,
+                    0 if score_window is None else score_window.total)
+
+    @staticmethod
+    def _is_used_up(windows: dict, address: Optional['Address'], budget: int) -> bool:
+        if address is None or budget <= 0:
+            return False
+
+        window = windows.get(address)
+        return window is not None and window.total >= budget
+
+    @staticmethod
+    def _get_window(windows: dict, address: 'Address') -> 'StepWindow':
+        window = windows.get(address)
+        if window is None:
+            window = StepWindow()
+            windows[address] = window
+        return window
+
+    @staticmethod
+    def _get_top(windows: dict, top_count: int) -> list:
+        items = sorted(windows.items(), key=lambda item: item[1].total, reverse=True)[:top_count]
+        return [{'address': address, 'steps': window.total} for address, window in items]
+
+    def _expire(self) -> None:
+        # Must be called with the lock
+        second = int(self._clock())
+        if second == self._last_second:
+            return
+        self._last_second = second
+
+        oldest_second = second - self._window + 1
+        for windows in (self._callers, self._scores):
+            for address in list(windows):
+                window = windows[address]
+                window.expire(oldest_second)
+                if window.total == 0:
+                    del windows[address]
@@ -14,10 +14,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import importlib.util
+import json
+import os
+import sys
+from collections import OrderedDict
 from os import walk
+from threading import Lock, get_ident
+from typing import Optional
+
+from iconcommons.logger import Logger
 
 from ..base.exception import ServerErrorException
+from ..icon_constant import ICON_LOADER_LOG_TAG
 
 # cpython
 IMPORT_STAR = 84
@@ -27,6 +37,10 @@ IMPORT_TABLE = [IMPORT_STAR, IMPORT_NAME, IMPORT_FROM]
 
 LOAD_BUILD_CLASS = 71
 
+# The max number of validation results kept in memory and on disk
+DEFAULT_VALIDATOR_CACHE_SIZE = 1024
+_TEMP_SUFFIX = '.tmp'
+
 CODE_ATTR = 'co_code'
 CODE_NAMES_ATTR = 'co_names'
 
@@ -34,21 +48,26 @@ BLACKLIST_RESERVED_KEYWORD = ['exec', 'eval', 'compile']
 
 
 class ScorePackageValidator(object):
-    PREV_IMPORT_NAME = None
-    PREV_LOAD_BUILD_CLASS = None
-    WHITELIST_IMPORT = {}
-    CUSTOM_IMPORT_LIST = []
+    """Checks imports and reserved keywords used in a SCORE package
 
-    @staticmethod
-    def execute(whitelist_table: dict, pkg_root_path: str, pkg_import_root: str) -> callable:
-        ScorePackageValidator.PREV_IMPORT_NAME = None
-        ScorePackageValidator.WHITELIST_IMPORT = whitelist_table
-        ScorePackageValidator.CUSTOM_IMPORT_LIST = ScorePackageValidator._make_custom_import_list(pkg_root_path)
+    An instance keeps the states of one validation.
+    Create a new instance for each validation.
+    """
+
+    def __init__(self) -> None:
+        self._prev_import_name = None
+        self._whitelist_import = {}
+        self._custom_import_list = []
+
+    def execute(self, whitelist_table: dict, pkg_root_path: str, pkg_import_root: str) -> None:
+        self._prev_import_name = None
+        self._whitelist_import = whitelist_table
+        self._custom_import_list = self._make_custom_import_list(pkg_root_path)
 
         # in order for the new module to be noticed by the import system
         importlib.invalidate_caches()
 
-        for imp in ScorePackageValidator.CUSTOM_IMPORT_LIST:
+        for imp in self._custom_import_list:
             full_name = ''.join((pkg_import_root, '.', imp))
             spec = importlib.util.find_spec(full_name)
             code = spec.loader.get_code(full_name)
@@ -62,8 +81,8 @@ class ScorePackageValidator(object):
             # mode = ast.parse(source)
             # for node in ast.walk(mode):
             #     if isinstance(node, ast.Import) or isinstance(node, ast.ImportFrom):
-            #         if not ScorePackageValidator._is_contain_custom_import(node.module):
-            #             if node.module not in ScorePackageValidator.WHITELIST_IMPORT:
+            #         if not self._is_contain_custom_import(node.module):
+            #             if node.module not in self._whitelist_import:
             #                 raise ServerErrorException(f'invalid import '
             #                                            f'import_name: {node.module}')
             #     elif isinstance(node, ast.Name):
@@ -73,9 +92,9 @@ class ScorePackageValidator(object):
             #     else:
             #         pass
 
-            ScorePackageValidator._validate_import_from_code(code)
-            ScorePackageValidator._validate_import_from_const(code.co_consts)
-            ScorePackageValidator._validate_blacklist_keyword_from_names(code.co_names)
+            self._validate_import_from_code(code)
+            self._validate_import_from_const(code.co_consts)
+            self._validate_blacklist_keyword_from_names(code.co_names)
 
     @staticmethod
     def _make_custom_import_list(pkg_root_path: str) -> list:
@@ -99,8 +118,7 @@ class ScorePackageValidator(object):
             if co_name in BLACKLIST_RESERVED_KEYWORD:
                 raise ServerErrorException(f'invalid blacklist keyword: {co_name}')
 
-    @staticmethod
-    def _validate_import_from_code(code):
+    def _validate_import_from_code(self, code):
         if not hasattr(code, CODE_ATTR):
             return
 
@@ -109,50 +127,47 @@ class ScorePackageValidator(object):
         for index in range(0, int(len(byte_code_list)), 2):
             key = byte_code_list[index]
             value = byte_code_list[index + 1]
-            ScorePackageValidator._validate_import(key, value, code.co_names)
+            self._validate_import(key, value, code.co_names)
 
-    @staticmethod
-    def _validate_import_from_const(co_consts: tuple):
+    def _validate_import_from_const(self, co_consts: tuple):
         for co_const in co_consts:
             if not hasattr(co_const, CODE_ATTR):
                 continue
-            ScorePackageValidator._validate_import_from_code(co_const)
-            ScorePackageValidator._validate_import_from_const(co_const.co_consts)
+            self._validate_import_from_code(co_const)
+            self._validate_import_from_const(co_const.co_consts)
             if hasattr(co_const, CODE_NAMES_ATTR):
-                ScorePackageValidator._validate_blacklist_keyword_from_names(co_const.co_names)
+                self._validate_blacklist_keyword_from_names(co_const.co_names)
 
-    @staticmethod
-    def _validate_import(key: int, value: int, co_names: tuple):
+    def _validate_import(self, key: int, value: int, co_names: tuple):
         if key not in IMPORT_TABLE:
             return
 
         if key == IMPORT_NAME:
             import_name = co_names[value]
-            ScorePackageValidator.PREV_IMPORT_NAME = import_name
-            if import_name not in ScorePackageValidator.WHITELIST_IMPORT:
-                if not ScorePackageValidator._is_contain_custom_import(import_name):
+            self._prev_import_name = import_name
+            if import_name not in self._whitelist_import:
+                if not self._is_contain_custom_import(import_name):
                     raise ServerErrorException(f'invalid import '
                                                f'import_name: {import_name}')
         elif key == IMPORT_STAR:
-            if ScorePackageValidator.PREV_IMPORT_NAME not in ScorePackageValidator.WHITELIST_IMPORT:
-                if not ScorePackageValidator._is_contain_custom_import(ScorePackageValidator.PREV_IMPORT_NAME):
+            if self._prev_import_name not in self._whitelist_import:
+                if not self._is_contain_custom_import(self._prev_import_name):
                     raise ServerErrorException(f'invalid import '
-                                               f'import_name: {ScorePackageValidator.PREV_IMPORT_NAME}')
+                                               f'import_name: {self._prev_import_name}')
         elif key == IMPORT_FROM:
-            if ScorePackageValidator.PREV_IMPORT_NAME in ScorePackageValidator.WHITELIST_IMPORT:
-                from_list = ScorePackageValidator.WHITELIST_IMPORT[ScorePackageValidator.PREV_IMPORT_NAME]
+            if self._prev_import_name in self._whitelist_import:
+                from_list = self._whitelist_import[self._prev_import_name]
                 if co_names[value] not in from_list:
                     raise ServerErrorException(f'invalid import '
-                                               f'import_name: {ScorePackageValidator.PREV_IMPORT_NAME}')
-            elif ScorePackageValidator._is_contain_custom_import(ScorePackageValidator.PREV_IMPORT_NAME):
+                                               f'import_name: {self._prev_import_name}')
+            elif self._is_contain_custom_import(self._prev_import_name):
                 pass
             else:
                 raise ServerErrorException(f'invalid import '
-                                           f'import_name: {ScorePackageValidator.PREV_IMPORT_NAME}')
+                                           f'import_name: {self._prev_import_name}')
 
-    @staticmethod
-    def _is_contain_custom_import(import_name: str) -> bool:
-        for custom_import in ScorePackageValidator.CUSTOM_IMPORT_LIST:
+    def _is_contain_custom_import(self, import_name: str) -> bool:
+        for custom_import in self._custom_import_list:
             if import_name == custom_import:
                 return True
             else:
@@ -163,3 +178,154 @@ class ScorePackageValidator(object):
                             return True
         return False
 
+
+class ScorePackageValidatorCache(object):
+    """Keeps the results of ScorePackageValidator
+
+    A result is keyed by the hash of python files in a package and the whitelist table,
+    so identical packages are validated only once.
+    Results are kept in memory and saved as files in cache_path.
+    The least recently used results are dropped from memory as new ones come in
+    and removed from cache_path by prune().
+    """
+
+    def __init__(self, cache_path: str, size: int = DEFAULT_VALIDATOR_CACHE_SIZE) -> None:
+        """Constructor
+
+        :param cache_path: directory where results are saved
+        :param size: the max number of results to keep in memory and on disk
+        """
+        self._cache_path = cache_path
+        self._size = size
+        self._lock = Lock()
+        # key: error message, None means valid. The least recently used one comes first
+        self._results = OrderedDict()
+
+    @staticmethod
+    def make_key(whitelist_table: dict, pkg_root_path: str) -> str:
+        """Returns a hex digest of the whitelist table and python files in a package
+
+        :param whitelist_table: {import name: [from list]}
+        :param pkg_root_path: SCORE package directory
+        :return: key
+        """
+        sha3 = hashlib.sha3_256()
+        # Bytecode which is checked differs among python versions
+        sha3.update(sys.implementation.cache_tag.encode())
+
+        table = {name: sorted(from_list) for name, from_list in whitelist_table.items()}
+        sha3.update(json.dumps(table, sort_keys=True).encode())
+
+        for root_path, dirs, files in walk(pkg_root_path):
+            dirs.sort()
+            for file in sorted(files):
+                if not file.endswith('.py'):
+                    continue
+                file_path = os.path.join(root_path, file)
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                relative_path = os.path.relpath(file_path, pkg_root_path).encode()
+                sha3.update(len(relative_path).to_bytes(4, 'big') + relative_path)
+                sha3.update(len(data).to_bytes(8, 'big') + data)
+
+        return sha3.hexdigest()
+
+    def execute(self, whitelist_table: dict, pkg_root_path: str, pkg_import_root: str) -> None:
+        """Validates a SCORE package unless the same package has been validated
+
+        :param whitelist_table: {import name: [from list]}
+        :param pkg_root_path: SCORE package directory
+        :param pkg_import_root: module name of the package
+        """
+        key: str = self.make_key(whitelist_table, pkg_root_path)
+        found, error = self._get(key)
+
+        if not found:
+            error = None
+            try:
+                ScorePackageValidator().execute(whitelist_table, pkg_root_path, pkg_import_root)
+            except ServerErrorException as e:
+                error = e.message
+            self._put(key, error)
+
+        if error is not None:
+            raise ServerErrorException(error)
+
+    def prune(self) -> int:
+        """Removes result files except the ones of the most recently used results
+
+        Results in memory are kept first, then the most recently used files.
+        Temporary files left by interrupted writes are removed as well.
+
+        :return: the number of removed files
+        """
+        try:
+            names = os.listdir(self._cache_path)
+        except OSError:
+            return 0
+
+        with self._lock:
+            keys_in_memory = set(self._results)
+
+        paths = []
+        for name in names:
+            path = os.path.join(self._cache_path, name)
+            try:
+                used_time = os.stat(path).st_mtime
+            except OSError:
+                continue
+            paths.append((name.endswith(_TEMP_SUFFIX), name in keys_in_memory, used_time, path))
+
+        # Temporary files come first, then the least recently used results
+        paths.sort(key=lambda item: (not item[0], item[1], item[2]))
+        remove_count = sum(1 for is_temp, _, _, _ in paths if is_temp)
+        remove_count = max(remove_count, len(paths) - self._size)
+
+        count = 0
+        for _, _, _, path in paths[:remove_count]:
+            try:
+                os.remove(path)
+                count += 1
+            except OSError as e:
+                Logger.warning(f'Failed to remove a validation result: {e}', ICON_LOADER_LOG_TAG)
+
+        return count
+
+    def _get(self, key: str) -> tuple:
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return True, self._results[key]
+
+        path = os.path.join(self._cache_path, key)
+        try:
+            with open(path, 'r') as f:
+                error: Optional[str] = json.load(f)['error']
+            # Marks the file as recently used for prune()
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return False, None
+
+        self._remember(key, error)
+        return True, error
+
+    def _put(self, key: str, error: Optional[str]) -> None:
+        self._remember(key, error)
+
+        path = os.path.join(self._cache_path, key)
+        # Writes to a temporary file first not to leave a broken result
+        temp_path = f'{path}.{os.getpid()}.{get_ident()}{_TEMP_SUFFIX}'
+        try:
+            os.makedirs(self._cache_path, exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump({'error': error}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            Logger.warning(f'Failed to save a validation result: {e}', ICON_LOADER_LOG_TAG)
+
+    def _remember(self, key: str, error: Optional[str]) -> None:
+        with self._lock:
+            self._results[key] = error
+            self._results.move_to_end(key)
+            while len(self._results) > self._size:
+                self._results.popitem(last=False)
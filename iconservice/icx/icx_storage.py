@@ -27,7 +27,7 @@ if TYPE_CHECKING:
 
 
 class IcxStorage(object):
-    _LAST_BLOCK_KEY = b'last_block'
+    LAST_BLOCK_KEY = b'last_block'
 
     """Icx coin state manager embedding a state db wrapper
     """
@@ -52,15 +52,21 @@ class IcxStorage(object):
     def last_block(self) -> 'Block':
         return self._last_block
 
+    @last_block.setter
+    def last_block(self, block: 'Block') -> None:
+        """Sets the last block which has been written to db with the states of the block
+        """
+        self._last_block = block
+
     def load_last_block_info(self, context: Optional['IconScoreContext']) -> None:
-        block_bytes = self._db.get(context, self._LAST_BLOCK_KEY)
+        block_bytes = self._db.get(context, self.LAST_BLOCK_KEY)
         if block_bytes is None:
             return
 
         self._last_block = Block.from_bytes(block_bytes)
 
     def put_block_info(self, context: 'IconScoreContext', block: 'Block') -> None:
-        self._db.put(context, self._LAST_BLOCK_KEY, bytes(block))
+        self._db.put(context, self.LAST_BLOCK_KEY, bytes(block))
         self._last_block = block
 
     def get_text(self, context: 'IconScoreContext', name: str) -> Optional[str]:
@@ -13,14 +13,25 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import OrderedDict
+import sys
 from enum import IntFlag
 from threading import Lock
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+from iconcommons.logger import Logger
 
 from .base.block import Block
 from .base.exception import ServerErrorException
 from .database.batch import BlockBatch
+from .database.sharding import decode_states, encode_states
+from .icon_constant import ICON_SERVICE_LOG_TAG
 from .iconscore.icon_score_mapper import IconScoreMapper
+from .iconscore.icon_score_result_encoder import ResultFormat, encode_tx_result
+from .iconscore.icon_score_trace import Trace
+
+if TYPE_CHECKING:
+    from .base.address import Address
 
 
 class PrecommitFlag(IntFlag):
@@ -42,7 +53,12 @@ class PrecommitData(object):
                  block_result: list,
                  score_mapper: Optional['IconScoreMapper']=None,
                  precommit_flag: PrecommitFlag = PrecommitFlag.NONE):
-        """
+        """Keeps what is needed to commit a block
+
+        The states in block_batch are kept encoded as a single bytes object
+        and block_result is kept only until release_block_result() is called.
+        block_result encoded in ResultFormat.BINARY and traces in block_result
+        are kept until the block is committed and their memory is counted in size.
 
         :param block_batch: changed states for a block
         :param block_result: tx_results made from transactions in a block
@@ -50,23 +66,106 @@ class PrecommitData(object):
         :param precommit_flag: precommit flag
 
         """
-        self.block_batch = block_batch
-        self.block_result = block_result
+        self.block_result: Optional[list] = block_result
         self.score_mapper = score_mapper
         self.precommit_flag = precommit_flag
         self.block = block_batch.block
-        self.state_root_hash: bytes = self.block_batch.digest()
+        self.state_root_hash: bytes = block_batch.digest()
+        self._states: bytes = encode_states(block_batch)
+        # tx_hash: traces, kept apart from block_result which can be released while traces are read
+        self._traces: dict = {tx_result.tx_hash: tx_result.traces or None for tx_result in block_result or []}
+        self._trace_size: int = sum(_get_deep_size(tx_result.traces) for tx_result in block_result or [])
+        # Answers the block invoked again after block_result is released
+        self._encoded_block_result: list = \
+            [encode_tx_result(tx_result, ResultFormat.BINARY) for tx_result in block_result or []]
+        self._encoded_size: int = _get_deep_size(self._encoded_block_result)
+
+    @property
+    def size(self) -> int:
+        """Bytes of the encoded states, the encoded block_result and the traces
+        """
+        return len(self._states) + self._encoded_size + self._trace_size
+
+    @property
+    def trace_size(self) -> int:
+        """Approximate bytes of memory taken by the traces
+        """
+        return self._trace_size
+
+    @property
+    def score_count(self) -> int:
+        """The number of SCOREs deployed in the block, which are kept loaded
+        """
+        return 0 if self.score_mapper is None else len(self.score_mapper)
+
+    @property
+    def is_released(self) -> bool:
+        return self.block_result is None
+
+    @property
+    def tx_results(self) -> list:
+        """block_result, or block_result encoded in ResultFormat.BINARY after it is released
+
+        Both of them can be passed to encode_invoke_result().
+        """
+        return self._encoded_block_result if self.block_result is None else self.block_result
+
+    def get_states(self) -> OrderedDict:
+        """Returns the states changed by the block in the order they were changed
+        """
+        return decode_states(self._states)
+
+    def get_traces(self, tx_hash: bytes) -> Optional[list]:
+        """Returns the traces of a transaction in the block
+
+        :param tx_hash:
+        :return: traces, None if the transaction is not in the block
+        """
+        if tx_hash not in self._traces:
+            return None
+        return self._traces[tx_hash] or []
+
+    def release_block_result(self) -> None:
+        """Drops tx_results which are no more needed after the invoke response is sent
+
+        Its encoded form is kept for the same block invoked again and traces for debug_getTraces.
+        """
+        self.block_result = None
+
+
+def _get_deep_size(value) -> int:
+    # Follows only the containers which traces are made of
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(_get_deep_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_get_deep_size(key) + _get_deep_size(item) for key, item in value.items())
+    elif isinstance(value, Trace):
+        size += _get_deep_size(value.__dict__)
+
+    return size
 
 
 class PrecommitDataManager(object):
     """Manages multiple precommit data made from next candidate block
 
+    If the number or the bytes of candidates exceeds the limits,
+    the oldest candidates are evicted and have to be invoked again to be committed.
     """
 
-    def __init__(self):
+    def __init__(self, max_count: int = 0, max_bytes: int = 0):
+        """Constructor
+
+        :param max_count: the max number of candidates to keep, 0 means no limit
+        :param max_bytes: the max bytes of candidate states and traces to keep, 0 means no limit
+        """
         self._lock = Lock()
-        self._precommit_data_mapper = {}
+        self._precommit_data_mapper = OrderedDict()
         self._last_block: 'Block' = None
+        self._max_count = max_count
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._evicted_count = 0
 
     @property
     def last_block(self) -> 'Block':
@@ -84,23 +183,67 @@ class PrecommitDataManager(object):
             self._last_block = block
 
     def push(self, precommit_data: 'PrecommitData'):
-        block: 'Block' = precommit_data.block_batch.block
+        block: 'Block' = precommit_data.block
+        self._remove(block.hash)
         self._precommit_data_mapper[block.hash] = precommit_data
+        self._bytes += precommit_data.size
+        self._evict()
 
     def get(self, block_hash: 'bytes') -> Optional['PrecommitData']:
         precommit_data = self._precommit_data_mapper.get(block_hash)
         return precommit_data
 
+    def release_block_results(self) -> None:
+        """Drops tx_results of all candidates, which are needed only for invoke responses
+        """
+        for precommit_data in list(self._precommit_data_mapper.values()):
+            precommit_data.release_block_result()
+
+    def get_status(self) -> dict:
+        """Returns the number and the bytes of candidates kept in memory
+
+        :return: status
+        """
+        candidates = [
+            {
+                'blockHeight': precommit_data.block.height,
+                'blockHash': precommit_data.block.hash,
+                'bytes': precommit_data.size,
+                'traceBytes': precommit_data.trace_size,
+                'scoreCount': precommit_data.score_count,
+                'released': precommit_data.is_released
+            }
+            for precommit_data in list(self._precommit_data_mapper.values())
+        ]
+
+        return {
+            'count': len(candidates),
+            'bytes': self._bytes,
+            'maxCount': self._max_count,
+            'maxBytes': self._max_bytes,
+            'evictedCount': self._evicted_count,
+            'candidates': candidates
+        }
+
     def commit(self, block: 'Block'):
         with self._lock:
             self._last_block = block
 
         # Clear remaining precommit data which have the same block height
-        self._precommit_data_mapper.clear()
+        self.clear()
 
     def rollback(self, block: 'Block'):
-        if block.hash in self._precommit_data_mapper:
-            del self._precommit_data_mapper[block.hash]
+        self._remove(block.hash)
+
+    def has_score(self, address: 'Address') -> bool:
+        """Checks if a SCORE is deployed or updated in any precommit data
+
+        :param address: SCORE address
+        """
+        for precommit_data in list(self._precommit_data_mapper.values()):
+            if precommit_data.score_mapper is not None and address in precommit_data.score_mapper:
+                return True
+        return False
 
     def empty(self) -> bool:
         return len(self._precommit_data_mapper) == 0
@@ -111,6 +254,21 @@ class PrecommitDataManager(object):
         :return:
         """
         self._precommit_data_mapper.clear()
+        self._bytes = 0
+
+    def _remove(self, block_hash: bytes) -> None:
+        precommit_data = self._precommit_data_mapper.pop(block_hash, None)
+        if precommit_data is not None:
+            self._bytes -= precommit_data.size
+
+    def _evict(self) -> None:
+        # The newest candidate is kept even if it exceeds the limits alone
+        while len(self._precommit_data_mapper) > 1 and \
+                (0 < self._max_count < len(self._precommit_data_mapper) or 0 < self._max_bytes < self._bytes):
+            _, precommit_data = self._precommit_data_mapper.popitem(last=False)
+            self._bytes -= precommit_data.size
+            self._evicted_count += 1
+            Logger.warning(f'Evict precommit data: {precommit_data.block}', ICON_SERVICE_LOG_TAG)
 
     def validate_block_to_invoke(self, block: 'Block'):
         """Check if the block to invoke is valid before invoking it
@@ -28,6 +28,10 @@ setup_options = {
     ]},
     'license': "Apache License 2.0",
     'install_requires': requires,
+    'extras_require': {
+        'socket': ['msgpack>=0.5.2'],
+        'lmdb': ['lmdb>=0.94']
+    },
     'entry_points': {
         'console_scripts': [
             'iconservice=iconservice.icon_service_cli:main'
@@ -66,6 +66,20 @@ class TestTypeConverterFunc(unittest.TestCase):
         TypeConverter.convert_data_params(annotations, params)
         self.assertEqual(value, self.test_score.func_param_address2(**params))
 
+    def test_make_data_params_converter(self):
+        address = create_address()
+        params = {"a": "0x10", "b": "b", "c": "0x1", "d": str(address), "e": "0x0102", "f": None, "g": "0x1"}
+        annotations = TypeConverter.make_annotations_from_method(self.test_score.func_params)
+        converter = TypeConverter.make_data_params_converter(annotations)
+
+        expected = dict(params)
+        TypeConverter.convert_data_params(annotations, expected)
+
+        converter(params)
+        self.assertEqual(expected, params)
+        self.assertEqual({"a": 16, "b": "b", "c": True, "d": address, "e": b'\x01\x02', "f": None, "g": "0x1"},
+                         params)
+
 
 class TestScore:
     def func_param_int(self, value: int) -> int:
@@ -84,4 +98,7 @@ class TestScore:
         return value
 
     def func_param_address2(self, value: 'Address') -> 'Address':
-        return value
\ No newline at end of file
+        return value
+
+    def func_params(self, a: int, b: str, c: bool, d: Address, e: bytes, f: int = None, g: list = None) -> None:
+        pass
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+
+from iconservice.base.address import AddressPrefix
+from iconservice.database.access_stats import HotKeySketch, StateAccessStats, get_variable_name
+from iconservice.database.backend import BackendType, open_backend
+from iconservice.database.batch import BlockBatch, TransactionBatch
+from iconservice.database.db import ContextDatabase, IconScoreDatabase, KeyValueDatabase
+from iconservice.iconscore.icon_container_db import DictDB, VarDB, ArrayDB
+from iconservice.iconscore.icon_score_context import IconScoreContext, IconScoreContextType, ContextContainer
+from tests import create_address
+
+
+class TestHotKeySketch(unittest.TestCase):
+    def test_top(self):
+        sketch = HotKeySketch(3)
+        for key, count in [(b'a', 5), (b'b', 3), (b'c', 1)]:
+            for _ in range(count):
+                sketch.add(key)
+
+        self.assertEqual([(b'a', 5, 0), (b'b', 3, 0), (b'c', 1, 0)], sketch.top(3))
+        self.assertEqual([(b'a', 5, 0)], sketch.top(1))
+
+        # d replaces c, the least counted key and inherits its count
+        sketch.add(b'd')
+        self.assertEqual([(b'a', 5, 0), (b'b', 3, 0), (b'd', 2, 1)], sketch.top(3))
+        self.assertEqual(3, len(sketch))
+
+    def test_frequent_keys_survive(self):
+        sketch = HotKeySketch(8)
+        for i in range(1000):
+            sketch.add(b'hot')
+            sketch.add(i.to_bytes(4, 'big'))
+            if i % 2 == 0:
+                sketch.add(b'warm')
+
+        self.assertEqual(8, len(sketch))
+        top = sketch.top(2)
+        self.assertEqual([b'hot', b'warm'], [key for key, _, _ in top])
+        # Counts are overestimated by at most error
+        self.assertLessEqual(top[0][1] - top[0][2], 1000)
+        self.assertGreaterEqual(top[0][1], 1000)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            HotKeySketch(0)
+
+
+class TestStateAccessStats(unittest.TestCase):
+    def setUp(self):
+        self.score_address = create_address(AddressPrefix.CONTRACT)
+        self.context_db = ContextDatabase(KeyValueDatabase(open_backend(BackendType.MEMORY, 'state_db')))
+
+        self.context = IconScoreContext(IconScoreContextType.INVOKE)
+        self.context.block_batch = BlockBatch()
+        self.context.tx_batch = TransactionBatch()
+        ContextContainer._push_context(self.context)
+
+        self.access_stats = StateAccessStats(hot_key_count=2)
+        IconScoreDatabase.access_stats = self.access_stats
+        self.db = IconScoreDatabase(self.score_address, self.context_db)
+
+    def tearDown(self):
+        IconScoreDatabase.access_stats = None
+        ContextContainer._clear_context()
+
+    def test_get_variable_name(self):
+        self.assertEqual('DictDB:balances', get_variable_name(b'\x01|balances|key'))
+        self.assertEqual('VarDB:name', get_variable_name(b'\x02|name'))
+        self.assertEqual('key', get_variable_name(b'key'))
+
+    def test_containers(self):
+        balances = DictDB('balances', self.db, value_type=int)
+        name = VarDB('name', self.db, value_type=str)
+        array = ArrayDB('array', self.db, value_type=int)
+
+        balances['alice'] = 100
+        balances['bob'] = 200
+        del balances['bob']
+        name.set('token')
+        self.assertEqual(100, balances['alice'])
+        self.assertEqual(100, balances['alice'])
+        array.put(1)
+        self.context_db.key_value_db.put(self.db._hash_key(b'raw'), b'value')
+        self.assertEqual(b'value', self.db.get(b'raw'))
+
+        stats = self.access_stats.to_dict()
+        self.assertEqual(1, len(stats['scores']))
+        score = stats['scores'][0]
+        self.assertEqual(self.score_address, score['address'])
+
+        variables = score['variables']
+        self.assertEqual({'DictDB:balances', 'VarDB:name', 'ArrayDB:array', 'raw'}, set(variables))
+        self.assertEqual(2, variables['DictDB:balances']['puts'])
+        self.assertEqual(1, variables['DictDB:balances']['deletes'])
+        self.assertEqual(2, variables['DictDB:balances']['gets'])
+        self.assertEqual(2, variables['DictDB:balances']['batchHits'])
+        self.assertEqual(0, variables['DictDB:balances']['dbHits'])
+        self.assertEqual(5, variables['VarDB:name']['bytesWritten'])
+        self.assertEqual(1, variables['raw']['dbHits'])
+        self.assertEqual(5, variables['raw']['bytesRead'])
+
+        total = sum(variable['gets'] + variable['puts'] + variable['deletes'] for variable in variables.values())
+        self.assertEqual(total, score['gets'] + score['puts'] + score['deletes'])
+
+        self.assertEqual(2, len(stats['hotKeys']))
+        self.assertEqual({'key': self.db._hash_key(b'\x01|balances|') + b'alice', 'count': 3, 'error': 0},
+                         stats['hotKeys'][0])
+
+    def test_batch_and_db_hits(self):
+        self.context_db.key_value_db.put(self.db._hash_key(b'key0'), b'value0')
+        self.context.block_batch[self.db._hash_key(b'key1')] = b'value1'
+        self.db.put(b'key2', b'value2')
+
+        self.assertEqual([b'value0', b'value1', b'value2', None],
+                         self.db.get_many([b'key0', b'key1', b'key2', b'key3']))
+        self.assertEqual(3, len(list(self.db.iterator())))
+
+        stats = self.access_stats.to_dict()
+        score = stats['scores'][0]
+        self.assertEqual(7, score['gets'])
+        self.assertEqual(4, score['batchHits'])
+        self.assertEqual(3, score['dbHits'])
+        self.assertEqual(36, score['bytesRead'])
+
+        self.access_stats.clear()
+        self.assertEqual({'scores': [], 'hotKeys': []}, self.access_stats.to_dict())
+
+    def test_disabled(self):
+        IconScoreDatabase.access_stats = None
+        self.db.put(b'key0', b'value0')
+        self.assertEqual(b'value0', self.db.get(b'key0'))
+        self.assertEqual({'scores': [], 'hotKeys': []}, self.access_stats.to_dict())
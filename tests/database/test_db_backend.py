@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import BackendType, open_backend, make_leveldb_options
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.factory import ContextDatabaseFactory
+from iconservice.icon_config import default_icon_config
+from iconservice.icon_constant import ConfigKey
+from tests import rmtree
+
+try:
+    import lmdb
+except ImportError:
+    lmdb = None
+
+
+class DatabaseBackendConformance(object):
+    """Tests every backend has to pass
+    """
+    BACKEND_TYPE = None
+
+    def setUp(self):
+        self.state_db_root_path = 'state_db'
+        rmtree(self.state_db_root_path)
+        os.mkdir(self.state_db_root_path)
+
+        self.db = open_backend(self.BACKEND_TYPE, os.path.join(self.state_db_root_path, 'db'))
+
+    def tearDown(self):
+        self.db.close()
+        rmtree(self.state_db_root_path)
+
+    def _put_items(self, db, keys: list):
+        for key in keys:
+            db.put(key, key + b'_value')
+
+    def test_get_put_delete(self):
+        db = self.db
+        self.assertIsNone(db.get(b'key0'))
+
+        db.put(b'key0', b'value0')
+        self.assertEqual(b'value0', db.get(b'key0'))
+
+        db.put(b'key0', b'')
+        self.assertEqual(b'', db.get(b'key0'))
+
+        db.delete(b'key0')
+        self.assertIsNone(db.get(b'key0'))
+        db.delete(b'key0')
+
+        with self.assertRaises(TypeError):
+            db.put(b'key1', None)
+
+    def test_write_batch(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+
+        with db.write_batch() as wb:
+            wb.put(b'key1', b'value1')
+            wb.put(b'key2', b'value2')
+            wb.delete(b'key0')
+
+        self.assertIsNone(db.get(b'key0'))
+        self.assertEqual(b'value1', db.get(b'key1'))
+        self.assertEqual(b'value2', db.get(b'key2'))
+
+    def test_prefixed_db(self):
+        db = self.db
+        sub_db = db.prefixed_db(b'sub|')
+        sub_sub_db = sub_db.prefixed_db(b'sub|')
+
+        sub_db.put(b'key0', b'value0')
+        sub_sub_db.put(b'key0', b'value1')
+        db.put(b'key0', b'value2')
+
+        self.assertEqual(b'value0', db.get(b'sub|key0'))
+        self.assertEqual(b'value1', db.get(b'sub|sub|key0'))
+        self.assertEqual(b'value1', sub_db.get(b'sub|key0'))
+        self.assertEqual(b'value2', db.get(b'key0'))
+
+        with sub_db.write_batch() as wb:
+            wb.put(b'key1', b'value3')
+            wb.delete(b'key0')
+
+        self.assertEqual(b'value3', db.get(b'sub|key1'))
+        self.assertIsNone(sub_db.get(b'key0'))
+
+        sub_sub_db.delete(b'key0')
+        self.assertIsNone(db.get(b'sub|sub|key0'))
+
+    def test_snapshot(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+        db.put(b'key1', b'value1')
+
+        with db.snapshot() as snapshot:
+            db.put(b'key0', b'changed')
+            db.delete(b'key1')
+            db.put(b'key2', b'value2')
+
+            self.assertEqual(b'value0', snapshot.get(b'key0'))
+            self.assertEqual(b'value1', snapshot.get(b'key1'))
+            self.assertIsNone(snapshot.get(b'key2'))
+            self.assertEqual([(b'key0', b'value0'), (b'key1', b'value1')], list(snapshot.iterator()))
+
+        sub_db = db.prefixed_db(b'key')
+        with sub_db.snapshot() as snapshot:
+            db.put(b'key2', b'changed')
+            self.assertEqual(b'value2', snapshot.get(b'2'))
+
+    def test_iterator(self):
+        db = self.db
+        keys = [b'a', b'b', b'b\x00', b'ba', b'b\xff', b'c', b'\xff', b'\xff\xff']
+        self._put_items(db, keys)
+
+        self.assertEqual([(key, key + b'_value') for key in keys], list(db.iterator()))
+        self.assertEqual(list(reversed(keys)), [key for key, _ in db.iterator(reverse=True)])
+
+        self.assertEqual([b'b', b'b\x00', b'ba', b'b\xff'],
+                         [key for key, _ in db.iterator(start=b'b', stop=b'c')])
+        self.assertEqual([b'b\xff', b'ba', b'b\x00', b'b'],
+                         [key for key, _ in db.iterator(start=b'b', stop=b'c', reverse=True)])
+        self.assertEqual([b'a', b'b'], [key for key, _ in db.iterator(stop=b'b\x00')])
+        self.assertEqual([b'b', b'a'], [key for key, _ in db.iterator(stop=b'b\x00', reverse=True)])
+        self.assertEqual([b'\xff\xff', b'\xff'], [key for key, _ in db.iterator(start=b'\xff', reverse=True)])
+        self.assertEqual([], list(db.iterator(start=b'd', stop=b'e')))
+        self.assertEqual([], list(db.iterator(start=b'd', stop=b'e', reverse=True)))
+
+    def test_long_keys(self):
+        # lmdb rejects keys of 512 bytes or longer by default
+        db = self.db
+        head = b'h' * 600
+        keys = [b'a', head[:480], head, head + b'\x00', head + b'\xff' * 400, head[:500] + b'\xff', b'i']
+        self._put_items(db, keys)
+
+        for key in keys:
+            self.assertEqual(key + b'_value', db.get(key))
+        self.assertIsNone(db.get(head + b'\x01'))
+
+        self.assertEqual([(key, key + b'_value') for key in keys], list(db.iterator()))
+        self.assertEqual(list(reversed(keys)), [key for key, _ in db.iterator(reverse=True)])
+        self.assertEqual(keys[2:4], [key for key, _ in db.iterator(start=head[:500], stop=head + b'\x01')])
+        self.assertEqual(list(reversed(keys[2:4])),
+                         [key for key, _ in db.iterator(start=head, stop=head + b'\x01', reverse=True)])
+
+        snapshot = db.snapshot()
+        batch = db.write_batch()
+        batch.put(head + b'\x00', b'new_value')
+        batch.delete(head)
+        batch.write()
+        self.assertEqual(b'new_value', db.get(head + b'\x00'))
+        self.assertIsNone(db.get(head))
+        self.assertEqual(head + b'_value', snapshot.get(head))
+        self.assertEqual(keys, [key for key, _ in snapshot.iterator()])
+        snapshot.close()
+
+        db.delete(head + b'\x00')
+        self.assertEqual(keys[:2] + keys[4:], [key for key, _ in db.iterator()])
+
+    def test_prefixed_iterator(self):
+        db = self.db
+        self._put_items(db, [b'a|1', b'b|1', b'b|2', b'b|3', b'b}', b'c|1'])
+
+        sub_db = db.prefixed_db(b'b|')
+        self.assertEqual([(b'1', b'b|1_value'), (b'2', b'b|2_value'), (b'3', b'b|3_value')],
+                         list(sub_db.iterator()))
+        self.assertEqual([b'3', b'2'], [key for key, _ in sub_db.iterator(start=b'2', reverse=True)])
+        self.assertEqual([b'1'], [key for key, _ in sub_db.iterator(stop=b'2')])
+
+        sub_db = db.prefixed_db(b'\xff')
+        self.assertEqual([], list(sub_db.iterator()))
+        sub_db.put(b'\xff', b'value')
+        self.assertEqual([(b'\xff', b'value')], list(sub_db.iterator()))
+
+    def test_key_value_database(self):
+        db = KeyValueDatabase(self.db)
+        db.write_batch({b'key0': b'value0', b'key1': b'value1'})
+        db.write_batch({b'key0': None})
+
+        self.assertIsNone(db.get(b'key0'))
+        self.assertEqual([None, b'value1', None], db.get_many([b'key0', b'key1', b'key2']))
+
+        sub_db = db.get_sub_db(b'key')
+        self.assertEqual(b'value1', sub_db.get(b'1'))
+        self.assertEqual([(b'1', b'value1')], list(sub_db.iterator()))
+
+
+class TestPlyvelBackend(DatabaseBackendConformance, unittest.TestCase):
+    BACKEND_TYPE = BackendType.PLYVEL
+
+
+@unittest.skipIf(lmdb is None, 'lmdb is not installed')
+class TestLmdbBackend(DatabaseBackendConformance, unittest.TestCase):
+    BACKEND_TYPE = BackendType.LMDB
+
+    def test_read_only(self):
+        path = os.path.join(self.state_db_root_path, 'db')
+        self.db.put(b'key0', b'value0')
+        self.db.close()
+
+        self.db = open_backend(BackendType.LMDB, path, read_only=True)
+        self.assertEqual(b'value0', self.db.get(b'key0'))
+        with self.assertRaises(lmdb.ReadonlyError):
+            self.db.put(b'key1', b'value1')
+
+        # LevelDB locks its db exclusively
+        with self.assertRaises(DatabaseException):
+            open_backend(BackendType.PLYVEL, path, read_only=True)
+
+
+class TestMemoryBackend(DatabaseBackendConformance, unittest.TestCase):
+    BACKEND_TYPE = BackendType.MEMORY
+
+
+class TestLevelDBOptions(unittest.TestCase):
+    def test_make_leveldb_options(self):
+        self.assertEqual({}, make_leveldb_options(None))
+        self.assertEqual({}, make_leveldb_options({}))
+
+        options = make_leveldb_options(default_icon_config[ConfigKey.STATE_DB_OPTIONS])
+        self.assertEqual({
+            'lru_cache_size': 64 * 1024 * 1024,
+            'bloom_filter_bits': 10,
+            'write_buffer_size': 16 * 1024 * 1024,
+            'max_open_files': 1000,
+            'block_size': 4096,
+            'compression': 'snappy'
+        }, options)
+
+        options = make_leveldb_options({ConfigKey.STATE_DB_COMPRESSION: 'none'})
+        self.assertEqual({'compression': None}, options)
+
+    def test_make_leveldb_options_with_invalid_options(self):
+        invalid_options = [
+            [],
+            {'cacheSize': 1024},
+            {ConfigKey.STATE_DB_LRU_CACHE_SIZE: -1},
+            {ConfigKey.STATE_DB_LRU_CACHE_SIZE: '1024'},
+            {ConfigKey.STATE_DB_BLOOM_FILTER_BITS: True},
+            {ConfigKey.STATE_DB_WRITE_BUFFER_SIZE: 1024},
+            {ConfigKey.STATE_DB_MAX_OPEN_FILES: 10},
+            {ConfigKey.STATE_DB_BLOCK_SIZE: 1.5},
+            {ConfigKey.STATE_DB_COMPRESSION: 'zlib'},
+            {ConfigKey.STATE_DB_COMPRESSION: None}
+        ]
+
+        for options in invalid_options:
+            with self.assertRaises(DatabaseException):
+                make_leveldb_options(options)
+
+    def test_open_plyvel_with_options(self):
+        state_db_root_path = 'state_db'
+        rmtree(state_db_root_path)
+
+        options = make_leveldb_options(default_icon_config[ConfigKey.STATE_DB_OPTIONS])
+        db = KeyValueDatabase.from_path(state_db_root_path, options=options)
+        try:
+            db.put(b'key0', b'value0')
+            self.assertEqual(b'value0', db.get(b'key0'))
+        finally:
+            db.close()
+            rmtree(state_db_root_path)
+
+
+class TestContextDatabaseFactory(unittest.TestCase):
+    def tearDown(self):
+        ContextDatabaseFactory.close()
+
+    def test_open_with_invalid_options(self):
+        with self.assertRaises(DatabaseException):
+            ContextDatabaseFactory.open(
+                'state_db', ContextDatabaseFactory.Mode.SINGLE_DB, BackendType.PLYVEL,
+                {ConfigKey.STATE_DB_BLOCK_SIZE: 0})
+
+    def test_open_with_backend(self):
+        ContextDatabaseFactory.open('state_db', ContextDatabaseFactory.Mode.SINGLE_DB, BackendType.MEMORY)
+        context_db = ContextDatabaseFactory.get_shared_db()
+        context_db.key_value_db.put(b'key0', b'value0')
+        self.assertEqual(b'value0', ContextDatabaseFactory.create_by_name('icon_dex').key_value_db.get(b'key0'))
+
+    def test_open_with_invalid_backend(self):
+        with self.assertRaises(DatabaseException):
+            ContextDatabaseFactory.open('state_db', ContextDatabaseFactory.Mode.SINGLE_DB, 'rocksdb')
+
+    def test_open_read_only_with_multiple_db(self):
+        with self.assertRaises(DatabaseException):
+            ContextDatabaseFactory.open(
+                'state_db', ContextDatabaseFactory.Mode.MULTIPLE_DB, BackendType.LMDB, read_only=True)
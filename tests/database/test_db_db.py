@@ -21,7 +21,7 @@ import unittest
 from iconservice.base.address import Address, AddressPrefix
 from iconservice.base.exception import DatabaseException
 from iconservice.database.batch import BlockBatch, TransactionBatch
-from iconservice.database.db import ContextDatabase
+from iconservice.database.db import ContextDatabase, DatabaseObserver, ReadView
 from iconservice.database.db import IconScoreDatabase
 from iconservice.database.db import KeyValueDatabase
 from iconservice.icon_constant import DATA_BYTE_ORDER
@@ -65,6 +65,15 @@ class TestKeyValueDatabase(unittest.TestCase):
         self.assertEqual(b'value1', db.get(b'key1'))
         self.assertEqual(b'value0', db.get(b'key0'))
 
+    def test_get_many(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+        db.put(b'key2', b'value2')
+
+        values = db.get_many([b'key2', b'key1', b'key0'])
+        self.assertEqual([b'value2', None, b'value0'], values)
+        self.assertEqual([], db.get_many([]))
+
 
 class TestContextDatabaseOnWriteMode(unittest.TestCase):
     def setUp(self):
@@ -185,6 +194,61 @@ class TestContextDatabaseOnWriteMode(unittest.TestCase):
         self.assertEqual(0, len(tx_batch))
         self.assertIsNone(db.get(context, b'key0'))
 
+    def test_get_many(self):
+        context = self.context
+        db = self.context_db
+
+        db.write_batch(context, {b'key0': b'value0', b'key1': b'value1', b'key2': b'value2'})
+        context.block_batch[b'key1'] = b'block1'
+        context.block_batch[b'key3'] = b'block3'
+        db.put(context, b'key0', b'tx0')
+        db.delete(context, b'key2')
+
+        values = db.get_many(context, [b'key0', b'key1', b'key2', b'key3', b'key4'])
+        self.assertEqual([b'tx0', b'block1', None, b'block3', None], values)
+
+        for key, value in zip([b'key0', b'key1', b'key2', b'key3', b'key4'], values):
+            self.assertEqual(db.get(context, key), value)
+
+    def test_iterator(self):
+        context = self.context
+        db = self.context_db
+
+        db.write_batch(context, {b'a': b'0', b'b1': b'1', b'b2': b'2', b'b4': b'4', b'c': b'5'})
+        context.block_batch[b'b3'] = b'3'
+        context.block_batch[b'b4'] = b'block4'
+        db.put(context, b'b0', b'tx0')
+        db.delete(context, b'b2')
+        db.put(context, b'b4', b'tx4')
+
+        items = list(db.iterator(context, b'b', b'c'))
+        self.assertEqual([(b'b0', b'tx0'), (b'b1', b'1'), (b'b3', b'3'), (b'b4', b'tx4')], items)
+
+        items = list(db.iterator(context, b'b', b'c', reverse=True))
+        self.assertEqual([(b'b4', b'tx4'), (b'b3', b'3'), (b'b1', b'1'), (b'b0', b'tx0')], items)
+
+        items = list(db.iterator(context, b'b2', None))
+        self.assertEqual([(b'b3', b'3'), (b'b4', b'tx4'), (b'c', b'5')], items)
+
+    def test_read_view(self):
+        db = self.context_db
+        db.write_batch(self.context, {b'a': b'0', b'b': b'1'})
+
+        query_context = IconScoreContext(IconScoreContextType.QUERY)
+        query_context.read_view = ReadView(db.key_value_db)
+        self.context.read_view = query_context.read_view
+        db.write_batch(self.context, {b'a': b'changed', b'c': b'2'})
+
+        self.assertEqual(b'0', db.get(query_context, b'a'))
+        self.assertEqual([b'0', b'1', None], db.get_many(query_context, [b'a', b'b', b'c']))
+        self.assertEqual([(b'a', b'0'), (b'b', b'1')], list(db.iterator(query_context, b'a', None)))
+        # Batches are applied over the view
+        self.context.block_batch[b'b'] = b'block'
+        self.assertEqual([b'0', b'block', None], db.get_many(self.context, [b'a', b'b', b'c']))
+
+        query_context.read_view.close()
+        self.assertEqual(b'changed', db.get(IconScoreContext(IconScoreContextType.QUERY), b'a'))
+
     def test_delete_on_readonly_exception(self):
         context = self.context
         db = self.context_db
@@ -234,3 +298,61 @@ class TestIconScoreDatabase(unittest.TestCase):
 
         db.put(key, value.to_bytes(32, DATA_BYTE_ORDER))
         self.assertEqual(value.to_bytes(32, DATA_BYTE_ORDER), db.get(key))
+
+    def test_get_many(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+        db.put(b'key2', b'value2')
+
+        got_keys = []
+        db.set_observer(DatabaseObserver(
+            lambda context, key, value: got_keys.append(key), None, None))
+
+        values = db.get_many([b'key0', b'key1', b'key2'])
+        self.assertEqual([b'value0', None, b'value2'], values)
+        self.assertEqual([b'key0', b'key1', b'key2'], got_keys)
+
+        # The observer is notified only for the consumed values
+        got_keys.clear()
+        it = db.iter_many([b'key0', b'key1', b'key2'])
+        self.assertEqual(b'value0', next(it))
+        self.assertEqual([b'key0'], got_keys)
+
+    def test_iterator(self):
+        db = self.db
+        sub_db = db.get_sub_db(b'sub')
+        for key in [b'2', b'1', b'3']:
+            sub_db.put(key, key * 2)
+        db.put(b'sub', b'x')
+        db.get_sub_db(b'sub2').put(b'1', b'y')
+
+        got_keys = []
+        sub_db.set_observer(DatabaseObserver(
+            lambda context, key, value: got_keys.append(key), None, None))
+
+        self.assertEqual([(b'1', b'11'), (b'2', b'22'), (b'3', b'33')], list(sub_db.iterator()))
+        self.assertEqual([(b'3', b'33'), (b'2', b'22')], list(sub_db.iterator(start=b'2', reverse=True)))
+        self.assertEqual([(b'1', b'11')], list(sub_db.iterator(stop=b'2')))
+        self.assertEqual([b'1', b'2', b'3', b'3', b'2', b'1'], got_keys)
+
+    def test_put_many(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+
+        events = []
+        db.set_observer(DatabaseObserver(
+            None,
+            lambda context, key, old_value, new_value: events.append(('put', key, old_value, new_value)),
+            lambda context, key, old_value: events.append(('delete', key, old_value))))
+
+        db.put_many([(b'key1', b'a'), (b'key0', None), (b'key1', b'b'), (b'key2', b'c'), (b'key2', None)])
+        self.assertEqual([('put', b'key1', None, b'a'),
+                          ('delete', b'key0', b'value0'),
+                          ('put', b'key1', b'a', b'b'),
+                          ('put', b'key2', None, b'c'),
+                          ('delete', b'key2', b'c')], events)
+
+        db.set_observer(None)
+        self.assertIsNone(db.get(b'key0'))
+        self.assertEqual(b'b', db.get(b'key1'))
+        self.assertIsNone(db.get(b'key2'))
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from iconservice.base.block import Block
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import BackendType
+from iconservice.database.db import ContextDatabase
+from iconservice.database.history import StateHistory
+from iconservice.database.state_snapshot import import_state_snapshot
+from iconservice.icon_constant import ICON_DEX_DB_NAME
+from iconservice.icx.icx_storage import IcxStorage
+from iconservice.iconscore.icon_score_context import IconScoreContextType, IconScoreContext
+from tests import create_block_hash, rmtree
+
+
+class TestStateHistory(unittest.TestCase):
+    def setUp(self):
+        self.root_path = 'state_history'
+        rmtree(self.root_path)
+        os.mkdir(self.root_path)
+
+        self.context_db = ContextDatabase.from_path(os.path.join(self.root_path, ICON_DEX_DB_NAME))
+        self.context = IconScoreContext(IconScoreContextType.DIRECT)
+        self.checkpoint_path = os.path.join(self.root_path, 'checkpoint')
+        self.history = StateHistory(self.context_db, max_reverse_diffs=3,
+                                    checkpoint_interval=2, checkpoint_path=self.checkpoint_path,
+                                    max_checkpoints=2, score_root_path=os.path.join(self.root_path, 'score'))
+        self.blocks = []
+
+    def tearDown(self):
+        self.history.close()
+        self.context_db.key_value_db.close()
+        rmtree(self.root_path)
+
+    def _commit(self, states: dict) -> 'Block':
+        prev_hash = self.blocks[-1].hash if self.blocks else None
+        block = Block(len(self.blocks), create_block_hash(), 0, prev_hash)
+        self.context_db.write_batch(self.context, self.history.make_commit_states(states, block))
+        self.blocks.append(block)
+        return block
+
+    def _get_states(self) -> dict:
+        return {key: value for key, value in self.context_db.key_value_db.iterator()
+                if not key.startswith(b'reverse_diff|')}
+
+    def test_invalid_config(self):
+        for kwargs in ({'max_reverse_diffs': -1},
+                       {'checkpoint_interval': True},
+                       {'checkpoint_interval': 10},
+                       {'checkpoint_interval': 10, 'checkpoint_path': 'checkpoint'}):
+            with self.assertRaises(DatabaseException):
+                StateHistory(self.context_db, **kwargs)
+
+    def test_make_commit_states(self):
+        history = StateHistory(self.context_db)
+        block = Block(0, create_block_hash(), 0, None)
+
+        states = history.make_commit_states({b'key0': b'value0'}, block)
+        self.assertEqual({b'key0': b'value0', IcxStorage.LAST_BLOCK_KEY: bytes(block)}, states)
+
+    def test_rollback_to(self):
+        history = []
+        for i in range(5):
+            self._commit({b'key0': bytes([i]), bytes([i]): b'value', b'key1': None if i % 2 else b'value1'})
+            history.append(self._get_states())
+
+        # The reverse diffs of the last 3 blocks
+        self.assertEqual([2, 3, 4], self.history.get_reverse_diff_heights())
+
+        for height in (-1, 0, 4, 5):
+            with self.assertRaises(DatabaseException):
+                self.history.rollback_to(self.context, height, self.blocks[-1])
+
+        block = self.history.rollback_to(self.context, 3, self.blocks[-1])
+        self.assertEqual(bytes(self.blocks[3]), bytes(block))
+        self.assertEqual(history[3], self._get_states())
+        self.assertEqual([2, 3], self.history.get_reverse_diff_heights())
+
+        block = self.history.rollback_to(self.context, 1, block)
+        self.assertEqual(bytes(self.blocks[1]), bytes(block))
+        self.assertEqual(history[1], self._get_states())
+        self.assertEqual([], self.history.get_reverse_diff_heights())
+
+    def test_check(self):
+        for i in range(4):
+            self._commit({b'key0': bytes([i])})
+        self.assertEqual([1, 2, 3], self.history.get_reverse_diff_heights())
+
+        self.history.check(self.blocks[-1])
+        self.assertEqual([1, 2, 3], self.history.get_reverse_diff_heights())
+
+        # Reverse diffs which do not lead to the last block
+        self.history.check(self.blocks[1])
+        self.assertEqual([1], self.history.get_reverse_diff_heights())
+        self.history.check(None)
+        self.assertEqual([], self.history.get_reverse_diff_heights())
+
+    def test_checkpoint(self):
+        for i in range(7):
+            block = self._commit({b'key0': bytes([i])})
+            self.history.on_commit(block)
+            # Waits for the checkpoint not to be skipped
+            self.history.close()
+
+        checkpoints = self.history.get_checkpoints()
+        self.assertEqual([4, 6], [height for height, _ in checkpoints])
+
+        state_db_root_path = os.path.join(self.root_path, 'restored')
+        with open(checkpoints[-1][1], 'rb') as f:
+            block = import_state_snapshot(f, state_db_root_path, os.path.join(self.root_path, 'restored_score'),
+                                          BackendType.PLYVEL)
+        self.assertEqual(bytes(self.blocks[6]), bytes(block))
+
+        context_db = ContextDatabase.from_path(os.path.join(state_db_root_path, ICON_DEX_DB_NAME), False)
+        self.assertEqual(bytes([6]), context_db.get(None, b'key0'))
+        context_db.key_value_db.close()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from iconservice.base.block import Block
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import BackendType, MemoryBackend
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.history import CHECKPOINT_FILE_PREFIX, CHECKPOINT_FILE_SUFFIX
+from iconservice.database.replica import ReadReplica
+from iconservice.database.state_snapshot import write_state_snapshot
+from iconservice.icon_constant import ICON_DEX_DB_NAME
+from iconservice.icx.icx_storage import IcxStorage
+from tests import create_block_hash, rmtree
+
+
+class TestReadReplica(unittest.TestCase):
+    def setUp(self):
+        self.root_path = 'read_replica'
+        rmtree(self.root_path)
+        os.mkdir(self.root_path)
+
+        self.checkpoint_path = os.path.join(self.root_path, 'checkpoint')
+        self.primary_score_root_path = os.path.join(self.root_path, 'primary_score')
+        self.state_db_root_path = os.path.join(self.root_path, 'statedb')
+        self.score_root_path = os.path.join(self.root_path, 'score')
+        os.makedirs(self.checkpoint_path)
+        os.makedirs(os.path.join(self.primary_score_root_path, 'score0'))
+
+        self.now = 0
+        self.replica = ReadReplica(self.state_db_root_path, self.score_root_path, BackendType.PLYVEL,
+                                   self.checkpoint_path, refresh_interval=5, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.replica.close()
+        rmtree(self.root_path)
+
+    def _write_checkpoint(self, height: int) -> None:
+        block = Block(height, create_block_hash(), 0, create_block_hash())
+        backend = MemoryBackend({IcxStorage.LAST_BLOCK_KEY: bytes(block), b'key': bytes([height])})
+        with open(os.path.join(self.primary_score_root_path, 'score0', 'score.py'), 'w') as f:
+            f.write(f'VALUE = {height}')
+
+        path = os.path.join(self.checkpoint_path, f'{CHECKPOINT_FILE_PREFIX}{height}{CHECKPOINT_FILE_SUFFIX}')
+        with open(path, 'wb') as f:
+            write_state_snapshot(f, {ICON_DEX_DB_NAME: backend}, self.primary_score_root_path, height)
+
+    def _check_served(self, height: int) -> None:
+        self.assertEqual(height, self.replica.height)
+
+        db = KeyValueDatabase.from_path(os.path.join(self.replica.state_db_root_path, ICON_DEX_DB_NAME), False)
+        self.assertEqual(bytes([height]), db.get(b'key'))
+        db.close()
+
+        with open(os.path.join(self.replica.score_root_path, 'score0', 'score.py')) as f:
+            self.assertEqual(f'VALUE = {height}', f.read())
+
+    def test_follow_checkpoints(self):
+        self._write_checkpoint(2)
+        self._write_checkpoint(4)
+        self.replica.open()
+        self._check_served(4)
+        self.assertIsNone(self.replica.poll_checkpoint())
+
+        self._write_checkpoint(6)
+        self.assertIsNone(self.replica.poll_checkpoint())
+        self.replica.close()
+        self.assertEqual(6, self.replica.poll_checkpoint())
+        # The served generation is kept until reopening
+        self._check_served(4)
+
+        self.replica.open()
+        self._check_served(6)
+        self.assertIsNone(self.replica.poll_checkpoint())
+        self.assertEqual(['replica_6', 'replica_6.done'], sorted(os.listdir(self.state_db_root_path)))
+        self.assertEqual(['replica_6'], os.listdir(self.score_root_path))
+
+    def test_reuse_imported_checkpoint(self):
+        self._write_checkpoint(2)
+        self.replica.open()
+
+        # An interrupted import is done again
+        os.remove(os.path.join(self.state_db_root_path, 'replica_2.done'))
+        self.replica.open()
+        self._check_served(2)
+
+        # Reopening does not import again
+        rmtree(self.checkpoint_path)
+        os.makedirs(self.checkpoint_path)
+        with open(os.path.join(self.checkpoint_path, f'{CHECKPOINT_FILE_PREFIX}2{CHECKPOINT_FILE_SUFFIX}'), 'wb'):
+            pass
+        self.replica.open()
+        self._check_served(2)
+
+    def test_is_due(self):
+        self.assertFalse(self.replica.is_due())
+        self.now = 5
+        self.assertTrue(self.replica.is_due())
+        self.assertFalse(self.replica.is_due())
+        self.now = 9
+        self.assertFalse(self.replica.is_due())
+        self.now = 10
+        self.assertTrue(self.replica.is_due())
+
+    def test_invalid(self):
+        with self.assertRaises(DatabaseException):
+            self.replica.open()
+
+        # LevelDB cannot be read while another process writes it
+        with self.assertRaises(DatabaseException):
+            ReadReplica(self.state_db_root_path, self.score_root_path, BackendType.PLYVEL)
+
+        replica = ReadReplica(self.state_db_root_path, self.score_root_path, BackendType.LMDB)
+        replica.open()
+        self.assertTrue(replica.is_in_place)
+        self.assertEqual(self.state_db_root_path, replica.state_db_root_path)
+        self.assertEqual(self.score_root_path, replica.score_root_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
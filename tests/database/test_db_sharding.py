@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from iconservice.base.address import AddressPrefix
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import BackendType
+from iconservice.database.db import KeyValueDatabase, IconScoreDatabase
+from iconservice.database.factory import ContextDatabaseFactory
+from iconservice.database.sharding import DatabasePool, PooledKeyValueDatabase, ShardedContextDatabase
+from iconservice.database.sharding import _COMMIT_MARKER_PREFIX, get_shard_name, split_states
+from iconservice.database.sharding import encode_states, decode_states, migrate_to_multiple_db
+from iconservice.icon_constant import ICON_DEX_DB_NAME
+from iconservice.iconscore.icon_score_context import IconScoreContextType, IconScoreContext
+from tests import create_address, rmtree
+
+
+class TestSharding(unittest.TestCase):
+    def test_get_shard_name(self):
+        score_address = create_address(AddressPrefix.CONTRACT)
+        score_key = score_address.to_bytes() + b'|' + b'key'
+
+        self.assertEqual(score_address.body.hex(), get_shard_name(score_key))
+        self.assertEqual(score_address.body.hex(), get_shard_name(score_address.to_bytes() + b'|'))
+        # icx account of SCORE
+        self.assertIsNone(get_shard_name(score_address.to_bytes()))
+        self.assertIsNone(get_shard_name(create_address(AddressPrefix.EOA).to_bytes()))
+        self.assertIsNone(get_shard_name(create_address(AddressPrefix.EOA).to_bytes() + b'|key|'))
+        self.assertIsNone(get_shard_name(b'isds|di|' + score_address.to_bytes()))
+        self.assertIsNone(get_shard_name(b'last_block'))
+
+    def test_encode_states(self):
+        states = {b'key0': b'value0', b'key1': None, b'key2': b'', b'': b'value3'}
+        self.assertEqual(states, decode_states(encode_states(states)))
+        self.assertEqual({}, decode_states(encode_states({})))
+
+
+class TestDatabasePool(unittest.TestCase):
+    def setUp(self):
+        self.state_db_root_path = 'state_db'
+        rmtree(self.state_db_root_path)
+        os.mkdir(self.state_db_root_path)
+
+        self.pool = DatabasePool(self.state_db_root_path, BackendType.PLYVEL, size=8)
+
+    def tearDown(self):
+        self.pool.close()
+        rmtree(self.state_db_root_path)
+
+    def test_invalid_size(self):
+        with self.assertRaises(DatabaseException):
+            DatabasePool(self.state_db_root_path, BackendType.PLYVEL, size=1)
+
+    def test_lru(self):
+        names = [f'db{i}' for i in range(10)]
+
+        for i, name in enumerate(names):
+            db = PooledKeyValueDatabase(self.pool, name)
+            db.put(b'key', name.encode())
+            self.assertEqual(min(i + 1, 8), len(self.pool))
+
+        # Reopens evicted dbs
+        for name in names:
+            self.assertEqual(name.encode(), PooledKeyValueDatabase(self.pool, name).get(b'key'))
+        self.assertEqual(8, len(self.pool))
+
+    def test_db_in_use_is_not_closed(self):
+        db = PooledKeyValueDatabase(self.pool, 'db')
+        db.put(b'key0', b'value0')
+        db.put(b'key1', b'value1')
+
+        it = db.iterator()
+        self.assertEqual((b'key0', b'value0'), next(it))
+
+        # 'db' is the least recently used but in use
+        for i in range(10):
+            PooledKeyValueDatabase(self.pool, f'db{i}').put(b'key', b'value')
+        self.assertEqual(8, len(self.pool))
+
+        self.assertEqual([(b'key1', b'value1')], list(it))
+        self.assertEqual(b'value0', db.get(b'key0'))
+
+    def test_sub_db(self):
+        db = PooledKeyValueDatabase(self.pool, 'db')
+        sub_db = db.get_sub_db(b'sub|')
+
+        sub_db.write_batch({b'key0': b'value0'})
+        self.assertEqual(b'value0', db.get(b'sub|key0'))
+        self.assertEqual([(b'key0', b'value0')], list(sub_db.iterator()))
+
+
+class TestShardedContextDatabase(unittest.TestCase):
+    def setUp(self):
+        self.state_db_root_path = 'state_db'
+        rmtree(self.state_db_root_path)
+        os.mkdir(self.state_db_root_path)
+
+        self.pool = DatabasePool(self.state_db_root_path, BackendType.PLYVEL)
+        self.main_db = KeyValueDatabase.from_path(os.path.join(self.state_db_root_path, ICON_DEX_DB_NAME))
+        self.context_db = ShardedContextDatabase(self.main_db, self.pool)
+        self.context = IconScoreContext(IconScoreContextType.DIRECT)
+
+        self.score_addresses = [create_address(AddressPrefix.CONTRACT) for _ in range(2)]
+        self.states = {
+            create_address().to_bytes(): b'account',
+            self.score_addresses[0].to_bytes(): b'score_account',
+            self.score_addresses[0].to_bytes() + b'|key0': b'value0',
+            self.score_addresses[1].to_bytes() + b'|key1': b'value1'
+        }
+
+    def tearDown(self):
+        self.pool.close()
+        self.main_db.close()
+        rmtree(self.state_db_root_path)
+
+    def _assert_states(self):
+        for key, value in self.states.items():
+            name = get_shard_name(key)
+            db = self.main_db if name is None else PooledKeyValueDatabase(self.pool, name)
+            self.assertEqual(value, db.get(key))
+
+        names = [address.body.hex() for address in self.score_addresses]
+        self.assertEqual(sorted(names + [ICON_DEX_DB_NAME]), sorted(os.listdir(self.state_db_root_path)))
+        self.assertEqual(2, len(list(self.main_db.iterator())))
+
+    def test_write_batch(self):
+        self.context_db.write_batch(self.context, self.states)
+        self._assert_states()
+
+        self.context_db.write_batch(self.context, dict.fromkeys(self.states))
+        for key in self.states:
+            name = get_shard_name(key)
+            db = self.main_db if name is None else PooledKeyValueDatabase(self.pool, name)
+            self.assertIsNone(db.get(key))
+
+    def test_write_batch_on_readonly_context(self):
+        context = IconScoreContext(IconScoreContextType.QUERY)
+        with self.assertRaises(DatabaseException):
+            self.context_db.write_batch(context, self.states)
+
+    def test_recover(self):
+        # Makes the state just after the first step of commit
+        main_states, shard_states = split_states(self.states)
+        for name, states in shard_states.items():
+            main_states[_COMMIT_MARKER_PREFIX + name.encode()] = encode_states(states)
+        self.main_db.write_batch(main_states)
+
+        self.assertEqual(4, len(list(self.main_db.iterator())))
+        self.assertEqual(2, self.context_db.recover())
+        self._assert_states()
+        self.assertEqual(0, self.context_db.recover())
+
+
+class TestContextDatabaseFactoryMultipleDB(unittest.TestCase):
+    def setUp(self):
+        self.state_db_root_path = 'state_db'
+        rmtree(self.state_db_root_path)
+        os.mkdir(self.state_db_root_path)
+
+        ContextDatabaseFactory.open(self.state_db_root_path, ContextDatabaseFactory.Mode.MULTIPLE_DB)
+
+    def tearDown(self):
+        ContextDatabaseFactory.close()
+        rmtree(self.state_db_root_path)
+
+    def test_mode_from_str(self):
+        self.assertEqual(ContextDatabaseFactory.Mode.SINGLE_DB, ContextDatabaseFactory.Mode.from_str('single'))
+        self.assertEqual(ContextDatabaseFactory.Mode.MULTIPLE_DB, ContextDatabaseFactory.Mode.from_str('multiple'))
+        with self.assertRaises(DatabaseException):
+            ContextDatabaseFactory.Mode.from_str('sharded')
+
+    def test_create_by_address(self):
+        address = create_address(AddressPrefix.CONTRACT)
+        context_db = ContextDatabaseFactory.create_by_address(address)
+
+        self.assertIs(context_db, ContextDatabaseFactory.create_by_address(address))
+        self.assertIsInstance(context_db.key_value_db, PooledKeyValueDatabase)
+        self.assertIsInstance(ContextDatabaseFactory.create_by_name(ICON_DEX_DB_NAME), ShardedContextDatabase)
+
+        # SCORE states written by the main db are read by the SCORE db
+        context = IconScoreContext(IconScoreContextType.DIRECT)
+        score_db = IconScoreDatabase(address, context_db)
+        ContextDatabaseFactory.get_shared_db().write_batch(context, {address.to_bytes() + b'|key': b'value'})
+        self.assertEqual(b'value', score_db.get(b'key'))
+
+
+class TestMigration(unittest.TestCase):
+    def setUp(self):
+        self.state_db_root_path = 'state_db'
+        rmtree(self.state_db_root_path)
+        os.mkdir(self.state_db_root_path)
+
+    def tearDown(self):
+        ContextDatabaseFactory.close()
+        rmtree(self.state_db_root_path)
+
+    def test_migrate_to_multiple_db(self):
+        score_addresses = [create_address(AddressPrefix.CONTRACT) for _ in range(3)]
+        states = {create_address().to_bytes(): b'account', b'last_block': b'block'}
+        for address in score_addresses:
+            states[address.to_bytes()] = b'score_account'
+            for i in range(5):
+                states[address.to_bytes() + b'|' + bytes([i])] = bytes([i])
+
+        ContextDatabaseFactory.open(self.state_db_root_path, ContextDatabaseFactory.Mode.SINGLE_DB)
+        ContextDatabaseFactory.get_shared_db().key_value_db.write_batch(states)
+        ContextDatabaseFactory.close()
+
+        self.assertEqual(15, migrate_to_multiple_db(self.state_db_root_path, BackendType.PLYVEL, batch_size=4))
+        self.assertEqual(0, migrate_to_multiple_db(self.state_db_root_path, BackendType.PLYVEL))
+
+        ContextDatabaseFactory.open(self.state_db_root_path, ContextDatabaseFactory.Mode.MULTIPLE_DB)
+        main_db = ContextDatabaseFactory.get_shared_db().key_value_db
+        self.assertEqual(5, len(list(main_db.iterator())))
+
+        for key, value in states.items():
+            name = get_shard_name(key)
+            context_db = ContextDatabaseFactory.get_shared_db() if name is None \
+                else ContextDatabaseFactory.create_by_name(name)
+            self.assertEqual(value, context_db.key_value_db.get(key))
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import io
+import os
+import unittest
+
+from iconservice.base.address import AddressPrefix
+from iconservice.base.block import Block
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import BackendType
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.sharding import encode_states
+from iconservice.database.state_snapshot import ChunkType, SnapshotWriter, _pack_name
+from iconservice.database.state_snapshot import export_state_snapshot, import_state_snapshot
+from iconservice.icon_constant import ICON_DEX_DB_NAME
+from tests import create_address, create_block_hash, create_tx_hash, rmtree
+
+
+class TestStateSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.root_path = 'state_snapshot'
+        rmtree(self.root_path)
+
+        self.state_db_root_path = os.path.join(self.root_path, 'src', 'statedb')
+        self.score_root_path = os.path.join(self.root_path, 'src', 'score')
+        self.block = Block(10, create_block_hash(), 1234, create_block_hash())
+
+        self.states = {
+            ICON_DEX_DB_NAME: {b'last_block': bytes(self.block)},
+            'score_db': {},
+            'empty_db': {}
+        }
+        for i in range(1000):
+            self.states[ICON_DEX_DB_NAME][i.to_bytes(4, 'big')] = os.urandom(i % 50)
+            self.states['score_db'][b'key' + i.to_bytes(2, 'big')] = b'value' * (i % 3)
+
+        os.makedirs(self.state_db_root_path)
+        for name, states in self.states.items():
+            db = KeyValueDatabase.from_path(os.path.join(self.state_db_root_path, name))
+            for key, value in states.items():
+                db.put(key, value)
+            db.close()
+
+        self.files = {
+            os.path.join('cx01', '0x01', 'package.json'): b'{}',
+            os.path.join('cx01', '0x01', '__init__.py'): b'',
+            os.path.join('cx01', '0x02', 'score.py'): os.urandom(10000)
+        }
+        for name, data in self.files.items():
+            path = os.path.join(self.score_root_path, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+
+    def tearDown(self):
+        rmtree(self.root_path)
+
+    def _export(self, **kwargs) -> bytes:
+        f = io.BytesIO()
+        export_state_snapshot(f, self.state_db_root_path, self.score_root_path, BackendType.PLYVEL, **kwargs)
+        return f.getvalue()
+
+    def _import(self, data: bytes) -> 'Block':
+        state_db_root_path = os.path.join(self.root_path, 'dst', 'statedb')
+        score_root_path = os.path.join(self.root_path, 'dst', 'score')
+        return import_state_snapshot(io.BytesIO(data), state_db_root_path, score_root_path, BackendType.PLYVEL)
+
+    def test_export_and_import(self):
+        data = self._export(block_height=10, chunk_size=1024)
+        block = self._import(data)
+
+        self.assertEqual(bytes(self.block), bytes(block))
+
+        state_db_root_path = os.path.join(self.root_path, 'dst', 'statedb')
+        self.assertEqual(sorted(self.states), sorted(os.listdir(state_db_root_path)))
+        for name, states in self.states.items():
+            db = KeyValueDatabase.from_path(os.path.join(state_db_root_path, name), False)
+            self.assertEqual(states, dict(db.iterator()))
+            db.close()
+
+        for name, data in self.files.items():
+            with open(os.path.join(self.root_path, 'dst', 'score', name), 'rb') as f:
+                self.assertEqual(data, f.read())
+
+    def test_export_with_wrong_block_height(self):
+        with self.assertRaises(DatabaseException):
+            self._export(block_height=11)
+
+    def test_import_broken_snapshot(self):
+        data = self._export(chunk_size=1024)
+
+        # Truncated
+        with self.assertRaises(DatabaseException):
+            self._import(data[:-10])
+        # Nothing written before the failure is left
+        self.assertEqual([], os.listdir(os.path.join(self.root_path, 'dst')))
+
+        # Broken chunk
+        data = bytearray(data)
+        data[len(data) // 2] ^= 0xff
+        with self.assertRaises(DatabaseException):
+            self._import(bytes(data))
+
+    def test_import_to_not_empty_path(self):
+        data = self._export()
+        self._import(data)
+
+        with self.assertRaises(DatabaseException):
+            self._import(data)
+
+    def test_import_snapshot_with_wrong_digest(self):
+        f = io.BytesIO()
+        writer = SnapshotWriter(f)
+        writer.write_chunk(ChunkType.META, b'{"lastBlock": "%s", "dbs": []}' % bytes(self.block).hex().encode())
+        writer._hash.update(b'changed')
+        writer.close()
+
+        with self.assertRaises(DatabaseException):
+            self._import(f.getvalue())
+
+    def test_import_snapshot_with_wrong_digest_after_data(self):
+        f = io.BytesIO()
+        writer = SnapshotWriter(f)
+        writer.write_chunk(ChunkType.META, b'{"lastBlock": "%s", "dbs": ["%s"]}' % (bytes(self.block).hex().encode(), ICON_DEX_DB_NAME.encode()))
+        writer.write_chunk(ChunkType.DB, _pack_name(ICON_DEX_DB_NAME) + encode_states({b'key': b'value'}))
+        writer.write_chunk(ChunkType.FILE, _pack_name(os.path.join('cx01', '0x01', 'score.py')) + b'data')
+        writer._hash.update(b'changed')
+        writer.close()
+
+        with self.assertRaises(DatabaseException):
+            self._import(f.getvalue())
+
+        # Unverified states are not imported
+        self.assertEqual([], os.listdir(os.path.join(self.root_path, 'dst')))
+        self._import(self._export())
+
+    def test_import_snapshot_with_invalid_path(self):
+        f = io.BytesIO()
+        writer = SnapshotWriter(f)
+        writer.write_chunk(ChunkType.META, b'{"lastBlock": "%s", "dbs": []}' % bytes(self.block).hex().encode())
+        writer.write_chunk(ChunkType.FILE, b'\x00\x06../bad')
+        writer.close()
+
+        with self.assertRaises(DatabaseException):
+            self._import(f.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.root_path, 'dst', 'bad')))
+
+    def _make_link_name(self) -> str:
+        return os.path.join(create_address(AddressPrefix.CONTRACT).to_bytes().hex(), f'0x{create_tx_hash().hex()}')
+
+    def _make_snapshot(self, *chunks) -> bytes:
+        f = io.BytesIO()
+        writer = SnapshotWriter(f)
+        writer.write_chunk(ChunkType.META, b'{"lastBlock": "%s", "dbs": []}' % bytes(self.block).hex().encode())
+        for chunk_type, name, data in chunks:
+            writer.write_chunk(chunk_type, _pack_name(name) + data)
+        writer.close()
+        return f.getvalue()
+
+    def test_export_and_import_links(self):
+        package_path = os.path.join(self.score_root_path, '.packages', 'abcd')
+        os.makedirs(package_path)
+        with open(os.path.join(package_path, 'package.json'), 'wb') as f:
+            f.write(b'{"version": "0.0.1"}')
+        link_name = self._make_link_name()
+        other_link_name = self._make_link_name()
+        for name in (link_name, other_link_name):
+            os.makedirs(os.path.join(self.score_root_path, os.path.dirname(name)))
+        os.symlink(os.path.join('..', '.packages', 'abcd'), os.path.join(self.score_root_path, link_name))
+        # A link to outside score root is left out
+        os.symlink(os.path.abspath(self.root_path), os.path.join(self.score_root_path, other_link_name))
+
+        self._import(self._export())
+
+        link_path = os.path.join(self.root_path, 'dst', 'score', link_name)
+        self.assertTrue(os.path.islink(link_path))
+        with open(os.path.join(link_path, 'package.json'), 'rb') as f:
+            self.assertEqual(b'{"version": "0.0.1"}', f.read())
+        self.assertFalse(os.path.lexists(os.path.join(self.root_path, 'dst', 'score', other_link_name)))
+
+    def test_import_snapshot_with_invalid_link(self):
+        data = self._make_snapshot((ChunkType.LINK, 'cx01', b'../../bad'))
+
+        with self.assertRaises(DatabaseException):
+            self._import(data)
+        self.assertFalse(os.path.lexists(os.path.join(self.root_path, 'dst', 'score', 'cx01')))
+
+        # A link in the shape of a package link refers to outside score root
+        rmtree(os.path.join(self.root_path, 'dst'))
+        data = self._make_snapshot((ChunkType.LINK, self._make_link_name(), b'../.packages/../../bad'))
+        with self.assertRaises(DatabaseException):
+            self._import(data)
+
+    def test_import_snapshot_with_chained_links(self):
+        # Links created in the import must not lead a file outside score root
+        data = self._make_snapshot(
+            (ChunkType.FILE, 'q/f', b''),
+            (ChunkType.LINK, 'x/y/z', b'../../q'),
+            (ChunkType.LINK, 'x/y/z/w', b'../../../b'),
+            (ChunkType.FILE, 'x/y/z/w/pwned.txt', b'pwned'))
+
+        with self.assertRaises(DatabaseException):
+            self._import(data)
+        self.assertFalse(os.path.lexists(os.path.join(self.root_path, 'dst', 'pwned.txt')))
+        self.assertFalse(os.path.lexists(os.path.join(self.root_path, 'dst', 'b')))
+
+    def test_import_snapshot_with_file_under_link(self):
+        link_name = self._make_link_name()
+        data = self._make_snapshot(
+            (ChunkType.FILE, '.packages/abcd/package.json', b'{}'),
+            (ChunkType.LINK, link_name, b'../.packages/abcd'),
+            (ChunkType.FILE, os.path.join(link_name, 'score.py'), b''))
+
+        with self.assertRaises(DatabaseException):
+            self._import(data)
+        self.assertFalse(os.path.lexists(os.path.join(self.root_path, 'dst', 'score', '.packages', 'abcd',
+                                                      'score.py')))
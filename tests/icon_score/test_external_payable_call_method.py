@@ -25,6 +25,7 @@ from iconservice.base.transaction import Transaction
 from iconservice.database.db import IconScoreDatabase
 from iconservice.deploy.icon_score_deploy_engine import IconScoreDeployEngine
 from iconservice.iconscore.icon_score_base import IconScoreBase, external, payable
+from iconservice.iconscore.icon_score_constant import CONST_CLASS_DISPATCH_TABLE, STR_FALLBACK
 from iconservice.iconscore.icon_score_context import ContextContainer, IconScoreContext
 from iconservice.iconscore.icon_score_context import IconScoreContextType, IconScoreFuncType
 
@@ -221,3 +222,31 @@ class TestExternalPayableCall(unittest.TestCase):
             func('func2', (), {})
         self.assertEqual(e.exception.code, ExceptionCode.METHOD_NOT_FOUND)
         self.assertEqual(e.exception.message, "Invalid external method")
+
+    def test_dispatch_table(self):
+        table = getattr(ExternalPayableCallClass, CONST_CLASS_DISPATCH_TABLE)
+        self.assertEqual({'func1', 'func2', STR_FALLBACK}, set(table))
+        self.assertTrue(table['func1'].is_payable)
+        self.assertFalse(table['func2'].is_payable)
+        self.assertFalse(table[STR_FALLBACK].is_external)
+
+        table = getattr(ExternalCallClass, CONST_CLASS_DISPATCH_TABLE)
+        self.assertTrue(table['func1'].is_readonly)
+        self.assertFalse(table['func2'].is_readonly)
+
+        # Overridden functions follow the child class
+        table = getattr(ChildCallClass, CONST_CLASS_DISPATCH_TABLE)
+        self.assertEqual({'func1', STR_FALLBACK}, set(table))
+
+    def test_convert_params(self):
+        test_score = ExternalCallClass(Mock())
+        get_func_entry = getattr(test_score, '_IconScoreBase__get_func_entry')
+
+        func_entry = get_func_entry('func2', allow_fallback=False)
+        self.assertEqual({'value': 16}, func_entry.convert_params({'value': '0x10'}))
+        self.assertEqual({'value': None}, func_entry.convert_params({'value': None}))
+
+        with self.assertRaises(BaseException) as e:
+            get_func_entry(STR_FALLBACK, allow_fallback=False)
+        self.assertEqual(e.exception.code, ExceptionCode.METHOD_NOT_FOUND)
+        self.assertFalse(get_func_entry(STR_FALLBACK).is_external)
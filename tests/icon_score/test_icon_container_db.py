@@ -17,11 +17,11 @@
 import unittest
 
 from iconservice import Address
-from iconservice.database.db import ContextDatabase, IconScoreDatabase
+from iconservice.database.db import ContextDatabase, IconScoreDatabase, DatabaseObserver
 from iconservice.iconscore.icon_score_context import IconScoreContextType, IconScoreContext
 from iconservice.base.address import AddressPrefix
 from iconservice.base.exception import ContainerDBException
-from iconservice.iconscore.icon_container_db import ContainerUtil, DictDB, ArrayDB, VarDB
+from iconservice.iconscore.icon_container_db import ContainerUtil, DictDB, ArrayDB, VarDB, SetDB, SortedDB
 from iconservice.iconscore.icon_score_context import ContextContainer
 from tests import create_address
 from tests.mock_db import MockKeyValueDatabase
@@ -228,6 +228,161 @@ class TestIconContainerDB(unittest.TestCase):
         self.assertEqual(5, testarray.pop())
         self.assertEqual(2, len(testarray))
 
+    def test_array_db_iter_and_slice(self):
+        testarray = ArrayDB('test_array', self.db, value_type=int)
+        range_size = 100
+        for i in range(range_size):
+            testarray.put(i)
+
+        self.assertEqual(list(range(range_size)), list(testarray))
+        self.assertEqual(list(range(range_size))[10:50], testarray[10:50])
+        self.assertEqual(list(range(range_size))[-5:], testarray[-5:])
+        self.assertEqual(list(range(range_size))[::7], testarray[::7])
+        self.assertEqual([], testarray[50:10])
+        self.assertTrue(range_size - 1 in testarray)
+        self.assertFalse(range_size in testarray)
+
+        # iter() resets the cursor of next()
+        self.assertEqual([0, 1], [next(testarray), next(testarray)])
+        self.assertEqual(list(range(range_size)), list(testarray))
+        self.assertEqual(0, next(testarray))
+
+    def test_array_db_extend(self):
+        def create_observed_db(events: list) -> 'IconScoreDatabase':
+            db = self.create_db()
+            db.set_observer(DatabaseObserver(
+                lambda context, key, value: events.append(('get', key, value)),
+                lambda context, key, old_value, new_value: events.append(('put', key, old_value, new_value)),
+                lambda context, key, old_value: events.append(('delete', key, old_value))))
+            return db
+
+        loop_events = []
+        loop_array = ArrayDB('test_array', create_observed_db(loop_events), value_type=int)
+        extend_events = []
+        extend_db = create_observed_db(extend_events)
+        extend_array = ArrayDB('test_array', extend_db, value_type=int)
+
+        for array in (loop_array, extend_array):
+            array.put(0)
+            array.pop()
+        loop_events.clear()
+        extend_events.clear()
+
+        for i in range(300):
+            loop_array.put(i)
+        extend_array.extend(range(300))
+
+        # Observer is notified as if put were called for each value
+        self.assertEqual(loop_events, extend_events)
+        self.assertEqual(300, len(extend_array))
+        self.assertEqual(list(loop_array), list(extend_array))
+
+        # The size is persisted
+        reloaded_array = ArrayDB('test_array', extend_db, value_type=int)
+        self.assertEqual(300, len(reloaded_array))
+        self.assertEqual(299, reloaded_array.pop())
+        self.assertEqual(299, len(ArrayDB('test_array', extend_db, value_type=int)))
+
+    def test_dict_db_get_many(self):
+        test_dict = DictDB('test_dict', self.db, value_type=int)
+        test_dict['a'] = 1
+        test_dict['c'] = 3
+
+        self.assertEqual([1, 0, 3], test_dict.get_many(['a', 'b', 'c']))
+
+        test_dict2 = DictDB('test_dict2', self.db, value_type=int, depth=2)
+        with self.assertRaises(ContainerDBException):
+            test_dict2.get_many(['a'])
+
+    def test_set_db(self):
+        test_set = SetDB('test_set', self.db, value_type=int)
+        prefix: bytes = ContainerUtil.create_db_prefix(SetDB, 'test_set')
+        self.assertEqual(b'\x03|test_set', prefix)
+
+        for value in [3, -1, 300, 3, 0]:
+            test_set.add(value)
+
+        self.assertEqual(4, len(test_set))
+        self.assertTrue(300 in test_set)
+        self.assertFalse(4 in test_set)
+        self.assertEqual({-1, 0, 3, 300}, set(test_set))
+
+        test_set.remove(3)
+        test_set.remove(4)
+        self.assertEqual(3, len(test_set))
+        self.assertFalse(3 in test_set)
+        self.assertEqual({-1, 0, 300}, set(test_set))
+
+        # Other containers are not included on iteration
+        other_set = SetDB('test_set2', self.db, value_type=int)
+        other_set.add(1)
+        self.assertEqual({-1, 0, 300}, set(SetDB('test_set', self.db, value_type=int)))
+
+    def test_set_db_name_with_separator(self):
+        self.assertEqual(b'\x03|a\\|items\\|b\\\\', ContainerUtil.create_db_prefix(SetDB, 'a|items|b\\'))
+
+        # The items of a container whose name starts with the items prefix of another one are not included
+        test_set = SetDB('a', self.db, value_type=int)
+        test_set.add(1)
+        other_set = SetDB('a|items|b', self.db, value_type=int)
+        other_set.add(2)
+        test_sorted = SortedDB('a', self.db, key_type=int, value_type=int)
+        test_sorted[1] = 1
+        other_sorted = SortedDB('a|items|b', self.db, key_type=int, value_type=int)
+        other_sorted[2] = 2
+
+        self.assertEqual([1], list(test_set))
+        self.assertEqual([2], list(other_set))
+        self.assertEqual([(1, 1)], list(test_sorted.items()))
+        self.assertEqual([(2, 2)], list(other_sorted.items()))
+
+    def test_sorted_db(self):
+        test_sorted = SortedDB('test_sorted', self.db, key_type=int, value_type=str)
+        prefix: bytes = ContainerUtil.create_db_prefix(SortedDB, 'test_sorted')
+        self.assertEqual(b'\x04|test_sorted', prefix)
+
+        keys = [0, 1, -1, 255, 256, -255, -256, -257, 10 ** 30, -10 ** 30, 127, 128]
+        for key in keys:
+            test_sorted[key] = str(key)
+
+        self.assertEqual(len(keys), len(test_sorted))
+        self.assertEqual(sorted(keys), list(test_sorted))
+        self.assertEqual('255', test_sorted[255])
+        self.assertEqual('', test_sorted[2])
+        self.assertTrue(-257 in test_sorted)
+
+        self.assertEqual([(k, str(k)) for k in sorted(keys) if -256 <= k < 128],
+                         list(test_sorted.items(-256, 128)))
+        self.assertEqual([(k, str(k)) for k in sorted(keys, reverse=True) if k >= 0],
+                         list(test_sorted.items(start=0, reverse=True)))
+        self.assertEqual([(10 ** 30, str(10 ** 30)), (256, '256'), (255, '255')], test_sorted.top(3))
+
+        test_sorted[256] = 'a'
+        del test_sorted[255]
+        test_sorted.remove(255)
+        self.assertEqual(len(keys) - 1, len(test_sorted))
+        self.assertEqual([(10 ** 30, str(10 ** 30)), (256, 'a'), (128, '128')], test_sorted.top(3))
+
+        with self.assertRaises(ContainerDBException):
+            test_sorted['a'] = 'a'
+
+    def test_sorted_db_str_key(self):
+        test_sorted = SortedDB('test_sorted', self.db, key_type=str, value_type=int)
+        for i, key in enumerate(['b', 'ab', 'a', 'abc', 'c']):
+            test_sorted[key] = i
+
+        self.assertEqual(['a', 'ab', 'abc', 'b', 'c'], list(test_sorted))
+        self.assertEqual([('ab', 1), ('abc', 3)], list(test_sorted.items('ab', 'b')))
+
+    def test_sort_key(self):
+        keys = sorted([0, 1, -1, 2 ** 64, -2 ** 64, 2 ** 64 - 1, 1 - 2 ** 64, 65535, -65536])
+        encoded_keys = [ContainerUtil.encode_sort_key(key) for key in keys]
+        self.assertEqual(sorted(encoded_keys), encoded_keys)
+        self.assertEqual(keys, [ContainerUtil.decode_sort_key(key, int) for key in encoded_keys])
+
+        with self.assertRaises(ContainerDBException):
+            ContainerUtil.encode_sort_key(2 ** (8 * 128))
+
     def test_container_util(self):
         prefix: bytes = ContainerUtil.create_db_prefix(ArrayDB, 'a')
         self.assertEqual(b'\x00|a', prefix)
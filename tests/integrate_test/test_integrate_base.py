@@ -17,11 +17,13 @@
 """IconServiceEngine testcase
 """
 
+from copy import deepcopy
 from unittest import TestCase
 
 from typing import TYPE_CHECKING, Union, Optional, Any
 
 from iconcommons import IconConfig
+from iconservice.base.address import ZERO_SCORE_ADDRESS
 from iconservice.base.block import Block
 from iconservice.icon_config import default_icon_config
 from iconservice.icon_constant import ConfigKey
@@ -58,7 +60,8 @@ class TestIntegrateBase(TestCase):
         self._block_height = 0
         self._prev_block_hash = None
 
-        config = IconConfig("", default_icon_config)
+        # update_conf() changes nested dicts in place
+        config = IconConfig("", deepcopy(default_icon_config))
         config.load()
         config.update_conf({ConfigKey.BUILTIN_SCORE_OWNER: str(self._admin)})
         config.update_conf({ConfigKey.SERVICE: {ConfigKey.SERVICE_AUDIT: False,
@@ -270,6 +273,20 @@ class TestIntegrateBase(TestCase):
     def _remove_precommit_state(self, block: 'Block') -> None:
         self.icon_service_engine.rollback(block)
 
+    def _deploy_score(self, value: int = 100) -> 'Address':
+        """Deploys test_deploy_scores/install/test_score
+
+        :param value: the initial value of the SCORE
+        :return: the address of the deployed SCORE
+        """
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_deploy_tx("test_deploy_scores/install", "test_score", self._addr_array[0], ZERO_SCORE_ADDRESS,
+                                 deploy_params={"value": hex(value)})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+        return tx_results[0].score_address
+
     def _query(self, request: dict, method: str = 'icx_call') -> Any:
         response = self.icon_service_engine.query(method, request)
         return response
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine batch estimate step testcase
+"""
+
+from copy import deepcopy
+from unittest.mock import patch
+
+from iconservice.base.address import Address
+from iconservice.base.exception import ExceptionCode, IconServiceBaseException
+from iconservice.icon_inner_service import IconScoreInnerTask
+from iconservice.icon_service_engine import IconServiceEngine
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateBatchEstimateStep(TestIntegrateBase):
+    def setUp(self):
+        super().setUp()
+
+        self.score_address = self._deploy_score()
+
+    def _make_estimate(self, to: 'Address', method: str = None, params: dict = None, value: int = 0) -> dict:
+        request_params = {
+            "version": self._version,
+            "from": self._addr_array[0],
+            "to": to,
+            "value": value
+        }
+        if method is not None:
+            request_params["dataType"] = "call"
+            request_params["data"] = {"method": method, "params": params}
+
+        return {"method": "debug_estimateStep", "params": request_params}
+
+    def test_batch_estimate_step(self):
+        requests = [
+            self._make_estimate(self.score_address, "set_value", {"value": hex(0)}),
+            self._make_estimate(self.score_address, "set_value", {"value": hex(200)}),
+            self._make_estimate(self._addr_array[1], value=10),
+            self._make_estimate(self.score_address, "no_method", {}),
+            self._make_estimate(self.score_address, "set_value", {"value": hex(0)})
+        ]
+
+        expected = []
+        for request in requests:
+            self.icon_service_engine._estimate_step_cache.clear()
+            try:
+                expected.append(self.icon_service_engine.estimate_step(deepcopy(request)))
+            except IconServiceBaseException as e:
+                expected.append(e.code)
+        self.assertNotEqual(expected[0], expected[1])
+
+        # A context is reused with its states thrown away for each request
+        self.icon_service_engine._estimate_step_cache.clear()
+        with patch.object(IconServiceEngine, '_create_estimation_context',
+                          autospec=True, side_effect=IconServiceEngine._create_estimation_context) as create:
+            results = self.icon_service_engine.batch_estimate_step(deepcopy(requests))
+        self.assertEqual(1, create.call_count)
+
+        self.assertEqual(5, len(results))
+        self.assertEqual(expected[:3], results[:3])
+        self.assertIsInstance(results[3], IconServiceBaseException)
+        self.assertEqual(expected[3], results[3].code)
+        self.assertEqual(expected[4], results[4])
+        self.assertFalse(self.icon_service_engine._commit_lock.locked())
+
+        # The states are not changed
+        self.assertEqual(100, self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": self.score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        }))
+
+    def test_batch_estimate_step_without_commit_lock(self):
+        requests = [
+            self._make_estimate(self.score_address, "set_value", {"value": hex(200)}),
+            self._make_estimate(self._addr_array[1], value=10)
+        ]
+        estimate_step = self.icon_service_engine._estimate_step
+        locked = []
+
+        def _estimate_step(context, request):
+            locked.append(self.icon_service_engine._commit_lock.locked())
+            self.assertIsNotNone(context.read_view)
+            return estimate_step(context, request)
+
+        # Requests read the pinned states, so commits are not held up while they run
+        with patch.object(self.icon_service_engine, '_estimate_step', side_effect=_estimate_step):
+            results = self.icon_service_engine.batch_estimate_step(deepcopy(requests))
+
+        self.assertEqual([False, False], locked)
+        self.assertTrue(all(isinstance(result, int) for result in results))
+
+    def test_estimate_step_cache(self):
+        request = self._make_estimate(self.score_address, "set_value", {"value": hex(200)})
+        estimate = self.icon_service_engine.estimate_step(deepcopy(request))
+
+        with patch.object(IconServiceEngine, '_estimate_step', autospec=True) as estimate_step:
+            self.assertEqual(estimate, self.icon_service_engine.estimate_step(deepcopy(request)))
+            self.assertEqual([estimate], self.icon_service_engine.batch_estimate_step([deepcopy(request)]))
+            estimate_step.assert_not_called()
+
+        # Other values are not served from the cache
+        with patch.object(IconServiceEngine, '_estimate_step', autospec=True, return_value=1) as estimate_step:
+            self.icon_service_engine.estimate_step(
+                self._make_estimate(self.score_address, "set_value", {"value": hex(300)}))
+            self.icon_service_engine.estimate_step(
+                self._make_estimate(self.score_address, "set_value", {"value": hex(200)}, value=1))
+            self.assertEqual(2, estimate_step.call_count)
+
+        # A commit invalidates the cache
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], self.score_address, 'set_value', {"value": hex(200)})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(0, len(self.icon_service_engine._estimate_step_cache))
+
+        with patch.object(IconServiceEngine, '_estimate_step', autospec=True, return_value=1) as estimate_step:
+            self.assertEqual(1, self.icon_service_engine.estimate_step(deepcopy(request)))
+            estimate_step.assert_called_once()
+
+    def test_inner_task_batch_estimate_step(self):
+        inner_task = IconScoreInnerTask.__new__(IconScoreInnerTask)
+        inner_task._icon_service_engine = self.icon_service_engine
+
+        request = self._make_estimate(self.score_address, "set_value", {"value": hex(200)})
+        request['params'].update({'version': hex(self._version), 'from': str(self._addr_array[0]),
+                                  'to': str(self.score_address), 'value': hex(0)})
+
+        responses = inner_task._batch_estimate_step([
+            deepcopy(request),
+            {'method': 'icx_getTotalSupply', 'params': {}},
+            deepcopy(request)
+        ])
+
+        estimate = self.icon_service_engine.estimate_step(
+            self._make_estimate(self.score_address, "set_value", {"value": hex(200)}))
+        self.assertEqual([hex(estimate), hex(estimate)], [responses[0], responses[2]])
+        self.assertEqual(ExceptionCode.INVALID_REQUEST, responses[1]['error']['code'])
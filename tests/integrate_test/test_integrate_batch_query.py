@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine batch query testcase
+"""
+
+from unittest.mock import Mock, call
+
+from iconservice.base.exception import ExceptionCode, ExternalException
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_inner_service import IconScoreInnerTask
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateBatchQuery(TestIntegrateBase):
+    def setUp(self):
+        super().setUp()
+
+        self.score_address = self._deploy_score()
+
+    def _make_call(self, method: str) -> dict:
+        return {
+            "version": self._version,
+            "from": self._admin,
+            "to": self.score_address,
+            "dataType": "call",
+            "data": {"method": method, "params": {}}
+        }
+
+    def test_batch_query(self):
+        self.icon_service_engine._handlers['test_isCommitLocked'] = \
+            lambda context, params: self.icon_service_engine._commit_lock.locked()
+
+        results = self.icon_service_engine.batch_query([
+            ('icx_call', self._make_call('get_value')),
+            ('icx_getBalance', {'address': self._genesis}),
+            ('icx_call', self._make_call('no_method')),
+            ('icx_getTotalSupply', {}),
+            ('test_isCommitLocked', {})
+        ])
+
+        self.assertEqual(5, len(results))
+        self.assertEqual(100, results[0])
+        self.assertEqual(self._query({'address': self._genesis}, 'icx_getBalance'), results[1])
+        self.assertIsInstance(results[2], ExternalException)
+        self.assertEqual(ExceptionCode.METHOD_NOT_FOUND, results[2].code)
+        self.assertEqual(self._query({}, 'icx_getTotalSupply'), results[3])
+        # The commit lock is held only while the committed states are pinned
+        self.assertFalse(results[4])
+        self.assertFalse(self.icon_service_engine._commit_lock.locked())
+
+    def test_batch_query_checkpoint(self):
+        checkpoint = Mock()
+        self.icon_service_engine.set_query_checkpoint(checkpoint)
+
+        results = self.icon_service_engine.batch_query([
+            ('icx_getBalance', {'address': self._genesis}),
+            ('icx_getTotalSupply', {})
+        ])
+        self.icon_service_engine.set_query_checkpoint(None)
+
+        # It is called before each request and it can wait for block work without the commit lock
+        self.assertEqual(2, len(results))
+        self.assertEqual([call(True), call(True)], checkpoint.call_args_list)
+
+    def test_batch_query_with_commit(self):
+        receiver = self._addr_array[1]
+        balance: int = self._query({'address': receiver}, 'icx_getBalance')
+
+        def _commit_block(context, params):
+            prev_block, tx_results = self._make_and_req_block([
+                self._make_icx_send_tx(self._genesis, receiver, 1)
+            ])
+            self._write_precommit_state(prev_block)
+            return tx_results[0].status
+
+        self.icon_service_engine._handlers['test_commitBlock'] = _commit_block
+
+        results = self.icon_service_engine.batch_query([
+            ('icx_getBalance', {'address': receiver}),
+            ('test_commitBlock', {}),
+            ('icx_getBalance', {'address': receiver})
+        ])
+
+        # A block is committed while the batch runs but the batch keeps reading the states pinned before
+        self.assertEqual(int(True), results[1])
+        self.assertEqual([balance, balance], [results[0], results[2]])
+        self.assertEqual(balance + 1, self._query({'address': receiver}, 'icx_getBalance'))
+
+    def test_inner_task_batch_query(self):
+        inner_task = IconScoreInnerTask.__new__(IconScoreInnerTask)
+        inner_task._icon_service_engine = self.icon_service_engine
+
+        call = self._make_call('get_value')
+        call.update({'version': hex(self._version), 'from': str(self._admin), 'to': str(self.score_address)})
+
+        responses = inner_task._batch_query([
+            {'method': 'icx_call', 'params': call},
+            {'method': 'icx_getBalance', 'params': {'address': str(self._genesis)}},
+            {'method': 'debug_estimateStep', 'params': {}},
+            {'method': 'icx_getBalance', 'params': {'address': 'invalid'}},
+            {'method': 'icx_getTotalSupply', 'params': {}}
+        ])
+
+        self.assertEqual(5, len(responses))
+        self.assertEqual(hex(100), responses[0])
+        self.assertEqual(hex(self._query({'address': self._genesis}, 'icx_getBalance')), responses[1])
+        self.assertEqual(ExceptionCode.INVALID_REQUEST, responses[2]['error']['code'])
+        self.assertIn('error', responses[3])
+        self.assertEqual(hex(self._query({}, 'icx_getTotalSupply')), responses[4])
+
+
+class TestIntegrateBatchQueryMultipleDB(TestIntegrateBatchQuery):
+    """SCORE dbs cannot be pinned together, so the commit lock is held for each request
+    """
+
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.STATE_DB_MODE: 'multiple'}
+
+    def test_batch_query(self):
+        self.icon_service_engine._handlers['test_isCommitLocked'] = \
+            lambda context, params: self.icon_service_engine._commit_lock.locked()
+
+        results = self.icon_service_engine.batch_query([
+            ('icx_call', self._make_call('get_value')),
+            ('test_isCommitLocked', {})
+        ])
+
+        self.assertEqual([100, True], results)
+        self.assertFalse(self.icon_service_engine._commit_lock.locked())
+
+    def test_batch_query_with_commit(self):
+        receiver = self._addr_array[1]
+        balance: int = self._query({'address': receiver}, 'icx_getBalance')
+        tx_results = []
+
+        def _commit_block(can_wait: bool):
+            # Block work runs at the checkpoint before the second request
+            if len(tx_results) == 0 and checkpoint.call_count == 2:
+                prev_block, results = self._make_and_req_block([
+                    self._make_icx_send_tx(self._genesis, receiver, 1)
+                ])
+                self._write_precommit_state(prev_block)
+                tx_results.extend(results)
+
+        checkpoint = Mock(side_effect=_commit_block)
+        self.icon_service_engine.set_query_checkpoint(checkpoint)
+
+        results = self.icon_service_engine.batch_query([
+            ('icx_getBalance', {'address': receiver}),
+            ('icx_getBalance', {'address': receiver})
+        ])
+        self.icon_service_engine.set_query_checkpoint(None)
+
+        # The lock is released between requests, so a commit is not blocked by the batch
+        self.assertEqual(int(True), tx_results[0].status)
+        self.assertEqual([call(True), call(True)], checkpoint.call_args_list)
+        self.assertEqual([balance, balance + 1], results)
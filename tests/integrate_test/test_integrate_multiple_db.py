@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine testcase in MULTIPLE_DB mode
+"""
+
+import os
+
+from iconservice.base.address import GOVERNANCE_SCORE_ADDRESS
+from iconservice.icon_constant import ConfigKey, ICON_DEX_DB_NAME
+from tests.integrate_test import test_integrate_scores
+
+
+class TestIntegrateMultipleDB(test_integrate_scores.TestIntegrateScores):
+    """Runs the same scenarios as TestIntegrateScores with a db per SCORE
+    """
+
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.STATE_DB_MODE: 'multiple'}
+
+    def test_db_per_score(self):
+        self.assertTrue(os.path.isdir(os.path.join(self._state_db_root_path, ICON_DEX_DB_NAME)))
+        self.assertTrue(os.path.isdir(os.path.join(self._state_db_root_path, GOVERNANCE_SCORE_ADDRESS.body.hex())))
+
+    def test_query_waits_for_commit(self):
+        # SCORE dbs are written after the main db, so a query is not run in the middle of a commit
+        self.icon_service_engine._handlers['test_isCommitLocked'] = \
+            lambda context, params: self.icon_service_engine._commit_lock.locked()
+
+        self.assertTrue(self.icon_service_engine.query('test_isCommitLocked', {}))
+        self.assertFalse(self.icon_service_engine._commit_lock.locked())
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine precommit data testcase
+"""
+
+from copy import deepcopy
+
+from iconservice.base.address import Address, ZERO_SCORE_ADDRESS
+from iconservice.base.block import Block
+from iconservice.base.exception import ServerErrorException
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_inner_service import IconScoreInnerTask
+from tests import create_block_hash
+from tests.integrate_test import create_timestamp
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegratePrecommit(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.PRECOMMIT: {ConfigKey.PRECOMMIT_MAX_COUNT: 2,
+                                      ConfigKey.PRECOMMIT_MAX_BYTES: 0}}
+
+    def setUp(self):
+        super().setUp()
+        self.inner_task = IconScoreInnerTask.__new__(IconScoreInnerTask)
+        self.inner_task._icon_service_engine = self.icon_service_engine
+
+    def _make_block(self) -> 'Block':
+        return Block(self._block_height, create_block_hash(), create_timestamp(), self._prev_block_hash)
+
+    def _make_tx_list(self) -> list:
+        tx_list = [self._make_icx_send_tx(self._genesis, self._addr_array[i], 10 ** 18) for i in range(3)]
+        for tx in tx_list:
+            self._to_tx_request(tx)
+        return tx_list
+
+    @staticmethod
+    def _to_tx_request(tx: dict) -> dict:
+        params = tx['params']
+        params.update({'from': str(params['from']), 'to': str(params['to']), 'txHash': params['txHash'].hex()})
+        for key in ('value', 'stepLimit', 'timestamp', 'nonce', 'version'):
+            if key in params:
+                params[key] = hex(params[key])
+        return tx
+
+    @staticmethod
+    def _make_block_request(block: 'Block') -> dict:
+        return {'block': {'blockHeight': hex(block.height), 'blockHash': block.hash.hex(),
+                          'timestamp': hex(block.timestamp), 'prevBlockHash': block.prev_hash.hex()}}
+
+    def _invoke(self, block: 'Block', tx_list: list = None) -> dict:
+        return self.inner_task._invoke({**self._make_block_request(block),
+                                        'transactions': deepcopy(tx_list or self._make_tx_list())})
+
+    def _get_status(self) -> dict:
+        return self._query({}, 'debug_getPrecommitStatus')
+
+    def test_release_tx_results(self):
+        block = self._make_block()
+        tx_list = self._make_tx_list()
+        response = self._invoke(block, tx_list)
+        self.assertEqual(3, len(response['txResults']))
+
+        precommit_data = self.icon_service_engine._precommit_data_manager.get(block.hash)
+        self.assertTrue(precommit_data.is_released)
+
+        status = self._get_status()
+        self.assertEqual(1, status['count'])
+        self.assertEqual(precommit_data.size, status['bytes'])
+        self.assertEqual([{'blockHeight': block.height, 'blockHash': block.hash,
+                           'bytes': precommit_data.size, 'traceBytes': precommit_data.trace_size,
+                           'scoreCount': 0, 'released': True}], status['candidates'])
+
+        # The released block is invoked again with the same transactions
+        self.assertEqual(response, self._invoke(block, tx_list))
+
+        self._write_precommit_state(block)
+        self.assertEqual(0, self._get_status()['count'])
+        self.assertEqual(10 ** 18, self._query({"address": self._addr_array[0]}, 'icx_getBalance'))
+
+    def test_invoke_released_block_with_deploy(self):
+        block = self._make_block()
+        tx_list = [self._to_tx_request(
+            self._make_deploy_tx("test_deploy_scores/install", "test_score", self._addr_array[0], ZERO_SCORE_ADDRESS,
+                                 deploy_params={"value": hex(100)}))]
+        response = self._invoke(block, tx_list)
+        tx_result = response['txResults'][tx_list[0]['params']['txHash']]
+        self.assertEqual('0x1', tx_result['status'])
+
+        precommit_data = self.icon_service_engine._precommit_data_manager.get(block.hash)
+        self.assertTrue(precommit_data.is_released)
+
+        # The released block is answered from its kept result without deploying the SCORE again
+        self.assertEqual(response, self._invoke(block, tx_list))
+        self.assertIs(precommit_data, self.icon_service_engine._precommit_data_manager.get(block.hash))
+
+        binary_response = self.inner_task._invoke({**self._make_block_request(block),
+                                                   'transactions': deepcopy(tx_list), 'resultFormat': 'binary'})
+        self.assertEqual(precommit_data.state_root_hash, binary_response['stateRootHash'])
+        self.assertEqual(response['stateRootHash'], binary_response['stateRootHash'].hex())
+
+        self._write_precommit_state(block)
+        self.assertEqual(100, self._query({"version": self._version,
+                                           "from": self._admin,
+                                           "to": Address.from_string(tx_result['scoreAddress']),
+                                           "dataType": "call",
+                                           "data": {"method": "get_value", "params": {}}}))
+
+    def test_evict(self):
+        blocks = [self._make_block() for _ in range(3)]
+        for block in blocks:
+            self._invoke(block)
+
+        status = self._get_status()
+        self.assertEqual(2, status['count'])
+        self.assertEqual(1, status['evictedCount'])
+
+        with self.assertRaises(ServerErrorException) as e:
+            self._write_precommit_state(blocks[0])
+        self.assertTrue(e.exception.message.startswith('No precommit data'))
+
+        self._write_precommit_state(blocks[2])
+        self.assertEqual(10 ** 18, self._query({"address": self._addr_array[0]}, 'icx_getBalance'))
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine query budget testcase
+"""
+
+from iconservice.base.address import Address
+from iconservice.base.exception import ServerErrorException, InvalidRequestException
+from iconservice.icon_constant import ConfigKey
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateQueryBudget(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.QUERY_BUDGET: {ConfigKey.QUERY_BUDGET_ENABLE: True,
+                                         ConfigKey.QUERY_BUDGET_WINDOW: 60,
+                                         ConfigKey.QUERY_BUDGET_CALLER_STEPS: 1,
+                                         ConfigKey.QUERY_BUDGET_SCORE_STEPS: 0}}
+
+    def _get_value(self, from_: 'Address', score_address: 'Address') -> int:
+        return self._query({
+            "version": self._version,
+            "from": from_,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        })
+
+    def test_query_budget(self):
+        score_address = self._deploy_score()
+
+        self.assertEqual(100, self._get_value(self._addr_array[1], score_address))
+        with self.assertRaises(ServerErrorException):
+            self._get_value(self._addr_array[1], score_address)
+
+        # Other callers and other queries are not limited
+        self.assertEqual(100, self._get_value(self._addr_array[2], score_address))
+        self._query({"address": self._addr_array[1]}, 'icx_getBalance')
+
+        # Transactions are not limited
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[1], score_address, 'set_value', {"value": hex(200)})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+
+        status = self._query({}, 'debug_getQueryBudgetStatus')
+        self.assertEqual(1, status['callerSteps'])
+        self.assertEqual(2, status['admittedCount'])
+        self.assertEqual(1, status['rejectedCount'])
+        self.assertEqual({self._addr_array[1], self._addr_array[2]},
+                         {caller['address'] for caller in status['callers']})
+        self.assertEqual([score_address], [score['address'] for score in status['scores']])
+        self.assertEqual(sum(caller['steps'] for caller in status['callers']), status['scores'][0]['steps'])
+
+
+class TestIntegrateQueryBudgetDisabled(TestIntegrateBase):
+    def test_get_query_budget_status(self):
+        with self.assertRaises(InvalidRequestException):
+            self._query({}, 'debug_getQueryBudgetStatus')
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine query checkpoint testcase
+"""
+
+from unittest.mock import Mock, call
+
+from iconservice.base.address import Address
+from iconservice.base.exception import ServerErrorException
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateQueryCheckpoint(TestIntegrateBase):
+    def _get_value(self, score_address: 'Address') -> int:
+        return self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        })
+
+    def test_query_checkpoint(self):
+        score_address = self._deploy_score()
+
+        checkpoint = Mock()
+        self.icon_service_engine.set_query_checkpoint(checkpoint)
+        self.assertEqual(100, self._get_value(score_address))
+        self.assertGreater(checkpoint.call_count, 0)
+        # A query does not wait for block work in the middle, not to mix the states of two blocks
+        self.assertEqual([call(False)] * checkpoint.call_count, checkpoint.call_args_list)
+
+        checkpoint.side_effect = ServerErrorException('Query timeout')
+        with self.assertRaises(ServerErrorException):
+            self._get_value(score_address)
+
+        # Transactions are not affected
+        call_count = checkpoint.call_count
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], score_address, 'set_value', {"value": hex(200)})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+        self.assertEqual(call_count, checkpoint.call_count)
+
+        self.icon_service_engine.set_query_checkpoint(None)
+        self.assertEqual(200, self._get_value(score_address))
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine read replica testcase
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+import unittest
+from copy import deepcopy
+from unittest.mock import patch
+
+from iconcommons import IconConfig
+from iconservice.base.address import Address
+from iconservice.base.block import Block
+from iconservice.base.exception import InvalidRequestException, DatabaseException
+from iconservice.database.backend import BackendType
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_service_engine import IconServiceEngine
+from tests import create_block_hash
+from tests.integrate_test import create_timestamp
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+try:
+    import lmdb
+except ImportError:
+    lmdb = None
+
+
+def _commit_block(conf: dict, block: 'Block', tx_list: list) -> None:
+    """Runs the primary engine in another process
+    """
+    engine = IconServiceEngine()
+    engine.open(IconConfig("", conf))
+    try:
+        engine.invoke(block, tx_list)
+        engine.commit(block)
+    finally:
+        engine.close()
+
+
+class TestIntegrateReadReplicaBase(TestIntegrateBase):
+    def tearDown(self):
+        super().tearDown()
+        for path in ('.replica_score', '.replica_statedb', '.checkpoint'):
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _get_value(self, score_address: 'Address') -> int:
+        return self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        })
+
+    def _commit_block_in_primary(self, primary_conf: dict, score_address: 'Address', value: int) -> None:
+        block = Block(self._block_height, create_block_hash(), create_timestamp(), self._prev_block_hash)
+        tx = self._make_score_call_tx(self._addr_array[0], score_address, 'set_value', {"value": hex(value)})
+
+        process = multiprocessing.get_context('spawn').Process(target=_commit_block, args=(primary_conf, block, [tx]))
+        process.start()
+        process.join()
+        self.assertEqual(0, process.exitcode)
+
+        self._block_height += 1
+        self._prev_block_hash = block.hash
+
+    def _open_replica(self, replica_conf: dict) -> dict:
+        primary_conf = dict(self.icon_service_engine._conf)
+        self.icon_service_engine.close()
+
+        conf = deepcopy(primary_conf)
+        conf.update(replica_conf)
+        self.icon_service_engine = IconServiceEngine()
+        self.icon_service_engine.open(IconConfig("", conf))
+        return primary_conf
+
+    def _check_not_writable(self):
+        block = Block(self._block_height, create_block_hash(), create_timestamp(), self._prev_block_hash)
+        with self.assertRaises(InvalidRequestException):
+            self.icon_service_engine.invoke(block, [])
+        with self.assertRaises(InvalidRequestException):
+            self.icon_service_engine.begin_block(block)
+        with self.assertRaises(InvalidRequestException):
+            self.icon_service_engine.commit(block)
+        with self.assertRaises(InvalidRequestException):
+            self.icon_service_engine.rollback_to(0)
+
+
+@unittest.skipIf(lmdb is None, 'lmdb is not installed')
+class TestIntegrateReadReplicaInPlace(TestIntegrateReadReplicaBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.STATE_DB_BACKEND: BackendType.LMDB}
+
+    def test_follow_committed_states(self):
+        score_address = self._deploy_score()
+
+        primary_conf = self._open_replica({
+            ConfigKey.READ_REPLICA: {ConfigKey.READ_REPLICA_ENABLE: True,
+                                     ConfigKey.READ_REPLICA_REFRESH_INTERVAL: 0}
+        })
+        self.assertEqual(100, self._get_value(score_address))
+        self.assertEqual(self._block_height - 1, self._query({}, 'ise_getStatus')['lastBlock']['blockHeight'])
+        self._check_not_writable()
+
+        # The primary keeps writing while the replica reads
+        self._commit_block_in_primary(primary_conf, score_address, 200)
+        self.assertEqual(200, self._get_value(score_address))
+        self.assertEqual(self._block_height - 1, self._query({}, 'ise_getStatus')['lastBlock']['blockHeight'])
+
+        # SCORE packages of the primary are kept
+        self.icon_service_engine.close()
+        self.assertTrue(os.listdir(self._score_root_path))
+        self.icon_service_engine.open(self.icon_service_engine._conf)
+
+
+    def test_pinned_states(self):
+        score_address = self._deploy_score()
+
+        primary_conf = self._open_replica({
+            ConfigKey.READ_REPLICA: {ConfigKey.READ_REPLICA_ENABLE: True,
+                                     ConfigKey.READ_REPLICA_REFRESH_INTERVAL: 3600}
+        })
+        self._commit_block_in_primary(primary_conf, score_address, 200)
+
+        # States and the last block stay the ones pinned at the last refresh
+        self.assertEqual(100, self._get_value(score_address))
+        self.assertEqual(self._block_height - 2, self._query({}, 'ise_getStatus')['lastBlock']['blockHeight'])
+        self.assertEqual([100], self.icon_service_engine.batch_query([('icx_call', {
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        })]))
+
+        with patch.object(self.icon_service_engine._read_replica, 'is_due', return_value=True):
+            self.assertEqual(200, self._get_value(score_address))
+            self.assertEqual(self._block_height - 1,
+                             self._query({}, 'ise_getStatus')['lastBlock']['blockHeight'])
+
+
+class TestIntegrateReadReplicaCheckpoint(TestIntegrateReadReplicaBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.STATE_HISTORY: {ConfigKey.STATE_HISTORY_CHECKPOINT_INTERVAL: 1,
+                                          ConfigKey.STATE_HISTORY_CHECKPOINT_PATH: '.checkpoint',
+                                          ConfigKey.STATE_HISTORY_MAX_CHECKPOINTS: 2}}
+
+    def test_follow_checkpoints(self):
+        score_address = self._deploy_score()
+
+        primary_conf = self._open_replica({
+            ConfigKey.SCORE_ROOT_PATH: '.replica_score',
+            ConfigKey.STATE_DB_ROOT_PATH: '.replica_statedb',
+            ConfigKey.READ_REPLICA: {ConfigKey.READ_REPLICA_ENABLE: True,
+                                     ConfigKey.READ_REPLICA_CHECKPOINT_PATH: '.checkpoint',
+                                     ConfigKey.READ_REPLICA_REFRESH_INTERVAL: 0}
+        })
+        self.assertEqual(100, self._get_value(score_address))
+        self._check_not_writable()
+
+        self._commit_block_in_primary(primary_conf, score_address, 200)
+        sys_path = list(sys.path)
+
+        # The newer checkpoint is imported in background and served without reopening the engine
+        deadline = time.monotonic() + 30
+        with patch.object(IconServiceEngine, 'open') as engine_open, \
+                patch.object(IconServiceEngine, 'close') as engine_close:
+            while self._get_value(score_address) != 200:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.1)
+        engine_open.assert_not_called()
+        engine_close.assert_not_called()
+        self.assertEqual(len(sys_path), len(sys.path))
+
+        self.assertEqual(self._block_height - 1, self._query({}, 'ise_getStatus')['lastBlock']['blockHeight'])
+        self.assertEqual([f'replica_{self._block_height - 1}'],
+                         [name for name in os.listdir('.replica_statedb') if not name.endswith('.done')])
+
+
+class TestIntegrateReadReplicaInvalid(TestIntegrateReadReplicaBase):
+    def _check_open_failure(self, replica_conf: dict) -> None:
+        primary_conf = dict(self.icon_service_engine._conf)
+        self.icon_service_engine.close()
+
+        conf = deepcopy(primary_conf)
+        conf.update(replica_conf)
+        with self.assertRaises(DatabaseException):
+            IconServiceEngine().open(IconConfig("", conf))
+
+        # tearDown closes the engine again
+        self.icon_service_engine.open(IconConfig("", primary_conf))
+
+    def test_plyvel_in_place(self):
+        self._check_open_failure({ConfigKey.READ_REPLICA: {ConfigKey.READ_REPLICA_ENABLE: True}})
+
+    def test_no_checkpoint(self):
+        self._check_open_failure({ConfigKey.READ_REPLICA: {ConfigKey.READ_REPLICA_ENABLE: True,
+                                                           ConfigKey.READ_REPLICA_CHECKPOINT_PATH: '.checkpoint'}})
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine rollback_to testcase
+"""
+
+import os
+
+from iconservice.base.address import ZERO_SCORE_ADDRESS
+from iconservice.base.exception import DatabaseException
+from iconservice.icon_constant import ConfigKey
+from tests import rmtree
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateRollbackTo(TestIntegrateBase):
+    _checkpoint_path = '.checkpoint'
+
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.STATE_HISTORY: {ConfigKey.STATE_HISTORY_MAX_REVERSE_DIFFS: 3,
+                                          ConfigKey.STATE_HISTORY_CHECKPOINT_INTERVAL: 2,
+                                          ConfigKey.STATE_HISTORY_CHECKPOINT_PATH: self._checkpoint_path,
+                                          ConfigKey.STATE_HISTORY_MAX_CHECKPOINTS: 1}}
+
+    def tearDown(self):
+        super().tearDown()
+        rmtree(self._checkpoint_path)
+
+    def _get_value1(self, score_address) -> int:
+        return self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value1", "params": {}}
+        })
+
+    def _get_balance(self, address) -> int:
+        return self._query({"address": address}, 'icx_getBalance')
+
+    def test_rollback_to(self):
+        blocks = {}
+
+        # block 1
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_deploy_tx("test_scores", "test_db_returns", self._addr_array[0], ZERO_SCORE_ADDRESS,
+                                 deploy_params={"value": str(self._addr_array[1]),
+                                                "value1": str(self._addr_array[1])})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+        score_address = tx_results[0].score_address
+
+        # block 2 ~ 4
+        for i in range(2, 5):
+            prev_block, tx_results = self._make_and_req_block([
+                self._make_score_call_tx(self._addr_array[0], score_address, 'set_value1', {"value": hex(i)}),
+                self._make_icx_send_tx(self._genesis, self._addr_array[2], i)
+            ])
+            self._write_precommit_state(prev_block)
+            self.assertEqual(tx_results[0].status, int(True))
+            blocks[i] = prev_block
+
+        self.assertEqual(4, self._get_value1(score_address))
+        self.assertEqual(2 + 3 + 4, self._get_balance(self._addr_array[2]))
+
+        block = self.icon_service_engine.rollback_to(2)
+        self.assertEqual(blocks[2].hash, block.hash)
+        self.assertEqual(2, self._get_value1(score_address))
+        self.assertEqual(2, self._get_balance(self._addr_array[2]))
+
+        # The reverse diff of block 1 has been removed on committing block 4
+        with self.assertRaises(DatabaseException):
+            self.icon_service_engine.rollback_to(0)
+
+        # Invokes the next block of block 2 again
+        self._block_height = 3
+        self._prev_block_hash = block.hash
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_icx_send_tx(self._genesis, self._addr_array[2], 10)
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(12, self._get_balance(self._addr_array[2]))
+
+        # A checkpoint is skipped while the previous one is in progress
+        self.icon_service_engine.close()
+        self.assertIn(os.listdir(self._checkpoint_path), (['checkpoint_2.snapshot'], ['checkpoint_4.snapshot']))
+
+        # Reopens the engine with the reverse diffs
+        self.icon_service_engine.open(self.icon_service_engine._conf)
+        self.icon_service_engine.rollback_to(2)
+        self.assertEqual(2, self._get_balance(self._addr_array[2]))
@@ -18,7 +18,7 @@
 """
 import unittest
 
-from iconservice.base.address import ZERO_SCORE_ADDRESS
+from iconservice.base.address import GOVERNANCE_SCORE_ADDRESS, ZERO_SCORE_ADDRESS
 from iconservice.base.exception import ExceptionCode
 from tests import raise_exception_start_tag, raise_exception_end_tag
 from tests.integrate_test.test_integrate_base import TestIntegrateBase
@@ -217,6 +217,37 @@ class TestIntegrateScoreInternalCall(TestIntegrateBase):
         self.assertEqual(tx_results[0].status, int(False))
         self.assertEqual(tx_results[0].failure.message, 'Max call stack size exceeded')
 
+    def test_link_score_without_method(self):
+        tx1 = self._make_deploy_tx("test_internal_call_scores",
+                                   "test_link_score",
+                                   self._addr_array[0],
+                                   ZERO_SCORE_ADDRESS)
+
+        prev_block, tx_results = self._make_and_req_block([tx1])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+        score_addr1 = tx_results[0].score_address
+
+        # The governance SCORE has no set_value
+        tx2 = self._make_score_call_tx(self._addr_array[0],
+                                       score_addr1,
+                                       'add_score_func',
+                                       {"score_addr": str(GOVERNANCE_SCORE_ADDRESS)})
+        tx3 = self._make_score_call_tx(self._addr_array[0],
+                                       score_addr1,
+                                       'set_value',
+                                       {"value": hex(1)})
+
+        raise_exception_start_tag("test_link_score_without_method")
+        prev_block, tx_results = self._make_and_req_block([tx2, tx3])
+        raise_exception_end_tag("test_link_score_without_method")
+
+        self._write_precommit_state(prev_block)
+
+        self.assertEqual(tx_results[0].status, int(True))
+        self.assertEqual(tx_results[1].status, int(False))
+        self.assertEqual(tx_results[1].failure.code, ExceptionCode.SERVER_ERROR)
+
 
 if __name__ == '__main__':
     unittest.main()
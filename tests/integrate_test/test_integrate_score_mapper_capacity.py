@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine bounded IconScoreMapper testcase
+"""
+
+import sys
+
+from iconservice.base.address import Address
+from iconservice.icon_constant import ConfigKey
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateScoreMapperCapacity(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        # governance and one more SCORE
+        return {ConfigKey.SCORE_MAPPER_CAPACITY: 2}
+
+    def _set_value(self, score_address: 'Address', value: int):
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], score_address, 'set_value', {"value": hex(value)})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+
+    def _get_value(self, score_address: 'Address') -> int:
+        return self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        })
+
+    def test_eviction(self):
+        score_addresses = [self._deploy_score(i) for i in range(3)]
+
+        for i, score_address in enumerate(score_addresses):
+            self._set_value(score_address, i + 10)
+
+        for i, score_address in enumerate(score_addresses):
+            self.assertEqual(i + 10, self._get_value(score_address))
+
+        status = self._query({}, 'debug_getScoreMapperStatus')
+        self.assertEqual(2, status['residentCount'])
+        self.assertEqual(2, status['capacity'])
+        self.assertGreater(status['evictionCount'], 0)
+        self.assertGreater(status['loadCount'], len(score_addresses))
+
+        # Modules of evicted SCOREs are unloaded
+        self.assertNotIn(score_addresses[0], self.icon_service_engine._icon_score_mapper)
+        self.assertIn(score_addresses[2], self.icon_service_engine._icon_score_mapper)
+        self.assertEqual([], [name for name in sys.modules
+                              if name.startswith(f'{score_addresses[0].to_bytes().hex()}.0x')])
+        self.assertNotEqual([], [name for name in sys.modules
+                                 if name.startswith(f'{score_addresses[2].to_bytes().hex()}.0x')])
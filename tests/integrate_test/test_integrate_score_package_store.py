@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine SCORE package store testcase
+"""
+
+import os
+
+from iconservice.base.address import Address, ZERO_SCORE_ADDRESS
+from iconservice.deploy.icon_score_package_store import IconScorePackageStore
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateScorePackageStore(TestIntegrateBase):
+    def _make_deploy_txs(self, count: int) -> list:
+        return [self._make_deploy_tx("test_deploy_scores/install", "test_score", self._addr_array[0],
+                                     ZERO_SCORE_ADDRESS, deploy_params={"value": hex(i)})
+                for i in range(count)]
+
+    def _get_value(self, score_address: 'Address') -> int:
+        return self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        })
+
+    def test_deploy_same_package(self):
+        prev_block, tx_results = self._make_and_req_block(self._make_deploy_txs(3))
+        self._write_precommit_state(prev_block)
+        self.assertTrue(all(tx_result.status == int(True) for tx_result in tx_results))
+
+        store = IconScorePackageStore(self._score_root_path)
+        self.assertEqual([3], list(store.get_reference_counts().values()))
+
+        for i, tx_result in enumerate(tx_results):
+            self.assertEqual(i, self._get_value(tx_result.score_address))
+
+    def test_clear_garbage_score(self):
+        prev_block, tx_results = self._make_and_req_block(self._make_deploy_txs(1))
+        self._write_precommit_state(prev_block)
+        score_address = tx_results[0].score_address
+
+        # Deployed but not committed
+        prev_block, tx_results = self._make_and_req_block(self._make_deploy_txs(2))
+        self._remove_precommit_state(prev_block)
+
+        store = IconScorePackageStore(self._score_root_path)
+        self.assertEqual([3], list(store.get_reference_counts().values()))
+
+        self.icon_service_engine._icon_score_mapper.clear_garbage_score()
+        self.assertEqual([1], list(store.get_reference_counts().values()))
+        for tx_result in tx_results:
+            self.assertFalse(os.path.exists(os.path.join(self._score_root_path,
+                                                         tx_result.score_address.to_bytes().hex())))
+        self.assertEqual(0, self._get_value(score_address))
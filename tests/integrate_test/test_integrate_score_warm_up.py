@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine SCORE warm-up testcase
+"""
+
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_service_engine import IconServiceEngine
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateScoreWarmUp(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.SCORE_WARM_UP: {ConfigKey.SCORE_WARM_UP_ENABLE: True,
+                                          ConfigKey.SCORE_WARM_UP_WORKERS: 2,
+                                          ConfigKey.SCORE_WARM_UP_TIMEOUT: 30}}
+
+    def _get_value(self, score_address) -> int:
+        return self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        })
+
+    def test_warm_up(self):
+        score_addresses = [self._deploy_score(i) for i in range(3)]
+
+        conf = self.icon_service_engine._conf
+        self.icon_service_engine.close()
+
+        self.icon_service_engine = IconServiceEngine()
+        self.icon_service_engine.open(conf)
+
+        icon_score_mapper = self.icon_service_engine._icon_score_mapper
+        for i, score_address in enumerate(score_addresses):
+            self.assertIn(score_address, icon_score_mapper)
+            self.assertEqual(i, self._get_value(score_address))
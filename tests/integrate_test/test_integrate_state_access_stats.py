@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine state access stats testcase
+"""
+
+from iconservice.base.address import ZERO_SCORE_ADDRESS, GOVERNANCE_SCORE_ADDRESS
+from iconservice.base.exception import InvalidRequestException
+from iconservice.database.db import IconScoreDatabase
+from iconservice.icon_constant import ConfigKey
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateStateAccessStats(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.STATE_ACCESS_STATS: {ConfigKey.STATE_ACCESS_STATS_ENABLE: True,
+                                               ConfigKey.STATE_ACCESS_STATS_HOT_KEY_COUNT: 5}}
+
+    def test_get_state_access_stats(self):
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_deploy_tx("test_scores", "test_db_returns", self._addr_array[0], ZERO_SCORE_ADDRESS,
+                                 deploy_params={"value": str(self._addr_array[1]),
+                                                "value1": str(self._addr_array[1])})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+        score_address = tx_results[0].score_address
+
+        stats = self._query({}, 'debug_getStateAccessStats')
+        scores = {score['address']: score for score in stats['scores']}
+        self.assertIn(score_address, scores)
+        self.assertIn(GOVERNANCE_SCORE_ADDRESS, scores)
+        self.assertGreater(scores[score_address]['puts'], 0)
+        self.assertGreater(scores[score_address]['bytesWritten'], 0)
+        self.assertLessEqual(len(stats['hotKeys']), 5)
+
+        self.icon_service_engine.close()
+        self.assertIsNone(IconScoreDatabase.access_stats)
+
+        # tearDown closes the engine again
+        self.icon_service_engine.open(self.icon_service_engine._conf)
+
+
+class TestIntegrateStateAccessStatsDisabled(TestIntegrateBase):
+    def test_get_state_access_stats(self):
+        self.assertIsNone(IconScoreDatabase.access_stats)
+        with self.assertRaises(InvalidRequestException):
+            self._query({}, 'debug_getStateAccessStats')
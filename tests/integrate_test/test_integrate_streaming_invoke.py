@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine streaming invoke testcase
+"""
+
+from copy import deepcopy
+
+from iconservice.base.address import Address
+from iconservice.base.block import Block
+from iconservice.base.exception import ExceptionCode, InvalidRequestException
+from iconservice.icon_inner_service import IconScoreInnerTask, MakeResponse
+from iconservice.utils import to_camel_case
+from tests import create_block_hash
+from tests.integrate_test import create_timestamp
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateStreamingInvoke(TestIntegrateBase):
+    def _make_block(self) -> 'Block':
+        return Block(self._block_height, create_block_hash(), create_timestamp(), self._prev_block_hash)
+
+    def _make_tx_list(self, score_address: 'Address') -> list:
+        tx_list = [self._make_icx_send_tx(self._genesis, self._addr_array[i], 10 ** 18) for i in range(4)]
+        tx_list.append(self._make_score_call_tx(self._addr_array[0], score_address, 'set_value', {"value": hex(200)}))
+        tx_list.extend(self._make_icx_send_tx(self._genesis, self._addr_array[i], 10 ** 18) for i in range(4, 8))
+        return tx_list
+
+    @staticmethod
+    def _to_dicts(tx_results: list) -> list:
+        return [tx_result.to_dict(to_camel_case) for tx_result in tx_results]
+
+    def test_same_result_as_invoke(self):
+        score_address = self._deploy_score()
+        block = self._make_block()
+        tx_list = self._make_tx_list(score_address)
+
+        # Call params are converted in place
+        tx_results, state_root_hash = self.icon_service_engine.invoke(block, deepcopy(tx_list))
+        self._remove_precommit_state(block)
+
+        self.icon_service_engine.begin_block(block)
+        chunk_results = []
+        for i in range(0, len(tx_list), 3):
+            chunk_results.extend(self.icon_service_engine.add_transactions(tx_list[i:i + 3]))
+        streamed_tx_results, streamed_state_root_hash = self.icon_service_engine.end_block()
+
+        self.assertEqual(len(tx_list), len(streamed_tx_results))
+        self.assertEqual(self._to_dicts(tx_results), self._to_dicts(streamed_tx_results))
+        self.assertEqual(self._to_dicts(streamed_tx_results), self._to_dicts(chunk_results))
+        self.assertEqual(state_root_hash, streamed_state_root_hash)
+        self.assertTrue(all(tx_result.status == int(True) for tx_result in streamed_tx_results))
+
+        # The block which has already been processed returns the precommit data
+        self.icon_service_engine.begin_block(block)
+        self.assertEqual([], self.icon_service_engine.add_transactions(tx_list))
+        self.assertEqual((streamed_tx_results, streamed_state_root_hash), self.icon_service_engine.end_block())
+
+        self._write_precommit_state(block)
+        self.assertEqual(200, self._query({
+            "version": self._version,
+            "from": self._admin,
+            "to": score_address,
+            "dataType": "call",
+            "data": {"method": "get_value", "params": {}}
+        }))
+
+    def test_without_begin_block(self):
+        with self.assertRaises(InvalidRequestException):
+            self.icon_service_engine.add_transactions([])
+        with self.assertRaises(InvalidRequestException):
+            self.icon_service_engine.end_block()
+
+        self.icon_service_engine.begin_block(self._make_block())
+        self.icon_service_engine.end_block()
+        with self.assertRaises(InvalidRequestException):
+            self.icon_service_engine.end_block()
+
+    def test_inner_task(self):
+        inner_task = IconScoreInnerTask.__new__(IconScoreInnerTask)
+        inner_task._icon_service_engine = self.icon_service_engine
+
+        block = self._make_block()
+        tx_list = [self._make_icx_send_tx(self._genesis, self._addr_array[i], 10 ** 18) for i in range(3)]
+        for tx in tx_list:
+            params = tx['params']
+            params.update({'from': str(params['from']), 'to': str(params['to']), 'txHash': params['txHash'].hex()})
+            for key in ('value', 'stepLimit', 'timestamp', 'nonce', 'version'):
+                params[key] = hex(params[key])
+
+        block_request = {'blockHeight': hex(block.height), 'blockHash': block.hash.hex(),
+                         'timestamp': hex(block.timestamp), 'prevBlockHash': block.prev_hash.hex()}
+
+        response = inner_task._invoke({'block': block_request, 'transactions': tx_list})
+        self._remove_precommit_state(block)
+
+        ok = MakeResponse.make_response(ExceptionCode.OK)
+        self.assertEqual(ok, inner_task._begin_block({'block': block_request}))
+        for tx in tx_list:
+            self.assertEqual(ok, inner_task._add_transactions({'transactions': [tx]}))
+        self.assertEqual(response, inner_task._end_block())
+        self.assertEqual(3, len(response['txResults']))
+
+        self.assertEqual(ExceptionCode.INVALID_REQUEST, inner_task._end_block()['error']['code'])
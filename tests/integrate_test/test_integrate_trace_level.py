@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""IconServiceEngine trace level testcase
+"""
+
+from iconservice.base.address import Address, ZERO_SCORE_ADDRESS, AddressPrefix
+from iconservice.icon_constant import ConfigKey
+from iconservice.iconscore.icon_score_trace import CallFrame, Trace, TraceType
+from tests import create_address, raise_exception_start_tag, raise_exception_end_tag
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateTraceLevelOnFailure(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.TRACE_LEVEL: 'onFailure'}
+
+    def _deploy_link_score(self, score_addr: 'Address') -> 'Address':
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_deploy_tx("test_internal_call_scores", "test_link_score",
+                                 self._addr_array[0], ZERO_SCORE_ADDRESS)
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+        link_score_addr = tx_results[0].score_address
+
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], link_score_addr, 'add_score_func',
+                                     {"score_addr": str(score_addr)})
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(True))
+        return link_score_addr
+
+    def test_call_frames(self):
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_deploy_tx("test_internal_call_scores", "test_score",
+                                 self._addr_array[0], ZERO_SCORE_ADDRESS, deploy_params={'value': hex(1)})
+        ])
+        self._write_precommit_state(prev_block)
+        score_addr = tx_results[0].score_address
+        link_score_addr = self._deploy_link_score(score_addr)
+
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], link_score_addr, 'set_value', {"value": hex(2)})
+        ])
+        self.assertEqual(tx_results[0].status, int(True))
+        frames = tx_results[0].traces
+        self.assertEqual(1, len(frames))
+        self.assertIsInstance(frames[0], CallFrame)
+
+        traces = self._query({'blockHash': prev_block.hash, 'txHash': tx_results[0].tx_hash}, 'debug_getTraces')
+        self.assertEqual(1, len(traces))
+        self.assertEqual(link_score_addr, traces[0]['scoreAddress'])
+        self.assertEqual(TraceType.CALL.name, traces[0]['trace'])
+        self.assertEqual([score_addr, 'set_value', None, 0], traces[0]['data'])
+        self.assertGreater(traces[0]['stepUsed'], 0)
+        self._write_precommit_state(prev_block)
+
+    def test_failure(self):
+        link_score_addr = self._deploy_link_score(create_address(AddressPrefix.CONTRACT))
+
+        raise_exception_start_tag("test_failure")
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], link_score_addr, 'set_value', {"value": hex(2)})
+        ])
+        raise_exception_end_tag("test_failure")
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(False))
+
+        traces = tx_results[0].traces
+        self.assertTrue(all(isinstance(trace, Trace) for trace in traces))
+        self.assertEqual([TraceType.CALL, TraceType.THROW], [trace.trace for trace in traces])
+        self.assertEqual(link_score_addr, traces[0].score_address)
+        self.assertEqual('set_value', traces[0].data[1])
+
+
+class TestIntegrateTraceLevelOff(TestIntegrateTraceLevelOnFailure):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.TRACE_LEVEL: 'off'}
+
+    def test_call_frames(self):
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_deploy_tx("test_internal_call_scores", "test_score",
+                                 self._addr_array[0], ZERO_SCORE_ADDRESS, deploy_params={'value': hex(1)})
+        ])
+        self._write_precommit_state(prev_block)
+        link_score_addr = self._deploy_link_score(tx_results[0].score_address)
+
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], link_score_addr, 'set_value', {"value": hex(2)})
+        ])
+        self.assertEqual(tx_results[0].status, int(True))
+        self.assertEqual([], tx_results[0].traces)
+        self.assertEqual([], self._query({'blockHash': prev_block.hash, 'txHash': tx_results[0].tx_hash},
+                                         'debug_getTraces'))
+        self._write_precommit_state(prev_block)
+
+    def test_failure(self):
+        link_score_addr = self._deploy_link_score(create_address(AddressPrefix.CONTRACT))
+
+        raise_exception_start_tag("test_failure")
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_score_call_tx(self._addr_array[0], link_score_addr, 'set_value', {"value": hex(2)})
+        ])
+        raise_exception_end_tag("test_failure")
+        self._write_precommit_state(prev_block)
+        self.assertEqual(tx_results[0].status, int(False))
+        self.assertEqual([], tx_results[0].traces)
@@ -56,8 +56,11 @@ class MockPlyvelDB(object):
     def get_sub_db(self, key: bytes):
         return MockPlyvelDB(self.make_db())
 
-    def iterator(self) -> iter:
-        return iter(self._db)
+    def iterator(self, start: bytes = None, stop: bytes = None, reverse: bool = False, *args, **kwargs) -> iter:
+        keys = sorted((key for key in self._db
+                       if (start is None or key >= start) and (stop is None or key < stop)),
+                      reverse=reverse)
+        return iter([(key, self._db[key]) for key in keys])
 
     def prefixed_db(self, bytes_prefix) -> 'MockPlyvelDB':
         return MockPlyvelDB(MockPlyvelDB.make_db())
@@ -65,6 +68,27 @@ class MockPlyvelDB(object):
     def write_batch(self, *args, **kwargs) -> 'MockWriteBatch':
         return MockWriteBatch(self)
 
+    def snapshot(self) -> 'MockSnapshot':
+        return MockSnapshot(dict(self._db))
+
+
+class MockSnapshot(object):
+    """ Snapshot(DB db) """
+    def __init__(self, db: dict):
+        self._db = db
+
+    def get(self, bytes_key: bytes, default=None) -> Optional[bytes]:
+        return self._db.get(bytes_key, default)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 
 class MockWriteBatch(object):
     """ WriteBatch(DB db, bytes prefix, bool transaction, sync) """
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice.base.block import Block
+from iconservice.iconscore.estimate_step_cache import EstimateStepCache, make_estimate_key
+from tests import create_address, create_block_hash
+
+
+class TestEstimateStepCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.cache = EstimateStepCache(size=2, ttl=10, clock=lambda: self.now)
+        self.block = Block(1, create_block_hash(), 0, create_block_hash())
+        self.score = create_address(1)
+        self.params = {
+            'from': create_address(),
+            'to': self.score,
+            'value': 0,
+            'dataType': 'call',
+            'data': {'method': 'transfer', 'params': {'_to': self.score, '_value': 1, '_data': b'\x00'}}
+        }
+
+    def _make_key(self, **kwargs) -> tuple:
+        params = dict(self.params)
+        params.update(kwargs)
+        return make_estimate_key(self.block, params)
+
+    def test_make_estimate_key(self):
+        key = self._make_key()
+        self.assertEqual(key, self._make_key(data={'params': {'_data': b'\x00', '_value': 1, '_to': self.score},
+                                                   'method': 'transfer'}))
+
+        self.assertNotEqual(key, make_estimate_key(Block(1, create_block_hash(), 0, None), self.params))
+        self.assertNotEqual(key, self._make_key(value=1))
+        self.assertNotEqual(key, self._make_key(to=create_address(1)))
+        self.assertNotEqual(key, self._make_key(dataType='message'))
+        self.assertNotEqual(key, self._make_key(data={'method': 'transfer',
+                                                      'params': {'_to': str(self.score), '_value': 1, '_data': b'\x00'}}))
+
+    def test_get_put(self):
+        keys = [self._make_key(value=i) for i in range(3)]
+        self.assertIsNone(self.cache.get(keys[0]))
+
+        self.cache.put(keys[0], 100)
+        self.cache.put(keys[1], 200)
+        self.assertEqual(100, self.cache.get(keys[0]))
+
+        # The least recently used one is evicted
+        self.cache.put(keys[2], 300)
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertEqual(100, self.cache.get(keys[0]))
+
+        self.now = 10
+        self.assertIsNone(self.cache.get(keys[0]))
+        self.assertEqual(1, len(self.cache))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(keys[2]))
+
+    def test_disabled(self):
+        cache = EstimateStepCache(size=0)
+        key = self._make_key()
+        cache.put(key, 100)
+        self.assertIsNone(cache.get(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,7 @@ import unittest
 from iconservice.base.address import AddressPrefix
 from iconservice.base.exception import ExceptionCode
 from iconservice.deploy.icon_score_deployer import IconScoreDeployer
+from iconservice.deploy.icon_score_package_store import PACKAGE_DIR
 from tests import create_address, create_tx_hash
 
 DIRECTORY_PATH = os.path.abspath(os.path.dirname(__file__))
@@ -131,6 +132,7 @@ class TestIconScoreDeployer(unittest.TestCase):
 
     def tearDown(self):
         IconScoreDeployer.remove_existing_score(self.score_root_path)
+        IconScoreDeployer.remove_existing_score(os.path.join(self.deployer.score_root_path, PACKAGE_DIR))
 
 
 if __name__ == "__main__":
@@ -15,10 +15,11 @@
 # limitations under the License.
 
 
+import time
 import unittest
 from unittest.mock import Mock
 
-from iconservice.base.address import AddressPrefix
+from iconservice.base.address import AddressPrefix, GOVERNANCE_SCORE_ADDRESS
 from iconservice.deploy.icon_score_deploy_storage import IconScoreDeployStorage
 from iconservice.iconscore.icon_score_base import IconScoreBase
 from iconservice.iconscore.icon_score_context import IconScoreContext
@@ -42,6 +43,107 @@ class TestIconScoreMapper(unittest.TestCase):
         self.icon_score_mapper.load_score = Mock(return_value=TestScore())
         self.icon_score_mapper.get_icon_score(create_address(AddressPrefix.CONTRACT), tx_hash)
 
+    def test_warm_up(self):
+        scores = [(create_address(AddressPrefix.CONTRACT), create_tx_hash()) for _ in range(4)]
+        failed_address = scores[3][0]
+
+        def load_score(address, tx_hash):
+            if address == failed_address:
+                raise Exception('invalid package')
+            return TestScore()
+
+        self.icon_score_mapper.load_score = Mock(side_effect=load_score)
+        self.assertEqual(3, self.icon_score_mapper.warm_up(scores, 2, None))
+
+        for address, tx_hash in scores[:3]:
+            self.assertIn(address, self.icon_score_mapper)
+            self.assertEqual(tx_hash, self.icon_score_mapper.get(address).tx_hash)
+        self.assertNotIn(failed_address, self.icon_score_mapper)
+        self.assertEqual(0, self.icon_score_mapper.warm_up([], 2, None))
+
+    def test_warm_up_timeout(self):
+        scores = [(create_address(AddressPrefix.CONTRACT), create_tx_hash()) for _ in range(3)]
+        lazy_score = Mock(spec=IconScoreBase)
+
+        def load_score(address, tx_hash):
+            time.sleep(0.2)
+            return Mock(spec=IconScoreBase)
+
+        self.icon_score_mapper.load_score = Mock(side_effect=load_score)
+        self.assertEqual(0, self.icon_score_mapper.warm_up(scores, 1, 0.05))
+
+        # A SCORE loaded lazily in the meantime is not replaced
+        self.icon_score_mapper.put_score_info(scores[0][0], lazy_score, scores[0][1])
+
+        # The first SCORE is still being loaded and others are cancelled
+        self.icon_score_mapper.close()
+        self.assertIs(lazy_score, self.icon_score_mapper.get(scores[0][0]).icon_score)
+        self.assertNotIn(scores[1][0], self.icon_score_mapper)
+        self.assertEqual(1, self.icon_score_mapper.load_score.call_count)
+
+    def test_lru_eviction(self):
+        mapper = IconScoreMapper(capacity=3)
+        addresses = [create_address(AddressPrefix.CONTRACT) for _ in range(4)]
+        tx_hashes = [create_tx_hash() for _ in range(4)]
+
+        mapper.put_score_info(GOVERNANCE_SCORE_ADDRESS, TestScore(), bytes(32))
+        for address, tx_hash in zip(addresses[:2], tx_hashes):
+            mapper.put_score_info(address, TestScore(), tx_hash)
+        self.assertEqual(0, mapper.get_status()['evictionCount'])
+
+        # Neither governance nor a pinned SCORE is evicted
+        mapper.is_pinned = lambda address: address == addresses[0]
+        mapper.put_score_info(addresses[2], TestScore(), tx_hashes[2])
+        self.assertIn(GOVERNANCE_SCORE_ADDRESS, mapper)
+        self.assertIn(addresses[0], mapper)
+        self.assertNotIn(addresses[1], mapper)
+
+        # addresses[2] becomes the least recently used
+        mapper.is_pinned = None
+        self.assertIsNotNone(mapper.get(addresses[0]))
+        mapper.put_score_info(addresses[3], TestScore(), tx_hashes[3])
+        self.assertNotIn(addresses[2], mapper)
+        self.assertIn(addresses[0], mapper)
+        self.assertIn(addresses[3], mapper)
+
+        loader = IconScoreMapper.icon_score_loader
+        loader.make_score_path.assert_any_call(addresses[1], tx_hashes[1])
+        loader.make_score_path.assert_any_call(addresses[2], tx_hashes[2])
+        self.assertEqual(2, loader.unload_score.call_count)
+
+        status = mapper.get_status()
+        self.assertEqual(3, status['residentCount'])
+        self.assertEqual(3, status['capacity'])
+        self.assertEqual(2, status['evictionCount'])
+
+    def test_update_with_capacity(self):
+        mapper = IconScoreMapper(capacity=2)
+        new_mapper = IconScoreMapper()
+        addresses = [create_address(AddressPrefix.CONTRACT) for _ in range(3)]
+
+        mapper.put_score_info(addresses[0], TestScore(), create_tx_hash())
+        for address in addresses[1:]:
+            new_mapper.put_score_info(address, TestScore(), create_tx_hash())
+        mapper.update(new_mapper)
+
+        self.assertNotIn(addresses[0], mapper)
+        self.assertIn(addresses[1], mapper)
+        self.assertIn(addresses[2], mapper)
+
+    def test_load_status(self):
+        address = create_address(AddressPrefix.CONTRACT)
+        IconScoreMapper.icon_score_loader.load_score.return_value = Mock(return_value=TestScore())
+        self.icon_score_mapper._create_icon_score_database = Mock()
+
+        self.icon_score_mapper.get_icon_score(address, create_tx_hash())
+        self.icon_score_mapper.get_icon_score(address, create_tx_hash())
+
+        status = self.icon_score_mapper.get_status()
+        self.assertEqual(1, status['loadCount'])
+        self.assertEqual(1, status['residentCount'])
+        self.assertEqual(0, status['capacity'])
+        self.assertGreaterEqual(status['maxLoadTime'], status['averageLoadTime'])
+
 
 class TestScore(IconScoreBase):
 
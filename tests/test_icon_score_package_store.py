@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+from iconservice.base.address import AddressPrefix
+from iconservice.base.exception import ScoreInstallException, ScoreInstallExtractException
+from iconservice.deploy.icon_score_deployer import IconScoreDeployer
+from iconservice.deploy.icon_score_package_store import IconScorePackageStore, PACKAGE_DIR, remove_score_path
+from tests import create_address, create_tx_hash, rmtree
+
+DIRECTORY_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+class TestIconScorePackageStore(unittest.TestCase):
+    def setUp(self):
+        self.score_root_path = os.path.abspath('package_store')
+        rmtree(self.score_root_path)
+        os.makedirs(self.score_root_path)
+
+        self.deployer = IconScoreDeployer(self.score_root_path)
+        self.store = IconScorePackageStore(self.score_root_path)
+
+    def tearDown(self):
+        rmtree(self.score_root_path)
+
+    @staticmethod
+    def _read_zip(name: str) -> bytes:
+        with open(os.path.join(DIRECTORY_PATH, 'sample', name), 'rb') as f:
+            return f.read()
+
+    def _deploy(self, data: bytes, legacy: bool = False) -> str:
+        address = create_address(AddressPrefix.CONTRACT)
+        tx_hash = create_tx_hash()
+        if legacy:
+            self.deployer.deploy_legacy(address, data, tx_hash)
+        else:
+            self.deployer.deploy(address, data, tx_hash)
+        return os.path.join(self.score_root_path, address.to_bytes().hex(), f'0x{tx_hash.hex()}')
+
+    def test_deploy_same_package(self):
+        data = self._read_zip('valid.zip')
+        install_paths = [self._deploy(data) for _ in range(3)]
+
+        content_hash = IconScorePackageStore.make_content_hash(data)
+        package_path = os.path.join(self.score_root_path, PACKAGE_DIR, content_hash)
+        for install_path in install_paths:
+            self.assertTrue(os.path.islink(install_path))
+            self.assertFalse(os.path.isabs(os.readlink(install_path)))
+            self.assertEqual(os.path.realpath(package_path), os.path.realpath(install_path))
+        self.assertEqual({content_hash: 3}, self.store.get_reference_counts())
+
+        # deploy_legacy() extracts the same zip file in another way
+        legacy_path = self._deploy(data, legacy=True)
+        self.assertNotEqual(os.path.realpath(package_path), os.path.realpath(legacy_path))
+        self.assertEqual(2, len(self.store.get_reference_counts()))
+
+        # The same path is not deployed again
+        address, tx_hash = create_address(AddressPrefix.CONTRACT), create_tx_hash()
+        self.deployer.deploy(address, data, tx_hash)
+        with self.assertRaises(ScoreInstallException):
+            self.deployer.deploy(address, data, tx_hash)
+
+    def test_collect_garbage(self):
+        data = self._read_zip('valid.zip')
+        install_paths = [self._deploy(data) for _ in range(2)]
+        other_path = self._deploy(self._read_zip('sample_token.zip'))
+        self.assertEqual(0, self.store.collect_garbage())
+
+        remove_score_path(install_paths[0])
+        self.assertTrue(os.path.isdir(install_paths[1]))
+        self.assertEqual(0, self.store.collect_garbage())
+
+        remove_score_path(os.path.dirname(install_paths[1]))
+        self.assertEqual(1, self.store.collect_garbage())
+        self.assertEqual({IconScorePackageStore.make_content_hash(self._read_zip('sample_token.zip')): 1},
+                         self.store.get_reference_counts())
+        self.assertTrue(os.path.isfile(os.path.join(other_path, 'package.json')))
+
+    def test_deploy_bad_zip(self):
+        address, tx_hash = create_address(AddressPrefix.CONTRACT), create_tx_hash()
+        with self.assertRaises(ScoreInstallExtractException):
+            self.deployer.deploy(address, self._read_zip('invalid.zip'), tx_hash)
+
+        self.assertFalse(os.path.lexists(os.path.join(self.score_root_path, address.to_bytes().hex(),
+                                                      f'0x{tx_hash.hex()}')))
+        self.assertEqual([], os.listdir(os.path.join(self.score_root_path, PACKAGE_DIR)))
+
+
+if __name__ == '__main__':
+    unittest.main()
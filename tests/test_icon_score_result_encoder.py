@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from iconservice.base.address import AddressPrefix, MalformedAddress
+from iconservice.base.block import Block
+from iconservice.base.exception import ExceptionCode
+from iconservice.base.transaction import Transaction
+from iconservice.base.type_converter import TypeConverter
+from iconservice.iconscore.icon_score_event_log import EventLog
+from iconservice.iconscore.icon_score_result import TransactionResult
+from iconservice.iconscore.icon_score_result_encoder import ResultFormat, encode_tx_result, encode_invoke_result
+from iconservice.iconscore.icon_score_trace import Trace, TraceType
+from iconservice.utils import to_camel_case
+from iconservice.utils.bloom import BloomFilter
+from tests import create_block_hash, create_tx_hash, create_address
+
+
+class TestResultEncoder(unittest.TestCase):
+    def setUp(self):
+        block = Block(block_height=0x1234,
+                      block_hash=create_block_hash(),
+                      timestamp=0x1234567890,
+                      prev_hash=create_block_hash())
+        score_address = create_address(AddressPrefix.CONTRACT)
+
+        self.tx_results = []
+        for i in range(4):
+            tx = Transaction(create_tx_hash(), i, create_address(), 0x1234567890)
+            self.tx_results.append(TransactionResult(tx=tx, block=block, to=score_address))
+
+        success = self.tx_results[0]
+        success.status = TransactionResult.SUCCESS
+        success.step_used = 10 ** 6
+        success.step_price = 10 ** 10
+        success.cumulative_step_used = 2 ** 70
+        success.event_logs = [
+            EventLog(score_address,
+                     ['Transfer(Address,Address,int)', create_address(), create_address(), 10 ** 30],
+                     [b'\x00\x01', True, None, 'str', -5, MalformedAddress.from_string('hx1234')]),
+            EventLog(score_address, ['Empty()'], None)
+        ]
+        success.logs_bloom = BloomFilter.from_iterable([b'Transfer', b'Empty'])
+        success.traces = [Trace(score_address, TraceType.CALL, [], 100)]
+        # failure is not included on success
+        success.failure = TransactionResult.Failure(ExceptionCode.SERVER_ERROR, 'ignored')
+
+        failure = self.tx_results[1]
+        failure.step_used = 100
+        failure.event_logs = []
+        failure.logs_bloom = BloomFilter()
+        failure.failure = TransactionResult.Failure(ExceptionCode.SCORE_ERROR, 'Out of step: 한글')
+
+        deploy = self.tx_results[2]
+        deploy.to = MalformedAddress.from_string('hx1234')
+        deploy.score_address = create_address(AddressPrefix.CONTRACT)
+        deploy.status = TransactionResult.SUCCESS
+
+        self.state_root_hash = create_block_hash()
+
+    def _convert_results(self) -> dict:
+        # Same as the former IconScoreInnerTask._invoke
+        convert_tx_results = \
+            {bytes.hex(tx_result.tx_hash): tx_result.to_dict(to_camel_case) for tx_result in self.tx_results}
+        results = {
+            'txResults': convert_tx_results,
+            'stateRootHash': bytes.hex(self.state_root_hash)
+        }
+        return TypeConverter.convert_type_reverse(results)
+
+    def test_json(self):
+        expected = self._convert_results()
+
+        result = encode_invoke_result(self.tx_results, self.state_root_hash)
+        self.assertEqual(json.dumps(expected), json.dumps(result))
+        self.assertEqual(json.dumps(expected, ensure_ascii=False), json.dumps(result, ensure_ascii=False))
+
+        for tx_result in self.tx_results:
+            self.assertEqual(expected['txResults'][tx_result.tx_hash.hex()], encode_tx_result(tx_result))
+
+        self.assertNotIn('failure', result['txResults'][self.tx_results[0].tx_hash.hex()])
+        self.assertNotIn('traces', result['txResults'][self.tx_results[0].tx_hash.hex()])
+
+    def test_binary(self):
+        success = self.tx_results[0]
+        result = encode_invoke_result(self.tx_results, self.state_root_hash, ResultFormat.BINARY)
+
+        self.assertEqual(self.state_root_hash, result['stateRootHash'])
+        self.assertEqual(list(self._convert_results()['txResults']), list(result['txResults']))
+
+        encoded = result['txResults'][success.tx_hash.hex()]
+        self.assertEqual(success.tx_hash, encoded['txHash'])
+        self.assertEqual(success.block_hash, encoded['blockHash'])
+        self.assertEqual(0x1234, encoded['blockHeight'])
+        self.assertEqual(str(success.to), encoded['to'])
+        self.assertEqual(10 ** 6, encoded['stepUsed'])
+        self.assertEqual(hex(2 ** 70), encoded['cumulativeStepUsed'])
+        self.assertEqual(int(success.logs_bloom).to_bytes(256, 'big'), encoded['logsBloom'])
+        self.assertEqual(['Transfer(Address,Address,int)', str(success.event_logs[0].indexed[1]),
+                          str(success.event_logs[0].indexed[2]), hex(10 ** 30)],
+                         encoded['eventLogs'][0]['indexed'])
+        self.assertEqual([b'\x00\x01', 1, None, 'str', -5, 'hx1234'], encoded['eventLogs'][0]['data'])
+        self.assertEqual({'scoreAddress': str(success.event_logs[1].score_address), 'indexed': ['Empty()']},
+                         encoded['eventLogs'][1])
+
+        failure = result['txResults'][self.tx_results[1].tx_hash.hex()]['failure']
+        self.assertEqual({'code': ExceptionCode.SCORE_ERROR, 'message': 'Out of step: 한글'}, failure)
+
+    def test_reencode(self):
+        # Transaction results kept in the binary format are encoded again in either format
+        encoded_tx_results = [encode_tx_result(tx_result, ResultFormat.BINARY) for tx_result in self.tx_results]
+        for result_format in ResultFormat:
+            self.assertEqual(
+                json.dumps(encode_invoke_result(self.tx_results, self.state_root_hash, result_format), default=repr),
+                json.dumps(encode_invoke_result(encoded_tx_results, self.state_root_hash, result_format), default=repr))
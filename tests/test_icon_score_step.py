@@ -22,14 +22,17 @@ from iconservice.iconscore.icon_score_context_util import IconScoreContextUtil
 from iconservice.iconscore.icon_score_engine import IconScoreEngine
 from iconservice import VarDB
 from iconservice.base.address import AddressPrefix, Address
+from iconservice.base.exception import InvalidRequestException
 from iconservice.builtin_scores.governance import governance
 from iconservice.database.db import IconScoreDatabase
 from iconservice.iconscore.icon_score_base import \
     IconScoreBase, eventlog, external
 from iconservice.iconscore.icon_score_base2 import sha3_256
 from iconservice.iconscore.icon_score_context import ContextContainer
+from iconservice.iconscore.icon_score_context import IconScoreContextType
 from iconservice.iconscore.icon_score_step import \
-    StepType, IconScoreStepCounter, IconScoreStepCounterFactory
+    StepType, IconScoreStepCounter, IconScoreStepCounterFactory, StepCosts, OutOfStepException, \
+    CheckpointStepCounter
 from tests import create_tx_hash, create_address
 from tests.mock_generator import generate_inner_task, create_request, ReqData, clear_inner_task
 
@@ -639,6 +642,87 @@ class TestIconScoreStepCounter(unittest.TestCase):
         return self._inner_task._invoke(request)
 
 
+class TestStepCosts(unittest.TestCase):
+
+    def test_step_costs(self):
+        step_costs = StepCosts({StepType.DEFAULT: 100, StepType.GET: 5})
+        self.assertEqual(len(StepType), len(step_costs.costs))
+        self.assertEqual(list(range(len(StepType))), [step_type.index for step_type in StepType])
+        self.assertEqual(100, step_costs[StepType.DEFAULT])
+        self.assertEqual(5, step_costs[StepType.GET])
+        self.assertEqual(0, step_costs[StepType.SET])
+        self.assertEqual(StepCosts(step_costs.to_dict()), step_costs)
+
+        replaced = step_costs.replace(StepType.GET, 10)
+        self.assertEqual(10, replaced[StepType.GET])
+        self.assertEqual(5, step_costs[StepType.GET])
+
+    def test_apply_step(self):
+        step_counter = IconScoreStepCounter(10, StepCosts({StepType.DEFAULT: 100, StepType.GET: 5}), 1000)
+        step_counter.reset(200)
+        self.assertEqual(100, step_counter.step_used)
+
+        self.assertEqual(100, step_counter.apply_step(StepType.GET, 10))
+        self.assertEqual(150, step_counter.apply_step(StepType.GET, 20))
+
+        with self.assertRaises(OutOfStepException):
+            step_counter.apply_step(StepType.GET, 11)
+        self.assertEqual(200, step_counter.step_used)
+
+        step_counter.set_step_costs({StepType.GET: 1})
+        step_counter.reset(200)
+        self.assertEqual(10, step_counter.apply_step(StepType.GET, 10))
+
+    def test_factory_shares_step_costs(self):
+        factory = IconScoreStepCounterFactory()
+        factory.set_step_properties(10, {StepType.DEFAULT: 100}, {IconScoreContextType.INVOKE: 1000})
+
+        step_costs = factory.get_step_costs()
+        step_counter = factory.create(IconScoreContextType.INVOKE)
+        self.assertIs(step_costs.costs, step_counter._costs)
+        self.assertEqual(10, step_counter.step_price)
+        self.assertEqual(1000, step_counter.max_step_limit)
+        self.assertEqual(0, factory.create(IconScoreContextType.QUERY).max_step_limit)
+
+        # Changes make new step costs and do not affect created counters
+        factory.set_step_cost(StepType.DEFAULT, 200)
+        factory.set_max_step_limit(IconScoreContextType.QUERY, 500)
+        self.assertEqual(200, factory.get_step_cost(StepType.DEFAULT))
+        self.assertEqual(100, step_costs[StepType.DEFAULT])
+        self.assertEqual(10, factory.get_step_price())
+        self.assertEqual(1000, factory.get_max_step_limit(IconScoreContextType.INVOKE))
+        self.assertEqual(500, factory.get_max_step_limit(IconScoreContextType.QUERY))
+
+        step_counter.reset(1000)
+        self.assertEqual(100, step_counter.step_used)
+
+    def test_query_checkpoint(self):
+        factory = IconScoreStepCounterFactory()
+        factory.set_step_properties(10, {StepType.DEFAULT: 100, StepType.GET: 5},
+                                    {IconScoreContextType.INVOKE: 1000, IconScoreContextType.QUERY: 1000})
+
+        checkpoint = Mock()
+        factory.set_query_checkpoint(checkpoint)
+
+        step_counter = factory.create(IconScoreContextType.QUERY)
+        self.assertIsInstance(step_counter, CheckpointStepCounter)
+        step_counter.reset(1000)
+        self.assertEqual(100, step_counter.apply_step(StepType.GET, 2))
+        self.assertEqual(110, step_counter.apply_step(StepType.GET, 20))
+        self.assertEqual(2, checkpoint.call_count)
+
+        # A checkpoint stops the query before the step is applied
+        checkpoint.side_effect = InvalidRequestException('stop')
+        with self.assertRaises(InvalidRequestException):
+            step_counter.apply_step(StepType.GET, 100)
+        self.assertEqual(110, step_counter.step_used)
+
+        self.assertNotIsInstance(factory.create(IconScoreContextType.INVOKE), CheckpointStepCounter)
+
+        factory.set_query_checkpoint(None)
+        self.assertNotIsInstance(factory.create(IconScoreContextType.QUERY), CheckpointStepCounter)
+
+
 # noinspection PyPep8Naming
 class SampleScore(IconScoreBase):
 
@@ -22,7 +22,7 @@ from unittest.mock import Mock, patch
 
 from iconservice.base.address import Address, AddressPrefix
 from iconservice.base.block import Block
-from iconservice.base.exception import RevertException, ExceptionCode, IconScoreException
+from iconservice.base.exception import RevertException, ExceptionCode, IconScoreException, ServerErrorException
 from iconservice.base.transaction import Transaction
 from iconservice.database.batch import TransactionBatch
 from iconservice.database.db import IconScoreDatabase
@@ -35,7 +35,7 @@ from iconservice.iconscore.icon_score_context import ContextContainer, IconScore
 from iconservice.iconscore.icon_score_context_util import IconScoreContextUtil
 from iconservice.iconscore.icon_score_engine import IconScoreEngine
 from iconservice.iconscore.icon_score_step import IconScoreStepCounter
-from iconservice.iconscore.icon_score_trace import TraceType
+from iconservice.iconscore.icon_score_trace import TraceType, TraceLevel, CallFrame, Trace, materialize_traces
 from iconservice.iconscore.internal_call import InternalCall
 from iconservice.icx import IcxEngine
 from iconservice.utils import to_camel_case
@@ -239,6 +239,53 @@ class TestTrace(unittest.TestCase):
         self.assertEqual(4, len(camel_dict['data']))
 
 
+    def test_call_frame(self):
+        context = ContextContainer._get_context()
+        context.step_counter.step_used = 1000
+        score_address = Mock(spec=Address)
+        func_name = "testCall"
+        params = {'to': Mock(spec=Address), 'amount': 100}
+
+        IconScoreContext.trace_level = TraceLevel.ON_FAILURE
+        try:
+            self._score.call(score_address, func_name, params)
+        finally:
+            IconScoreContext.trace_level = TraceLevel.FULL
+
+        context.traces.append.assert_called()
+        frame = context.traces.append.call_args[0][0]
+        self.assertIsInstance(frame, CallFrame)
+        self.assertEqual(self._score.address, frame.score_address)
+        self.assertEqual(score_address, frame.to)
+        self.assertEqual(func_name, frame.func_name)
+        self.assertEqual(1000, frame.step_used)
+
+        revert = Trace(score_address, TraceType.REVERT, [ExceptionCode.SCORE_ERROR, 'revert'])
+        traces = materialize_traces([frame, revert])
+        self.assertEqual(revert, traces[1])
+        camel_dict = traces[0].to_dict(to_camel_case)
+        self.assertEqual(TraceType.CALL.name, camel_dict['trace'])
+        self.assertEqual([score_address, func_name, None, 0], camel_dict['data'])
+        self.assertEqual(1000, camel_dict['stepUsed'])
+
+    def test_trace_level_off(self):
+        context = ContextContainer._get_context()
+
+        IconScoreContext.trace_level = TraceLevel.OFF
+        try:
+            self._score.call(Mock(spec=Address), "testCall", {})
+        finally:
+            IconScoreContext.trace_level = TraceLevel.FULL
+
+        context.traces.append.assert_not_called()
+
+    def test_trace_level_from_str(self):
+        self.assertEqual(TraceLevel.OFF, TraceLevel.from_str('off'))
+        self.assertEqual(TraceLevel.ON_FAILURE, TraceLevel.from_str('onFailure'))
+        self.assertEqual(TraceLevel.FULL, TraceLevel.from_str('full'))
+        with self.assertRaises(ServerErrorException):
+            TraceLevel.from_str('on-failure')
+
 class TestInterfaceScore(InterfaceScore):
     @interface
     def interfaceCall(self, addr_to: Address, value: int) -> bool: pass
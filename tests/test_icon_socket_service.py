@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import os
+import tempfile
+import unittest
+
+from earlgrey import message_queue_task, MessageQueueException, TASK_ATTR_DICT
+
+try:
+    import msgpack
+    from iconservice.icon_socket_service import UnixSocketService, UnixSocketStub, IconScoreSocketStub, \
+        pack_frame, read_frame
+except ImportError:
+    msgpack = None
+    UnixSocketService = UnixSocketStub = object
+
+from iconservice.icon_inner_service import IconScoreInnerTask
+
+
+class SampleTask(object):
+    def __init__(self, prefix: str):
+        self._prefix = prefix
+        self.calls = []
+
+    @message_queue_task
+    async def echo(self, request: dict, suffix: str = ''):
+        self.calls.append(request)
+        return {'value': f'{self._prefix}{request["value"]}{suffix}', 'data': request.get('data')}
+
+    @message_queue_task
+    async def sleep(self, seconds: float):
+        self.calls.append(seconds)
+        await asyncio.sleep(seconds)
+        return seconds
+
+    @message_queue_task
+    async def hello(self):
+        return 'hello'
+
+    @message_queue_task
+    async def fail(self):
+        raise ValueError('failed')
+
+    async def not_task(self):
+        pass
+
+
+class SampleSocketService(UnixSocketService):
+    TaskType = SampleTask
+
+
+class SampleSocketStub(UnixSocketStub):
+    TaskType = SampleTask
+
+
+@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+class TestUnixSocketService(unittest.TestCase):
+    def setUp(self):
+        self._loop = SampleSocketService.loop
+        self._dir = tempfile.TemporaryDirectory()
+        self._socket_path = os.path.join(self._dir.name, 'test.sock')
+
+        self._service = SampleSocketService(self._socket_path, prefix='v:')
+        self._stub = SampleSocketStub(self._socket_path)
+        self._run(self._service.serve())
+        self._run(self._stub.connect())
+
+    def tearDown(self):
+        self._run(self._stub.close())
+        self._run(self._service.close())
+        self._dir.cleanup()
+
+    def _run(self, coroutine):
+        return self._loop.run_until_complete(coroutine)
+
+    def test_call(self):
+        task = self._stub.async_task()
+
+        self.assertEqual('hello', self._run(task.hello()))
+        self.assertEqual({'value': 'v:a!', 'data': b'\x00\x01'},
+                         self._run(task.echo({'value': 'a', 'data': b'\x00\x01'}, suffix='!')))
+        self.assertEqual({'value': 'v:b', 'data': None}, self._run(task.echo(request={'value': 'b'})))
+
+        with self.assertRaises(MessageQueueException):
+            self._run(task.fail())
+        with self.assertRaises(TypeError):
+            self._run(task.echo())
+        self.assertFalse(hasattr(task, 'calls'))
+
+        # The connection is still available after failures
+        self.assertEqual('hello', self._run(task.hello()))
+
+    def test_socket_mode(self):
+        self.assertEqual(0o600, os.stat(self._socket_path).st_mode & 0o777)
+
+        socket_path = os.path.join(self._dir.name, 'group.sock')
+        service = SampleSocketService(socket_path, 0o660, prefix='v:')
+        self._run(service.serve())
+        self.assertEqual(0o660, os.stat(socket_path).st_mode & 0o777)
+        self._run(service.close())
+
+    def test_pipelining(self):
+        task = self._stub.async_task()
+
+        async def _call():
+            return await asyncio.gather(task.sleep(0.2), *(task.echo({'value': i}) for i in range(100)))
+
+        results = self._run(_call())
+
+        self.assertEqual(0.2, results[0])
+        self.assertEqual([{'value': f'v:{i}', 'data': None} for i in range(100)], results[1:])
+        # Requests are started in order
+        self.assertEqual([0.2] + [{'value': i} for i in range(100)], self._service._task.calls)
+
+    def test_invalid_task(self):
+        async def _call():
+            reader, writer = await asyncio.open_unix_connection(self._socket_path)
+            writer.write(pack_frame([7, 'not_task', {}]))
+            response = await read_frame(reader)
+            writer.close()
+            return response
+
+        self.assertEqual([7, None, 'Invalid task: not_task'], self._run(_call()))
+
+    def test_invalid_request(self):
+        async def _call(frames: list):
+            reader, writer = await asyncio.open_unix_connection(self._socket_path)
+            for frame in frames:
+                writer.write(pack_frame(frame))
+            responses = [await read_frame(reader) for _ in frames]
+            writer.close()
+            return responses
+
+        self.assertEqual([[1, None, 'Invalid arguments of hello: list'],
+                          [2, None, "hello() got an unexpected keyword argument 'name'"],
+                          [3, None, 'Invalid task: None']],
+                         self._run(_call([[1, 'hello', []], [2, 'hello', {'name': 'a'}], [3, None, {}]])))
+
+        # A frame which a response cannot be matched to closes the connection
+        async def _call_with_invalid_frame():
+            reader, writer = await asyncio.open_unix_connection(self._socket_path)
+            writer.write(pack_frame({'msg_id': 1}))
+            with self.assertRaises(asyncio.IncompleteReadError):
+                await read_frame(reader)
+            writer.close()
+
+        self._run(_call_with_invalid_frame())
+        self.assertEqual('hello', self._run(self._stub.async_task().hello()))
+
+    def test_connection_closed(self):
+        task = self._stub.async_task()
+        self._run(self._service.close())
+        self._run(self._stub.close())
+
+        with self.assertRaises(MessageQueueException):
+            self._run(task.hello())
+
+
+@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+class TestIconScoreSocketStub(unittest.TestCase):
+    def test_tasks(self):
+        stub = IconScoreSocketStub('')
+        stub._register_tasks()
+        task = stub.async_task()
+
+        for name in ('hello', 'invoke', 'query', 'batch_query', 'batch_estimate_step', 'begin_block', 'add_transactions', 'end_block',
+                     'write_precommit_state', 'remove_precommit_state', 'validate_transaction', 'close'):
+            self.assertIsInstance(getattr(task, name), functools.partial)
+            self.assertTrue(hasattr(getattr(IconScoreInnerTask, name), TASK_ATTR_DICT))
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice.base.block import Block
+from iconservice.base.transaction import Transaction
+from iconservice.database.batch import BlockBatch
+from iconservice.iconscore.icon_score_result import TransactionResult
+from iconservice.iconscore.icon_score_result_encoder import ResultFormat, encode_invoke_result, encode_tx_result
+from iconservice.precommit_data_manager import PrecommitData, PrecommitDataManager
+from tests import create_block_hash, create_tx_hash
+
+
+def _make_precommit_data(height: int = 1, value_size: int = 10) -> 'PrecommitData':
+    block_batch = BlockBatch(Block(height, create_block_hash(), 0, create_block_hash()))
+    block_batch[b'key0'] = b'\x01' * value_size
+    block_batch[b'key1'] = None
+    block_batch[b'key2'] = b''
+
+    traced_tx_result = TransactionResult(Transaction(create_tx_hash(), 0), block_batch.block)
+    traced_tx_result.traces = ['trace']
+    tx_result = TransactionResult(Transaction(create_tx_hash(), 1), block_batch.block)
+    block_result = [traced_tx_result, tx_result]
+    return PrecommitData(block_batch, block_result)
+
+
+class TestPrecommitData(unittest.TestCase):
+    def test_states(self):
+        block_batch = BlockBatch(Block(1, create_block_hash(), 0, create_block_hash()))
+        block_batch[b'key1'] = b'value1'
+        block_batch[b'key0'] = None
+        block_batch[b'key2'] = b''
+
+        precommit_data = PrecommitData(block_batch, [])
+        self.assertEqual(block_batch.digest(), precommit_data.state_root_hash)
+        self.assertEqual(block_batch.block, precommit_data.block)
+        self.assertEqual(list(block_batch.items()), list(precommit_data.get_states().items()))
+        self.assertGreater(precommit_data.size, 0)
+
+    def test_release_block_result(self):
+        precommit_data = _make_precommit_data()
+        traced_tx_hash, tx_hash = [tx_result.tx_hash for tx_result in precommit_data.block_result]
+        self.assertFalse(precommit_data.is_released)
+        self.assertEqual(['trace'], precommit_data.get_traces(traced_tx_hash))
+
+        precommit_data.release_block_result()
+        self.assertTrue(precommit_data.is_released)
+        self.assertIsNone(precommit_data.block_result)
+        self.assertEqual(['trace'], precommit_data.get_traces(traced_tx_hash))
+        self.assertEqual([], precommit_data.get_traces(tx_hash))
+        self.assertIsNone(precommit_data.get_traces(create_tx_hash()))
+
+        # Releasing twice keeps the traces
+        precommit_data.release_block_result()
+        self.assertEqual(['trace'], precommit_data.get_traces(traced_tx_hash))
+
+    def test_tx_results(self):
+        precommit_data = _make_precommit_data()
+        block_result = precommit_data.block_result
+        self.assertIs(block_result, precommit_data.tx_results)
+        expected = encode_invoke_result(block_result, precommit_data.state_root_hash)
+
+        # The encoded form answers the same invoke result after release
+        precommit_data.release_block_result()
+        self.assertEqual([encode_tx_result(tx_result, ResultFormat.BINARY) for tx_result in block_result],
+                         precommit_data.tx_results)
+        self.assertEqual(expected, encode_invoke_result(precommit_data.tx_results, precommit_data.state_root_hash))
+
+
+class TestPrecommitDataManager(unittest.TestCase):
+    def test_push_and_remove(self):
+        manager = PrecommitDataManager()
+        data = [_make_precommit_data() for _ in range(3)]
+        for precommit_data in data:
+            manager.push(precommit_data)
+        # Pushing the same block again replaces the old one
+        manager.push(data[0])
+
+        status = manager.get_status()
+        self.assertEqual(3, status['count'])
+        self.assertEqual(sum(precommit_data.size for precommit_data in data), status['bytes'])
+        self.assertEqual(0, status['evictedCount'])
+
+        manager.rollback(data[1].block)
+        self.assertIsNone(manager.get(data[1].block.hash))
+        self.assertEqual(data[0].size + data[2].size, manager.get_status()['bytes'])
+
+        manager.commit(data[0].block)
+        self.assertTrue(manager.empty())
+        self.assertEqual(0, manager.get_status()['bytes'])
+        self.assertEqual(data[0].block, manager.last_block)
+
+    def test_evict_by_count(self):
+        manager = PrecommitDataManager(max_count=2)
+        data = [_make_precommit_data() for _ in range(3)]
+        for precommit_data in data:
+            manager.push(precommit_data)
+
+        self.assertIsNone(manager.get(data[0].block.hash))
+        self.assertIs(data[1], manager.get(data[1].block.hash))
+        self.assertIs(data[2], manager.get(data[2].block.hash))
+
+        status = manager.get_status()
+        self.assertEqual(2, status['count'])
+        self.assertEqual(1, status['evictedCount'])
+        self.assertEqual([data[1].block.hash, data[2].block.hash],
+                         [candidate['blockHash'] for candidate in status['candidates']])
+
+    def test_evict_by_bytes(self):
+        small = _make_precommit_data(value_size=10)
+        large = _make_precommit_data(value_size=100)
+        manager = PrecommitDataManager(max_bytes=small.size + large.size - 1)
+
+        manager.push(small)
+        manager.push(large)
+        self.assertIsNone(manager.get(small.block.hash))
+        self.assertEqual(large.size, manager.get_status()['bytes'])
+
+        # The newest candidate is kept even if it exceeds the limit alone
+        larger = _make_precommit_data(value_size=small.size + large.size)
+        manager.push(larger)
+        self.assertIs(larger, manager.get(larger.block.hash))
+        self.assertEqual(1, manager.get_status()['count'])
+        self.assertEqual(2, manager.get_status()['evictedCount'])
+
+    def test_size_with_traces(self):
+        precommit_data = _make_precommit_data()
+        self.assertGreater(precommit_data.trace_size, 0)
+        size = precommit_data.size
+
+        # Traces are counted until the block is committed
+        precommit_data.release_block_result()
+        self.assertEqual(size, precommit_data.size)
+
+        manager = PrecommitDataManager(max_bytes=size * 2 - 1)
+        manager.push(precommit_data)
+        manager.push(_make_precommit_data())
+        status = manager.get_status()
+        self.assertEqual(1, status['count'])
+        self.assertEqual(size, status['bytes'])
+        self.assertEqual(precommit_data.trace_size, status['candidates'][0]['traceBytes'])
+        self.assertEqual(0, status['candidates'][0]['scoreCount'])
+
+    def test_release_block_results(self):
+        manager = PrecommitDataManager()
+        data = [_make_precommit_data() for _ in range(2)]
+        for precommit_data in data:
+            manager.push(precommit_data)
+
+        manager.release_block_results()
+        self.assertTrue(all(precommit_data.is_released for precommit_data in data))
+        self.assertTrue(all(candidate['released'] for candidate in manager.get_status()['candidates']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from iconservice.base.exception import ExceptionCode, ServerErrorException
+from iconservice.icon_inner_service import PriorityScheduler
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    def setUp(self):
+        self._executor = ThreadPoolExecutor(2)
+
+    def tearDown(self):
+        self._executor.shutdown()
+
+    def test_load_shedding(self):
+        scheduler = PriorityScheduler(max_pending_queries=2, query_timeout=0)
+
+        works = [scheduler.wrap_query(lambda i: i, i) for i in range(2)]
+        self.assertEqual(2, scheduler.pending_query_count)
+
+        with self.assertRaises(ServerErrorException) as cm:
+            scheduler.wrap_query(lambda: None)
+        self.assertEqual('Server is busy', cm.exception.message)
+
+        self.assertEqual(0, works[0]())
+        self.assertEqual(1, scheduler.pending_query_count)
+        self.assertEqual(2, scheduler.wrap_query(lambda: 2)())
+        self.assertEqual(1, works[1]())
+        self.assertEqual(0, scheduler.pending_query_count)
+
+    def test_load_shedding_by_requests(self):
+        scheduler = PriorityScheduler(max_pending_queries=3, query_timeout=0)
+
+        # Each request of a batch counts as a query
+        batch = scheduler.wrap_query(lambda requests: len(requests), [0, 1], count=2)
+        self.assertEqual(2, scheduler.pending_query_count)
+        with self.assertRaises(ServerErrorException):
+            scheduler.wrap_query(lambda requests: None, [0, 1], count=2)
+
+        query = scheduler.wrap_query(lambda: None)
+        with self.assertRaises(ServerErrorException):
+            scheduler.wrap_query(lambda: None)
+
+        self.assertEqual(2, batch())
+        query()
+        self.assertEqual(0, scheduler.pending_query_count)
+
+    def test_block_work_first(self):
+        scheduler = PriorityScheduler(query_timeout=0)
+        calls = []
+
+        block_work = scheduler.wrap_block_work(lambda: calls.append('invoke') or 'invoked')
+        self.assertEqual(1, scheduler.block_work_count)
+
+        query = self._executor.submit(scheduler.wrap_query(lambda: calls.append('query') or 'queried'))
+        validation = self._executor.submit(scheduler.wrap_validation(lambda: calls.append('validate')))
+        time.sleep(0.1)
+        self.assertEqual([], calls)
+
+        self.assertEqual('invoked', block_work())
+        self.assertEqual('queried', query.result(timeout=5))
+        validation.result(timeout=5)
+
+        self.assertEqual('invoke', calls[0])
+        self.assertEqual(0, scheduler.block_work_count)
+        self.assertEqual(0, scheduler.pending_query_count)
+
+    def test_deadline_before_start(self):
+        scheduler = PriorityScheduler(query_timeout=0.05)
+        calls = []
+
+        block_work = scheduler.wrap_block_work(lambda: None)
+        response = scheduler.wrap_query(lambda: calls.append('query'))()
+        self.assertEqual(ExceptionCode.SERVER_ERROR, response['error']['code'])
+        self.assertEqual('Query timeout', response['error']['message'])
+        self.assertEqual([], calls)
+        self.assertEqual(0, scheduler.pending_query_count)
+
+        # A validation runs after waiting
+        scheduler.wrap_validation(lambda: calls.append('validate'))()
+        self.assertEqual(['validate'], calls)
+        block_work()
+
+    def test_checkpoint(self):
+        scheduler = PriorityScheduler(query_timeout=0.05)
+
+        # Outside of queries, it only yields
+        block_work = scheduler.wrap_block_work(lambda: None)
+        scheduler.checkpoint()
+        block_work()
+
+        def _query():
+            scheduler.checkpoint()
+            time.sleep(0.1)
+            scheduler.checkpoint()
+
+        with self.assertRaises(ServerErrorException) as cm:
+            scheduler.wrap_query(_query)()
+        self.assertEqual('Query timeout', cm.exception.message)
+        self.assertEqual(0, scheduler.pending_query_count)
+
+        # The deadline belongs to the query
+        scheduler.checkpoint()
+
+    def test_yield_to_block_work(self):
+        scheduler = PriorityScheduler(query_timeout=0)
+        started = Event()
+        stop = Event()
+
+        def _query() -> int:
+            started.set()
+            count = 0
+            while not stop.is_set():
+                scheduler.checkpoint()
+                count += 1
+            return count
+
+        query = self._executor.submit(scheduler.wrap_query(_query))
+        started.wait(5)
+
+        block_work = scheduler.wrap_block_work(lambda: sum(range(10 ** 5)))
+        self.assertEqual(sum(range(10 ** 5)), self._executor.submit(block_work).result(timeout=5))
+
+        stop.set()
+        self.assertGreater(query.result(timeout=5), 0)
+
+    def test_wait_for_block_work(self):
+        scheduler = PriorityScheduler(query_timeout=0)
+        calls = []
+        started = Event()
+        resume = Event()
+
+        def _query():
+            started.set()
+            resume.wait(5)
+            scheduler.checkpoint()
+            calls.append('query')
+
+        query = self._executor.submit(scheduler.wrap_query(_query))
+        started.wait(5)
+
+        # A running query stops at its next checkpoint until block work is done
+        block_work = scheduler.wrap_block_work(lambda: calls.append('invoke'))
+        resume.set()
+        time.sleep(0.1)
+        self.assertEqual([], calls)
+
+        block_work()
+        query.result(timeout=5)
+        self.assertEqual(['invoke', 'query'], calls)
+
+    def test_checkpoint_holding_lock(self):
+        scheduler = PriorityScheduler(query_timeout=0)
+        started = Event()
+        resume = Event()
+
+        def _query():
+            started.set()
+            resume.wait(5)
+            # It does not wait for block work which needs a lock held by the query
+            scheduler.checkpoint(can_wait=False)
+            return 'queried'
+
+        query = self._executor.submit(scheduler.wrap_query(_query))
+        started.wait(5)
+
+        block_work = scheduler.wrap_block_work(lambda: None)
+        resume.set()
+        self.assertEqual('queried', query.result(timeout=5))
+        block_work()
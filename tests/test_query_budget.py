@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice.base.exception import ServerErrorException
+from iconservice.iconscore.query_budget import QueryBudget
+from tests import create_address
+
+
+class TestQueryBudget(unittest.TestCase):
+    def setUp(self):
+        self._now = 1000.0
+        self._budget = QueryBudget(window=10, caller_steps=100, score_steps=150, clock=lambda: self._now)
+        self._caller1 = create_address()
+        self._caller2 = create_address()
+        self._score = create_address(1)
+
+    def test_caller_budget(self):
+        self._budget.check(self._caller1, self._score)
+        self._budget.consume(self._caller1, self._score, 60)
+        self._budget.check(self._caller1, self._score)
+        self._budget.consume(self._caller1, self._score, 40)
+
+        with self.assertRaises(ServerErrorException):
+            self._budget.check(self._caller1, self._score)
+        self._budget.check(self._caller2, self._score)
+        self.assertEqual((100, 0), self._budget.get_steps(self._caller1))
+        self.assertEqual((0, 100), self._budget.get_steps(self._score))
+
+    def test_score_budget(self):
+        self._budget.consume(self._caller1, self._score, 90)
+        self._budget.consume(self._caller2, self._score, 60)
+
+        with self.assertRaises(ServerErrorException):
+            self._budget.check(self._caller2, self._score)
+        # Callers without a from address are limited by the SCORE budget only
+        with self.assertRaises(ServerErrorException):
+            self._budget.check(None, self._score)
+        self._budget.check(None, create_address(1))
+
+    def test_sliding_window(self):
+        self._budget.consume(self._caller1, self._score, 60)
+        self._now += 5
+        self._budget.consume(self._caller1, self._score, 40)
+        with self.assertRaises(ServerErrorException):
+            self._budget.check(self._caller1, self._score)
+
+        # Steps of the first second expire
+        self._now += 5
+        self._budget.check(self._caller1, self._score)
+        self.assertEqual((40, 0), self._budget.get_steps(self._caller1))
+
+        self._now += 5
+        self.assertEqual((0, 0), self._budget.get_steps(self._caller1))
+        self.assertEqual(0, self._budget.get_status()['callerCount'])
+
+    def test_unlimited(self):
+        budget = QueryBudget(window=10, caller_steps=0, score_steps=0, clock=lambda: self._now)
+        budget.consume(self._caller1, self._score, 10 ** 12)
+        budget.check(self._caller1, self._score)
+
+    def test_get_status(self):
+        self._budget.consume(self._caller1, self._score, 10)
+        self._budget.consume(self._caller2, self._score, 20)
+        self._budget.check(self._caller1, self._score)
+        self._budget.consume(self._caller2, self._score, 120)
+        with self.assertRaises(ServerErrorException):
+            self._budget.check(self._caller1, self._score)
+
+        status = self._budget.get_status(top_count=1)
+        self.assertEqual(10, status['window'])
+        self.assertEqual(100, status['callerSteps'])
+        self.assertEqual(150, status['scoreSteps'])
+        self.assertEqual(1, status['admittedCount'])
+        self.assertEqual(1, status['rejectedCount'])
+        self.assertEqual(2, status['callerCount'])
+        self.assertEqual([{'address': self._caller2, 'steps': 140}], status['callers'])
+        self.assertEqual([{'address': self._score, 'steps': 150}], status['scores'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from iconservice.base.exception import ServerErrorException
+from iconservice.iconscore.icon_score_loader import IconScoreLoader
+from iconservice.iconscore.score_package_validator import ScorePackageValidator, ScorePackageValidatorCache
+from tests import rmtree
+
+WHITELIST_TABLE = {"iconservice": ['*']}
+
+VALID_MAIN = '''from iconservice import *
+from .util import double
+
+
+class Valid(IconScoreBase):
+    pass
+'''
+
+INVALID_MAIN = '''from iconservice import *
+import os
+
+
+class Invalid(IconScoreBase):
+    pass
+'''
+
+
+class TestScorePackageValidator(unittest.TestCase):
+    _ROOT_SCORE_PATH = '.score_validator'
+
+    def setUp(self):
+        rmtree(self._ROOT_SCORE_PATH)
+        self._loader = IconScoreLoader(os.path.abspath(self._ROOT_SCORE_PATH))
+        self._cache_path = os.path.join(self._loader.score_root_path, IconScoreLoader._VALIDATOR_CACHE_DIR)
+
+        self._valid_path = self._make_package('validator_valid', {
+            '__init__.py': '', 'main.py': VALID_MAIN, 'util.py': 'def double(a):\n    return a * 2\n'})
+        self._invalid_path = self._make_package('validator_invalid', {
+            '__init__.py': '', 'main.py': INVALID_MAIN})
+
+    def tearDown(self):
+        rmtree(self._ROOT_SCORE_PATH)
+
+    def _make_package(self, name: str, files: dict) -> str:
+        score_path = os.path.join(self._loader.score_root_path, name)
+        os.makedirs(score_path)
+        for file_name, source in files.items():
+            with open(os.path.join(score_path, file_name), 'w') as f:
+                f.write(source)
+        return score_path
+
+    def test_validate(self):
+        ScorePackageValidator().execute(WHITELIST_TABLE, self._valid_path, 'validator_valid')
+
+        with self.assertRaises(ServerErrorException) as cm:
+            ScorePackageValidator().execute(WHITELIST_TABLE, self._invalid_path, 'validator_invalid')
+        self.assertEqual('invalid import import_name: os', cm.exception.message)
+
+        ScorePackageValidator().execute({"iconservice": ['*'], "os": ['*']}, self._invalid_path, 'validator_invalid')
+
+    def test_cache(self):
+        with patch.object(ScorePackageValidator, 'execute', autospec=True,
+                          side_effect=ScorePackageValidator.execute) as execute:
+            for _ in range(2):
+                self._loader.try_score_package_validate(WHITELIST_TABLE, self._valid_path)
+                with self.assertRaises(ServerErrorException) as cm:
+                    self._loader.try_score_package_validate(WHITELIST_TABLE, self._invalid_path)
+                self.assertEqual('invalid import import_name: os', cm.exception.message)
+            self.assertEqual(2, execute.call_count)
+
+            # Results are saved in files
+            self.assertEqual(2, len(os.listdir(self._cache_path)))
+            IconScoreLoader(self._loader.score_root_path).try_score_package_validate(
+                WHITELIST_TABLE, self._valid_path)
+            self.assertEqual(2, execute.call_count)
+
+            # A whitelist change makes a new key
+            self._loader.try_score_package_validate({"iconservice": ['*'], "os": ['*']}, self._invalid_path)
+            self.assertEqual(3, execute.call_count)
+
+    def test_cache_size(self):
+        cache = ScorePackageValidatorCache(self._cache_path, size=1)
+        cache.execute(WHITELIST_TABLE, self._valid_path, 'validator_valid')
+        with self.assertRaises(ServerErrorException):
+            cache.execute(WHITELIST_TABLE, self._invalid_path, 'validator_invalid')
+        with open(os.path.join(self._cache_path, 'interrupted.tmp'), 'w') as f:
+            f.write('{')
+        self.assertEqual(3, len(os.listdir(self._cache_path)))
+
+        # The result in memory is kept and the others are removed
+        self.assertEqual(2, cache.prune())
+        self.assertEqual([ScorePackageValidatorCache.make_key(WHITELIST_TABLE, self._invalid_path)],
+                         os.listdir(self._cache_path))
+        self.assertEqual(0, cache.prune())
+
+        with patch.object(ScorePackageValidator, 'execute', autospec=True,
+                          side_effect=ScorePackageValidator.execute) as execute:
+            cache.execute(WHITELIST_TABLE, self._valid_path, 'validator_valid')
+            with self.assertRaises(ServerErrorException):
+                cache.execute(WHITELIST_TABLE, self._invalid_path, 'validator_invalid')
+            # The removed result is made again and the other one is read from its file
+            self.assertEqual(1, execute.call_count)
+
+    def test_make_key(self):
+        key = ScorePackageValidatorCache.make_key(WHITELIST_TABLE, self._valid_path)
+
+        # The same files in another directory make the same key
+        same_path = self._make_package('validator_same', {
+            'main.py': VALID_MAIN, 'util.py': 'def double(a):\n    return a * 2\n', '__init__.py': ''})
+        with open(os.path.join(same_path, 'package.json'), 'w') as f:
+            f.write('{}')
+        self.assertEqual(key, ScorePackageValidatorCache.make_key(WHITELIST_TABLE, same_path))
+
+        with open(os.path.join(same_path, 'util.py'), 'a') as f:
+            f.write('\n')
+        self.assertNotEqual(key, ScorePackageValidatorCache.make_key(WHITELIST_TABLE, same_path))
+        self.assertNotEqual(key, ScorePackageValidatorCache.make_key({"iconservice": ['IconScoreBase']},
+                                                                     self._valid_path))
+
+    def test_concurrent_validation(self):
+        def validate(i: int) -> bool:
+            validator = ScorePackageValidator()
+            try:
+                if i % 2 == 0:
+                    validator.execute(WHITELIST_TABLE, self._valid_path, 'validator_valid')
+                else:
+                    validator.execute(WHITELIST_TABLE, self._invalid_path, 'validator_invalid')
+            except ServerErrorException:
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(validate, range(40)))
+
+        self.assertEqual([i % 2 == 0 for i in range(40)], results)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures how long it takes to make the invoke response from transaction results
+
+Usage: python tools/benchmark_result_encoder.py [--txs N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from iconservice.base.address import Address, AddressPrefix
+from iconservice.base.block import Block
+from iconservice.base.transaction import Transaction
+from iconservice.base.type_converter import TypeConverter
+from iconservice.iconscore.icon_score_event_log import EventLog
+from iconservice.iconscore.icon_score_result import TransactionResult
+from iconservice.iconscore.icon_score_result_encoder import ResultFormat, encode_invoke_result
+from iconservice.utils import to_camel_case, sha3_256
+from iconservice.utils.bloom import BloomFilter
+
+
+def _make_tx_results(count: int) -> list:
+    block = Block(1, sha3_256(b'block'), 1, sha3_256(b'prev'))
+    score_address = Address.from_data(AddressPrefix.CONTRACT, b'score')
+
+    tx_results = []
+    for i in range(count):
+        tx = Transaction(sha3_256(i.to_bytes(4, 'big')), i, Address.from_data(AddressPrefix.EOA, b'from'), 1)
+        tx_result = TransactionResult(tx, block, score_address, step_used=150000, step_price=10 ** 10,
+                                      cumulative_step_used=150000 * (i + 1), status=TransactionResult.SUCCESS)
+        tx_result.event_logs = [
+            EventLog(score_address,
+                     ['Transfer(Address,Address,int,bytes)', tx.origin, Address.from_data(AddressPrefix.EOA, b'to'),
+                      10 ** 18],
+                     [b'memo'])
+            for _ in range(2)
+        ]
+        tx_result.logs_bloom = BloomFilter.from_iterable([b'Transfer(Address,Address,int,bytes)'])
+        tx_results.append(tx_result)
+    return tx_results
+
+
+def _convert(tx_results: list, state_root_hash: bytes) -> dict:
+    convert_tx_results = \
+        {bytes.hex(tx_result.tx_hash): tx_result.to_dict(to_camel_case) for tx_result in tx_results}
+    results = {
+        'txResults': convert_tx_results,
+        'stateRootHash': bytes.hex(state_root_hash)
+    }
+    return TypeConverter.convert_type_reverse(results)
+
+
+def _measure(func, repeat: int) -> float:
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Invoke result encoder benchmark')
+    parser.add_argument('--txs', type=int, default=1000, help='number of transactions in a block')
+    parser.add_argument('--repeat', type=int, default=10, help='number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    tx_results = _make_tx_results(args.txs)
+    state_root_hash = sha3_256(b'state')
+
+    results = {
+        'to_dict+reverse': _measure(lambda: _convert(tx_results, state_root_hash), args.repeat),
+        'encoder(json)': _measure(lambda: encode_invoke_result(tx_results, state_root_hash), args.repeat),
+        'encoder(binary)': _measure(
+            lambda: encode_invoke_result(tx_results, state_root_hash, ResultFormat.BINARY), args.repeat)
+    }
+
+    for name, elapsed in results.items():
+        print(f'{name:>16}: {elapsed * 1000:8.2f}ms for {args.txs} txs')
+
+
+if __name__ == '__main__':
+    main()
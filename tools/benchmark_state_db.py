@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures random account reads on a state db with several LevelDB option sets
+
+Usage: python tools/benchmark_state_db.py [--accounts N] [--reads N] [--path PATH]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from iconservice.database.backend import make_leveldb_options
+from iconservice.database.db import KeyValueDatabase
+from iconservice.icon_config import default_icon_config
+from iconservice.icon_constant import ConfigKey
+
+PROFILES = {
+    'leveldb default': {},
+    'iconservice default': default_icon_config[ConfigKey.STATE_DB_OPTIONS],
+    'large cache': {
+        ConfigKey.STATE_DB_LRU_CACHE_SIZE: 512 * 1024 * 1024,
+        ConfigKey.STATE_DB_BLOOM_FILTER_BITS: 10,
+        ConfigKey.STATE_DB_WRITE_BUFFER_SIZE: 64 * 1024 * 1024,
+        ConfigKey.STATE_DB_MAX_OPEN_FILES: 4096,
+        ConfigKey.STATE_DB_BLOCK_SIZE: 4096
+    }
+}
+
+
+def _account_key(index: int) -> bytes:
+    # Same shape as an icx account key: 20 bytes address body with a prefix
+    return b'\x00' + hashlib.sha3_256(index.to_bytes(8, 'big')).digest()[:20]
+
+
+def populate(path: str, accounts: int) -> None:
+    db = KeyValueDatabase.from_path(path)
+    batch_size = 10000
+
+    for start in range(0, accounts, batch_size):
+        items = {}
+        for i in range(start, min(start + batch_size, accounts)):
+            # account type, flags and 32 bytes balance
+            items[_account_key(i)] = b'\x00\x00\x00\x00' + i.to_bytes(32, 'big')
+        db.write_batch(items)
+
+    db.close()
+
+
+def measure(path: str, options: dict, accounts: int, reads: int, seed: int) -> tuple:
+    db = KeyValueDatabase.from_path(path, create_if_missing=False, options=make_leveldb_options(options))
+    rand = random.Random(seed)
+    # The half of reads target missing accounts where bloom filters help
+    keys = [_account_key(rand.randrange(accounts * 2)) for _ in range(reads)]
+
+    start = time.perf_counter()
+    hits = 0
+    for key in keys:
+        if db.get(key) is not None:
+            hits += 1
+    elapsed = time.perf_counter() - start
+
+    db.close()
+    return elapsed, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='State db random read benchmark')
+    parser.add_argument('--accounts', type=int, default=1000000, help='number of accounts to create')
+    parser.add_argument('--reads', type=int, default=200000, help='number of random reads per profile')
+    parser.add_argument('--path', default='.benchmark_statedb', help='db path removed after benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    shutil.rmtree(args.path, ignore_errors=True)
+    try:
+        print(f'Creating {args.accounts} accounts in {args.path} ...')
+        populate(args.path, args.accounts)
+
+        for name, options in PROFILES.items():
+            # The first run warms up OS page cache equally for all profiles
+            measure(args.path, options, args.accounts, args.reads, args.seed + 1)
+            elapsed, hits = measure(args.path, options, args.accounts, args.reads, args.seed)
+            print(f'{name:>20}: {args.reads / elapsed:10.0f} reads/s ({hits} hits, {elapsed:.3f}s)')
+    finally:
+        shutil.rmtree(args.path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures IconScoreStepCounter.apply_step and IconScoreStepCounterFactory.create throughput
+
+Usage: python tools/benchmark_step_counter.py [--calls N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from iconservice.icon_constant import IconScoreContextType
+from iconservice.iconscore.icon_score_step import IconScoreStepCounter, IconScoreStepCounterFactory, StepType
+
+STEP_COSTS = {
+    StepType.DEFAULT: 100000,
+    StepType.CONTRACT_CALL: 25000,
+    StepType.CONTRACT_CREATE: 1000000000,
+    StepType.CONTRACT_UPDATE: 1600000000,
+    StepType.CONTRACT_DESTRUCT: -70000,
+    StepType.CONTRACT_SET: 30000,
+    StepType.GET: 0,
+    StepType.SET: 320,
+    StepType.REPLACE: 80,
+    StepType.DELETE: -240,
+    StepType.INPUT: 200,
+    StepType.EVENT_LOG: 100,
+    StepType.API_CALL: 0
+}
+
+# Step types applied by a SCORE call which mostly reads and writes states
+WORKLOAD = [StepType.GET, StepType.GET, StepType.SET, StepType.REPLACE, StepType.EVENT_LOG, StepType.GET]
+
+
+def _apply_step(step_counter: 'IconScoreStepCounter', calls: int) -> float:
+    workload = WORKLOAD
+    size = len(workload)
+    apply_step = step_counter.apply_step
+
+    start = time.perf_counter()
+    for i in range(calls):
+        apply_step(workload[i % size], 32)
+    return time.perf_counter() - start
+
+
+def _create(factory: 'IconScoreStepCounterFactory', calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        factory.create(IconScoreContextType.INVOKE)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Step counter benchmark')
+    parser.add_argument('--calls', type=int, default=1000000, help='number of calls per run')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs, the best one is reported')
+    args = parser.parse_args()
+
+    factory = IconScoreStepCounterFactory()
+    factory.set_step_properties(10 ** 10, STEP_COSTS, {IconScoreContextType.INVOKE: 2 ** 62})
+    step_counter = factory.create(IconScoreContextType.INVOKE)
+
+    results = {
+        'apply_step': min(step_counter.reset(2 ** 62) or _apply_step(step_counter, args.calls)
+                          for _ in range(args.repeat)),
+        'factory.create': min(_create(factory, args.calls) for _ in range(args.repeat))
+    }
+
+    for name, elapsed in results.items():
+        print(f'{name:>15}: {args.calls / elapsed:12.0f} calls/s ({elapsed:.3f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares per-call latency and throughput of the AMQP and the Unix socket transports
+
+The served task answers a small query without touching IconServiceEngine,
+so only the transport overhead is measured. The AMQP path needs a running RabbitMQ.
+
+Usage: python tools/benchmark_transport.py [--calls N] [--concurrency N] [--amqp-target HOST] [--socket-path PATH]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from earlgrey import message_queue_task, MessageQueueService, MessageQueueStub
+
+from iconservice.icon_socket_service import UnixSocketService, UnixSocketStub
+
+QUEUE_NAME = 'benchmark_transport'
+
+REQUEST = {
+    'method': 'icx_getBalance',
+    'params': {'address': 'hx' + '1' * 40}
+}
+
+
+class BenchmarkTask(object):
+    @message_queue_task
+    async def query(self, request: dict):
+        return hex(10 ** 18)
+
+
+class BenchmarkQueueService(MessageQueueService[BenchmarkTask]):
+    TaskType = BenchmarkTask
+
+
+class BenchmarkQueueStub(MessageQueueStub[BenchmarkTask]):
+    TaskType = BenchmarkTask
+
+
+class BenchmarkSocketService(UnixSocketService):
+    TaskType = BenchmarkTask
+
+
+class BenchmarkSocketStub(UnixSocketStub):
+    TaskType = BenchmarkTask
+
+
+async def _measure(task, calls: int, concurrency: int) -> dict:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await task.query(REQUEST)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    async def _worker(count: int):
+        for _ in range(count):
+            await task.query(REQUEST)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(calls // concurrency) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'p50': latencies[len(latencies) // 2],
+        'p99': latencies[int(len(latencies) * 0.99)],
+        'throughput': (calls // concurrency) * concurrency / elapsed
+    }
+
+
+async def _benchmark_amqp(amqp_target: str, calls: int, concurrency: int) -> dict:
+    service = BenchmarkQueueService(amqp_target, QUEUE_NAME)
+    await service.connect(exclusive=True)
+
+    stub = BenchmarkQueueStub(amqp_target, QUEUE_NAME)
+    await stub.connect()
+    return await _measure(stub.async_task(), calls, concurrency)
+
+
+async def _benchmark_socket(socket_path: str, calls: int, concurrency: int) -> dict:
+    service = BenchmarkSocketService(socket_path)
+    await service.serve()
+
+    stub = BenchmarkSocketStub(socket_path)
+    await stub.connect()
+    try:
+        return await _measure(stub.async_task(), calls, concurrency)
+    finally:
+        await stub.close()
+        await service.close()
+
+
+def _print_result(name: str, result: dict):
+    print(f'{name:>6}: p50 {result["p50"] * 10 ** 6:9.1f}us, p99 {result["p99"] * 10 ** 6:9.1f}us, '
+          f'{result["throughput"]:9.0f} calls/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transport benchmark')
+    parser.add_argument('--calls', type=int, default=10000, help='number of calls per measurement')
+    parser.add_argument('--concurrency', type=int, default=32, help='number of calls in flight for throughput')
+    parser.add_argument('--amqp-target', type=str, default='127.0.0.1', help='RabbitMQ host')
+    parser.add_argument('--socket-path', type=str, default=None, help='Unix domain socket path')
+    args = parser.parse_args()
+
+    loop = MessageQueueService.loop
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = args.socket_path or os.path.join(temp_dir, 'benchmark.sock')
+        _print_result('socket', loop.run_until_complete(
+            _benchmark_socket(socket_path, args.calls, args.concurrency)))
+
+    try:
+        _print_result('amqp', loop.run_until_complete(
+            _benchmark_amqp(args.amqp_target, args.calls, args.concurrency)))
+    except (ConnectionError, OSError) as e:
+        print(f'  amqp: unavailable ({e})')
+
+
+if __name__ == '__main__':
+    main()
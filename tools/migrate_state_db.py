@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Moves SCORE states of a state db in single db layout to a db per SCORE
+
+Stop iconservice before running it and set stateDbMode to "multiple" after it.
+It is safe to run again after being interrupted.
+
+Usage: python tools/migrate_state_db.py <stateDbRootPath> [--backend plyvel]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from iconservice.database.backend import BackendType, SUPPORTED_BACKEND_TYPES
+from iconservice.database.sharding import migrate_to_multiple_db
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate state db from single db to multiple db layout')
+    parser.add_argument('state_db_root_path', help='stateDbRootPath in config')
+    parser.add_argument('--backend', default=BackendType.PLYVEL, choices=SUPPORTED_BACKEND_TYPES,
+                        help='stateDbBackend in config')
+    parser.add_argument('--batch-size', type=int, default=10000, help='the number of keys written at once')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    moved_count = migrate_to_multiple_db(args.state_db_root_path, args.backend, batch_size=args.batch_size)
+    print(f'Moved {moved_count} keys in {time.perf_counter() - start:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
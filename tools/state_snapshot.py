@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Exports committed states to a snapshot file or imports it for bootstrapping a node
+
+Stop iconservice before running it.
+
+Usage:
+    python tools/state_snapshot.py export <file> --state-db-root-path .statedb --score-root-path .score
+    python tools/state_snapshot.py import <file> --state-db-root-path .statedb --score-root-path .score
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from iconservice.database.backend import BackendType, SUPPORTED_BACKEND_TYPES
+from iconservice.database.state_snapshot import DEFAULT_CHUNK_SIZE, export_state_snapshot, import_state_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export or import state snapshot')
+    parser.add_argument('command', choices=('export', 'import'))
+    parser.add_argument('file', help='snapshot file')
+    parser.add_argument('--state-db-root-path', default='.statedb', help='stateDbRootPath in config')
+    parser.add_argument('--score-root-path', default='.score', help='scoreRootPath in config')
+    parser.add_argument('--backend', default=BackendType.PLYVEL, choices=SUPPORTED_BACKEND_TYPES,
+                        help='stateDbBackend in config')
+    parser.add_argument('--block-height', type=int, help='expected height of the last block on export')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='chunk size on export')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'export':
+        with open(args.file, 'wb') as f:
+            block = export_state_snapshot(f, args.state_db_root_path, args.score_root_path,
+                                          args.backend, args.block_height, args.chunk_size)
+    else:
+        with open(args.file, 'rb') as f:
+            block = import_state_snapshot(f, args.state_db_root_path, args.score_root_path, args.backend)
+
+    print(f'{args.command.capitalize()}ed the state at block {block.height} (0x{block.hash.hex()}) '
+          f'in {time.perf_counter() - start:.3f}s')
+
+
+if __name__ == '__main__':
+    main()